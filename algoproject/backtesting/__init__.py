@@ -5,9 +5,15 @@ AlgoProject Backtesting Engine
 Comprehensive backtesting framework for trading strategies.
 """
 
-from .backtest_engine import BacktestEngine
+from .backtest_engine import BacktestEngine, EngineMode
+from .aligned_timeline import AlignedTimeline
+from .fill_simulator import simulate_fills, FillSimulation, PositionMode, SizingMode
+from .matrix_backtest import MatrixBacktestEngine, ExecutionBackend
 from .backtest_context import BacktestContext
 from .portfolio import Portfolio
 from .trade_executor import TradeExecutor
+from .order_book import OrderBook, BookSide
+from .result_cache import BacktestResultCache
+from .job_service import BacktestJobService, BacktestJobSpec, JobStatus, JobQueueFullError
 
-__all__ = ['BacktestEngine', 'BacktestContext', 'Portfolio', 'TradeExecutor']
\ No newline at end of file
+__all__ = ['BacktestEngine', 'EngineMode', 'AlignedTimeline', 'simulate_fills', 'FillSimulation', 'PositionMode', 'SizingMode', 'MatrixBacktestEngine', 'ExecutionBackend', 'BacktestContext', 'Portfolio', 'TradeExecutor', 'OrderBook', 'BookSide', 'BacktestResultCache', 'BacktestJobService', 'BacktestJobSpec', 'JobStatus', 'JobQueueFullError']
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Aligned Timeline
+================
+
+Pre-aligned NumPy representation of multi-symbol OHLCV data for backtesting.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from ..core.interfaces import MarketData
+
+
+OHLCV_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class AlignedTimeline:
+    """Multi-symbol OHLCV data aligned onto a single sorted timeline
+
+    All symbol frames are reindexed once onto the union of their timestamps.
+    Prices are stored in a contiguous float64 array of shape
+    ``(n_symbols, 5, n_bars)`` and ``mask[s, i]`` is True when symbol ``s``
+    has a bar at timeline position ``i``.
+    """
+
+    def __init__(self, symbols: List[str], index: pd.DatetimeIndex,
+                 ohlcv: np.ndarray, mask: np.ndarray):
+        """Initialize aligned timeline
+
+        Args:
+            symbols: Symbols in array order
+            index: Sorted union of all timestamps
+            ohlcv: Float64 array of shape (n_symbols, 5, n_bars)
+            mask: Bool array of shape (n_symbols, n_bars)
+        """
+        self.symbols = list(symbols)
+        self.index = index
+        self.ohlcv = ohlcv
+        self.mask = mask
+        self.symbol_index: Dict[str, int] = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_frames(cls, historical_data: Dict[str, pd.DataFrame]) -> 'AlignedTimeline':
+        """Align symbol DataFrames onto one timeline
+
+        Args:
+            historical_data: Dictionary mapping symbols to OHLCV DataFrames
+
+        Returns:
+            AlignedTimeline instance
+        """
+        symbols = list(historical_data.keys())
+
+        frames = {}
+        index = None
+        for symbol in symbols:
+            df = historical_data[symbol]
+            if df.index.has_duplicates:
+                df = df[~df.index.duplicated(keep='last')]
+            frames[symbol] = df
+            index = df.index if index is None else index.union(df.index)
+
+        if index is None:
+            index = pd.DatetimeIndex([])
+        index = index.sort_values()
+
+        n_bars = len(index)
+        ohlcv = np.full((len(symbols), len(OHLCV_FIELDS), n_bars), np.nan, dtype=np.float64)
+        mask = np.zeros((len(symbols), n_bars), dtype=bool)
+
+        for i, symbol in enumerate(symbols):
+            df = frames[symbol]
+            positions = index.get_indexer(df.index)
+            mask[i, positions] = True
+            for j, field in enumerate(OHLCV_FIELDS):
+                ohlcv[i, j, positions] = df[field].to_numpy(dtype=np.float64)
+
+        return cls(symbols, index, ohlcv, mask)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def n_symbols(self) -> int:
+        """Number of symbols on the timeline"""
+        return len(self.symbols)
+
+    def field(self, name: str, symbol: Optional[str] = None) -> np.ndarray:
+        """Get a single OHLCV field
+
+        Args:
+            name: Field name ('open', 'high', 'low', 'close', 'volume')
+            symbol: Restrict to one symbol (optional)
+
+        Returns:
+            Array of shape (n_bars,) for one symbol, else (n_symbols, n_bars)
+        """
+        j = OHLCV_FIELDS.index(name)
+        if symbol is not None:
+            return self.ohlcv[self.symbol_index[symbol], j]
+        return self.ohlcv[:, j]
+
+    def iter_market_data(self, exchange: str = "backtest"):
+        """Walk the timeline by integer position
+
+        Yields, for every timeline position, the timestamp and the list of
+        MarketData objects for symbols that have a bar at that position (in
+        symbol order). Array rows are converted to Python lists up front so
+        the per-bar loop never touches pandas or NumPy scalars.
+
+        Args:
+            exchange: Exchange name stamped onto MarketData
+
+        Yields:
+            Tuple of (timestamp, list of MarketData)
+        """
+        timestamps = list(self.index)
+        mask_rows = self.mask.T.tolist()
+        columns = [
+            [self.ohlcv[s, j].tolist() for j in range(len(OHLCV_FIELDS))]
+            for s in range(self.n_symbols)
+        ]
+        symbols = self.symbols
+
+        for i, timestamp in enumerate(timestamps):
+            bars = []
+            present = mask_rows[i]
+            for s, symbol in enumerate(symbols):
+                if present[s]:
+                    opens, highs, lows, closes, volumes = columns[s]
+                    bars.append(MarketData(
+                        symbol=symbol,
+                        timestamp=timestamp,
+                        open=opens[i],
+                        high=highs[i],
+                        low=lows[i],
+                        close=closes[i],
+                        volume=volumes[i],
+                        exchange=exchange
+                    ))
+            yield timestamp, bars
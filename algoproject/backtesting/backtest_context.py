@@ -3,30 +3,79 @@ Backtest Context
 ===============
 
 Context object that provides backtesting environment for strategies.
+
+By default every bar is kept for the whole run. With a ``lookback``, each
+symbol's history is a fixed-size ring buffer holding only the last
+``lookback`` bars, so memory no longer grows with the length of the
+backtest. The equity curve and trade log are recorded in typed columns
+either way.
+
+``equity_curve`` holds a point per executed trade. ``bar_equity`` holds
+the marked-to-market value at the close of every bar; the portfolio
+keeps running totals, so recording it is O(1) per bar regardless of the
+number of open positions.
 """
 
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List, Any, Optional
+import sys
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
-from collections import defaultdict
 
 from ..core.interfaces import MarketData, Signal, Position
 from .portfolio import Portfolio
+from .columnar import BAR_FIELDS, BarRingBuffer, ColumnarLog, to_datetime64
+
+
+EQUITY_SCHEMA = {
+    'timestamp': 'datetime64[ns]',
+    'portfolio_value': np.float64,
+    'cash': np.float64,
+    'positions_value': np.float64,
+    'total_trades': np.int64,
+    'commission_paid': np.float64
+}
+
+BAR_EQUITY_SCHEMA = {
+    'timestamp': 'datetime64[ns]',
+    'portfolio_value': np.float64,
+    'cash': np.float64,
+    'positions_value': np.float64
+}
+
+TRADE_SCHEMA = {
+    'timestamp': 'datetime64[ns]',
+    'symbol': object,
+    'action': object,
+    'quantity': np.float64,
+    'signal_price': object,     # None when the signal had no price
+    'executed_price': np.float64,
+    'commission': np.float64,
+    'portfolio_value': np.float64,
+    'cash': np.float64,
+    'confidence': np.float64,
+    'metadata': object
+}
 
 
 class BacktestContext:
     """Backtesting context for strategies"""
     
-    def __init__(self, initial_capital: float = 100000.0, commission: float = 0.001):
+    def __init__(self, initial_capital: float = 100000.0, commission: float = 0.001,
+                 lookback: Optional[int] = None):
         """Initialize backtest context
         
         Args:
             initial_capital: Starting capital for backtesting
             commission: Commission rate (as decimal, e.g., 0.001 = 0.1%)
+            lookback: Bars of history kept per symbol (None keeps every bar)
         """
+        if lookback is not None and lookback <= 0:
+            raise ValueError(f"lookback must be positive, got {lookback}")
         self.initial_capital = initial_capital
         self.commission = commission
+        self.lookback = lookback
         self.logger = logging.getLogger(__name__)
         
         # Portfolio management
@@ -36,13 +85,13 @@ class BacktestContext:
         self.current_data: Dict[str, MarketData] = {}
         self.current_timestamp: Optional[datetime] = None
         
-        # Historical data storage
-        self.historical_data: Dict[str, List[MarketData]] = defaultdict(list)
+        # Historical data storage: lists of bars, or ring buffers with a lookback
+        self.historical_data: Dict[str, Union[List[MarketData], BarRingBuffer]] = {}
         
         # Performance tracking
-        self.equity_curve: List[Dict[str, Any]] = []
-        self.trade_log: List[Dict[str, Any]] = []
-        self.daily_returns: List[float] = []
+        self.equity_curve = ColumnarLog(EQUITY_SCHEMA)
+        self.bar_equity = ColumnarLog(BAR_EQUITY_SCHEMA, capacity=4096)
+        self.trade_log = ColumnarLog(TRADE_SCHEMA)
         
         # Strategy state
         self.strategy_states: Dict[str, Any] = {}
@@ -63,6 +112,12 @@ class BacktestContext:
         """Get current cash balance"""
         return self.portfolio.cash
     
+    @property
+    def daily_returns(self) -> List[float]:
+        """Returns between consecutive equity curve points"""
+        values = self.equity_curve.column('portfolio_value')
+        return (np.diff(values) / values[:-1]).tolist()
+    
     @property
     def positions(self) -> Dict[str, Position]:
         """Get current positions"""
@@ -101,7 +156,12 @@ class BacktestContext:
         self.current_timestamp = data.timestamp
         
         # Store historical data
-        self.historical_data[symbol].append(data)
+        history = self.historical_data.get(symbol)
+        if history is None:
+            history = self.historical_data[symbol] = (
+                [] if self.lookback is None else BarRingBuffer(symbol, self.lookback)
+            )
+        history.append(data)
         
         # Update portfolio with current prices
         self.portfolio.update_market_price(symbol, data.close)
@@ -114,13 +174,36 @@ class BacktestContext:
             periods: Number of periods to return (None for all)
             
         Returns:
-            List of historical MarketData objects
+            List of historical MarketData objects (at most lookback with a lookback)
         """
         data = self.historical_data.get(symbol, [])
+        if isinstance(data, BarRingBuffer):
+            return data.tail(periods)
         if periods is not None:
             return data[-periods:]
         return data
     
+    def get_historical_arrays(self, symbol: str, periods: int = None) -> Dict[str, np.ndarray]:
+        """Get historical data for a symbol as arrays
+        
+        Args:
+            symbol: Trading symbol
+            periods: Number of periods to return (None for all)
+            
+        Returns:
+            Arrays keyed by 'timestamp' and the OHLCV fields, oldest first
+        """
+        data = self.historical_data.get(symbol)
+        if isinstance(data, BarRingBuffer):
+            return data.arrays(periods)
+        
+        bars = (data or [])[-periods:] if periods is not None else (data or [])
+        arrays = {'timestamp': np.array([to_datetime64(bar.timestamp) for bar in bars],
+                                        dtype='datetime64[ns]')}
+        for name in BAR_FIELDS:
+            arrays[name] = np.array([getattr(bar, name) for bar in bars], dtype=np.float64)
+        return arrays
+    
     def get_current_price(self, symbol: str) -> Optional[float]:
         """Get current price for a symbol
         
@@ -187,7 +270,7 @@ class BacktestContext:
             executed_price: Actual execution price
             commission: Commission paid
         """
-        trade_record = {
+        self.trade_log.append({
             'timestamp': self.current_timestamp,
             'symbol': signal.symbol,
             'action': signal.action,
@@ -199,30 +282,34 @@ class BacktestContext:
             'cash': self.cash,
             'confidence': signal.confidence,
             'metadata': signal.metadata
-        }
-        
-        self.trade_log.append(trade_record)
+        })
     
     def _update_performance_tracking(self):
         """Update performance tracking metrics"""
         # Record equity curve point
-        equity_point = {
+        portfolio_value = self.portfolio_value
+        self.equity_curve.append({
             'timestamp': self.current_timestamp,
-            'portfolio_value': self.portfolio_value,
+            'portfolio_value': portfolio_value,
             'cash': self.cash,
-            'positions_value': self.portfolio_value - self.cash,
+            'positions_value': portfolio_value - self.cash,
             'total_trades': self.total_trades,
             'commission_paid': self.total_commission_paid
-        }
-        
-        self.equity_curve.append(equity_point)
+        })
+    
+    def record_bar_equity(self):
+        """Record the marked-to-market portfolio value for the current bar
         
-        # Calculate daily return if we have previous data
-        if len(self.equity_curve) > 1:
-            prev_value = self.equity_curve[-2]['portfolio_value']
-            current_value = self.portfolio_value
-            daily_return = (current_value - prev_value) / prev_value
-            self.daily_returns.append(daily_return)
+        Called once per timestamp after the bar's trades have executed.
+        """
+        positions_value = self.portfolio.get_total_positions_value()
+        cash = self.cash
+        self.bar_equity.append({
+            'timestamp': self.current_timestamp,
+            'portfolio_value': cash + positions_value,
+            'cash': cash,
+            'positions_value': positions_value
+        })
     
     def get_equity_curve_df(self) -> pd.DataFrame:
         """Get equity curve as DataFrame
@@ -230,12 +317,21 @@ class BacktestContext:
         Returns:
             DataFrame with equity curve data
         """
-        if not self.equity_curve:
+        if not len(self.equity_curve):
+            return pd.DataFrame()
+        
+        return self.equity_curve.to_frame(index='timestamp')
+    
+    def get_bar_equity_df(self) -> pd.DataFrame:
+        """Get the per-bar equity series as DataFrame
+        
+        Returns:
+            DataFrame with one row per bar
+        """
+        if not len(self.bar_equity):
             return pd.DataFrame()
         
-        df = pd.DataFrame(self.equity_curve)
-        df.set_index('timestamp', inplace=True)
-        return df
+        return self.bar_equity.to_frame(index='timestamp')
     
     def get_trade_log_df(self) -> pd.DataFrame:
         """Get trade log as DataFrame
@@ -243,12 +339,10 @@ class BacktestContext:
         Returns:
             DataFrame with trade log data
         """
-        if not self.trade_log:
+        if not len(self.trade_log):
             return pd.DataFrame()
         
-        df = pd.DataFrame(self.trade_log)
-        df.set_index('timestamp', inplace=True)
-        return df
+        return self.trade_log.to_frame(index='timestamp')
     
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get performance summary
@@ -256,24 +350,16 @@ class BacktestContext:
         Returns:
             Dictionary with performance metrics
         """
-        if not self.equity_curve:
+        if not len(self.equity_curve):
             return {}
         
         final_value = self.portfolio_value
         total_return = (final_value - self.initial_capital) / self.initial_capital
         
         # Calculate win rate
-        winning_trades = 0
-        losing_trades = 0
-        
-        for i in range(1, len(self.equity_curve)):
-            prev_value = self.equity_curve[i-1]['portfolio_value']
-            curr_value = self.equity_curve[i]['portfolio_value']
-            
-            if curr_value > prev_value:
-                winning_trades += 1
-            elif curr_value < prev_value:
-                losing_trades += 1
+        changes = np.diff(self.equity_curve.column('portfolio_value'))
+        winning_trades = int(np.count_nonzero(changes > 0))
+        losing_trades = int(np.count_nonzero(changes < 0))
         
         total_trades = winning_trades + losing_trades
         win_rate = winning_trades / total_trades if total_trades > 0 else 0
@@ -299,14 +385,42 @@ class BacktestContext:
         self.current_timestamp = None
         self.historical_data.clear()
         self.equity_curve.clear()
+        self.bar_equity.clear()
         self.trade_log.clear()
-        self.daily_returns.clear()
         self.strategy_states.clear()
         self.total_trades = 0
         self.winning_trades = 0
         self.losing_trades = 0
         self.total_commission_paid = 0.0
     
+    def get_memory_usage(self) -> Dict[str, int]:
+        """Get bytes held by the history, equity curve and trade log
+        
+        Ring buffers and typed columns are counted exactly; unbounded
+        history lists are estimated from their first bar.
+        
+        Returns:
+            Dictionary with history_bytes, equity_curve_bytes, bar_equity_bytes
+            and trade_log_bytes
+        """
+        history_bytes = 0
+        for history in self.historical_data.values():
+            if isinstance(history, BarRingBuffer):
+                history_bytes += history.nbytes
+            elif history:
+                bar = history[0]
+                # Symbol and exchange strings are shared between bars
+                per_bar = sys.getsizeof(bar) + sys.getsizeof(vars(bar)) + sum(
+                    sys.getsizeof(value) for value in vars(bar).values() if not isinstance(value, str)
+                )
+                history_bytes += sys.getsizeof(history) + per_bar * len(history)
+        return {
+            'history_bytes': history_bytes,
+            'equity_curve_bytes': self.equity_curve.nbytes,
+            'bar_equity_bytes': self.bar_equity.nbytes,
+            'trade_log_bytes': self.trade_log.nbytes
+        }
+    
     def set_strategy_state(self, key: str, value: Any):
         """Set strategy-specific state
         
@@ -5,26 +5,45 @@ Backtest Engine
 Core backtesting engine for AlgoProject.
 """
 
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List, Any, Optional, Union
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 import time
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 from ..core.interfaces import MarketData, Signal
+from ..core import kpi_kernel as kernel
 from ..strategies.base_strategy import BaseStrategy
 from ..data.data_loader import DataLoader
 from .backtest_context import BacktestContext
 from .trade_executor import TradeExecutor
+from .aligned_timeline import AlignedTimeline, OHLCV_FIELDS
+
+
+class EngineMode(Enum):
+    """Backtest event loop modes"""
+    EVENT = "event"            # Per-timestamp pandas lookups
+    VECTORIZED = "vectorized"  # Integer walk over a pre-aligned NumPy timeline
 
 
 class BacktestEngine:
     """Core backtesting engine"""
     
     def __init__(self, data_loader: DataLoader, initial_capital: float = 100000.0,
-                 commission: float = 0.001, slippage: float = 0.001):
+                 commission: float = 0.001, slippage: float = 0.001,
+                 mode: Union[EngineMode, str] = EngineMode.EVENT,
+                 use_batch_signals: bool = True,
+                 progress_callback: Optional[Callable[[int, int], None]] = None,
+                 lookback: Optional[int] = None):
         """Initialize backtest engine
         
         Args:
@@ -32,13 +51,28 @@ class BacktestEngine:
             initial_capital: Starting capital
             commission: Commission rate (as decimal)
             slippage: Slippage factor (as decimal)
+            mode: Event loop mode ('event' or 'vectorized')
+            use_batch_signals: Use a strategy's generate_signals_batch when it
+                provides one instead of calling next() per bar
+            progress_callback: Called as callback(bars_done, total_bars) after
+                every bar; an exception raised by it aborts the backtest
+            lookback: Bars of history the context keeps per symbol (None uses
+                the strategy's get_lookback(), which keeps every bar by default)
         """
         self.data_loader = data_loader
         self.initial_capital = initial_capital
         self.commission = commission
         self.slippage = slippage
+        self.mode = EngineMode(mode)
+        self.use_batch_signals = use_batch_signals
+        self.progress_callback = progress_callback
+        self.lookback = lookback
         self.logger = logging.getLogger(__name__)
         
+        # Peak resident memory sampled during the current run (psutil only)
+        self._process = psutil.Process() if psutil is not None else None
+        self._peak_rss = 0
+        
         # Backtest state
         self.context: Optional[BacktestContext] = None
         self.executor: Optional[TradeExecutor] = None
@@ -68,7 +102,9 @@ class BacktestEngine:
             self.is_running = True
             
             # Initialize backtest components
-            self.context = BacktestContext(self.initial_capital, self.commission)
+            self._peak_rss = 0
+            self._sample_memory()
+            self.context = self._create_context(strategy)
             self.executor = TradeExecutor(self.context, self.slippage)
             self.strategy = strategy
             
@@ -98,7 +134,8 @@ class BacktestEngine:
     
     def run_matrix_backtest(self, strategies: List[BaseStrategy], symbols: List[str],
                           start_date: datetime, end_date: datetime,
-                          timeframe: str = '1d', max_workers: int = 4) -> Dict[str, Dict[str, Any]]:
+                          timeframe: str = '1d', max_workers: int = 4,
+                          backend: str = 'thread') -> Dict[str, Dict[str, Any]]:
         """Run matrix backtest (multiple strategies on multiple symbols)
         
         Args:
@@ -108,6 +145,8 @@ class BacktestEngine:
             end_date: End date for backtest
             timeframe: Data timeframe
             max_workers: Maximum number of parallel workers
+            backend: 'thread' or 'process' (process pool over shared-memory data;
+                strategy classes must be importable at module level)
             
         Returns:
             Dictionary with results for each strategy-symbol combination
@@ -115,6 +154,10 @@ class BacktestEngine:
         try:
             self.logger.info(f"Starting matrix backtest: {len(strategies)} strategies on {len(symbols)} symbols")
             
+            if backend == 'process':
+                return self._run_matrix_backtest_in_processes(strategies, symbols, start_date,
+                                                              end_date, timeframe, max_workers)
+            
             results = {}
             
             # Create all combinations
@@ -149,6 +192,54 @@ class BacktestEngine:
             self.logger.error(f"Matrix backtest failed: {e}")
             raise
     
+    def _run_matrix_backtest_in_processes(self, strategies: List[BaseStrategy], symbols: List[str],
+                                          start_date: datetime, end_date: datetime,
+                                          timeframe: str, max_workers: int) -> Dict[str, Dict[str, Any]]:
+        """Run a matrix backtest on the MatrixBacktestEngine process backend
+        
+        Args:
+            strategies: List of trading strategies
+            symbols: List of symbols to trade
+            start_date: Start date for backtest
+            end_date: End date for backtest
+            timeframe: Data timeframe
+            max_workers: Maximum number of worker processes
+            
+        Returns:
+            Dictionary with results for each strategy-symbol combination
+        """
+        from .matrix_backtest import MatrixBacktestEngine, BacktestJob
+        
+        matrix = MatrixBacktestEngine(self.data_loader, max_workers=max_workers,
+                                      backend='process', engine_mode=self.mode)
+        for strategy in strategies:
+            for symbol in symbols:
+                matrix.jobs.append(BacktestJob(
+                    job_id=f"{strategy.name}_{symbol}",
+                    strategy_name=strategy.name,
+                    strategy_class=strategy.__class__,
+                    strategy_params=strategy.parameters.copy(),
+                    symbols=[symbol],
+                    start_date=start_date,
+                    end_date=end_date,
+                    timeframe=timeframe,
+                    initial_capital=self.initial_capital,
+                    commission=self.commission,
+                    slippage=self.slippage
+                ))
+        
+        results = {}
+        for result in matrix.stream_matrix_backtest():
+            if result.success:
+                results[result.job_id] = result.results
+                self.logger.info(f"Completed: {result.job_id}")
+            else:
+                self.logger.error(f"Failed: {result.job_id} - {result.error_message}")
+                results[result.job_id] = {"error": result.error_message}
+        
+        self.logger.info(f"Matrix backtest completed: {len(results)} results")
+        return results
+    
     def _run_single_backtest(self, strategy: BaseStrategy, symbols: List[str],
                            start_date: datetime, end_date: datetime, timeframe: str) -> Dict[str, Any]:
         """Run a single backtest (used for parallel execution)
@@ -163,12 +254,12 @@ class BacktestEngine:
         Returns:
             Backtest results
         """
-        # Create new instances for thread safety
-        context = BacktestContext(self.initial_capital, self.commission)
-        executor = TradeExecutor(context, self.slippage)
-        
         # Clone strategy to avoid state conflicts
         strategy_copy = strategy.__class__(strategy.name, strategy.parameters.copy())
+        
+        # Create new instances for thread safety
+        context = self._create_context(strategy_copy)
+        executor = TradeExecutor(context, self.slippage)
         strategy_copy.initialize(context)
         
         # Load historical data
@@ -183,6 +274,25 @@ class BacktestEngine:
         # Calculate and return results
         return self._calculate_results_with_context(context, executor, strategy_copy)
     
+    def _create_context(self, strategy: BaseStrategy) -> BacktestContext:
+        """Create a context whose history is bounded by the lookback in effect
+        
+        Args:
+            strategy: Strategy that will run in the context
+            
+        Returns:
+            New backtest context
+        """
+        lookback = self.lookback
+        if lookback is None and isinstance(strategy, BaseStrategy):
+            lookback = strategy.get_lookback()
+        return BacktestContext(self.initial_capital, self.commission, lookback=lookback)
+    
+    def _sample_memory(self):
+        """Record the process's resident memory if it is a new peak"""
+        if self._process is not None:
+            self._peak_rss = max(self._peak_rss, self._process.memory_info().rss)
+    
     def _load_historical_data(self, symbols: List[str], start_date: datetime,
                             end_date: datetime, timeframe: str) -> Dict[str, pd.DataFrame]:
         """Load historical data for symbols
@@ -232,6 +342,34 @@ class BacktestEngine:
                                      executor: TradeExecutor):
         """Execute backtest with specific context
         
+        Args:
+            historical_data: Historical data
+            strategy: Trading strategy
+            context: Backtest context
+            executor: Trade executor
+        """
+        timeline = None
+        batch_orders = None
+        base_hook = BaseStrategy.generate_signals_batch
+        overrides_batch = getattr(type(strategy), 'generate_signals_batch', base_hook) is not base_hook
+        if self.use_batch_signals and overrides_batch:
+            timeline = AlignedTimeline.from_frames(historical_data)
+            batch_orders = self._generate_batch_orders(timeline, strategy)
+        
+        if batch_orders is not None:
+            self._execute_batch_loop(timeline, batch_orders, strategy, context, executor)
+        elif self.mode == EngineMode.VECTORIZED:
+            self._execute_vectorized_loop(historical_data, strategy, context, executor, timeline)
+        else:
+            self._execute_event_loop(historical_data, strategy, context, executor)
+        
+        self.logger.info("Backtest execution completed")
+    
+    def _execute_event_loop(self, historical_data: Dict[str, pd.DataFrame],
+                            strategy: BaseStrategy, context: BacktestContext,
+                            executor: TradeExecutor):
+        """Walk the timeline with per-timestamp DataFrame lookups
+        
         Args:
             historical_data: Historical data
             strategy: Trading strategy
@@ -271,28 +409,156 @@ class BacktestEngine:
                     # Process market data through executor
                     executor.process_market_data(market_data)
             
-            # Generate signals from strategy
+            self._dispatch_strategy(historical_data.keys(), strategy, context, executor, timestamp)
+            context.record_bar_equity()
+            self._log_progress(i, len(sorted_timestamps))
+    
+    def _execute_vectorized_loop(self, historical_data: Dict[str, pd.DataFrame],
+                                 strategy: BaseStrategy, context: BacktestContext,
+                                 executor: TradeExecutor,
+                                 timeline: Optional[AlignedTimeline] = None):
+        """Walk a pre-aligned NumPy timeline by integer index
+        
+        Feeds the context, executor and strategy exactly the same sequence
+        of MarketData as the event loop, without per-timestamp pandas
+        lookups.
+        
+        Args:
+            historical_data: Historical data
+            strategy: Trading strategy
+            context: Backtest context
+            executor: Trade executor
+            timeline: Already aligned timeline (optional)
+        """
+        if timeline is None:
+            timeline = AlignedTimeline.from_frames(historical_data)
+        total = len(timeline)
+        
+        self.logger.info(f"Processing {total} time periods (vectorized)")
+        
+        for i, (timestamp, bars) in enumerate(timeline.iter_market_data()):
+            for market_data in bars:
+                context.update_market_data(market_data)
+                executor.process_market_data(market_data)
+            
+            self._dispatch_strategy(timeline.symbols, strategy, context, executor, timestamp)
+            context.record_bar_equity()
+            self._log_progress(i, total)
+    
+    def _generate_batch_orders(self, timeline: AlignedTimeline,
+                               strategy: BaseStrategy) -> Optional[Dict[int, List[Tuple[str, str, float]]]]:
+        """Ask the strategy for whole-array signals, one symbol at a time
+        
+        Args:
+            timeline: Aligned timeline
+            strategy: Trading strategy
+            
+        Returns:
+            Mapping of timeline position to (symbol, action, quantity) orders,
+            or None if the strategy does not provide batch signals
+        """
+        orders: Dict[int, List[Tuple[str, str, float]]] = {}
+        
+        for s, symbol in enumerate(timeline.symbols):
+            positions = np.flatnonzero(timeline.mask[s])
+            ohlcv_arrays = {field: timeline.ohlcv[s, j, positions] for j, field in enumerate(OHLCV_FIELDS)}
+            ohlcv_arrays['timestamp'] = timeline.index[positions].to_numpy()
+            ohlcv_arrays['symbol'] = symbol
+            
             try:
-                signals = []
-                for symbol in historical_data.keys():
-                    if symbol in context.current_data:
-                        symbol_signals = strategy.next(context.current_data[symbol])
-                        if symbol_signals:
-                            signals.extend(symbol_signals)
+                result = strategy.generate_signals_batch(ohlcv_arrays)
+                if result is None:
+                    return None
                 
-                # Execute signals
-                for signal in signals:
-                    executor.execute_signal(signal)
-                    
+                action = np.asarray(result['action'])
+                if action.shape != positions.shape:
+                    raise ValueError(f"expected {len(positions)} actions, got shape {action.shape}")
+                quantity = np.broadcast_to(np.asarray(result['quantity'], dtype=np.float64), positions.shape)
             except Exception as e:
-                self.logger.error(f"Error processing timestamp {timestamp}: {e}")
+                self.logger.error(f"Batch signals failed for {symbol}, using next(): {e}")
+                return None
             
-            # Log progress periodically
-            if i % 1000 == 0 and i > 0:
-                progress = (i / len(sorted_timestamps)) * 100
-                self.logger.info(f"Progress: {progress:.1f}% ({i}/{len(sorted_timestamps)})")
+            for k in np.flatnonzero(action):
+                orders.setdefault(int(positions[k]), []).append(
+                    (symbol, 'buy' if action[k] > 0 else 'sell', float(quantity[k]))
+                )
         
-        self.logger.info("Backtest execution completed")
+        self.logger.info(f"Using batch signals: {sum(len(o) for o in orders.values())} orders")
+        return orders
+    
+    def _execute_batch_loop(self, timeline: AlignedTimeline,
+                            orders: Dict[int, List[Tuple[str, str, float]]],
+                            strategy: BaseStrategy, context: BacktestContext,
+                            executor: TradeExecutor):
+        """Walk the timeline placing precomputed batch orders
+        
+        Market data still flows through the context and executor on every
+        bar, but the strategy is only touched on bars that carry an order.
+        
+        Args:
+            timeline: Aligned timeline
+            orders: Orders by timeline position from _generate_batch_orders
+            strategy: Trading strategy
+            context: Backtest context
+            executor: Trade executor
+        """
+        total = len(timeline)
+        
+        self.logger.info(f"Processing {total} time periods (batch signals)")
+        
+        for i, (timestamp, bars) in enumerate(timeline.iter_market_data()):
+            for market_data in bars:
+                context.update_market_data(market_data)
+                executor.process_market_data(market_data)
+            
+            for symbol, action, quantity in orders.get(i, ()):
+                try:
+                    executor.execute_signal(strategy.create_signal(symbol, action, quantity))
+                except Exception as e:
+                    self.logger.error(f"Error processing timestamp {timestamp}: {e}")
+            
+            context.record_bar_equity()
+            self._log_progress(i, total)
+    
+    def _dispatch_strategy(self, symbols, strategy: BaseStrategy, context: BacktestContext,
+                           executor: TradeExecutor, timestamp):
+        """Generate signals from strategy for the current bar and execute them
+        
+        Args:
+            symbols: Symbols in the backtest
+            strategy: Trading strategy
+            context: Backtest context
+            executor: Trade executor
+            timestamp: Current timestamp
+        """
+        try:
+            signals = []
+            for symbol in symbols:
+                if symbol in context.current_data:
+                    symbol_signals = strategy.next(context.current_data[symbol])
+                    if symbol_signals:
+                        signals.extend(symbol_signals)
+            
+            # Execute signals
+            for signal in signals:
+                executor.execute_signal(signal)
+                
+        except Exception as e:
+            self.logger.error(f"Error processing timestamp {timestamp}: {e}")
+    
+    def _log_progress(self, i: int, total: int):
+        """Report progress to the callback and log it periodically
+        
+        Args:
+            i: Current timeline position
+            total: Number of timeline positions
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(i + 1, total)
+        if i % 1000 == 0 and i > 0:
+            self._sample_memory()
+            progress = (i / total) * 100
+            self.logger.info(f"Progress: {progress:.1f}% ({i}/{total})")
     
     def _calculate_results(self) -> Dict[str, Any]:
         """Calculate backtest results
@@ -320,12 +586,21 @@ class BacktestEngine:
         # Get execution summary
         execution = executor.get_execution_summary()
         
-        # Get equity curve and trade log
+        # Get equity curves and trade log
         equity_curve = context.get_equity_curve_df()
+        bar_equity = context.get_bar_equity_df()
         trade_log = context.get_trade_log_df()
         
-        # Calculate additional metrics
-        additional_metrics = self._calculate_additional_metrics(equity_curve, trade_log)
+        # Calculate additional metrics on the per-bar curve
+        additional_metrics = self._calculate_additional_metrics(bar_equity, trade_log)
+        
+        # Context storage only grows during a run, so its final size is its peak
+        self._sample_memory()
+        memory = {
+            'lookback': context.lookback,
+            **context.get_memory_usage(),
+            'peak_rss_bytes': self._peak_rss or None
+        }
         
         # Combine all results
         results = {
@@ -334,9 +609,11 @@ class BacktestEngine:
             'performance': performance,
             'execution': execution,
             'metrics': additional_metrics,
-            'equity_curve': equity_curve.to_dict('records') if not equity_curve.empty else [],
-            'trade_log': trade_log.to_dict('records') if not trade_log.empty else [],
-            'final_portfolio': context.portfolio.get_portfolio_summary()
+            'equity_curve': equity_curve.reset_index().to_dict('records') if not equity_curve.empty else [],
+            'bar_equity': bar_equity.reset_index().to_dict('records') if not bar_equity.empty else [],
+            'trade_log': trade_log.reset_index().to_dict('records') if not trade_log.empty else [],
+            'final_portfolio': context.portfolio.get_portfolio_summary(),
+            'memory': memory
         }
         
         return results
@@ -346,7 +623,7 @@ class BacktestEngine:
         """Calculate additional performance metrics
         
         Args:
-            equity_curve: Equity curve DataFrame
+            equity_curve: Per-bar equity curve DataFrame
             trade_log: Trade log DataFrame
             
         Returns:
@@ -358,14 +635,14 @@ class BacktestEngine:
             return metrics
         
         try:
-            # Calculate returns
-            returns = equity_curve['portfolio_value'].pct_change().dropna()
+            values = kernel.as_runs(equity_curve['portfolio_value'].to_numpy(dtype=float))
+            returns = kernel.simple_returns(values)
             
-            if len(returns) > 0:
+            if returns.size > 0:
                 # Basic return metrics
-                metrics['total_return'] = (equity_curve['portfolio_value'].iloc[-1] / equity_curve['portfolio_value'].iloc[0]) - 1
-                metrics['annualized_return'] = (1 + metrics['total_return']) ** (252 / len(returns)) - 1
-                metrics['volatility'] = returns.std() * (252 ** 0.5)
+                metrics['total_return'] = float(values[0, -1] / values[0, 0] - 1)
+                metrics['annualized_return'] = (1 + metrics['total_return']) ** (252 / returns.shape[1]) - 1
+                metrics['volatility'] = float(kernel.nan_std(returns)[0] * (252 ** 0.5))
                 
                 # Risk metrics
                 if metrics['volatility'] > 0:
@@ -374,20 +651,27 @@ class BacktestEngine:
                     metrics['sharpe_ratio'] = 0
                 
                 # Drawdown metrics
-                peak = equity_curve['portfolio_value'].expanding().max()
-                drawdown = (equity_curve['portfolio_value'] - peak) / peak
-                metrics['max_drawdown'] = drawdown.min()
-                metrics['avg_drawdown'] = drawdown[drawdown < 0].mean() if len(drawdown[drawdown < 0]) > 0 else 0
+                drawdown = kernel.drawdowns(values)
+                underwater = drawdown[drawdown < 0]
+                metrics['max_drawdown'] = float(drawdown.min())
+                metrics['avg_drawdown'] = float(underwater.mean()) if underwater.size else 0
                 
                 # Trade metrics
                 if not trade_log.empty:
-                    # Calculate trade returns
-                    buy_trades = trade_log[trade_log['action'] == 'buy']
-                    sell_trades = trade_log[trade_log['action'] == 'sell']
+                    # The context logs fills indexed by timestamp
+                    timestamps = pd.Series(trade_log['timestamp'].to_numpy() if 'timestamp' in trade_log.columns
+                                           else trade_log.index.to_numpy())
+                    actions = trade_log['action'].to_numpy()
+                    buys = timestamps[actions == 'buy']
+                    sells = timestamps[actions == 'sell']
                     
-                    if len(buy_trades) > 0 and len(sell_trades) > 0:
-                        metrics['avg_trade_duration'] = (sell_trades['timestamp'].mean() - buy_trades['timestamp'].mean()).total_seconds() / 3600  # hours
-                        metrics['profit_factor'] = abs(returns[returns > 0].sum()) / abs(returns[returns < 0].sum()) if len(returns[returns < 0]) > 0 else float('inf')
+                    if len(buys) > 0 and len(sells) > 0:
+                        metrics['avg_trade_duration'] = (sells.mean() - buys.mean()).total_seconds() / 3600  # hours
+                        gains = kernel.masked(returns, returns > 0)
+                        losses = kernel.masked(returns, returns < 0)
+                        metrics['profit_factor'] = float(kernel.profit_factor(
+                            np.nansum(gains), -np.nansum(losses), no_trades=float('inf')
+                        ))
                 
         except Exception as e:
             self.logger.error(f"Error calculating additional metrics: {e}")
@@ -0,0 +1,200 @@
+"""
+Columnar Storage
+================
+
+Compact containers for per-bar backtest state.
+
+``BarRingBuffer`` keeps the last N bars of one symbol in preallocated
+NumPy arrays, so a strategy's lookback costs a fixed amount of memory no
+matter how long the backtest runs. ``ColumnarLog`` is an append-only
+table of typed columns that doubles its capacity as it grows, used for
+the equity curve and trade log instead of lists of dicts.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..core.interfaces import MarketData
+
+
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def to_datetime64(value: Any) -> np.datetime64:
+    """Convert a timestamp to naive UTC datetime64[ns] (NaT for None)"""
+    if value is None:
+        return np.datetime64('NaT', 'ns')
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return ts.to_datetime64().astype('datetime64[ns]')
+
+
+def _restore_timezone(values: np.ndarray, tz: Any) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(values)
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    return index
+
+
+class BarRingBuffer:
+    """Last ``capacity`` bars of one symbol in fixed NumPy arrays"""
+
+    def __init__(self, symbol: str, capacity: int):
+        """
+        Initialize the buffer
+
+        Args:
+            symbol: Trading symbol
+            capacity: Bars kept; older bars are overwritten
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity <= 0:
+            raise ValueError(f"Ring buffer capacity must be positive, got {capacity}")
+        self.symbol = symbol
+        self.capacity = capacity
+        self.exchange = ''
+        self.timestamps = np.empty(capacity, dtype='datetime64[ns]')
+        self.values = np.empty((capacity, len(BAR_FIELDS)), dtype=np.float64)
+        self._tz = None
+        self._next = 0
+        self._count = 0
+
+    def append(self, data: MarketData):
+        """Add a bar, overwriting the oldest when full"""
+        i = self._next
+        if self._count == 0 and getattr(data.timestamp, 'tzinfo', None) is not None:
+            self._tz = data.timestamp.tzinfo
+        self.timestamps[i] = to_datetime64(data.timestamp)
+        self.values[i] = (data.open, data.high, data.low, data.close, data.volume)
+        self.exchange = data.exchange
+        self._next = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        return iter(self.tail())
+
+    def _order(self, periods: Optional[int]) -> np.ndarray:
+        """Buffer positions of the last ``periods`` bars, oldest first"""
+        count = self._count if periods is None else max(0, min(periods, self._count))
+        return (np.arange(self._next - count, self._next)) % self.capacity
+
+    def arrays(self, periods: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Get the last bars as arrays
+
+        Args:
+            periods: Bars to return (None for everything buffered)
+
+        Returns:
+            Arrays keyed by 'timestamp' and the OHLCV fields, oldest first
+        """
+        order = self._order(periods)
+        result = {'timestamp': self.timestamps[order]}
+        values = self.values[order]
+        for column, name in enumerate(BAR_FIELDS):
+            result[name] = values[:, column]
+        return result
+
+    def tail(self, periods: Optional[int] = None) -> List[MarketData]:
+        """Get the last bars as MarketData objects, oldest first"""
+        order = self._order(periods)
+        index = _restore_timezone(self.timestamps[order], self._tz)
+        return [
+            MarketData(self.symbol, ts, *map(float, self.values[i]), self.exchange)
+            for ts, i in zip(index, order)
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.values.nbytes
+
+
+class ColumnarLog:
+    """Append-only table of typed columns with amortized O(1) appends"""
+
+    def __init__(self, schema: Dict[str, Any], capacity: int = 256):
+        """
+        Initialize the log
+
+        Args:
+            schema: Column name -> NumPy dtype ('datetime64[ns]' columns accept
+                    any timestamp; object columns hold arbitrary values)
+            capacity: Initial rows allocated
+        """
+        self.schema = {name: np.dtype(dtype) for name, dtype in schema.items()}
+        self._initial_capacity = max(1, capacity)
+        self._tz = None
+        self.clear()
+
+    def clear(self):
+        """Drop all rows"""
+        self._columns = {name: np.empty(self._initial_capacity, dtype=dtype)
+                         for name, dtype in self.schema.items()}
+        self._size = 0
+
+    def append(self, row: Dict[str, Any]):
+        """Append a row; every schema column must be present"""
+        if self._size == len(next(iter(self._columns.values()))):
+            self._grow()
+        i = self._size
+        for name, column in self._columns.items():
+            value = row[name]
+            if column.dtype.kind == 'M':
+                if self._size == 0 and getattr(value, 'tzinfo', None) is not None:
+                    self._tz = value.tzinfo
+                value = to_datetime64(value)
+            elif column.dtype.kind == 'f' and value is None:
+                value = np.nan
+            column[i] = value
+        self._size += 1
+
+    def _grow(self):
+        for name, column in self._columns.items():
+            grown = np.empty(len(column) * 2, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a read-only view of a column's rows"""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def last(self, name: str) -> Any:
+        """Get a column's value in the last row"""
+        return self._columns[name][self._size - 1]
+
+    def to_frame(self, index: Optional[str] = None) -> pd.DataFrame:
+        """
+        Copy the rows into a DataFrame
+
+        Args:
+            index: Column to use as the index (optional)
+
+        Returns:
+            DataFrame with one column per schema column
+        """
+        data = {}
+        for name, column in self._columns.items():
+            values = column[:self._size].copy()
+            data[name] = _restore_timezone(values, self._tz) if column.dtype.kind == 'M' else values
+        df = pd.DataFrame(data)
+        if index is not None:
+            df.set_index(index, inplace=True)
+        return df
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated by the columns (object columns count their pointers only)"""
+        return sum(column.nbytes for column in self._columns.values())
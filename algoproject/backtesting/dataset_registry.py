@@ -0,0 +1,199 @@
+"""
+Dataset Registry
+================
+
+Run-scoped registry that loads each historical dataset once per matrix run.
+"""
+
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from ..data.data_loader import DataLoader
+from .aligned_timeline import OHLCV_FIELDS
+from .shared_market_data import DatasetKey
+
+
+def make_read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a read-only OHLCV copy of a DataFrame
+
+    The OHLCV columns are packed into one non-writeable float64 block, so
+    consumers sharing the frame cannot mutate each other's data in place.
+
+    Args:
+        df: OHLCV DataFrame
+
+    Returns:
+        Read-only DataFrame with the OHLCV columns
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    values = df[list(OHLCV_FIELDS)].to_numpy(dtype=np.float64, copy=True)
+    values.flags.writeable = False
+    return pd.DataFrame(values, index=df.index.copy(), columns=list(OHLCV_FIELDS), copy=False)
+
+
+class DatasetRegistry(DataLoader):
+    """Deduplicating, prefetching DataLoader wrapper for one matrix run
+
+    Every distinct ``(symbol, timeframe, start_date, end_date)`` request is
+    sent to the underlying loader at most once. Callers receive shallow
+    copies of a shared read-only frame.
+
+    Counters:
+        loads:  datasets fetched from the underlying loader
+        hits:   requests served from the registry
+        misses: requests for datasets that were not prefetched
+    """
+
+    def __init__(self, data_loader: DataLoader, max_workers: int = 4, limit: int = 10000):
+        """Initialize dataset registry
+
+        Args:
+            data_loader: Underlying data loader
+            max_workers: Concurrent loads during prefetch
+            limit: Candle limit passed to the underlying loader
+        """
+        super().__init__(config_manager=None)
+        self.data_loader = data_loader
+        self.max_workers = max_workers
+        self.limit = limit
+
+        self._frames: Dict[DatasetKey, pd.DataFrame] = {}
+        self._inflight: Dict[DatasetKey, Future] = {}
+        self._lock = threading.Lock()
+
+        self.loads = 0
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, keys: Iterable[DatasetKey]) -> int:
+        """Load all distinct datasets concurrently
+
+        Args:
+            keys: Dataset keys (duplicates are ignored)
+
+        Returns:
+            Number of datasets loaded
+        """
+        pending = [key for key in dict.fromkeys(keys) if key not in self._frames]
+        if not pending:
+            return 0
+
+        self.logger.info(f"Prefetching {len(pending)} datasets with {self.max_workers} workers")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for _ in executor.map(self._load_once, pending):
+                pass
+
+        return len(pending)
+
+    def get(self, key: DatasetKey) -> pd.DataFrame:
+        """Get a read-only view of a dataset, loading it on first use
+
+        Args:
+            key: Dataset key
+
+        Returns:
+            Shallow copy of the shared read-only frame
+        """
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if frame is None:
+            frame = self._load_once(key)
+
+        return frame.copy(deep=False)
+
+    def get_historical_data(self, symbol: str, timeframe: str,
+                          provider: str = None,
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None,
+                          limit: int = 1000) -> pd.DataFrame:
+        """Get historical market data through the registry
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            provider: Ignored (the underlying loader picks the provider)
+            start_date: Start date for data
+            end_date: End date for data
+            limit: Ignored (the registry limit applies)
+
+        Returns:
+            Read-only DataFrame with OHLCV data
+        """
+        return self.get((symbol, timeframe, start_date, end_date))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get registry counters
+
+        Returns:
+            Dictionary with datasets, loads, hits and misses
+        """
+        return {
+            'datasets': len(self._frames),
+            'loads': self.loads,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def clear(self):
+        """Drop all datasets and reset counters"""
+        with self._lock:
+            self._frames.clear()
+            self.loads = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _load_once(self, key: DatasetKey) -> pd.DataFrame:
+        """Load a dataset, coalescing concurrent requests for the same key
+
+        Args:
+            key: Dataset key
+
+        Returns:
+            Shared read-only frame
+        """
+        with self._lock:
+            if key in self._frames:
+                return self._frames[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        symbol, timeframe, start_date, end_date = key
+        try:
+            df = self.data_loader.get_historical_data(
+                symbol=symbol,
+                timeframe=timeframe,
+                start_date=start_date,
+                end_date=end_date,
+                limit=self.limit
+            )
+            frame = make_read_only(df)
+        except Exception as e:
+            self.logger.error(f"Error loading data for {symbol}: {e}")
+            frame = pd.DataFrame()
+
+        with self._lock:
+            self._frames[key] = frame
+            self.loads += 1
+            del self._inflight[key]
+
+        future.set_result(frame)
+        return frame
@@ -0,0 +1,185 @@
+"""
+Fill Simulator
+==============
+
+NumPy position and PnL simulation for signal-array backtests.
+
+Scripts that produce a signal per bar (1 buy, -1 sell, 0 none) hand the
+aligned price and signal arrays to ``simulate_fills`` instead of walking
+their signals row by row. Only bars that carry a signal are visited in
+Python; per-bar positions and equity are filled in with array operations.
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Union
+
+
+class PositionMode(Enum):
+    """Which directions a simulation may hold"""
+    LONG_ONLY = "long_only"    # Buy opens, sell closes
+    LONG_SHORT = "long_short"  # Opposite signals close and reverse
+
+
+class SizingMode(Enum):
+    """How entry quantities are sized"""
+    FIXED_NOTIONAL = "fixed_notional"  # notional / entry price
+    EQUITY_FRACTION = "equity_fraction"  # fraction of realized equity / entry price
+
+
+TRADE_FIELDS = ('entry_index', 'exit_index', 'side', 'quantity', 'entry_price',
+                'exit_price', 'pnl', 'pnl_pct', 'commission')
+
+
+@dataclass
+class FillSimulation:
+    """Result of a fill simulation
+
+    All per-bar arrays have the length of the input. ``position`` and
+    ``equity`` are the state after each bar's fills; ``realized_equity``
+    only moves when a trade closes.
+    """
+    position: np.ndarray
+    cash: np.ndarray
+    equity: np.ndarray
+    realized_equity: np.ndarray
+    trades: Dict[str, np.ndarray]
+
+    @property
+    def trade_count(self) -> int:
+        return len(self.trades['pnl'])
+
+    def trades_frame(self, timestamps=None) -> pd.DataFrame:
+        """Closed trades as a DataFrame
+
+        Args:
+            timestamps: Per-bar timestamps used to add entry/exit times (optional)
+
+        Returns:
+            DataFrame with one row per closed trade
+        """
+        df = pd.DataFrame(self.trades)
+        if timestamps is not None:
+            timestamps = np.asarray(timestamps)
+            df.insert(0, 'entry_time', timestamps[self.trades['entry_index']])
+            df.insert(1, 'exit_time', timestamps[self.trades['exit_index']])
+        return df
+
+
+def _step_values(n: int, event_index, event_values, initial: float) -> np.ndarray:
+    """Expand values set at event bars into a per-bar step array"""
+    event_index = np.asarray(event_index, dtype=np.int64)
+    values = np.concatenate(([initial], np.asarray(event_values, dtype=np.float64)))
+    segment = np.searchsorted(event_index, np.arange(n), side='right')
+    return values[segment]
+
+
+def simulate_fills(prices, signals, initial_capital: float = 100000.0,
+                   mode: Union[PositionMode, str] = PositionMode.LONG_ONLY,
+                   sizing: Union[SizingMode, str] = SizingMode.FIXED_NOTIONAL,
+                   notional: float = 10000.0, fraction: float = 1.0,
+                   commission: float = 0.0, slippage: float = 0.0) -> FillSimulation:
+    """Simulate fills for aligned price and signal arrays
+
+    A buy while flat opens a long and a sell while long closes it. In
+    long/short mode a sell while flat opens a short, and a signal against
+    the open position closes it and opens the opposite side on the same
+    bar. Signals in the direction of the open position are ignored. Fills
+    happen at the bar price moved against the trade by ``slippage``;
+    ``commission`` is charged on the notional of every fill.
+
+    Args:
+        prices: Fill prices per bar
+        signals: Per-bar signals (> 0 buy, < 0 sell, 0 none)
+        initial_capital: Starting equity
+        mode: Position mode ('long_only' or 'long_short')
+        sizing: Sizing mode ('fixed_notional' or 'equity_fraction')
+        notional: Entry notional for fixed-notional sizing
+        fraction: Fraction of realized equity for equity-fraction sizing
+        commission: Commission rate per fill (as decimal)
+        slippage: Slippage factor (as decimal)
+
+    Returns:
+        FillSimulation with per-bar arrays and the closed-trade table
+    """
+    prices = np.asarray(prices, dtype=np.float64).reshape(-1)
+    actions = np.sign(np.asarray(signals, dtype=np.float64).reshape(-1)).astype(np.int8)
+    if len(prices) != len(actions):
+        raise ValueError(f"prices and signals must be aligned ({len(prices)} != {len(actions)})")
+
+    mode = PositionMode(mode)
+    sizing = SizingMode(sizing)
+    n = len(prices)
+
+    trades = {field: [] for field in TRADE_FIELDS}
+    event_index, event_position, event_cash, event_realized = [], [], [], []
+
+    side = 0
+    quantity = entry_price = entry_commission = 0.0
+    entry_index = 0
+    cash = realized = float(initial_capital)
+
+    price_list = prices.tolist()
+    for i in np.flatnonzero(actions).tolist():
+        action = int(actions[i])
+        price = price_list[i]
+        changed = False
+
+        if side != 0 and action != side:
+            # Close the open position
+            exit_price = price * (1 - slippage * side)
+            exit_commission = exit_price * quantity * commission
+            pnl = (exit_price - entry_price) * quantity * side - entry_commission - exit_commission
+            cost_pct = (entry_commission + exit_commission) / (entry_price * quantity)
+            cash += exit_price * quantity * side - exit_commission
+            realized += pnl
+
+            trades['entry_index'].append(entry_index)
+            trades['exit_index'].append(i)
+            trades['side'].append(side)
+            trades['quantity'].append(quantity)
+            trades['entry_price'].append(entry_price)
+            trades['exit_price'].append(exit_price)
+            trades['pnl'].append(pnl)
+            trades['pnl_pct'].append((side * (exit_price - entry_price) / entry_price - cost_pct) * 100)
+            trades['commission'].append(entry_commission + exit_commission)
+
+            side = 0
+            changed = True
+
+        if side == 0 and (action > 0 or mode == PositionMode.LONG_SHORT):
+            # Open a new position
+            entry_price = price * (1 + slippage * action)
+            if sizing == SizingMode.FIXED_NOTIONAL:
+                quantity = notional / entry_price
+            else:
+                quantity = fraction * realized / entry_price
+            if quantity > 0:
+                entry_commission = entry_price * quantity * commission
+                cash -= entry_price * quantity * action + entry_commission
+                side = action
+                entry_index = i
+                changed = True
+
+        if changed:
+            event_index.append(i)
+            event_position.append(side * quantity)
+            event_cash.append(cash)
+            event_realized.append(realized)
+
+    position = _step_values(n, event_index, event_position, 0.0)
+    cash_by_bar = _step_values(n, event_index, event_cash, float(initial_capital))
+
+    return FillSimulation(
+        position=position,
+        cash=cash_by_bar,
+        equity=cash_by_bar + position * prices,
+        realized_equity=_step_values(n, event_index, event_realized, float(initial_capital)),
+        trades={
+            field: np.asarray(values, dtype=np.int64 if field in ('entry_index', 'exit_index', 'side')
+                              else np.float64)
+            for field, values in trades.items()
+        }
+    )
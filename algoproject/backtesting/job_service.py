@@ -0,0 +1,496 @@
+"""
+Backtest Job Service
+====================
+
+Runs backtests as background jobs on a local process pool.
+
+Submitting a job returns its id straight away. Workers run
+``BacktestEngine`` and report progress through a queue that a monitor
+thread turns into listener events. Results are written to the job's
+directory: a small ``summary.json`` plus the equity curve and trade log
+as JSON lines with a byte-offset index, so a page of rows is read with
+one seek instead of loading the whole file. The number of waiting jobs
+is bounded, and queued or running jobs can be cancelled. With a result
+cache, a job that was already run on the same data is answered from it.
+"""
+
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..data.data_loader import DataLoader
+from ..strategies.base_strategy import BaseStrategy
+from .backtest_engine import BacktestEngine
+from .dataset_registry import DatasetRegistry
+from .result_cache import BacktestResultCache, frame_fingerprint, make_result_key
+
+
+DEFAULT_RESULTS_DIR = os.path.join('data', 'backtest_jobs')
+RESULT_SECTIONS = ('equity_curve', 'bar_equity', 'trade_log')
+CANCEL_MARKER = 'CANCEL'
+# Only strategies under this package are imported by name
+STRATEGY_PACKAGE = 'algoproject.strategies.'
+
+# loader_factory(exchange) -> DataLoader; must be picklable (module-level)
+LoaderFactory = Callable[[Optional[str]], DataLoader]
+
+
+class JobStatus(Enum):
+    """Backtest job states"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is full"""
+
+
+class BacktestCancelled(Exception):
+    """Raised inside a worker to stop a cancelled backtest"""
+
+
+@dataclass
+class BacktestJobSpec:
+    """What to backtest"""
+    strategy: str                   # Dotted path to a BaseStrategy subclass
+    symbols: List[str]
+    start_date: datetime
+    end_date: datetime
+    timeframe: str = '1d'
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    initial_capital: float = 100000.0
+    commission: float = 0.001
+    slippage: float = 0.001
+    exchange: Optional[str] = None  # Passed to the loader factory
+    strategy_name: Optional[str] = None
+
+
+@dataclass
+class BacktestJob:
+    """A submitted job and its state"""
+    job_id: str
+    spec: BacktestJobSpec
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0
+    submitted_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    summary: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['status'] = self.status.value
+        return json.loads(json.dumps(data, default=_json_default))
+
+
+def resolve_strategy_class(path: str) -> type:
+    """
+    Import a strategy class from its dotted path
+
+    Paths outside STRATEGY_PACKAGE are rejected without being imported.
+
+    Raises:
+        ValueError: If the path does not name a BaseStrategy subclass
+    """
+    if not path.startswith(STRATEGY_PACKAGE):
+        raise ValueError(f"Unknown strategy: {path}")
+    module_name, _, class_name = path.rpartition('.')
+    try:
+        strategy_class = getattr(importlib.import_module(module_name), class_name, None)
+    except (ImportError, ValueError) as e:
+        raise ValueError(f"Unknown strategy: {path}") from e
+    if not (isinstance(strategy_class, type) and issubclass(strategy_class, BaseStrategy)):
+        raise ValueError(f"Unknown strategy: {path}")
+    return strategy_class
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _write_rows(path: str, rows: List[Dict[str, Any]]) -> int:
+    """Write rows as JSON lines with an index of line start offsets"""
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    with open(path, 'wb') as f:
+        for i, row in enumerate(rows):
+            f.write(json.dumps(row, default=_json_default).encode() + b'\n')
+            offsets[i + 1] = f.tell()
+    np.save(path + '.idx.npy', offsets)
+    return len(rows)
+
+
+def _read_rows(path: str, offset: int, limit: int) -> Dict[str, Any]:
+    """Read one page of rows written by _write_rows"""
+    offsets = np.load(path + '.idx.npy', mmap_mode='r')
+    total = len(offsets) - 1
+    start, stop = min(offset, total), min(offset + limit, total)
+    rows = []
+    if stop > start:
+        with open(path, 'rb') as f:
+            f.seek(int(offsets[start]))
+            chunk = f.read(int(offsets[stop] - offsets[start]))
+        rows = [json.loads(line) for line in chunk.splitlines()]
+    return {'total': total, 'offset': start, 'limit': limit, 'rows': rows}
+
+
+# Worker process state, set by _init_worker
+_events = None
+_loader_factory: Optional[LoaderFactory] = None
+_progress_interval = 0.5
+_loaders: Dict[Optional[str], DataLoader] = {}
+_result_cache: Optional[BacktestResultCache] = None
+
+
+def _init_worker(events, loader_factory: LoaderFactory, progress_interval: float,
+                 result_cache_dir: Optional[str]):
+    global _events, _loader_factory, _progress_interval, _result_cache
+    _events = events
+    _loader_factory = loader_factory
+    _progress_interval = progress_interval
+    _loaders.clear()
+    _result_cache = BacktestResultCache(result_cache_dir) if result_cache_dir else None
+
+
+def _run_job(job_id: str, spec: BacktestJobSpec, job_dir: str) -> Dict[str, Any]:
+    """Run one job in a worker process and write its results"""
+    cancel_path = os.path.join(job_dir, CANCEL_MARKER)
+    if os.path.exists(cancel_path):
+        return {'cancelled': True}
+    _events.put((job_id, 'started', None))
+
+    last_report = [0.0]
+
+    def on_progress(done: int, total: int):
+        now = time.monotonic()
+        if now - last_report[0] < _progress_interval and done < total:
+            return
+        last_report[0] = now
+        if os.path.exists(cancel_path):
+            raise BacktestCancelled("backtest cancelled")
+        _events.put((job_id, 'progress', done / total))
+
+    strategy_class = resolve_strategy_class(spec.strategy)
+    strategy = strategy_class(spec.strategy_name or strategy_class.__name__, dict(spec.parameters))
+
+    # Loaders are reused by later jobs in the same worker
+    if spec.exchange not in _loaders:
+        _loaders[spec.exchange] = _loader_factory(spec.exchange)
+    data_loader = _loaders[spec.exchange]
+
+    results = result_key = None
+    if _result_cache is not None:
+        # Load the data up front to fingerprint it; the engine reuses the frames
+        data_loader = DatasetRegistry(data_loader)
+        fingerprints = {
+            symbol: frame_fingerprint(data_loader.get((symbol, spec.timeframe,
+                                                       spec.start_date, spec.end_date)))
+            for symbol in spec.symbols
+        }
+        result_key = make_result_key(strategy_class, spec.parameters, spec.symbols,
+                                     spec.start_date, spec.end_date, spec.timeframe,
+                                     spec.initial_capital, spec.commission, spec.slippage,
+                                     fingerprints)
+        results = _result_cache.get(result_key)
+
+    cached = results is not None
+    if not cached:
+        engine = BacktestEngine(data_loader, initial_capital=spec.initial_capital,
+                                commission=spec.commission, slippage=spec.slippage,
+                                progress_callback=on_progress)
+        try:
+            results = engine.run_backtest(strategy, spec.symbols, spec.start_date,
+                                          spec.end_date, spec.timeframe)
+        except BacktestCancelled:
+            return {'cancelled': True}
+        if result_key is not None:
+            _result_cache.put(result_key, results)
+
+    summary = {key: results.get(key) for key in
+               ('strategy_name', 'strategy_parameters', 'performance', 'execution',
+                'metrics', 'final_portfolio', 'memory')}
+    summary['strategy_name'] = strategy.name
+    summary['cached'] = cached
+    summary['rows'] = {
+        section: _write_rows(os.path.join(job_dir, f"{section}.jsonl"), results.get(section) or [])
+        for section in RESULT_SECTIONS
+    }
+    summary = json.loads(json.dumps(summary, default=_json_default))
+    with open(os.path.join(job_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f)
+    return summary
+
+
+class BacktestJobService:
+    """Queues backtest jobs on a process pool and keeps their results on disk"""
+
+    def __init__(self, loader_factory: LoaderFactory, results_dir: str = DEFAULT_RESULTS_DIR,
+                 max_workers: int = 2, max_queued: int = 16, progress_interval: float = 0.5,
+                 result_cache_dir: Optional[str] = None):
+        """
+        Initialize the service
+
+        Args:
+            loader_factory: Module-level function returning a DataLoader for an
+                            exchange; called once per exchange in each worker
+            results_dir: Directory holding one sub-directory per job
+            max_workers: Worker processes
+            max_queued: Jobs waiting for a worker before submit is refused
+            progress_interval: Minimum seconds between a job's progress events
+            result_cache_dir: Directory of a BacktestResultCache shared by the
+                              workers (None disables result caching)
+        """
+        self.loader_factory = loader_factory
+        self.results_dir = results_dir
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.progress_interval = progress_interval
+        self.result_cache_dir = result_cache_dir
+        self.logger = logging.getLogger(__name__)
+
+        self.jobs: Dict[str, BacktestJob] = {}
+        self._futures: Dict[str, Future] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.RLock()
+
+        # The pool and event monitor start with the first job
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._events = None
+        self._monitor: Optional[threading.Thread] = None
+
+        os.makedirs(results_dir, exist_ok=True)
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback for job events
+
+        Callbacks run on the service's threads and receive
+        {'type': 'backtest_<event>', 'data': job_dict}.
+        """
+        self._listeners.append(callback)
+
+    def submit(self, spec: BacktestJobSpec) -> str:
+        """
+        Queue a backtest
+
+        Args:
+            spec: What to backtest
+
+        Returns:
+            Job id
+
+        Raises:
+            ValueError: If the strategy or symbols are invalid
+            JobQueueFullError: If max_workers + max_queued jobs are unfinished
+        """
+        resolve_strategy_class(spec.strategy)
+        if not spec.symbols:
+            raise ValueError("At least one symbol is required")
+
+        with self._lock:
+            active = sum(1 for job in self.jobs.values() if job.status not in FINISHED_STATUSES)
+            if active >= self.max_workers + self.max_queued:
+                raise JobQueueFullError(f"Backtest queue is full ({active} jobs pending)")
+
+            job = BacktestJob(job_id=uuid.uuid4().hex[:12], spec=spec)
+            job_dir = self._job_dir(job.job_id)
+            os.makedirs(job_dir, exist_ok=True)
+            self.jobs[job.job_id] = job
+            self._save(job)
+
+            self._ensure_pool()
+            future = self._executor.submit(_run_job, job.job_id, spec, job_dir)
+            self._futures[job.job_id] = future
+
+        self.logger.info(f"Queued backtest {job.job_id}: {spec.strategy} on {spec.symbols}")
+        self._notify('backtest_queued', job)
+        future.add_done_callback(lambda f, job_id=job.job_id: self._finish(job_id, f))
+        return job.job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job
+
+        Queued jobs are dropped; a running job stops at its next progress check.
+
+        Returns:
+            True if cancellation was requested, False if the job is unknown or finished
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATUSES:
+                return False
+            future = self._futures.get(job_id)
+
+        if future is not None and future.cancel():
+            return True
+        # Already handed to a worker: it polls for this marker
+        open(os.path.join(self._job_dir(job_id), CANCEL_MARKER), 'w').close()
+        self.logger.info(f"Cancellation requested for backtest {job_id}")
+        return True
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job's state, including jobs from earlier runs still on disk"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is not None:
+                return job.to_dict()
+        path = os.path.join(self._job_dir(job_id), 'job.json')
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Get this process's jobs, newest first"""
+        with self._lock:
+            jobs = sorted(self.jobs.values(), key=lambda job: job.submitted_at, reverse=True)
+            return [job.to_dict() for job in jobs]
+
+    def get_results(self, job_id: str, section: str = 'trade_log', offset: int = 0,
+                    limit: int = 500) -> Optional[Dict[str, Any]]:
+        """
+        Read a page of a completed job's results
+
+        Args:
+            job_id: Job id
+            section: 'trade_log', 'equity_curve' or 'bar_equity'
+            offset: First row
+            limit: Maximum rows
+
+        Returns:
+            {'total', 'offset', 'limit', 'rows'}, or None if the job has no results
+
+        Raises:
+            ValueError: If the section is unknown
+        """
+        if section not in RESULT_SECTIONS:
+            raise ValueError(f"Unknown results section: {section}")
+        path = os.path.join(self._job_dir(job_id), f"{section}.jsonl")
+        if not os.path.exists(path + '.idx.npy'):
+            return None
+        return _read_rows(path, max(0, offset), max(0, limit))
+
+    def shutdown(self, wait: bool = True):
+        """Cancel queued jobs and stop the pool and monitor"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        executor.shutdown(wait=wait, cancel_futures=True)
+        self._events.put(None)
+        if wait:
+            self._monitor.join(timeout=5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get job counts by status and the pool limits"""
+        with self._lock:
+            counts = {status.value: 0 for status in JobStatus}
+            for job in self.jobs.values():
+                counts[job.status.value] += 1
+        return {**counts, 'max_workers': self.max_workers, 'max_queued': self.max_queued}
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.results_dir, os.path.basename(job_id))
+
+    def _ensure_pool(self):
+        if self._executor is not None:
+            return
+        context = multiprocessing.get_context()
+        self._events = context.Queue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=context, initializer=_init_worker,
+            initargs=(self._events, self.loader_factory, self.progress_interval,
+                      self.result_cache_dir)
+        )
+        self._monitor = threading.Thread(target=self._watch_events, args=(self._events,),
+                                         name='backtest-job-events', daemon=True)
+        self._monitor.start()
+
+    def _watch_events(self, events):
+        """Apply worker events to jobs until shutdown"""
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            job_id, kind, value = event
+            with self._lock:
+                job = self.jobs.get(job_id)
+                # Events can arrive after the result; never move a finished job back
+                if job is None or job.status in FINISHED_STATUSES:
+                    continue
+                if kind == 'started':
+                    job.status = JobStatus.RUNNING
+                    job.started_at = datetime.now()
+                    self._save(job)
+                else:
+                    job.progress = round(value, 4)
+            self._notify('backtest_started' if kind == 'started' else 'backtest_progress', job)
+
+    def _finish(self, job_id: str, future: Future):
+        """Record a job's outcome when its future settles"""
+        with self._lock:
+            job = self.jobs[job_id]
+            self._futures.pop(job_id, None)
+            if future.cancelled():
+                job.status = JobStatus.CANCELLED
+            elif future.exception() is not None:
+                job.status = JobStatus.FAILED
+                job.error = str(future.exception())
+            elif future.result().get('cancelled'):
+                job.status = JobStatus.CANCELLED
+            else:
+                job.status = JobStatus.COMPLETED
+                job.progress = 1.0
+                job.summary = future.result()
+            job.finished_at = datetime.now()
+            self._save(job)
+
+        if job.status == JobStatus.FAILED:
+            self.logger.error(f"Backtest {job_id} failed: {job.error}")
+        else:
+            self.logger.info(f"Backtest {job_id} {job.status.value}")
+        event = {JobStatus.COMPLETED: 'backtest_complete', JobStatus.FAILED: 'backtest_failed',
+                 JobStatus.CANCELLED: 'backtest_cancelled'}[job.status]
+        self._notify(event, job)
+
+    def _save(self, job: BacktestJob):
+        try:
+            with open(os.path.join(self._job_dir(job.job_id), 'job.json'), 'w') as f:
+                json.dump(job.to_dict(), f)
+        except OSError as e:
+            self.logger.error(f"Error saving backtest job {job.job_id}: {e}")
+
+    def _notify(self, event_type: str, job: BacktestJob):
+        with self._lock:
+            message = {'type': event_type, 'data': job.to_dict()}
+        for listener in list(self._listeners):
+            try:
+                listener(message)
+            except Exception as e:
+                self.logger.error(f"Backtest job listener failed: {e}")
@@ -7,17 +7,27 @@ Advanced matrix backtesting with parallel processing and result aggregation.
 
 import pandas as pd
 import logging
-from typing import Dict, List, Any, Optional, Tuple, Callable
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterator, Union
 from datetime import datetime
 import time
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
+from enum import Enum
 import itertools
 
 from ..strategies.base_strategy import BaseStrategy
 from ..data.data_loader import DataLoader
-from .backtest_engine import BacktestEngine
+from .backtest_engine import BacktestEngine, EngineMode
+from .shared_market_data import SharedMarketDataStore, SharedMemoryDataLoader
+from .dataset_registry import DatasetRegistry
+from .result_cache import BacktestResultCache, frame_fingerprint, make_result_key
+
+
+class ExecutionBackend(Enum):
+    """Parallel execution backends for matrix backtests"""
+    THREAD = "thread"    # Thread pool sharing the parent's data loader
+    PROCESS = "process"  # Process pool reading OHLCV from shared memory
 
 
 @dataclass
@@ -46,20 +56,30 @@ class BacktestResult:
     error_message: Optional[str]
     execution_time: float
     results: Optional[Dict[str, Any]]
+    cached: bool = False  # Served from the result cache
 
 
 class MatrixBacktestEngine:
     """Advanced matrix backtesting engine with parallel processing"""
     
-    def __init__(self, data_loader: DataLoader, max_workers: Optional[int] = None):
+    def __init__(self, data_loader: DataLoader, max_workers: Optional[int] = None,
+                 backend: Union[ExecutionBackend, str] = ExecutionBackend.THREAD,
+                 engine_mode: Union[EngineMode, str] = EngineMode.EVENT,
+                 result_cache: Optional[BacktestResultCache] = None):
         """Initialize matrix backtest engine
         
         Args:
             data_loader: Data loader for historical data
             max_workers: Maximum number of parallel workers (None for auto-detect)
+            backend: Default execution backend ('thread' or 'process')
+            engine_mode: Event loop mode for each BacktestEngine
+            result_cache: Cache of earlier results; jobs found in it are not rerun
         """
         self.data_loader = data_loader
         self.max_workers = max_workers or 4
+        self.backend = ExecutionBackend(backend)
+        self.engine_mode = EngineMode(engine_mode)
+        self.result_cache = result_cache
         self.logger = logging.getLogger(__name__)
         
         # Job management
@@ -67,6 +87,12 @@ class MatrixBacktestEngine:
         self.results: List[BacktestResult] = []
         self.progress_callback: Optional[Callable] = None
         
+        # Run-scoped historical data (rebuilt at the start of every run)
+        self.dataset_registry: Optional[DatasetRegistry] = None
+        # Result cache keys of the current run's jobs, and data fingerprints by dataset key
+        self._result_keys: Dict[str, str] = {}
+        self._data_fingerprints: Dict[Tuple, str] = {}
+        
         # Status tracking
         self.is_running = False
         self.completed_jobs = 0
@@ -162,9 +188,12 @@ class MatrixBacktestEngine:
         
         self.logger.info(f"Added {len(param_combinations) * len(symbols)} parameter sweep jobs")
     
-    def run_matrix_backtest(self) -> List[BacktestResult]:
+    def run_matrix_backtest(self, backend: Optional[Union[ExecutionBackend, str]] = None) -> List[BacktestResult]:
         """Run all queued backtest jobs
         
+        Args:
+            backend: Execution backend for this run (None uses the engine default)
+        
         Returns:
             List of backtest results
         """
@@ -173,16 +202,7 @@ class MatrixBacktestEngine:
             return []
         
         try:
-            self.is_running = True
-            self.start_time = datetime.now()
-            self.total_jobs = len(self.jobs)
-            self.completed_jobs = 0
-            self.results.clear()
-            
-            self.logger.info(f"Starting matrix backtest with {self.total_jobs} jobs using {self.max_workers} workers")
-            
-            results = self._run_with_threads()
-            self.results = results
+            results = list(self.stream_matrix_backtest(backend))
             
             # Calculate summary statistics
             successful_jobs = [r for r in results if r.success]
@@ -197,57 +217,168 @@ class MatrixBacktestEngine:
             self.logger.info(f"  Failed: {len(failed_jobs)}")
             self.logger.info(f"  Total time: {total_time:.2f}s")
             self.logger.info(f"  Avg time per job: {avg_time_per_job:.2f}s")
+            self.logger.info(f"  Datasets: {self.get_dataset_stats()}")
             
             return results
             
         except Exception as e:
             self.logger.error(f"Matrix backtest failed: {e}")
             raise
+    
+    def stream_matrix_backtest(self, backend: Optional[Union[ExecutionBackend, str]] = None) -> Iterator[BacktestResult]:
+        """Run all queued backtest jobs, yielding results as they complete
+        
+        Results are also accumulated in ``self.results`` so that
+        ``get_results_summary`` and ``export_results`` work afterwards.
+        
+        Args:
+            backend: Execution backend for this run (None uses the engine default)
+            
+        Yields:
+            Backtest results in completion order
+        """
+        backend = ExecutionBackend(backend) if backend is not None else self.backend
+        
+        try:
+            self.is_running = True
+            self.start_time = datetime.now()
+            self.total_jobs = len(self.jobs)
+            self.completed_jobs = 0
+            self.results = []
+            self._result_keys = {}
+            self._data_fingerprints = {}
+            
+            self.logger.info(f"Starting matrix backtest with {self.total_jobs} jobs using "
+                             f"{self.max_workers} {backend.value} workers")
+            
+            # Load every distinct dataset once, before any job starts
+            self.dataset_registry = DatasetRegistry(self.data_loader, max_workers=self.max_workers)
+            self.dataset_registry.prefetch(self._dataset_keys())
+            
+            pending = self.jobs
+            if self.result_cache is not None:
+                pending = []
+                for job in self.jobs:
+                    result = self._get_cached_result(job)
+                    if result is None:
+                        pending.append(job)
+                        continue
+                    self.completed_jobs += 1
+                    self._report_progress(result)
+                    self.results.append(result)
+                    yield result
+                self.logger.info(f"{self.total_jobs - len(pending)} of {self.total_jobs} jobs "
+                                 f"served from the result cache")
+            
+            if not pending:
+                return
+            if backend == ExecutionBackend.PROCESS:
+                results = self._iter_with_processes(pending)
+            else:
+                results = self._iter_with_threads(pending)
+            
+            for result in results:
+                self.results.append(result)
+                yield result
+                
         finally:
             self.is_running = False
     
-    def _run_with_threads(self) -> List[BacktestResult]:
+    def _iter_with_threads(self, jobs: List[BacktestJob]) -> Iterator[BacktestResult]:
         """Run backtests using thread pool
         
-        Returns:
-            List of backtest results
-        """
-        results = []
+        Args:
+            jobs: Jobs to run
         
+        Yields:
+            Backtest results as they complete
+        """
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # Submit all jobs
             future_to_job = {
                 executor.submit(self._execute_single_job, job): job 
-                for job in self.jobs
+                for job in jobs
             }
             
-            # Collect results as they complete
-            for future in as_completed(future_to_job):
-                job = future_to_job[future]
-                
-                try:
-                    result = future.result()
-                    results.append(result)
-                    self.completed_jobs += 1
-                    
-                    # Report progress
-                    self._report_progress(result)
-                    
-                except Exception as e:
-                    self.logger.error(f"Job {job.job_id} failed: {e}")
-                    error_result = BacktestResult(
-                        job_id=job.job_id,
-                        strategy_name=job.strategy_name,
-                        symbols=job.symbols,
-                        success=False,
-                        error_message=str(e),
-                        execution_time=0.0,
-                        results=None
-                    )
-                    results.append(error_result)
-                    self.completed_jobs += 1
+            yield from self._collect_results(future_to_job)
+    
+    def _iter_with_processes(self, jobs: List[BacktestJob]) -> Iterator[BacktestResult]:
+        """Run backtests using a process pool over shared-memory market data
+        
+        Each distinct (symbol, timeframe, start, end) dataset is taken from the
+        run's dataset registry and copied into shared memory. Workers attach to it by
+        name when they start, so no OHLCV data is pickled per job.
         
-        return results
+        Args:
+            jobs: Jobs to run
+        
+        Yields:
+            Backtest results as they complete
+        """
+        store = SharedMarketDataStore()
+        executor = None
+        
+        try:
+            for job in jobs:
+                for key in self._job_dataset_keys(job):
+                    store.add(key, self.dataset_registry.get(key))
+            
+            self.logger.info(f"Published {len(store.handles)} datasets to shared memory "
+                             f"({store.total_bytes() / 1e6:.1f} MB)")
+            
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_process_worker,
+                initargs=(store.handles, self.engine_mode)
+            )
+            
+            future_to_job = {
+                executor.submit(_run_job_in_process, job): job
+                for job in jobs
+            }
+            
+            yield from self._collect_results(future_to_job)
+            
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            store.close()
+    
+    def _collect_results(self, future_to_job: Dict[Any, BacktestJob]) -> Iterator[BacktestResult]:
+        """Collect results from futures as they complete
+        
+        Args:
+            future_to_job: Mapping of futures to their jobs
+            
+        Yields:
+            Backtest results
+        """
+        for future in as_completed(future_to_job):
+            job = future_to_job[future]
+            
+            try:
+                result = future.result()
+            except Exception as e:
+                self.logger.error(f"Job {job.job_id} failed: {e}")
+                result = BacktestResult(
+                    job_id=job.job_id,
+                    strategy_name=job.strategy_name,
+                    symbols=job.symbols,
+                    success=False,
+                    error_message=str(e),
+                    execution_time=0.0,
+                    results=None
+                )
+            
+            self.completed_jobs += 1
+            
+            if result.success and job.job_id in self._result_keys:
+                self.result_cache.put(self._result_keys[job.job_id], result.results)
+            
+            # Report progress
+            self._report_progress(result)
+            
+            yield result
     
     def _execute_single_job(self, job: BacktestJob) -> BacktestResult:
         """Execute a single backtest job
@@ -258,53 +389,78 @@ class MatrixBacktestEngine:
         Returns:
             Backtest result
         """
-        start_time = time.time()
+        return execute_backtest_job(job, self.dataset_registry or self.data_loader, self.engine_mode)
+    
+    def _get_cached_result(self, job: BacktestJob) -> Optional[BacktestResult]:
+        """Look a job up in the result cache
         
-        try:
-            # Create strategy instance
-            strategy = job.strategy_class(job.strategy_name, job.strategy_params)
-            
-            # Create backtest engine
-            engine = BacktestEngine(
-                data_loader=self.data_loader,
-                initial_capital=job.initial_capital,
-                commission=job.commission,
-                slippage=job.slippage
-            )
-            
-            # Run backtest
-            results = engine.run_backtest(
-                strategy=strategy,
-                symbols=job.symbols,
-                start_date=job.start_date,
-                end_date=job.end_date,
-                timeframe=job.timeframe
-            )
-            
-            execution_time = time.time() - start_time
-            
-            return BacktestResult(
-                job_id=job.job_id,
-                strategy_name=job.strategy_name,
-                symbols=job.symbols,
-                success=True,
-                error_message=None,
-                execution_time=execution_time,
-                results=results
-            )
+        The job's key is remembered so that a miss can be stored once it has run.
+        
+        Args:
+            job: Backtest job
             
-        except Exception as e:
-            execution_time = time.time() - start_time
+        Returns:
+            Cached result, or None on a miss
+        """
+        fingerprints = {}
+        for key in self._job_dataset_keys(job):
+            if key not in self._data_fingerprints:
+                self._data_fingerprints[key] = frame_fingerprint(self.dataset_registry.get(key))
+            fingerprints[key[0]] = self._data_fingerprints[key]
+        
+        result_key = make_result_key(job.strategy_class, job.strategy_params, job.symbols,
+                                     job.start_date, job.end_date, job.timeframe,
+                                     job.initial_capital, job.commission, job.slippage,
+                                     fingerprints)
+        self._result_keys[job.job_id] = result_key
+        
+        results = self.result_cache.get(result_key)
+        if results is None:
+            return None
+        results['strategy_name'] = job.strategy_name
+        return BacktestResult(
+            job_id=job.job_id,
+            strategy_name=job.strategy_name,
+            symbols=job.symbols,
+            success=True,
+            error_message=None,
+            execution_time=0.0,
+            results=results,
+            cached=True
+        )
+    
+    def _job_dataset_keys(self, job: BacktestJob) -> List[Tuple]:
+        """Get the dataset keys a job will request
+        
+        Args:
+            job: Backtest job
             
-            return BacktestResult(
-                job_id=job.job_id,
-                strategy_name=job.strategy_name,
-                symbols=job.symbols,
-                success=False,
-                error_message=str(e),
-                execution_time=execution_time,
-                results=None
-            )
+        Returns:
+            List of (symbol, timeframe, start_date, end_date) keys
+        """
+        return [(symbol, job.timeframe, job.start_date, job.end_date) for symbol in job.symbols]
+    
+    def _dataset_keys(self) -> List[Tuple]:
+        """Get the distinct dataset keys across all queued jobs
+        
+        Returns:
+            List of unique dataset keys in first-seen order
+        """
+        keys = {}
+        for job in self.jobs:
+            for key in self._job_dataset_keys(job):
+                keys[key] = None
+        return list(keys)
+    
+    def get_dataset_stats(self) -> Dict[str, int]:
+        """Get dataset load counters for the current or last run
+        
+        Returns:
+            Dictionary with datasets, loads, hits and misses
+        """
+        if self.dataset_registry is None:
+            return {}
+        return self.dataset_registry.get_stats()
     
     def _report_progress(self, result: BacktestResult):
         """Report progress of backtest execution
@@ -379,7 +535,7 @@ class MatrixBacktestEngine:
         performance_data = []
         for result in successful_results:
             if result.results and 'performance' in result.results:
-                perf = result.results['performance']
+                perf = dict(result.results['performance'])
                 perf['strategy_name'] = result.strategy_name
                 perf['symbols'] = result.symbols
                 perf['job_id'] = result.job_id
@@ -396,8 +552,10 @@ class MatrixBacktestEngine:
             'total_backtests': len(self.results),
             'successful_backtests': len(successful_results),
             'failed_backtests': len(self.results) - len(successful_results),
+            'cached_backtests': sum(1 for r in self.results if r.cached),
             'strategies_tested': len(set(r.strategy_name for r in self.results)),
             'symbols_tested': len(set(symbol for r in self.results for symbol in r.symbols)),
+            'dataset_stats': self.get_dataset_stats(),
             'performance_summary': {
                 'avg_total_return': df['total_return_pct'].mean() if 'total_return_pct' in df.columns else 0,
                 'best_total_return': df['total_return_pct'].max() if 'total_return_pct' in df.columns else 0,
@@ -512,4 +670,85 @@ class MatrixBacktestEngine:
         Returns:
             True if running, False otherwise
         """
-        return self.is_running
\ No newline at end of file
+        return self.is_running
+
+
+def execute_backtest_job(job: BacktestJob, data_loader: DataLoader,
+                         engine_mode: EngineMode = EngineMode.EVENT) -> BacktestResult:
+    """Execute a single backtest job
+    
+    Module-level so that process-pool workers can run it.
+    
+    Args:
+        job: Backtest job to execute
+        data_loader: Data loader for historical data
+        engine_mode: Event loop mode for the BacktestEngine
+        
+    Returns:
+        Backtest result
+    """
+    start_time = time.time()
+    
+    try:
+        # Create strategy instance
+        strategy = job.strategy_class(job.strategy_name, job.strategy_params)
+        
+        # Create backtest engine
+        engine = BacktestEngine(
+            data_loader=data_loader,
+            initial_capital=job.initial_capital,
+            commission=job.commission,
+            slippage=job.slippage,
+            mode=engine_mode
+        )
+        
+        # Run backtest
+        results = engine.run_backtest(
+            strategy=strategy,
+            symbols=job.symbols,
+            start_date=job.start_date,
+            end_date=job.end_date,
+            timeframe=job.timeframe
+        )
+        
+        execution_time = time.time() - start_time
+        
+        return BacktestResult(
+            job_id=job.job_id,
+            strategy_name=job.strategy_name,
+            symbols=job.symbols,
+            success=True,
+            error_message=None,
+            execution_time=execution_time,
+            results=results
+        )
+        
+    except Exception as e:
+        execution_time = time.time() - start_time
+        
+        return BacktestResult(
+            job_id=job.job_id,
+            strategy_name=job.strategy_name,
+            symbols=job.symbols,
+            success=False,
+            error_message=str(e),
+            execution_time=execution_time,
+            results=None
+        )
+
+
+# Per-process state for process-pool workers
+_worker_data_loader: Optional[SharedMemoryDataLoader] = None
+_worker_engine_mode: EngineMode = EngineMode.EVENT
+
+
+def _init_process_worker(handles, engine_mode: EngineMode):
+    """Process-pool initializer: attach this worker to the shared datasets"""
+    global _worker_data_loader, _worker_engine_mode
+    _worker_data_loader = SharedMemoryDataLoader(handles)
+    _worker_engine_mode = engine_mode
+
+
+def _run_job_in_process(job: BacktestJob) -> BacktestResult:
+    """Process-pool entry point for a single job"""
+    return execute_backtest_job(job, _worker_data_loader, _worker_engine_mode)
@@ -0,0 +1,179 @@
+"""
+Order Book
+==========
+
+Per-symbol index of resting limit and stop orders.
+
+Each symbol keeps four price-sorted heaps: buy limits (highest price
+first), sell limits (lowest first), buy stops (lowest first) and sell
+stops (highest first). A bar pops only the orders whose trigger price
+lies within its high/low range, so checking a bar costs O(k log n) for k
+triggered orders instead of a scan over every resting order.
+
+Cancelled orders are removed lazily: they stay in their heap until they
+reach the top or the heap is compacted.
+"""
+
+import heapq
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class BookSide(Enum):
+    """Which heap an order rests in"""
+    BUY_LIMIT = "buy_limit"    # Triggers when low <= price
+    SELL_LIMIT = "sell_limit"  # Triggers when high >= price
+    BUY_STOP = "buy_stop"      # Triggers when high >= price
+    SELL_STOP = "sell_stop"    # Triggers when low <= price
+
+
+# Heap keys are negated for the sides that pop their highest price first
+_NEGATED = {BookSide.BUY_LIMIT: True, BookSide.SELL_LIMIT: False,
+            BookSide.BUY_STOP: False, BookSide.SELL_STOP: True}
+
+
+class _SymbolBook:
+    """The four heaps of one symbol"""
+
+    def __init__(self):
+        self.heaps: Dict[BookSide, List[Tuple[float, int, str]]] = {side: [] for side in BookSide}
+        self.live: Dict[str, Tuple[int, Any]] = {}
+        self.stale = 0
+
+    def clear(self):
+        for heap in self.heaps.values():
+            heap.clear()
+        self.stale = 0
+
+    def compact(self):
+        for side, heap in self.heaps.items():
+            kept = [entry for entry in heap if self.live.get(entry[2], (None,))[0] == entry[1]]
+            heapq.heapify(kept)
+            self.heaps[side] = kept
+        self.stale = 0
+
+
+class OrderBook:
+    """Resting orders indexed by symbol, side and trigger price"""
+
+    def __init__(self):
+        self._books: Dict[str, _SymbolBook] = {}
+        self._symbols: Dict[str, str] = {}
+        self._seq = 0
+        self.stats = {'added': 0, 'removed': 0, 'triggered': 0, 'compactions': 0}
+
+    def add(self, order_id: str, symbol: str, side: BookSide, price: float, order: Any):
+        """
+        Rest an order
+
+        Args:
+            order_id: Unique order id
+            symbol: Trading symbol
+            side: Heap the order rests in
+            price: Trigger price (limit price or stop price)
+            order: Object returned when the order triggers
+
+        Raises:
+            ValueError: If the order id is already in the book
+        """
+        if order_id in self._symbols:
+            raise ValueError(f"Order {order_id} is already in the book")
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _SymbolBook()
+
+        self._seq += 1
+        key = -price if _NEGATED[side] else price
+        heapq.heappush(book.heaps[side], (key, self._seq, order_id))
+        book.live[order_id] = (self._seq, order)
+        self._symbols[order_id] = symbol
+        self.stats['added'] += 1
+
+    def remove(self, order_id: str) -> Any:
+        """
+        Take an order out of the book
+
+        Args:
+            order_id: Order id
+
+        Returns:
+            The order, or None if it is not in the book
+        """
+        symbol = self._symbols.pop(order_id, None)
+        if symbol is None:
+            return None
+        book = self._books[symbol]
+        _, order = book.live.pop(order_id)
+        book.stale += 1
+        self.stats['removed'] += 1
+        if not book.live:
+            book.clear()
+        elif book.stale > len(book.live) + 64:
+            book.compact()
+            self.stats['compactions'] += 1
+        return order
+
+    def pop_triggered(self, symbol: str, high: float, low: float) -> List[Any]:
+        """
+        Take out every order a bar's range triggers
+
+        Args:
+            symbol: Trading symbol
+            high: Bar high
+            low: Bar low
+
+        Returns:
+            Triggered orders in the order they were added
+        """
+        book = self._books.get(symbol)
+        if book is None or not book.live:
+            return []
+
+        triggered = []
+        for side, heap in book.heaps.items():
+            negated = _NEGATED[side]
+            bound = low if side in (BookSide.BUY_LIMIT, BookSide.SELL_STOP) else high
+            while heap:
+                key, seq, order_id = heap[0]
+                price = -key if negated else key
+                if (price < bound) if negated else (price > bound):
+                    break
+                heapq.heappop(heap)
+                entry = book.live.get(order_id)
+                if entry is None or entry[0] != seq:
+                    book.stale -= 1
+                    continue
+                del book.live[order_id]
+                del self._symbols[order_id]
+                triggered.append(entry)
+
+        if not book.live:
+            book.clear()
+        triggered.sort(key=lambda entry: entry[0])
+        self.stats['triggered'] += len(triggered)
+        return [order for _, order in triggered]
+
+    def orders(self, symbol: str) -> List[Any]:
+        """Resting orders of a symbol in the order they were added"""
+        book = self._books.get(symbol)
+        if book is None:
+            return []
+        return [order for _, order in sorted(book.live.values(), key=lambda entry: entry[0])]
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._symbols
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._symbols))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get order book statistics"""
+        return {
+            **self.stats,
+            'resting': len(self._symbols),
+            'symbols': sum(1 for book in self._books.values() if book.live),
+            'stale_entries': sum(book.stale for book in self._books.values())
+        }
@@ -3,6 +3,10 @@ Portfolio Management
 ===================
 
 Portfolio management for backtesting and live trading.
+
+Cash, market value and cost basis are kept as running totals that every
+fill and price update adjusts by its delta, so valuing the portfolio is
+O(1) however many positions it holds.
 """
 
 import logging
@@ -25,6 +29,10 @@ class Portfolio:
         self.cash = initial_cash
         self.positions: Dict[str, Position] = {}
         self.market_prices: Dict[str, float] = {}
+        
+        # Running totals over all positions
+        self._positions_value = 0.0
+        self._cost_basis = 0.0
         self.logger = logging.getLogger(__name__)
     
     def buy(self, symbol: str, quantity: float, price: float, commission: float = 0.0) -> bool:
@@ -48,6 +56,9 @@ class Portfolio:
         # Deduct cash
         self.cash -= total_cost
         
+        # The existing position is re-marked at the fill price
+        self._remove_from_totals(symbol)
+        
         # Update position
         if symbol in self.positions:
             # Add to existing position
@@ -75,6 +86,7 @@ class Portfolio:
         
         # Update market price
         self.market_prices[symbol] = price
+        self._add_to_totals(symbol)
         
         self.logger.info(f"Bought {quantity} shares of {symbol} at {price}")
         return True
@@ -107,6 +119,7 @@ class Portfolio:
         
         # Add cash
         self.cash += net_proceeds
+        self._remove_from_totals(symbol)
         
         # Update position
         remaining_quantity = position.quantity - quantity
@@ -126,6 +139,7 @@ class Portfolio:
         
         # Update market price
         self.market_prices[symbol] = price
+        self._add_to_totals(symbol)
         
         self.logger.info(f"Sold {quantity} shares of {symbol} at {price}")
         return True
@@ -137,18 +151,49 @@ class Portfolio:
             symbol: Trading symbol
             price: Current market price
         """
+        # Update position market price if we have a position
+        position = self.positions.get(symbol)
+        if position is not None:
+            self._positions_value += position.quantity * (price - self._mark(symbol, position))
+            position.market_price = price
+        
         self.market_prices[symbol] = price
+    
+    def _mark(self, symbol: str, position: Position) -> float:
+        """Price a position is currently valued at"""
+        return self.market_prices.get(symbol, position.avg_price)
+    
+    def _add_to_totals(self, symbol: str):
+        position = self.positions.get(symbol)
+        if position is not None:
+            self._positions_value += position.quantity * self._mark(symbol, position)
+            self._cost_basis += position.quantity * position.avg_price
+    
+    def _remove_from_totals(self, symbol: str):
+        position = self.positions.get(symbol)
+        if position is not None:
+            self._positions_value -= position.quantity * self._mark(symbol, position)
+            self._cost_basis -= position.quantity * position.avg_price
+    
+    def reconcile(self) -> float:
+        """Recompute the running totals from the positions
         
-        # Update position market price if we have a position
-        if symbol in self.positions:
-            position = self.positions[symbol]
-            self.positions[symbol] = Position(
-                symbol=position.symbol,
-                quantity=position.quantity,
-                avg_price=position.avg_price,
-                market_price=price,
-                timestamp=position.timestamp
-            )
+        Delta updates accumulate floating-point rounding over millions of
+        price updates; this resets them with one full scan.
+        
+        Returns:
+            Difference between the running and recomputed market value
+        """
+        positions_value = 0.0
+        cost_basis = 0.0
+        for symbol, position in self.positions.items():
+            positions_value += position.quantity * self._mark(symbol, position)
+            cost_basis += position.quantity * position.avg_price
+        
+        drift = self._positions_value - positions_value
+        self._positions_value = positions_value
+        self._cost_basis = cost_basis
+        return drift
     
     def get_position_quantity(self, symbol: str) -> float:
         """Get position quantity for a symbol
@@ -205,12 +250,15 @@ class Portfolio:
         Returns:
             Total market value of all positions
         """
-        total_value = 0.0
-        
-        for symbol in self.positions:
-            total_value += self.get_position_value(symbol)
+        return self._positions_value
+    
+    def get_total_exposure(self) -> float:
+        """Get gross exposure (positions are long-only, so their market value)
         
-        return total_value
+        Returns:
+            Total exposure
+        """
+        return self._positions_value
     
     def get_total_value(self) -> float:
         """Get total portfolio value (cash + positions)
@@ -218,7 +266,7 @@ class Portfolio:
         Returns:
             Total portfolio value
         """
-        return self.cash + self.get_total_positions_value()
+        return self.cash + self._positions_value
     
     def get_total_pnl(self) -> float:
         """Get total unrealized P&L
@@ -226,12 +274,7 @@ class Portfolio:
         Returns:
             Total unrealized P&L
         """
-        total_pnl = 0.0
-        
-        for symbol in self.positions:
-            total_pnl += self.get_position_pnl(symbol)
-        
-        return total_pnl
+        return self._positions_value - self._cost_basis
     
     def get_portfolio_summary(self) -> Dict[str, float]:
         """Get portfolio summary
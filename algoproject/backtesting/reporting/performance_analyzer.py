@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 import math
 
 from ...core.interfaces import MarketData
+from ...core import kpi_kernel as kernel
 
 
 class PerformanceAnalyzer:
@@ -71,47 +72,41 @@ class PerformanceAnalyzer:
             self.logger.error(f"Error calculating metrics: {e}")
             return {}
     
+    def _equity_arrays(self, equity_curve: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Portfolio values as a single kernel run and its bar returns"""
+        values = kernel.as_runs(equity_curve['portfolio_value'].to_numpy(dtype=float))
+        return values, kernel.simple_returns(values)
+    
+    def _cagr(self, equity_curve: pd.DataFrame, values: np.ndarray) -> float:
+        """Compound annual growth over the calendar span of the curve"""
+        years = (equity_curve.index[-1] - equity_curve.index[0]).days / 365.25
+        return float((values[0, -1] / values[0, 0]) ** (1 / years) - 1) if years > 0 else 0
+    
     def _calculate_return_metrics(self, equity_curve: pd.DataFrame) -> Dict[str, float]:
         """Calculate return-based metrics"""
         if 'portfolio_value' not in equity_curve.columns:
             return {}
         
-        values = equity_curve['portfolio_value']
-        returns = values.pct_change().dropna()
-        
-        initial_value = values.iloc[0]
-        final_value = values.iloc[-1]
-        
-        # Time period calculations
-        start_date = equity_curve.index[0]
-        end_date = equity_curve.index[-1]
-        total_days = (end_date - start_date).days
-        years = total_days / 365.25
+        values, returns = self._equity_arrays(equity_curve)
         
         # Basic returns
-        total_return = (final_value - initial_value) / initial_value
+        total_return = float(values[0, -1] / values[0, 0] - 1)
         total_return_pct = total_return * 100
         
         # Annualized returns
-        if years > 0:
-            cagr = (final_value / initial_value) ** (1 / years) - 1
-            cagr_pct = cagr * 100
-        else:
-            cagr = cagr_pct = 0
+        cagr = self._cagr(equity_curve, values)
         
         # Average returns
-        avg_daily_return = returns.mean()
-        avg_monthly_return = avg_daily_return * 21  # Approximate trading days per month
-        avg_annual_return = avg_daily_return * 252  # Trading days per year
+        avg_daily_return = float(kernel.nan_mean(returns)[0])
         
         return {
             'total_return': total_return,
             'total_return_pct': total_return_pct,
             'cagr': cagr,
-            'cagr_pct': cagr_pct,
+            'cagr_pct': cagr * 100,
             'avg_daily_return': avg_daily_return,
-            'avg_monthly_return': avg_monthly_return,
-            'avg_annual_return': avg_annual_return,
+            'avg_monthly_return': avg_daily_return * 21,  # Approximate trading days per month
+            'avg_annual_return': avg_daily_return * 252,  # Trading days per year
             'final_return_pct': total_return_pct
         }
     
@@ -120,69 +115,42 @@ class PerformanceAnalyzer:
         if 'portfolio_value' not in equity_curve.columns:
             return {}
         
-        values = equity_curve['portfolio_value']
-        returns = values.pct_change().dropna()
-        
-        if len(returns) == 0:
+        values, returns = self._equity_arrays(equity_curve)
+        if returns.size == 0:
             return {}
         
         # Volatility metrics
-        daily_vol = returns.std()
-        annual_vol = daily_vol * np.sqrt(252)
+        daily_vol = float(kernel.nan_std(returns)[0])
+        mean_return = float(kernel.nan_mean(returns)[0])
         
-        # Sharpe ratio
-        excess_returns = returns - (risk_free_rate / 252)  # Daily risk-free rate
-        if daily_vol > 0:
-            sharpe_ratio = excess_returns.mean() / daily_vol * np.sqrt(252)
-        else:
-            sharpe_ratio = 0
+        # Sharpe ratio on returns in excess of the daily risk-free rate
+        sharpe_ratio = (mean_return - risk_free_rate / 252) / daily_vol * np.sqrt(252) if daily_vol > 0 else 0
         
         # Sortino ratio (downside deviation)
-        downside_returns = returns[returns < 0]
-        if len(downside_returns) > 0:
-            downside_deviation = downside_returns.std() * np.sqrt(252)
-            if downside_deviation > 0:
-                sortino_ratio = (returns.mean() * 252 - risk_free_rate) / downside_deviation
-            else:
-                sortino_ratio = 0
+        downside = returns < 0
+        if downside.any():
+            downside_deviation = kernel.nan_std(kernel.masked(returns, downside))[0] * np.sqrt(252)
+            sortino_ratio = (mean_return * 252 - risk_free_rate) / downside_deviation if downside_deviation > 0 else 0
         else:
             sortino_ratio = float('inf')
         
         # Calmar ratio (CAGR / Max Drawdown)
-        total_days = (equity_curve.index[-1] - equity_curve.index[0]).days
-        years = total_days / 365.25
-        if years > 0:
-            cagr = (values.iloc[-1] / values.iloc[0]) ** (1 / years) - 1
-        else:
-            cagr = 0
-        
-        peak = values.expanding().max()
-        drawdown = (values - peak) / peak
-        max_drawdown = abs(drawdown.min())
-        
-        if max_drawdown > 0:
-            calmar_ratio = cagr / max_drawdown
-        else:
-            calmar_ratio = float('inf')
+        max_drawdown = -float(kernel.drawdowns(values).min())
+        calmar_ratio = self._cagr(equity_curve, values) / max_drawdown if max_drawdown > 0 else float('inf')
         
-        # Value at Risk (VaR)
-        var_95 = np.percentile(returns, 5)
-        var_99 = np.percentile(returns, 1)
-        
-        # Expected Shortfall (Conditional VaR)
-        es_95 = returns[returns <= var_95].mean()
-        es_99 = returns[returns <= var_99].mean()
+        # Value at Risk (VaR) and Expected Shortfall (Conditional VaR)
+        var_95, var_99 = np.percentile(returns[0], [5, 1])
         
         return {
-            'volatility': annual_vol,
+            'volatility': daily_vol * np.sqrt(252),
             'daily_volatility': daily_vol,
-            'sharpe_ratio': sharpe_ratio,
-            'sortino_ratio': sortino_ratio,
+            'sharpe_ratio': float(sharpe_ratio),
+            'sortino_ratio': float(sortino_ratio),
             'calmar_ratio': calmar_ratio,
-            'var_95': var_95,
-            'var_99': var_99,
-            'expected_shortfall_95': es_95,
-            'expected_shortfall_99': es_99
+            'var_95': float(var_95),
+            'var_99': float(var_99),
+            'expected_shortfall_95': float(returns[returns <= var_95].mean()),
+            'expected_shortfall_99': float(returns[returns <= var_99].mean())
         }
     
     def _calculate_drawdown_metrics(self, equity_curve: pd.DataFrame) -> Dict[str, float]:
@@ -190,58 +158,31 @@ class PerformanceAnalyzer:
         if 'portfolio_value' not in equity_curve.columns:
             return {}
         
-        values = equity_curve['portfolio_value']
-        
-        # Calculate drawdowns
-        peak = values.expanding().max()
-        drawdown = (values - peak) / peak
+        values, _ = self._equity_arrays(equity_curve)
+        drawdown = kernel.drawdowns(values)
         
-        # Maximum drawdown
-        max_drawdown = abs(drawdown.min())
-        max_drawdown_pct = max_drawdown * 100
+        # Maximum and average drawdown
+        max_drawdown = -float(drawdown.min())
+        underwater = drawdown[drawdown < 0]
+        avg_drawdown = -float(underwater.mean()) if underwater.size else 0
         
-        # Average drawdown
-        negative_drawdowns = drawdown[drawdown < 0]
-        if len(negative_drawdowns) > 0:
-            avg_drawdown = abs(negative_drawdowns.mean())
-            avg_drawdown_pct = avg_drawdown * 100
-        else:
-            avg_drawdown = avg_drawdown_pct = 0
-        
-        # Drawdown duration
-        in_drawdown = drawdown < 0
-        drawdown_periods = []
-        current_period = 0
-        
-        for is_dd in in_drawdown:
-            if is_dd:
-                current_period += 1
-            else:
-                if current_period > 0:
-                    drawdown_periods.append(current_period)
-                    current_period = 0
-        
-        if current_period > 0:
-            drawdown_periods.append(current_period)
-        
-        if drawdown_periods:
-            max_drawdown_duration = max(drawdown_periods)
-            avg_drawdown_duration = np.mean(drawdown_periods)
+        # Drawdown duration, including a drawdown still open at the end
+        durations = kernel.find_periods(drawdown < 0).length
+        if durations.size:
+            max_drawdown_duration = int(durations.max())
+            avg_drawdown_duration = float(durations.mean())
         else:
             max_drawdown_duration = avg_drawdown_duration = 0
         
         # Recovery factor
-        total_return = (values.iloc[-1] - values.iloc[0]) / values.iloc[0]
-        if max_drawdown > 0:
-            recovery_factor = total_return / max_drawdown
-        else:
-            recovery_factor = float('inf')
+        total_return = float(values[0, -1] / values[0, 0] - 1)
+        recovery_factor = total_return / max_drawdown if max_drawdown > 0 else float('inf')
         
         return {
             'max_drawdown': max_drawdown,
-            'max_drawdown_pct': max_drawdown_pct,
+            'max_drawdown_pct': max_drawdown * 100,
             'avg_drawdown': avg_drawdown,
-            'avg_drawdown_pct': avg_drawdown_pct,
+            'avg_drawdown_pct': avg_drawdown * 100,
             'max_drawdown_duration': max_drawdown_duration,
             'avg_drawdown_duration': avg_drawdown_duration,
             'recovery_factor': recovery_factor
@@ -301,27 +242,26 @@ class PerformanceAnalyzer:
         
         # Win/Loss analysis
         if trade_returns:
-            winning_trades = [r for r in trade_returns if r > 0]
-            losing_trades = [r for r in trade_returns if r < 0]
+            returns = np.asarray(trade_returns, dtype=float)
+            stats = {key: value[0] for key, value in
+                     kernel.trade_stats(kernel.TradeTable(np.zeros(len(returns)), returns, returns), 1).items()}
             
-            win_count = len(winning_trades)
-            loss_count = len(losing_trades)
+            win_count = int(stats['wins'])
+            loss_count = int(stats['losses'])
             total_closed_trades = win_count + loss_count
             
             win_rate = win_count / total_closed_trades if total_closed_trades > 0 else 0
             win_rate_pct = win_rate * 100
             
             # Average trade metrics
-            avg_trade_return = np.mean(trade_returns) if trade_returns else 0
+            avg_trade_return = float(stats['mean'])
             avg_trade_return_pct = avg_trade_return * 100
             
-            avg_winning_trade = np.mean(winning_trades) if winning_trades else 0
-            avg_losing_trade = np.mean(losing_trades) if losing_trades else 0
+            avg_winning_trade = float(stats['avg_win']) if win_count else 0
+            avg_losing_trade = float(stats['avg_loss']) if loss_count else 0
             
             # Profit factor
-            gross_profit = sum(winning_trades) if winning_trades else 0
-            gross_loss = abs(sum(losing_trades)) if losing_trades else 0
-            profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
+            profit_factor = float(kernel.profit_factor(stats['gross_profit'], stats['gross_loss']))
             
             # Expectancy
             expectancy = (win_rate * avg_winning_trade) - ((1 - win_rate) * abs(avg_losing_trade))
@@ -418,39 +358,32 @@ class PerformanceAnalyzer:
         if 'portfolio_value' not in equity_curve.columns:
             return {}
         
-        values = equity_curve['portfolio_value']
-        returns = values.pct_change().dropna()
-        
-        if len(returns) == 0:
+        _, returns = self._equity_arrays(equity_curve)
+        if returns.size == 0:
             return {}
         
-        # Skewness and Kurtosis
-        skewness = returns.skew()
-        kurtosis = returns.kurtosis()
-        
         # Tail ratio
-        returns_sorted = returns.sort_values()
-        n = len(returns_sorted)
+        n = returns.shape[1]
         if n >= 20:  # Need sufficient data
-            top_10_pct = returns_sorted.iloc[int(0.9 * n):].mean()
-            bottom_10_pct = returns_sorted.iloc[:int(0.1 * n)].mean()
+            bottom_10_pct, top_10_pct = (float(tail[0]) for tail in kernel.tail_means(returns))
             tail_ratio = abs(top_10_pct / bottom_10_pct) if bottom_10_pct != 0 else 0
         else:
             tail_ratio = 0
         
         # Stability metrics
-        rolling_returns = returns.rolling(window=21).mean()  # 21-day rolling average
-        return_stability = 1 - (rolling_returns.std() / returns.std()) if returns.std() > 0 else 0
+        returns_std = kernel.nan_std(returns)[0]
+        rolling_std = kernel.nan_std(kernel.rolling_mean(returns, 21))[0]  # 21-day rolling average
+        return_stability = float(1 - rolling_std / returns_std) if returns_std > 0 else 0
         
         # Consistency score (percentage of positive months)
-        monthly_returns = returns.resample('M').apply(lambda x: (1 + x).prod() - 1)
-        positive_months = (monthly_returns > 0).sum()
-        total_months = len(monthly_returns)
+        monthly, inside = kernel.monthly_returns(returns, equity_curve.index[1:].to_numpy())
+        positive_months = int(np.count_nonzero((monthly > 0) & inside))
+        total_months = int(np.count_nonzero(inside))
         consistency_score = positive_months / total_months if total_months > 0 else 0
         
         return {
-            'skewness': skewness,
-            'kurtosis': kurtosis,
+            'skewness': float(kernel.nan_skew(returns)[0]),
+            'kurtosis': float(kernel.nan_kurtosis(returns)[0]),
             'tail_ratio': tail_ratio,
             'return_stability': return_stability,
             'consistency_score': consistency_score,
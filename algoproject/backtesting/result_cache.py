@@ -0,0 +1,333 @@
+"""
+Backtest Result Cache
+=====================
+
+Content-addressed store for backtest results.
+
+A result is keyed by a hash of everything that decides it: the job
+definition (parameters, symbols, date range, timeframe, capital and
+costs), the source of the modules defining the strategy and its base
+classes, the source of the engine, KPI and indicator packages,
+RESULT_CACHE_VERSION and a fingerprint of the OHLCV bars the job runs on.
+Editing a strategy or the engine, or receiving different bars, gives a
+new key rather than a stale hit. Entries are pickled into one
+directory per strategy, so a strategy's results can be dropped at once,
+and the least recently used entries are evicted past a byte limit.
+"""
+
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .aligned_timeline import OHLCV_FIELDS
+
+
+DEFAULT_RESULT_CACHE_DIR = os.path.join('data', 'backtest_cache')
+ENTRY_SUFFIX = '.pkl'
+# Bump to invalidate every cached result when results change in a way the
+# hashed sources do not show (e.g. a dependency upgrade)
+RESULT_CACHE_VERSION = 1
+# Packages whose source decides fills, equity and metrics
+ENGINE_PACKAGES = ('algoproject.backtesting', 'algoproject.core', 'algoproject.indicators')
+
+
+def strategy_id(strategy_class: type) -> str:
+    """Stable identifier of a strategy class ('module.QualName')"""
+    return f"{strategy_class.__module__}.{strategy_class.__qualname__}"
+
+
+@functools.lru_cache(maxsize=None)
+def strategy_fingerprint(strategy_class: type) -> str:
+    """Hash of the source of the modules defining a strategy class and its bases
+
+    A class whose module source is unavailable contributes its id.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for cls in strategy_class.__mro__:
+        if cls.__module__ in ('builtins', 'abc'):
+            continue
+        try:
+            source = inspect.getsource(inspect.getmodule(cls))
+        except (OSError, TypeError):
+            source = strategy_id(cls)
+        digest.update(source.encode())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def engine_fingerprint() -> str:
+    """Hash of every source file in ENGINE_PACKAGES"""
+    digest = hashlib.blake2b(digest_size=16)
+    for package in ENGINE_PACKAGES:
+        for directory in importlib.import_module(package).__path__:
+            for root, dirs, files in os.walk(directory):
+                dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+                for name in sorted(files):
+                    if name.endswith('.py'):
+                        path = os.path.join(root, name)
+                        digest.update(os.path.relpath(path, directory).encode())
+                        with open(path, 'rb') as f:
+                            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Hash of an OHLCV frame's timestamps and values"""
+    if df is None or df.empty:
+        return 'empty'
+    digest = hashlib.blake2b(digest_size=16)
+    index = pd.DatetimeIndex(df.index).as_unit('ns')
+    digest.update(np.ascontiguousarray(index.asi8).tobytes())
+    columns = [column for column in OHLCV_FIELDS if column in df.columns]
+    digest.update(','.join(columns).encode())
+    digest.update(np.ascontiguousarray(df[columns].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def make_result_key(strategy_class: type, strategy_params: Dict[str, Any], symbols: List[str],
+                    start_date: datetime, end_date: datetime, timeframe: str,
+                    initial_capital: float, commission: float, slippage: float,
+                    data_fingerprints: Dict[str, str]) -> str:
+    """
+    Build the cache key of a backtest
+
+    Args:
+        strategy_class: Strategy class
+        strategy_params: Strategy parameters
+        symbols: Symbols traded
+        start_date: Backtest start
+        end_date: Backtest end
+        timeframe: Data timeframe
+        initial_capital: Starting capital
+        commission: Commission rate
+        slippage: Slippage factor
+        data_fingerprints: frame_fingerprint of each symbol's data
+
+    Returns:
+        Key of the form '<strategy dir>/<digest>'
+    """
+    definition = {
+        'strategy': strategy_id(strategy_class),
+        'source': strategy_fingerprint(strategy_class),
+        'engine': engine_fingerprint(),
+        'version': RESULT_CACHE_VERSION,
+        'params': strategy_params,
+        'symbols': list(symbols),
+        'start': start_date,
+        'end': end_date,
+        'timeframe': timeframe,
+        'initial_capital': initial_capital,
+        'commission': commission,
+        'slippage': slippage,
+        'data': [data_fingerprints.get(symbol, 'empty') for symbol in symbols]
+    }
+    encoded = json.dumps(definition, sort_keys=True, default=str).encode()
+    digest = hashlib.blake2b(encoded, digest_size=20).hexdigest()
+    return f"{_strategy_dir(strategy_id(strategy_class))}/{digest}"
+
+
+def _strategy_dir(name: str) -> str:
+    return re.sub(r'[^\w.-]', '_', name)
+
+
+class BacktestResultCache:
+    """On-disk backtest results keyed by make_result_key
+
+    Several processes may share a directory: writes are atomic, and each
+    process evicts from the entries it has seen (all entries present when
+    it started plus those it reads or writes).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_RESULT_CACHE_DIR,
+                 max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding the entries
+            max_bytes: Total entry size before the least recently used are evicted
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+
+        # key -> entry size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.stats: Dict[str, int] = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'invalidations': 0  # Entries dropped by invalidate_strategy
+        }
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scan()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get stored results
+
+        Args:
+            key: Result key
+
+        Returns:
+            A fresh copy of the results, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            results = pickle.loads(data)
+        except FileNotFoundError:
+            results = None
+        except Exception as e:
+            self.logger.error(f"Dropping unreadable backtest cache entry {key}: {e}")
+            self._remove(path)
+            results = None
+
+        with self._lock:
+            if results is None:
+                self.stats['misses'] += 1
+                self._forget(key)
+                return None
+            self.stats['hits'] += 1
+            self._forget(key)
+            self._entries[key] = len(data)
+            self._bytes += len(data)
+
+        # Keeps the LRU order across restarts
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return results
+
+    def put(self, key: str, results: Dict[str, Any]) -> bool:
+        """
+        Store results, evicting old entries past the byte limit
+
+        Returns:
+            True if stored
+        """
+        path = self._path(key)
+        try:
+            data = pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.error(f"Error storing backtest result {key}: {e}")
+            return False
+
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = len(data)
+            self._bytes += len(data)
+            self.stats['stores'] += 1
+            self._evict()
+        return True
+
+    def invalidate_strategy(self, strategy: Union[type, str]) -> int:
+        """
+        Drop every result of a strategy
+
+        Args:
+            strategy: Strategy class or its strategy_id
+
+        Returns:
+            Number of entries dropped
+        """
+        name = _strategy_dir(strategy if isinstance(strategy, str) else strategy_id(strategy))
+        directory = os.path.join(self.cache_dir, name)
+        prefix = f"{name}/"
+        try:
+            count = sum(1 for entry in os.listdir(directory) if entry.endswith(ENTRY_SUFFIX))
+        except OSError:
+            count = 0
+        shutil.rmtree(directory, ignore_errors=True)
+
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._forget(key)
+            self.stats['invalidations'] += count
+        self.logger.info(f"Invalidated {count} cached backtest results for {name}")
+        return count
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters, size and hit rate"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else 0.0
+            }
+
+    def _path(self, key: str) -> str:
+        name, _, digest = key.partition('/')
+        return os.path.join(self.cache_dir, _strategy_dir(name), os.path.basename(digest) + ENTRY_SUFFIX)
+
+    def _scan(self):
+        """Index the entries already on disk, oldest first"""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            directory = os.path.join(self.cache_dir, name)
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.scandir(directory):
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, f"{name}/{entry.name[:-len(ENTRY_SUFFIX)]}",
+                                  stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._bytes -= size
+
+    def _evict(self):
+        # The newest entry is kept even if it alone exceeds the limit
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._remove(self._path(key))
+            self.stats['evictions'] += 1
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
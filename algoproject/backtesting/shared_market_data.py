@@ -0,0 +1,195 @@
+"""
+Shared Market Data
+==================
+
+Shared-memory OHLCV storage for multi-process backtesting.
+
+The parent process copies each dataset into one ``multiprocessing.shared_memory``
+block. Worker processes attach to the blocks by name and wrap them in read-only
+DataFrames without copying the underlying data.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+from ..data.data_loader import DataLoader
+from .aligned_timeline import OHLCV_FIELDS
+
+
+# (symbol, timeframe, start_date, end_date)
+DatasetKey = Tuple[str, str, Optional[datetime], Optional[datetime]]
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """Picklable reference to an OHLCV frame stored in shared memory
+
+    Block layout: ``n_bars`` int64 nanosecond timestamps followed by a
+    row-major float64 array of shape ``(n_bars, len(columns))``.
+    """
+    shm_name: str
+    n_bars: int
+    columns: Tuple[str, ...]
+    tz: Optional[str] = None
+
+
+def attach_frame(handle: SharedFrameHandle) -> Tuple[pd.DataFrame, shared_memory.SharedMemory]:
+    """Attach to a shared OHLCV frame without copying
+
+    The returned SharedMemory object must be kept alive for as long as the
+    DataFrame is in use.
+
+    Args:
+        handle: Shared frame handle
+
+    Returns:
+        Tuple of (read-only DataFrame, SharedMemory block)
+    """
+    shm = shared_memory.SharedMemory(name=handle.shm_name)
+    n_bars = handle.n_bars
+
+    index_ns = np.ndarray((n_bars,), dtype=np.int64, buffer=shm.buf, offset=0)
+    values = np.ndarray((n_bars, len(handle.columns)), dtype=np.float64,
+                        buffer=shm.buf, offset=index_ns.nbytes)
+    values.flags.writeable = False
+
+    index = pd.DatetimeIndex(index_ns.view('datetime64[ns]'))
+    if handle.tz:
+        index = index.tz_localize('UTC').tz_convert(handle.tz)
+
+    df = pd.DataFrame(values, index=index, columns=list(handle.columns), copy=False)
+    return df, shm
+
+
+class SharedMarketDataStore:
+    """Owns the shared-memory blocks for one matrix run"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.handles: Dict[DatasetKey, SharedFrameHandle] = {}
+        self._blocks: Dict[DatasetKey, shared_memory.SharedMemory] = {}
+
+    def add(self, key: DatasetKey, df: pd.DataFrame) -> Optional[SharedFrameHandle]:
+        """Copy a DataFrame's OHLCV columns into shared memory
+
+        Args:
+            key: Dataset key
+            df: OHLCV DataFrame with a DatetimeIndex
+
+        Returns:
+            Shared frame handle, or None if the frame is empty
+        """
+        if key in self.handles:
+            return self.handles[key]
+
+        if df is None or df.empty:
+            return None
+
+        n_bars = len(df)
+        index = pd.DatetimeIndex(df.index)
+        tz = str(index.tz) if index.tz is not None else None
+
+        index_bytes = n_bars * np.dtype(np.int64).itemsize
+        values_bytes = n_bars * len(OHLCV_FIELDS) * np.dtype(np.float64).itemsize
+        shm = shared_memory.SharedMemory(create=True, size=index_bytes + values_bytes)
+
+        index_ns = np.ndarray((n_bars,), dtype=np.int64, buffer=shm.buf, offset=0)
+        index_ns[:] = index.values.astype('datetime64[ns]').view(np.int64)
+        values = np.ndarray((n_bars, len(OHLCV_FIELDS)), dtype=np.float64,
+                            buffer=shm.buf, offset=index_bytes)
+        values[:] = df[list(OHLCV_FIELDS)].to_numpy(dtype=np.float64)
+
+        handle = SharedFrameHandle(shm_name=shm.name, n_bars=n_bars,
+                                   columns=OHLCV_FIELDS, tz=tz)
+        self._blocks[key] = shm
+        self.handles[key] = handle
+        return handle
+
+    def total_bytes(self) -> int:
+        """Total size of all shared blocks in bytes"""
+        return sum(shm.size for shm in self._blocks.values())
+
+    def close(self):
+        """Release and unlink all shared-memory blocks"""
+        for key, shm in self._blocks.items():
+            try:
+                shm.unlink()
+                shm.close()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.logger.error(f"Error releasing shared memory for {key}: {e}")
+
+        self._blocks.clear()
+        self.handles.clear()
+
+    def __enter__(self) -> 'SharedMarketDataStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SharedMemoryDataLoader(DataLoader):
+    """DataLoader that serves historical data from shared-memory handles
+
+    Used inside worker processes in place of the provider-backed loader.
+    """
+
+    def __init__(self, handles: Dict[DatasetKey, SharedFrameHandle]):
+        """Initialize shared-memory data loader
+
+        Args:
+            handles: Dataset handles published by the parent process
+        """
+        super().__init__(config_manager=None)
+        self.handles = handles
+        self._frames: Dict[DatasetKey, pd.DataFrame] = {}
+        self._blocks: Dict[DatasetKey, shared_memory.SharedMemory] = {}
+
+    def get_historical_data(self, symbol: str, timeframe: str,
+                          provider: str = None,
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None,
+                          limit: int = 1000) -> pd.DataFrame:
+        """Get historical market data from shared memory
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            provider: Ignored
+            start_date: Start date for data
+            end_date: End date for data
+            limit: Ignored (the parent already applied it)
+
+        Returns:
+            Read-only DataFrame with OHLCV data (empty if not published)
+        """
+        key = (symbol, timeframe, start_date, end_date)
+
+        if key not in self._frames:
+            handle = self.handles.get(key)
+            if handle is None:
+                self.logger.warning(f"No shared data published for {symbol} {timeframe}")
+                return pd.DataFrame()
+
+            df, shm = attach_frame(handle)
+            self._frames[key] = df
+            self._blocks[key] = shm
+
+        return self._frames[key]
+
+    def close(self):
+        """Detach from all shared-memory blocks"""
+        self._frames.clear()
+        for key, shm in self._blocks.items():
+            try:
+                shm.close()
+            except BufferError:
+                self.logger.warning(f"Shared data for {key} still referenced, leaving attached")
+        self._blocks.clear()
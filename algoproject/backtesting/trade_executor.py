@@ -3,16 +3,22 @@ Trade Executor
 ==============
 
 Handles trade execution for backtesting and live trading.
+
+Limit and stop orders rest in a per-symbol ``OrderBook`` and trigger on
+the bar whose high/low range crosses their price. Orders that share an
+``oco_group`` cancel each other when one of them fills.
 """
 
+import itertools
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 from enum import Enum
 
 from ..core.interfaces import Signal, MarketData
 from ..core.risk_manager import RiskManager
 from .backtest_context import BacktestContext
+from .order_book import BookSide, OrderBook
 
 
 class ExecutionMode(Enum):
@@ -37,7 +43,8 @@ class Order:
     
     def __init__(self, order_id: str, symbol: str, action: str, quantity: float,
                  order_type: ExecutionMode, price: Optional[float] = None,
-                 stop_price: Optional[float] = None, metadata: Optional[Dict] = None):
+                 stop_price: Optional[float] = None, metadata: Optional[Dict] = None,
+                 oco_group: Optional[str] = None):
         self.order_id = order_id
         self.symbol = symbol
         self.action = action.lower()
@@ -46,6 +53,7 @@ class Order:
         self.price = price
         self.stop_price = stop_price
         self.metadata = metadata or {}
+        self.oco_group = oco_group
         
         self.status = OrderStatus.PENDING
         self.filled_quantity = 0.0
@@ -76,8 +84,11 @@ class TradeExecutor:
         
         # Order management
         self.pending_orders: Dict[str, Order] = {}
+        self.order_book = OrderBook()
+        self.oco_groups: Dict[str, Set[str]] = {}
         self.filled_orders: List[Order] = []
         self.order_counter = 0
+        self._oco_counter = itertools.count(1)
         
         # Execution settings (fallback if no risk manager)
         self.max_position_size = 0.1  # Max 10% of portfolio per position
@@ -105,7 +116,7 @@ class TradeExecutor:
                 self._execute_market_order(order)
             else:
                 # Add to pending orders for limit/stop orders
-                self.pending_orders[order.order_id] = order
+                self._rest_order(order)
             
             return order.order_id
             
@@ -113,26 +124,130 @@ class TradeExecutor:
             self.logger.error(f"Error executing signal: {e}")
             return None
     
-    def process_market_data(self, data: MarketData):
-        """Process market data and check pending orders
+    def place_order(self, symbol: str, action: str, quantity: float,
+                    order_type: ExecutionMode, price: Optional[float] = None,
+                    stop_price: Optional[float] = None, metadata: Optional[Dict] = None,
+                    oco_group: Optional[str] = None) -> str:
+        """Place an order directly, without signal validation
+        
+        Market orders execute immediately; limit and stop orders rest in
+        the order book until a bar's range crosses their price. Fills still
+        go through the context, which rejects trades the portfolio cannot
+        cover.
         
         Args:
-            data: Market data update
+            symbol: Trading symbol
+            action: 'buy' or 'sell'
+            quantity: Order quantity
+            order_type: MARKET, LIMIT or STOP
+            price: Limit price (LIMIT orders)
+            stop_price: Trigger price (STOP orders)
+            metadata: Passed through to the executed signal
+            oco_group: Orders sharing a group cancel each other on a fill
+            
+        Returns:
+            Order ID
+            
+        Raises:
+            ValueError: If the order is malformed or of an unsupported type
         """
-        symbol = data.symbol
+        action = action.lower()
+        if action not in ('buy', 'sell') or quantity <= 0:
+            raise ValueError(f"Invalid order: {action} {quantity} {symbol}")
+        if order_type == ExecutionMode.LIMIT and not price:
+            raise ValueError("Limit orders need a price")
+        if order_type == ExecutionMode.STOP and not stop_price:
+            raise ValueError("Stop orders need a stop_price")
+        if order_type == ExecutionMode.STOP_LIMIT:
+            raise ValueError("Stop-limit orders are not supported in backtests")
+        
+        self.order_counter += 1
+        order = Order(f"ORDER_{self.order_counter:06d}", symbol, action, quantity, order_type,
+                      price=price, stop_price=stop_price, metadata=metadata, oco_group=oco_group)
+        
+        if order_type == ExecutionMode.MARKET:
+            self._execute_market_order(order)
+        else:
+            self._rest_order(order)
+        return order.order_id
+    
+    def place_bracket(self, symbol: str, action: str, quantity: float, take_profit: float,
+                      stop_loss: float, metadata: Optional[Dict] = None) -> Tuple[str, str]:
+        """Place a take-profit limit and a stop-loss as one OCO pair
         
-        # Check pending orders for this symbol
-        orders_to_remove = []
+        If a single bar reaches both prices the stop-loss fills, as the
+        bar does not say which came first.
         
-        for order_id, order in self.pending_orders.items():
-            if order.symbol == symbol:
-                if self._should_execute_order(order, data):
-                    self._execute_order(order, data)
-                    orders_to_remove.append(order_id)
+        Args:
+            symbol: Trading symbol
+            action: Side of the exit orders ('sell' to close a long)
+            quantity: Quantity of each order
+            take_profit: Limit price
+            stop_loss: Stop price
+            metadata: Passed through to the executed signal
+            
+        Returns:
+            Tuple of (take_profit_order_id, stop_loss_order_id)
+            
+        Raises:
+            ValueError: If the prices are on the wrong side of each other
+        """
+        action = action.lower()
+        if (action == 'sell' and take_profit <= stop_loss) or (action == 'buy' and take_profit >= stop_loss):
+            raise ValueError(f"Bracket prices out of order for a {action} exit: "
+                             f"take_profit={take_profit}, stop_loss={stop_loss}")
+        
+        group = f"OCO_{next(self._oco_counter):06d}"
+        # The stop is placed first so it wins ties within a bar
+        stop_id = self.place_order(symbol, action, quantity, ExecutionMode.STOP,
+                                   stop_price=stop_loss, metadata=metadata, oco_group=group)
+        limit_id = self.place_order(symbol, action, quantity, ExecutionMode.LIMIT,
+                                    price=take_profit, metadata=metadata, oco_group=group)
+        return limit_id, stop_id
+    
+    def _rest_order(self, order: Order):
+        """Add a limit or stop order to the order book
+        
+        Args:
+            order: Pending order
+        """
+        if order.order_type == ExecutionMode.LIMIT:
+            side = BookSide.BUY_LIMIT if order.action == 'buy' else BookSide.SELL_LIMIT
+            trigger = order.price
+        else:
+            side = BookSide.BUY_STOP if order.action == 'buy' else BookSide.SELL_STOP
+            trigger = order.stop_price
         
-        # Remove executed orders from pending
-        for order_id in orders_to_remove:
-            del self.pending_orders[order_id]
+        self.pending_orders[order.order_id] = order
+        self.order_book.add(order.order_id, order.symbol, side, trigger, order)
+        if order.oco_group:
+            self.oco_groups.setdefault(order.oco_group, set()).add(order.order_id)
+    
+    def process_market_data(self, data: MarketData):
+        """Process market data and execute the pending orders it triggers
+        
+        Args:
+            data: Market data update
+        """
+        for order in self.order_book.pop_triggered(data.symbol, data.high, data.low):
+            self.pending_orders.pop(order.order_id, None)
+            self._leave_oco_group(order)
+            
+            # An OCO sibling may have filled earlier in this bar
+            if order.status != OrderStatus.PENDING:
+                continue
+            
+            self._execute_order(order, data)
+            if order.status == OrderStatus.FILLED and order.oco_group:
+                for sibling_id in self.oco_groups.pop(order.oco_group, ()):
+                    self.cancel_order(sibling_id)
+    
+    def _leave_oco_group(self, order: Order):
+        group = self.oco_groups.get(order.oco_group) if order.oco_group else None
+        if group is not None:
+            group.discard(order.order_id)
+            if not group:
+                del self.oco_groups[order.oco_group]
     
     def cancel_order(self, order_id: str) -> bool:
         """Cancel a pending order
@@ -143,14 +258,15 @@ class TradeExecutor:
         Returns:
             True if order cancelled, False otherwise
         """
-        if order_id in self.pending_orders:
-            order = self.pending_orders[order_id]
-            order.status = OrderStatus.CANCELLED
-            del self.pending_orders[order_id]
-            self.logger.info(f"Cancelled order {order_id}")
-            return True
+        order = self.pending_orders.pop(order_id, None)
+        if order is None:
+            return False
         
-        return False
+        order.status = OrderStatus.CANCELLED
+        self.order_book.remove(order_id)
+        self._leave_oco_group(order)
+        self.logger.info(f"Cancelled order {order_id}")
+        return True
     
     def get_pending_orders(self, symbol: Optional[str] = None) -> List[Order]:
         """Get pending orders
@@ -161,12 +277,10 @@ class TradeExecutor:
         Returns:
             List of pending orders
         """
-        orders = list(self.pending_orders.values())
-        
         if symbol:
-            orders = [order for order in orders if order.symbol == symbol]
+            return self.order_book.orders(symbol)
         
-        return orders
+        return list(self.pending_orders.values())
     
     def get_filled_orders(self, symbol: Optional[str] = None) -> List[Order]:
         """Get filled orders
@@ -200,7 +314,8 @@ class TradeExecutor:
                     signal=signal,
                     portfolio_value=self.context.portfolio_value,
                     current_positions=self.context.positions,
-                    market_data=self.context.current_data
+                    market_data=self.context.current_data,
+                    current_exposure=self.context.portfolio.get_total_exposure()
                 )
                 
                 if not is_valid:
@@ -327,6 +442,8 @@ class TradeExecutor:
     def _should_execute_order(self, order: Order, data: MarketData) -> bool:
         """Check if an order should be executed based on market data
         
+        This is the rule the order book applies to a bar's high/low range.
+        
         Args:
             order: Order to check
             data: Current market data
@@ -334,18 +451,16 @@ class TradeExecutor:
         Returns:
             True if order should be executed, False otherwise
         """
-        current_price = data.close
-        
         if order.order_type == ExecutionMode.LIMIT:
-            if order.action == 'buy' and current_price <= order.price:
+            if order.action == 'buy' and data.low <= order.price:
                 return True
-            elif order.action == 'sell' and current_price >= order.price:
+            elif order.action == 'sell' and data.high >= order.price:
                 return True
         
         elif order.order_type == ExecutionMode.STOP:
-            if order.action == 'buy' and current_price >= order.stop_price:
+            if order.action == 'buy' and data.high >= order.stop_price:
                 return True
-            elif order.action == 'sell' and current_price <= order.stop_price:
+            elif order.action == 'sell' and data.low <= order.stop_price:
                 return True
         
         return False
@@ -357,14 +472,15 @@ class TradeExecutor:
             order: Order to execute
             data: Market data for execution
         """
-        execution_price = order.price if order.order_type == ExecutionMode.LIMIT else data.close
-        
-        # Apply slippage for stop orders
-        if order.order_type == ExecutionMode.STOP:
-            if order.action == 'buy':
-                execution_price = execution_price * (1 + self.slippage)
-            else:
-                execution_price = execution_price * (1 - self.slippage)
+        # Fill at the order's price, or at the open if the bar gapped through it
+        buy = order.action == 'buy'
+        if order.order_type == ExecutionMode.LIMIT:
+            execution_price = min(order.price, data.open) if buy else max(order.price, data.open)
+        else:
+            execution_price = max(order.stop_price, data.open) if buy else min(order.stop_price, data.open)
+            
+            # Apply slippage for stop orders
+            execution_price *= (1 + self.slippage) if buy else (1 - self.slippage)
         
         # Create signal for execution
         execution_signal = Signal(
@@ -10,6 +10,7 @@ __author__ = "AlgoProject Team"
 
 from .strategy_engine import StrategyEngine
 from .kpi_calculator import KPICalculator
+from .kpi_kernel import KPI_NAMES, TradeTable, compute_kpis
 from .trade_executor import TradeExecutor
 from .risk_manager import RiskManager
 from .config_manager import ConfigManager
@@ -17,6 +18,9 @@ from .config_manager import ConfigManager
 __all__ = [
     'StrategyEngine',
     'KPICalculator', 
+    'KPI_NAMES',
+    'TradeTable',
+    'compute_kpis',
     'TradeExecutor',
     'RiskManager',
     'ConfigManager'
@@ -8,7 +8,7 @@ Centralized configuration management for AlgoProject.
 import yaml
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 
@@ -7,9 +7,9 @@ Comprehensive KPI calculations for trading performance analysis.
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any
-import math
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+from . import kpi_kernel as kernel
 
 
 class KPICalculator:
@@ -24,261 +24,213 @@ class KPICalculator:
         if not trades or not equity_curve:
             return self._empty_kpis()
         
-        trades_df = pd.DataFrame(trades)
-        equity_series = pd.Series(equity_curve)
+        equity = kernel.as_runs(equity_curve)
+        table = kernel.TradeTable.from_records(trades)
         
         kpis = {}
         
         # Basic metrics
-        kpis.update(self._calculate_basic_metrics(trades_df, equity_series, initial_capital))
+        kpis.update(self._calculate_basic_metrics(table, equity, initial_capital))
         
         # Return metrics
-        kpis.update(self._calculate_return_metrics(equity_series, initial_capital))
+        kpis.update(self._calculate_return_metrics(equity, initial_capital))
         
         # Risk metrics
-        kpis.update(self._calculate_risk_metrics(equity_series, trades_df))
+        kpis.update(self._calculate_risk_metrics(equity))
         
         # Trade metrics
-        kpis.update(self._calculate_trade_metrics(trades_df))
+        kpis.update(self._calculate_trade_metrics(table, trades))
         
         # Drawdown metrics
-        kpis.update(self._calculate_drawdown_metrics(equity_series))
+        kpis.update(self._calculate_drawdown_metrics(equity))
         
         # Duration metrics
-        kpis.update(self._calculate_duration_metrics(trades_df))
+        kpis.update(self._calculate_duration_metrics(table))
         
         # Advanced metrics
-        kpis.update(self._calculate_advanced_metrics(equity_series, trades_df))
+        kpis.update(self._calculate_advanced_metrics(equity, table))
         
         return kpis
     
-    def _calculate_basic_metrics(self, trades_df: pd.DataFrame, equity_series: pd.Series, 
+    def calculate_batch(self, equity_curves: Any, timestamps: Optional[Any] = None,
+                        trades: Optional[kernel.TradeTable] = None,
+                        initial_capital: Optional[float] = None,
+                        benchmark: Optional[Any] = None,
+                        periods_per_year: int = 252) -> pd.DataFrame:
+        """Score many equity curves at once
+        
+        Args:
+            equity_curves: (N, T) equity curves, NaN-padded at the end
+            timestamps: (T,) bar timestamps
+            trades: Closed trades of all runs, keyed by row
+            initial_capital: Capital returns are measured against (defaults
+                             to each curve's first value)
+            benchmark: Benchmark prices for buy & hold, alpha and beta
+            periods_per_year: Bars per year
+            
+        Returns:
+            DataFrame with one row per curve and one column per KPI
+        """
+        kpis = kernel.compute_kpis(
+            equity_curves, timestamps=timestamps, trades=trades,
+            initial_capital=initial_capital, benchmark=benchmark,
+            periods_per_year=periods_per_year, risk_free_rate=self.risk_free_rate
+        )
+        return pd.DataFrame(kpis, columns=list(kernel.KPI_NAMES))
+    
+    def _calculate_basic_metrics(self, table: kernel.TradeTable, equity: np.ndarray, 
                                initial_capital: float) -> Dict[str, float]:
         """Calculate basic trading metrics"""
-        total_trades = len(trades_df)
-        winning_trades = len(trades_df[trades_df['pnl'] > 0])
-        losing_trades = len(trades_df[trades_df['pnl'] < 0])
-        
         return {
-            'total_trades': total_trades,
-            'winning_trades': winning_trades,
-            'losing_trades': losing_trades,
+            'total_trades': len(table),
+            'winning_trades': int(np.count_nonzero(table.pnl > 0)),
+            'losing_trades': int(np.count_nonzero(table.pnl < 0)),
             'initial_capital': initial_capital,
-            'final_capital': equity_series.iloc[-1] if len(equity_series) > 0 else initial_capital
+            'final_capital': float(equity[0, -1])
         }
     
-    def _calculate_return_metrics(self, equity_series: pd.Series, initial_capital: float) -> Dict[str, float]:
+    def _calculate_return_metrics(self, equity: np.ndarray, initial_capital: float) -> Dict[str, float]:
         """Calculate return-based metrics"""
-        if len(equity_series) == 0:
-            return {}
-        
-        final_value = equity_series.iloc[-1]
+        final_value = equity[0, -1]
         total_return = (final_value - initial_capital) / initial_capital
         
-        # Calculate returns
-        returns = equity_series.pct_change().dropna()
-        
         # Annualized return (assuming daily data)
-        days = len(equity_series)
-        years = days / 252  # Trading days per year
-        cagr = (final_value / initial_capital) ** (1/years) - 1 if years > 0 else 0
+        years = equity.shape[1] / 252  # Trading days per year
+        cagr = (final_value / initial_capital) ** (1/years) - 1
         
         return {
-            'total_return_pct': total_return * 100,
-            'final_return_pct': total_return * 100,
-            'cagr_pct': cagr * 100,
-            'annualized_return_pct': cagr * 100
+            'total_return_pct': float(total_return * 100),
+            'final_return_pct': float(total_return * 100),
+            'cagr_pct': float(cagr * 100),
+            'annualized_return_pct': float(cagr * 100)
         }
     
-    def _calculate_risk_metrics(self, equity_series: pd.Series, trades_df: pd.DataFrame) -> Dict[str, float]:
+    def _calculate_risk_metrics(self, equity: np.ndarray) -> Dict[str, float]:
         """Calculate risk-based metrics"""
-        if len(equity_series) < 2:
+        if equity.shape[1] < 2:
             return {}
         
-        returns = equity_series.pct_change().dropna()
-        
-        if len(returns) == 0:
-            return {}
+        returns = kernel.simple_returns(equity)
+        annual_return = kernel.nan_mean(returns)[0] * 252
         
         # Volatility
-        volatility = returns.std() * np.sqrt(252)  # Annualized
+        volatility = kernel.nan_std(returns)[0] * np.sqrt(252)  # Annualized
         
         # Sharpe Ratio
-        excess_returns = returns.mean() * 252 - self.risk_free_rate
+        excess_returns = annual_return - self.risk_free_rate
         sharpe_ratio = excess_returns / volatility if volatility > 0 else 0
         
         # Sortino Ratio (downside deviation)
-        downside_returns = returns[returns < 0]
-        downside_deviation = downside_returns.std() * np.sqrt(252) if len(downside_returns) > 0 else 0
+        downside_deviation = kernel.nan_std(kernel.masked(returns, returns < 0))[0] * np.sqrt(252)
         sortino_ratio = excess_returns / downside_deviation if downside_deviation > 0 else 0
         
         # Calmar Ratio (return/max drawdown)
-        max_dd = self._calculate_max_drawdown(equity_series)
-        calmar_ratio = (returns.mean() * 252) / abs(max_dd) if max_dd != 0 else 0
+        max_dd = self._calculate_max_drawdown(equity)
+        calmar_ratio = annual_return / abs(max_dd) if max_dd != 0 else 0
         
         return {
-            'volatility_pct': volatility * 100,
-            'annualized_volatility_pct': volatility * 100,
-            'sharpe_ratio': sharpe_ratio,
-            'sortino_ratio': sortino_ratio,
-            'calmar_ratio': calmar_ratio
+            'volatility_pct': float(volatility * 100),
+            'annualized_volatility_pct': float(volatility * 100),
+            'sharpe_ratio': float(sharpe_ratio),
+            'sortino_ratio': float(sortino_ratio),
+            'calmar_ratio': float(calmar_ratio)
         }
     
-    def _calculate_trade_metrics(self, trades_df: pd.DataFrame) -> Dict[str, float]:
+    def _calculate_trade_metrics(self, table: kernel.TradeTable, trades: List[Dict]) -> Dict[str, float]:
         """Calculate trade-specific metrics"""
-        if len(trades_df) == 0:
-            return {}
-        
-        pnl_series = trades_df['pnl']
-        winning_trades = pnl_series[pnl_series > 0]
-        losing_trades = pnl_series[pnl_series < 0]
+        stats = {key: value[0] for key, value in kernel.trade_stats(table, 1).items()}
         
-        # Win rate
-        win_rate = len(winning_trades) / len(trades_df) * 100
+        # Percentages are relative to the average trade price, when known
+        mean_price = np.mean([trade['price'] for trade in trades]) if 'price' in trades[0] else None
         
-        # Average trade
-        avg_trade = pnl_series.mean()
-        avg_trade_pct = (avg_trade / trades_df['price'].mean()) * 100 if 'price' in trades_df.columns else 0
+        def pct(value):
+            return float(value / mean_price * 100) if mean_price is not None else 0
         
-        # Average winning/losing trade
-        avg_win = winning_trades.mean() if len(winning_trades) > 0 else 0
-        avg_loss = losing_trades.mean() if len(losing_trades) > 0 else 0
-        
-        # Profit factor
-        gross_profit = winning_trades.sum() if len(winning_trades) > 0 else 0
-        gross_loss = abs(losing_trades.sum()) if len(losing_trades) > 0 else 0
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0
-        
-        # Expectancy
+        win_rate = stats['wins'] / stats['count'] * 100
+        avg_win = float(stats['avg_win']) if stats['wins'] else 0
+        avg_loss = float(stats['avg_loss']) if stats['losses'] else 0
+        gross_profit = float(stats['gross_profit'])
+        gross_loss = float(stats['gross_loss'])
+        profit_factor = float(kernel.profit_factor(gross_profit, gross_loss, no_trades=0))
         expectancy = (win_rate/100 * avg_win) + ((100-win_rate)/100 * avg_loss)
-        expectancy_pct = expectancy / trades_df['price'].mean() * 100 if 'price' in trades_df.columns else 0
-        
-        # Best and worst trades
-        best_trade = pnl_series.max()
-        worst_trade = pnl_series.min()
-        best_trade_pct = (best_trade / trades_df['price'].mean()) * 100 if 'price' in trades_df.columns else 0
-        worst_trade_pct = (worst_trade / trades_df['price'].mean()) * 100 if 'price' in trades_df.columns else 0
         
         return {
             'win_rate_pct': win_rate,
-            'avg_trade': avg_trade,
-            'avg_trade_pct': avg_trade_pct,
+            'avg_trade': float(stats['mean']),
+            'avg_trade_pct': pct(stats['mean']),
             'avg_winning_trade': avg_win,
             'avg_losing_trade': avg_loss,
             'profit_factor': profit_factor,
             'expectancy': expectancy,
-            'expectancy_pct': expectancy_pct,
-            'best_trade': best_trade,
-            'worst_trade': worst_trade,
-            'best_trade_pct': best_trade_pct,
-            'worst_trade_pct': worst_trade_pct,
+            'expectancy_pct': pct(expectancy),
+            'best_trade': float(stats['best']),
+            'worst_trade': float(stats['worst']),
+            'best_trade_pct': pct(stats['best']),
+            'worst_trade_pct': pct(stats['worst']),
             'gross_profit': gross_profit,
             'gross_loss': gross_loss
         }
     
-    def _calculate_drawdown_metrics(self, equity_series: pd.Series) -> Dict[str, float]:
+    def _calculate_drawdown_metrics(self, equity: np.ndarray) -> Dict[str, float]:
         """Calculate drawdown metrics"""
-        if len(equity_series) < 2:
+        if equity.shape[1] < 2:
             return {}
         
-        # Calculate running maximum
-        running_max = equity_series.expanding().max()
-        drawdown = (equity_series - running_max) / running_max
-        
-        max_drawdown = drawdown.min()
-        avg_drawdown = drawdown[drawdown < 0].mean() if len(drawdown[drawdown < 0]) > 0 else 0
-        
-        # Drawdown duration
-        drawdown_periods = []
-        in_drawdown = False
-        start_idx = 0
+        drawdown = kernel.drawdowns(equity)
+        underwater = drawdown[drawdown < 0]
         
-        for i, dd in enumerate(drawdown):
-            if dd < 0 and not in_drawdown:
-                in_drawdown = True
-                start_idx = i
-            elif dd >= 0 and in_drawdown:
-                in_drawdown = False
-                drawdown_periods.append(i - start_idx)
-        
-        max_drawdown_duration = max(drawdown_periods) if drawdown_periods else 0
-        avg_drawdown_duration = np.mean(drawdown_periods) if drawdown_periods else 0
+        # Only drawdowns that recovered count towards duration
+        periods = kernel.find_periods(drawdown < 0)
+        durations = periods.length[~periods.open]
         
         return {
-            'max_drawdown_pct': max_drawdown * 100,
-            'avg_drawdown_pct': avg_drawdown * 100,
-            'max_drawdown_duration': max_drawdown_duration,
-            'avg_drawdown_duration': avg_drawdown_duration
+            'max_drawdown_pct': float(drawdown.min() * 100),
+            'avg_drawdown_pct': float(underwater.mean() * 100) if len(underwater) else 0,
+            'max_drawdown_duration': int(durations.max()) if len(durations) else 0,
+            'avg_drawdown_duration': float(durations.mean()) if len(durations) else 0
         }
     
-    def _calculate_duration_metrics(self, trades_df: pd.DataFrame) -> Dict[str, float]:
+    def _calculate_duration_metrics(self, table: kernel.TradeTable) -> Dict[str, float]:
         """Calculate trade duration metrics"""
-        if 'entry_time' not in trades_df.columns or 'exit_time' not in trades_df.columns:
+        if table.entry_time is None or table.exit_time is None:
             return {}
         
-        # Convert to datetime if needed
-        entry_times = pd.to_datetime(trades_df['entry_time'])
-        exit_times = pd.to_datetime(trades_df['exit_time'])
-        
-        durations = (exit_times - entry_times).dt.total_seconds() / 3600  # Hours
+        durations = table.duration_days * 24  # Hours
         
         return {
-            'avg_trade_duration_hours': durations.mean(),
-            'max_trade_duration_hours': durations.max(),
-            'min_trade_duration_hours': durations.min()
+            'avg_trade_duration_hours': float(durations.mean()),
+            'max_trade_duration_hours': float(durations.max()),
+            'min_trade_duration_hours': float(durations.min())
         }
     
-    def _calculate_advanced_metrics(self, equity_series: pd.Series, trades_df: pd.DataFrame) -> Dict[str, float]:
+    def _calculate_advanced_metrics(self, equity: np.ndarray, table: kernel.TradeTable) -> Dict[str, float]:
         """Calculate advanced performance metrics"""
-        if len(equity_series) < 2:
+        if equity.shape[1] < 2:
             return {}
         
-        returns = equity_series.pct_change().dropna()
+        returns = kernel.simple_returns(equity)
+        std = kernel.nan_std(returns)[0]
         
         # Information Ratio (if benchmark available)
         # For now, using market return as 0
-        information_ratio = returns.mean() / returns.std() * np.sqrt(252) if returns.std() > 0 else 0
+        information_ratio = kernel.nan_mean(returns)[0] / std * np.sqrt(252) if std > 0 else 0
         
         # Recovery Factor
-        max_dd = abs(self._calculate_max_drawdown(equity_series))
-        total_return = (equity_series.iloc[-1] - equity_series.iloc[0]) / equity_series.iloc[0]
+        max_dd = abs(self._calculate_max_drawdown(equity))
+        total_return = (equity[0, -1] - equity[0, 0]) / equity[0, 0]
         recovery_factor = total_return / max_dd if max_dd > 0 else 0
         
         # Consecutive wins/losses
-        if len(trades_df) > 0:
-            pnl_signs = np.sign(trades_df['pnl'])
-            consecutive_wins = self._max_consecutive(pnl_signs, 1)
-            consecutive_losses = self._max_consecutive(pnl_signs, -1)
-        else:
-            consecutive_wins = 0
-            consecutive_losses = 0
-        
         return {
-            'information_ratio': information_ratio,
-            'recovery_factor': recovery_factor,
-            'max_consecutive_wins': consecutive_wins,
-            'max_consecutive_losses': consecutive_losses
+            'information_ratio': float(information_ratio),
+            'recovery_factor': float(recovery_factor),
+            'max_consecutive_wins': int(kernel.max_streak(table.pnl > 0, table.run, 1)[0]),
+            'max_consecutive_losses': int(kernel.max_streak(table.pnl < 0, table.run, 1)[0])
         }
     
-    def _calculate_max_drawdown(self, equity_series: pd.Series) -> float:
+    def _calculate_max_drawdown(self, equity: np.ndarray) -> float:
         """Calculate maximum drawdown"""
-        running_max = equity_series.expanding().max()
-        drawdown = (equity_series - running_max) / running_max
-        return drawdown.min()
-    
-    def _max_consecutive(self, series: pd.Series, value: int) -> int:
-        """Calculate maximum consecutive occurrences of a value"""
-        max_count = 0
-        current_count = 0
-        
-        for val in series:
-            if val == value:
-                current_count += 1
-                max_count = max(max_count, current_count)
-            else:
-                current_count = 0
-        
-        return max_count
+        return float(kernel.drawdowns(equity).min())
     
     def calculate_star_rating(self, profit_factor: float, sharpe_ratio: float) -> str:
         """Calculate star rating based on performance thresholds"""
@@ -0,0 +1,565 @@
+"""
+KPI Kernel
+==========
+
+Vectorized performance metrics over many equity curves at once.
+
+Equity curves are a 2-D array of N runs by T bars (a 1-D curve is treated
+as one run). Runs of different lengths are padded with NaN at the end.
+Closed trades of all runs go in one ``TradeTable`` keyed by run index.
+Every function works along the bar axis with NumPy reductions, so scoring
+thousands of curves costs a handful of array passes rather than a Python
+loop per curve.
+
+``compute_kpis`` returns the 29 standard KPIs (``KPI_NAMES``). The
+building blocks below it are shared by ``KPICalculator``,
+``PerformanceAnalyzer``, ``BacktestEngine`` and the crypto evaluators,
+which each keep their own conventions on top.
+"""
+
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+KPI_NAMES = (
+    # Basic information
+    'start_date', 'end_date', 'duration_days', 'exposure_time_pct',
+    'equity_final', 'equity_peak',
+    # Returns
+    'return_pct', 'buy_hold_return_pct', 'return_ann_pct', 'volatility_ann_pct', 'cagr_pct',
+    # Risk ratios
+    'sharpe_ratio', 'sortino_ratio', 'calmar_ratio', 'alpha_pct', 'beta',
+    # Drawdowns
+    'max_drawdown_pct', 'avg_drawdown_pct', 'max_drawdown_duration', 'avg_drawdown_duration',
+    # Trades
+    'total_trades', 'win_rate_pct', 'best_trade_pct', 'worst_trade_pct', 'avg_trade_pct',
+    'max_trade_duration', 'avg_trade_duration', 'profit_factor', 'expectancy_pct'
+)
+
+DAY = np.timedelta64(1, 'D')
+
+
+def _naive_utc(value: Any) -> np.datetime64:
+    if getattr(value, 'tzinfo', None) is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, 'ns')
+
+
+def as_datetime64(timestamps: Any) -> np.ndarray:
+    """
+    Convert timestamps to datetime64[ns]
+
+    Timezone-aware timestamps (a tz-aware DatetimeIndex, or datetimes in
+    an object array) become naive UTC, which NumPy would otherwise convert
+    with a warning.
+
+    Args:
+        timestamps: Array-like of timestamps
+
+    Returns:
+        datetime64[ns] array
+    """
+    if getattr(timestamps, 'tz', None) is not None:
+        timestamps = timestamps.tz_convert('UTC').tz_localize(None)
+    array = np.asarray(timestamps)
+    if array.dtype == object:
+        return np.array([_naive_utc(value) for value in array.ravel()],
+                        dtype='datetime64[ns]').reshape(array.shape)
+    return array.astype('datetime64[ns]')
+
+
+@dataclass
+class TradeTable:
+    """Closed trades of N runs, sorted by run (trade order kept within a run)
+
+    ``entry_time`` and ``exit_time`` are datetime64[ns] and may be None
+    when durations are not needed.
+    """
+    run: np.ndarray
+    pnl: np.ndarray
+    pnl_pct: np.ndarray
+    entry_time: Optional[np.ndarray] = None
+    exit_time: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        self.run = np.asarray(self.run, dtype=np.int64)
+        order = np.argsort(self.run, kind='stable')
+        self.run = self.run[order]
+        self.pnl = np.asarray(self.pnl, dtype=np.float64)[order]
+        self.pnl_pct = np.asarray(self.pnl_pct, dtype=np.float64)[order]
+        if self.entry_time is not None:
+            self.entry_time = as_datetime64(self.entry_time)[order]
+        if self.exit_time is not None:
+            self.exit_time = as_datetime64(self.exit_time)[order]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], run: int = 0, pnl: str = 'pnl',
+                     pnl_pct: str = 'pnl_pct', entry_time: str = 'entry_time',
+                     exit_time: str = 'exit_time') -> 'TradeTable':
+        """
+        Build a table from trade dicts of one run
+
+        Args:
+            records: Trade dicts
+            run: Run index for every trade
+            pnl, pnl_pct, entry_time, exit_time: Field names in the dicts;
+                missing pnl_pct or time fields become NaN / None
+
+        Returns:
+            TradeTable
+        """
+        records = list(records)
+        first = records[0] if records else {}
+        times = {}
+        for name, key in (('entry_time', entry_time), ('exit_time', exit_time)):
+            times[name] = (np.array([_naive_utc(r[key]) for r in records], dtype='datetime64[ns]')
+                           if key in first else None)
+        return cls(
+            run=np.full(len(records), run, dtype=np.int64),
+            pnl=np.array([r[pnl] for r in records], dtype=np.float64),
+            pnl_pct=np.array([r.get(pnl_pct, np.nan) for r in records], dtype=np.float64),
+            **times
+        )
+
+    def __len__(self) -> int:
+        return len(self.run)
+
+    @property
+    def duration_days(self) -> np.ndarray:
+        """Holding time of each trade in days"""
+        return (self.exit_time - self.entry_time) / DAY
+
+
+def as_runs(equity: Any) -> np.ndarray:
+    """Equity as a float (N, T) array"""
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity[None, :] if equity.ndim == 1 else equity
+
+
+def run_lengths(equity: np.ndarray) -> np.ndarray:
+    """Valid bars per run (NaN padding excluded)"""
+    return np.count_nonzero(~np.isnan(equity), axis=1)
+
+
+def last_valid(values: np.ndarray) -> np.ndarray:
+    """Last non-NaN value of each row"""
+    lengths = run_lengths(values)
+    rows = np.arange(len(values))
+    out = np.full(len(values), np.nan)
+    has = lengths > 0
+    out[has] = values[rows[has], lengths[has] - 1]
+    return out
+
+
+def simple_returns(equity: np.ndarray) -> np.ndarray:
+    """Bar-to-bar returns, shape (N, T-1); NaN past each run's end"""
+    return equity[:, 1:] / equity[:, :-1] - 1
+
+
+def nan_count(values: np.ndarray) -> np.ndarray:
+    return np.count_nonzero(~np.isnan(values), axis=1)
+
+
+def nan_mean(values: np.ndarray) -> np.ndarray:
+    """Row means ignoring NaN (NaN for empty rows)"""
+    count = nan_count(values)
+    total = np.nansum(values, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+def nan_std(values: np.ndarray, ddof: int = 1) -> np.ndarray:
+    """Row standard deviations ignoring NaN (NaN when count <= ddof, like pandas)"""
+    count = nan_count(values)
+    deviations = values - nan_mean(values)[:, None]
+    squares = np.nansum(deviations * deviations, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > ddof, np.sqrt(squares / np.maximum(count - ddof, 1)), np.nan)
+
+
+def nan_skew(values: np.ndarray) -> np.ndarray:
+    """Bias-corrected row skewness, matching pandas Series.skew"""
+    count = nan_count(values).astype(np.float64)
+    d = values - nan_mean(values)[:, None]
+    m2 = np.nansum(d ** 2, axis=1) / np.maximum(count, 1)
+    m3 = np.nansum(d ** 3, axis=1) / np.maximum(count, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = np.sqrt(count * (count - 1)) / (count - 2) * m3 / m2 ** 1.5
+    result = np.where(m2 == 0, 0.0, result)
+    return np.where(count < 3, np.nan, result)
+
+
+def nan_kurtosis(values: np.ndarray) -> np.ndarray:
+    """Bias-corrected excess row kurtosis, matching pandas Series.kurtosis"""
+    count = nan_count(values).astype(np.float64)
+    d = values - nan_mean(values)[:, None]
+    m2 = np.nansum(d ** 2, axis=1)
+    m4 = np.nansum(d ** 4, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        adj = 3 * (count - 1) ** 2 / ((count - 2) * (count - 3))
+        numerator = count * (count + 1) * (count - 1) * m4
+        denominator = (count - 2) * (count - 3) * m2 ** 2
+        result = numerator / denominator - adj
+    result = np.where(denominator == 0, 0.0, result)
+    return np.where(count < 4, np.nan, result)
+
+
+def masked(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Values where mask holds, NaN elsewhere"""
+    return np.where(mask, values, np.nan)
+
+
+def running_peak(equity: np.ndarray) -> np.ndarray:
+    """Running maximum along each run (NaN padding keeps the last peak)"""
+    return np.fmax.accumulate(equity, axis=1)
+
+
+def drawdowns(equity: np.ndarray) -> np.ndarray:
+    """Fractional drawdown from the running peak (<= 0; NaN past each run's end)"""
+    peak = running_peak(equity)
+    return (equity - peak) / peak
+
+
+def tail_means(values: np.ndarray, lower: float = 0.1, upper: float = 0.9) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean of each row's values below its `lower` and above its `upper` rank
+
+    Matches slicing a sorted row at int(lower * n) and int(upper * n).
+
+    Returns:
+        Tuple of (bottom_mean, top_mean)
+    """
+    ordered = np.sort(values, axis=1)   # NaN sorts last
+    count = nan_count(values)
+    cumulative = np.concatenate([np.zeros((len(values), 1)), np.cumsum(np.nan_to_num(ordered), axis=1)], axis=1)
+    rows = np.arange(len(values))
+    low_end = (lower * count).astype(np.int64)
+    high_start = (upper * count).astype(np.int64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bottom = cumulative[rows, low_end] / low_end
+        top = (cumulative[rows, count] - cumulative[rows, high_start]) / (count - high_start)
+    return bottom, top
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling mean along each row (NaN until the window fills)"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] < window:
+        return out
+    cumulative = np.cumsum(np.concatenate([np.zeros((len(values), 1)), values], axis=1), axis=1)
+    out[:, window - 1:] = (cumulative[:, window:] - cumulative[:, :-window]) / window
+    return out
+
+
+@dataclass
+class Periods:
+    """Contiguous stretches of True in a (N, T) mask
+
+    ``end`` is the index just past each stretch; ``open`` marks stretches
+    still running at the last valid bar of their run.
+    """
+    run: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    open: np.ndarray
+
+    @property
+    def length(self) -> np.ndarray:
+        return self.end - self.start
+
+
+def find_periods(mask: np.ndarray, lengths: Optional[np.ndarray] = None) -> Periods:
+    """
+    Locate the stretches of True in each row
+
+    Args:
+        mask: Boolean (N, T) array
+        lengths: Valid bars per row (defaults to T)
+
+    Returns:
+        Periods in row-major order
+    """
+    n, t = mask.shape
+    if lengths is None:
+        lengths = np.full(n, t)
+    padded = np.zeros((n, t + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    steps = np.diff(padded, axis=1)
+    run, start = np.nonzero(steps == 1)
+    _, end = np.nonzero(steps == -1)
+    return Periods(run, start, end, end >= lengths[run])
+
+
+def group_count(run: np.ndarray, n_runs: int, where: Optional[np.ndarray] = None) -> np.ndarray:
+    weights = None if where is None else where.astype(np.float64)
+    return np.bincount(run, weights=weights, minlength=n_runs).astype(np.int64)
+
+
+def group_sum(run: np.ndarray, values: np.ndarray, n_runs: int) -> np.ndarray:
+    return np.bincount(run, weights=values, minlength=n_runs)
+
+
+def group_mean(run: np.ndarray, values: np.ndarray, n_runs: int, empty: float = np.nan) -> np.ndarray:
+    count = np.bincount(run, minlength=n_runs)
+    total = np.bincount(run, weights=values, minlength=n_runs)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / np.maximum(count, 1), empty)
+
+
+def group_max(run: np.ndarray, values: np.ndarray, n_runs: int, empty: float = np.nan) -> np.ndarray:
+    out = np.full(n_runs, np.nan)
+    np.fmax.at(out, run, values)
+    return np.where(np.bincount(run, minlength=n_runs) > 0, out, empty)
+
+
+def group_min(run: np.ndarray, values: np.ndarray, n_runs: int, empty: float = np.nan) -> np.ndarray:
+    out = np.full(n_runs, np.nan)
+    np.fmin.at(out, run, values)
+    return np.where(np.bincount(run, minlength=n_runs) > 0, out, empty)
+
+
+def group_std(run: np.ndarray, values: np.ndarray, n_runs: int, ddof: int = 1) -> np.ndarray:
+    """Per-run standard deviation (NaN when count <= ddof)"""
+    count = np.bincount(run, minlength=n_runs)
+    mean = group_mean(run, values, n_runs)
+    squares = np.bincount(run, weights=(values - mean[run]) ** 2, minlength=n_runs)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > ddof, np.sqrt(squares / np.maximum(count - ddof, 1)), np.nan)
+
+
+def max_streak(flags: np.ndarray, run: np.ndarray, n_runs: int) -> np.ndarray:
+    """Longest stretch of consecutive True flags within each run"""
+    flags = np.asarray(flags, dtype=bool)
+    out = np.zeros(n_runs, dtype=np.int64)
+    if not flags.any():
+        return out
+    new_run = np.ones(len(run), dtype=bool)
+    new_run[1:] = run[1:] != run[:-1]
+    previous = np.zeros(len(flags), dtype=bool)
+    previous[1:] = flags[:-1]
+    starts = flags & (new_run | ~previous)
+    labels = np.cumsum(starts) - 1
+    lengths = np.bincount(labels[flags])
+    np.maximum.at(out, run[starts], lengths)
+    return out
+
+
+def profit_factor(gross_profit: np.ndarray, gross_loss: np.ndarray,
+                  no_loss: float = np.inf, no_trades: float = np.inf) -> np.ndarray:
+    """Gross profit over gross loss
+
+    Args:
+        gross_profit: Sum of winning P&L (>= 0)
+        gross_loss: Absolute sum of losing P&L (>= 0)
+        no_loss: Value when there were wins but no losses
+        no_trades: Value when there were neither
+    """
+    # Arrays, not Python floats: scalar float division would raise on zero
+    gross_profit = np.asarray(gross_profit, dtype=float)
+    gross_loss = np.asarray(gross_loss, dtype=float)
+    has_loss = gross_loss > 0
+    ratio = np.divide(gross_profit, gross_loss, out=np.zeros(np.broadcast(gross_profit, gross_loss).shape),
+                      where=has_loss)
+    return np.where(has_loss, ratio, np.where(gross_profit > 0, no_loss, no_trades))
+
+
+def trade_stats(trades: TradeTable, n_runs: int, values: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Per-run statistics of closed trades
+
+    Args:
+        trades: Trade table
+        n_runs: Number of runs
+        values: Per-trade values to score (defaults to trades.pnl)
+
+    Returns:
+        Dictionary of (n_runs,) arrays: count, wins, losses, mean, avg_win,
+        avg_loss, best, worst, gross_profit, gross_loss, max_win_streak,
+        max_loss_streak
+    """
+    run = trades.run
+    values = trades.pnl if values is None else np.asarray(values, dtype=np.float64)
+    wins = values > 0
+    losses = values < 0
+    return {
+        'count': group_count(run, n_runs),
+        'wins': group_count(run, n_runs, wins),
+        'losses': group_count(run, n_runs, losses),
+        'mean': group_mean(run, values, n_runs),
+        'avg_win': group_mean(run[wins], values[wins], n_runs),
+        'avg_loss': group_mean(run[losses], values[losses], n_runs),
+        'best': group_max(run, values, n_runs),
+        'worst': group_min(run, values, n_runs),
+        'gross_profit': group_sum(run[wins], values[wins], n_runs),
+        'gross_loss': -group_sum(run[losses], values[losses], n_runs),
+        'max_win_streak': max_streak(wins, run, n_runs),
+        'max_loss_streak': max_streak(losses, run, n_runs),
+    }
+
+
+def monthly_returns(returns: np.ndarray, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compound returns into calendar months
+
+    Args:
+        returns: (N, T) returns, NaN past each run's end
+        timestamps: (T,) datetime64 of each return
+
+    Returns:
+        Tuple of ((N, M) monthly returns, (N, M) mask of months inside each run)
+    """
+    months = as_datetime64(timestamps).astype('datetime64[M]').astype(np.int64)
+    first = months[0]
+    bins = months - first
+    starts = np.flatnonzero(np.diff(bins, prepend=-1))
+    n_months = int(bins[-1]) + 1
+    growth = np.multiply.reduceat(np.where(np.isnan(returns), 1.0, 1.0 + returns), starts, axis=1)
+    compounded = np.zeros((len(returns), n_months))
+    compounded[:, bins[starts]] = growth - 1
+
+    # A run spans every month from its first to its last return
+    lengths = nan_count(returns)
+    last_month = np.where(lengths > 0, bins[np.maximum(lengths - 1, 0)], -1)
+    inside = np.arange(n_months)[None, :] <= last_month[:, None]
+    return compounded, inside
+
+
+def compute_kpis(equity: Any, timestamps: Optional[np.ndarray] = None,
+                 trades: Optional[TradeTable] = None, initial_capital: Optional[float] = None,
+                 benchmark: Optional[np.ndarray] = None, periods_per_year: int = 252,
+                 risk_free_rate: float = 0.02) -> Dict[str, np.ndarray]:
+    """
+    Compute the 29 standard KPIs for N runs in vectorized passes
+
+    Args:
+        equity: (N, T) or (T,) equity curves, NaN-padded at the end
+        timestamps: (T,) datetime64 of each bar (dates, calendar years and
+                    exposure are NaN without them)
+        trades: Closed trades of all runs (trade KPIs are 0 without them)
+        initial_capital: Capital the return is measured against (defaults
+                         to each run's first equity value)
+        benchmark: (T,) or (N, T) benchmark prices for buy & hold, alpha and
+                   beta (NaN without it)
+        periods_per_year: Bars per year, for annualizing
+        risk_free_rate: Annual risk-free rate
+
+    Returns:
+        Dictionary of KPI name -> (N,) array, in KPI_NAMES order. Percent
+        KPIs are in percent; drawdown durations are in bars and trade
+        durations in days. Win rate and profit factor come from trade P&L,
+        the other trade KPIs from trade pnl_pct.
+    """
+    equity = as_runs(equity)
+    n, t = equity.shape
+    rows = np.arange(n)
+    lengths = run_lengths(equity)
+    first = equity[:, 0]
+    final = last_valid(equity)
+    base = first if initial_capital is None else np.full(n, float(initial_capital))
+
+    returns = simple_returns(equity)
+    mean_return = nan_mean(returns)
+    volatility = nan_std(returns) * np.sqrt(periods_per_year)
+    downside = nan_std(masked(returns, returns < 0)) * np.sqrt(periods_per_year)
+    excess = mean_return * periods_per_year - risk_free_rate
+
+    if timestamps is not None:
+        timestamps = as_datetime64(timestamps)
+        start_date = np.full(n, timestamps[0])
+        end_date = timestamps[np.maximum(lengths - 1, 0)]
+        span_days = (end_date - start_date) / DAY
+        years = span_days / 365.25
+    else:
+        start_date = np.full(n, np.datetime64('NaT', 'ns'))
+        end_date = np.full(n, np.datetime64('NaT', 'ns'))
+        span_days = np.full(n, np.nan)
+        years = (lengths - 1) / periods_per_year
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cagr = np.where(years > 0, (final / base) ** (1 / years) - 1, 0.0)
+
+    dd = drawdowns(equity)
+    max_dd = -np.nanmin(np.where(np.isnan(dd), 0.0, dd), axis=1)
+    avg_dd = -nan_mean(masked(dd, dd < 0))
+    periods = find_periods(dd < 0, lengths)
+    max_dd_duration = group_max(periods.run, periods.length.astype(np.float64), n, empty=0.0)
+    avg_dd_duration = group_mean(periods.run, periods.length.astype(np.float64), n, empty=0.0)
+
+    if benchmark is not None:
+        prices = np.broadcast_to(as_runs(benchmark), equity.shape)
+        buy_hold = last_valid(np.where(np.isnan(equity), np.nan, prices)) / prices[:, 0] - 1
+        bench_returns = masked(simple_returns(prices), ~np.isnan(returns))
+        r_dev = returns - mean_return[:, None]
+        b_dev = bench_returns - nan_mean(bench_returns)[:, None]
+        count = nan_count(returns)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            beta = np.nansum(r_dev * b_dev, axis=1) / np.nansum(b_dev * b_dev, axis=1)
+            alpha = (mean_return - beta * nan_mean(bench_returns)) * periods_per_year
+        beta = np.where(count > 1, beta, np.nan)
+    else:
+        buy_hold, alpha, beta = (np.full(n, np.nan) for _ in range(3))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = np.where(volatility > 0, excess / volatility, 0.0)
+        sortino = np.where(downside > 0, excess / downside, 0.0)
+        calmar = np.where(max_dd > 0, cagr / max_dd, 0.0)
+
+    if trades is not None and len(trades):
+        pnl_stats = trade_stats(trades, n)
+        pct_stats = trade_stats(trades, n, trades.pnl_pct)
+        count = pnl_stats['count']
+        traded = count > 0
+        win_rate = np.where(traded, pnl_stats['wins'] / np.maximum(count, 1), 0.0)
+        pf = profit_factor(pnl_stats['gross_profit'], pnl_stats['gross_loss'], no_trades=0.0)
+        best = np.where(traded, pct_stats['best'], 0.0)
+        worst = np.where(traded, pct_stats['worst'], 0.0)
+        avg_trade = np.where(traded, pct_stats['mean'], 0.0)
+        expectancy = np.where(traded, win_rate * np.nan_to_num(pct_stats['avg_win'])
+                              + (1 - win_rate) * np.nan_to_num(pct_stats['avg_loss']), 0.0)
+        if trades.entry_time is not None and trades.exit_time is not None:
+            durations = trades.duration_days
+            max_duration = group_max(trades.run, durations, n, empty=0.0)
+            avg_duration = group_mean(trades.run, durations, n, empty=0.0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                exposure = np.minimum(group_sum(trades.run, durations, n) / span_days, 1.0) * 100
+        else:
+            max_duration, avg_duration, exposure = (np.full(n, np.nan) for _ in range(3))
+    else:
+        count = np.zeros(n, dtype=np.int64)
+        # One array per KPI, so the returned columns never share memory
+        win_rate, best, worst, avg_trade, expectancy, pf = (np.zeros(n) for _ in range(6))
+        max_duration, avg_duration, exposure = (np.zeros(n) for _ in range(3))
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'duration_days': span_days,
+        'exposure_time_pct': exposure,
+        'equity_final': final,
+        'equity_peak': np.nanmax(equity, axis=1),
+        'return_pct': (final / base - 1) * 100,
+        'buy_hold_return_pct': buy_hold * 100,
+        'return_ann_pct': mean_return * periods_per_year * 100,
+        'volatility_ann_pct': volatility * 100,
+        'cagr_pct': cagr * 100,
+        'sharpe_ratio': sharpe,
+        'sortino_ratio': sortino,
+        'calmar_ratio': calmar,
+        'alpha_pct': alpha * 100,
+        'beta': beta,
+        'max_drawdown_pct': max_dd * 100,
+        'avg_drawdown_pct': np.nan_to_num(avg_dd) * 100,
+        'max_drawdown_duration': max_dd_duration,
+        'avg_drawdown_duration': avg_dd_duration,
+        'total_trades': count,
+        'win_rate_pct': win_rate * 100,
+        'best_trade_pct': best,
+        'worst_trade_pct': worst,
+        'avg_trade_pct': avg_trade,
+        'max_trade_duration': max_duration,
+        'avg_trade_duration': avg_duration,
+        'profit_factor': pf,
+        'expectancy_pct': expectancy,
+    }
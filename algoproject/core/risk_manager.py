@@ -74,7 +74,8 @@ class RiskManager:
         
     def validate_signal(self, signal: Signal, portfolio_value: float, 
                        current_positions: Dict[str, Position],
-                       market_data: Dict[str, MarketData]) -> Tuple[bool, str, float]:
+                       market_data: Dict[str, MarketData],
+                       current_exposure: Optional[float] = None) -> Tuple[bool, str, float]:
         """Validate a trading signal against risk parameters
         
         Args:
@@ -82,6 +83,9 @@ class RiskManager:
             portfolio_value: Current portfolio value
             current_positions: Current positions
             market_data: Current market data
+            current_exposure: Running total exposure, e.g. from
+                              Portfolio.get_total_exposure() (summed over the
+                              positions when not given)
             
         Returns:
             Tuple of (is_valid, reason, adjusted_quantity)
@@ -113,8 +117,9 @@ class RiskManager:
             # Check portfolio risk
             if signal.action.lower() == 'buy':
                 # Calculate total exposure after this trade
-                total_exposure = sum(pos.quantity * pos.market_price for pos in current_positions.values())
-                total_exposure += position_value
+                if current_exposure is None:
+                    current_exposure = sum(pos.quantity * pos.market_price for pos in current_positions.values())
+                total_exposure = current_exposure + position_value
                 
                 max_exposure = portfolio_value * 0.95  # Max 95% exposure
                 if total_exposure > max_exposure:
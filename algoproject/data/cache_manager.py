@@ -3,60 +3,209 @@ Cache Manager
 =============
 
 Manages data caching for AlgoProject.
+
+Two tiers are provided:
+
+- A general-purpose key/value cache with TTLs, bounded by entry count (LRU).
+- A tiered OHLCV cache: a byte-bounded in-memory LRU in front of an on-disk
+  columnar store (one ``.npy`` file per column) per
+  ``(provider, symbol, timeframe)``. Requests for a date range only fetch the
+  parts of the range that are not already covered.
 """
 
 import pandas as pd
-import pickle
+import numpy as np
 import hashlib
+import json
 import logging
-from typing import Dict, Any, Optional
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from datetime import datetime, timedelta
 import os
 
 
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# (provider, symbol, timeframe)
+SeriesKey = Tuple[str, str, str]
+
+# Inclusive [start_ns, end_ns] range of timestamps known to be fully cached
+Interval = Tuple[int, int]
+
+
+def timeframe_to_timedelta(timeframe: str) -> timedelta:
+    """Convert a timeframe string (e.g. '5m', '1h', '1d') to a timedelta
+
+    Args:
+        timeframe: Timeframe string
+
+    Returns:
+        Bar duration (zero if the timeframe is not recognised)
+    """
+    match = re.fullmatch(r'(\d+)([smhdwM])', timeframe or '')
+    if not match:
+        return timedelta(0)
+
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == 's':
+        return timedelta(seconds=amount)
+    if unit == 'm':
+        return timedelta(minutes=amount)
+    if unit == 'h':
+        return timedelta(hours=amount)
+    if unit == 'd':
+        return timedelta(days=amount)
+    if unit == 'w':
+        return timedelta(weeks=amount)
+    return timedelta(days=30 * amount)
+
+
+def _to_ns(value: Any) -> int:
+    """Convert a datetime-like value to UTC nanoseconds"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return int(ts.value)
+
+
+def _subtract_intervals(start: int, end: int, covered: List[Interval]) -> List[Interval]:
+    """Get the parts of [start, end] not covered by sorted, merged intervals"""
+    gaps = []
+    cursor = start
+    for cov_start, cov_end in covered:
+        if cov_end < cursor:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, cov_start - 1))
+        cursor = max(cursor, cov_end + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Sort and merge overlapping or adjacent intervals"""
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+@dataclass
+class _SeriesEntry:
+    """Cached OHLCV series in columnar form"""
+    timestamps: np.ndarray                    # int64 UTC nanoseconds, sorted, unique
+    values: np.ndarray                        # float64 (n_bars, 5)
+    intervals: List[Interval] = field(default_factory=list)
+    tz: Optional[str] = None
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.timestamps.nbytes + self.values.nbytes)
+
+    def merge(self, timestamps: np.ndarray, values: np.ndarray) -> '_SeriesEntry':
+        """Get a new series with bars merged in (new bars win on duplicate timestamps)
+
+        The entry itself is left unchanged, so the memory tier can still
+        subtract the size it accounted for it.
+        """
+        all_ts = np.concatenate([timestamps, self.timestamps])
+        all_values = np.concatenate([values, self.values])
+        merged_ts, first = np.unique(all_ts, return_index=True)
+        return _SeriesEntry(merged_ts, all_values[first], list(self.intervals), self.tz)
+
+    def slice(self, start: int, end: int) -> pd.DataFrame:
+        """Get bars in [start, end] as a DataFrame"""
+        lo = np.searchsorted(self.timestamps, start, side='left')
+        hi = np.searchsorted(self.timestamps, end, side='right')
+        index = pd.DatetimeIndex(self.timestamps[lo:hi].view('datetime64[ns]'))
+        if self.tz:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+        return pd.DataFrame(self.values[lo:hi].copy(), index=index, columns=list(OHLCV_COLUMNS))
+
+
 class CacheManager:
     """Manages data caching"""
-    
-    def __init__(self, cache_dir: str = "cache", ttl: int = 3600):
+
+    def __init__(self, cache_dir: str = "cache", ttl: int = 3600, max_items: int = 1000,
+                 max_memory_bytes: int = 256 * 1024 * 1024,
+                 max_disk_bytes: int = 2 * 1024 * 1024 * 1024):
         """Initialize cache manager
-        
+
         Args:
             cache_dir: Directory to store cache files
             ttl: Default time-to-live in seconds
+            max_items: Maximum entries in the key/value cache
+            max_memory_bytes: Byte budget for in-memory OHLCV series
+            max_disk_bytes: Byte budget for on-disk OHLCV series
         """
         self.cache_dir = cache_dir
         self.default_ttl = ttl
+        self.max_items = max_items
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
         self.logger = logging.getLogger(__name__)
-        self.memory_cache: Dict[str, Dict[str, Any]] = {}
-        self._ensure_cache_dir()
-    
-    def _ensure_cache_dir(self):
-        """Ensure cache directory exists"""
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
-    
+        self.memory_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+
+        # OHLCV tiers
+        self.ohlcv_dir = os.path.join(cache_dir, "ohlcv")
+        self._series: 'OrderedDict[SeriesKey, _SeriesEntry]' = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_index: Dict[SeriesKey, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._series_locks: Dict[SeriesKey, threading.Lock] = {}
+
+        self.stats: Dict[str, int] = {
+            'hits': 0,               # Range fully served from cache
+            'partial_hits': 0,       # Range partly served, gaps fetched
+            'misses': 0,             # Nothing cached for the range
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'fetches': 0,            # Provider calls for missing ranges
+            'bars_fetched': 0,
+            'bytes_fetched': 0,
+            'bytes_read': 0,         # Bytes loaded from disk
+            'bytes_written': 0,      # Bytes written to disk
+            'memory_evictions': 0,
+            'disk_evictions': 0
+        }
+
+        self._scan_disk()
+
     def get(self, key: str) -> Optional[Any]:
         """Get item from cache
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             Cached item or None if not found or expired
         """
-        # Check memory cache first
-        if key in self.memory_cache:
-            cache_item = self.memory_cache[key]
-            if cache_item['expires_at'] > datetime.now():
-                return cache_item['data']
-            else:
-                del self.memory_cache[key]
-        
+        with self._lock:
+            if key in self.memory_cache:
+                cache_item = self.memory_cache[key]
+                if cache_item['expires_at'] > datetime.now():
+                    self.memory_cache.move_to_end(key)
+                    return cache_item['data']
+                else:
+                    del self.memory_cache[key]
+
         return None
-    
+
     def set(self, key: str, value: Any, ttl: Optional[int] = None):
         """Set item in cache
-        
+
         Args:
             key: Cache key
             value: Value to cache
@@ -64,11 +213,351 @@ class CacheManager:
         """
         ttl = ttl or self.default_ttl
         expires_at = datetime.now() + timedelta(seconds=ttl)
-        
+
         cache_item = {
             'data': value,
             'expires_at': expires_at,
             'created_at': datetime.now()
         }
-        
-        self.memory_cache[key] = cache_item
\ No newline at end of file
+
+        with self._lock:
+            self.memory_cache[key] = cache_item
+            self.memory_cache.move_to_end(key)
+            while len(self.memory_cache) > self.max_items:
+                self.memory_cache.popitem(last=False)
+
+    def get_or_fetch_ohlcv(self, provider: str, symbol: str, timeframe: str,
+                           start_date: datetime, end_date: datetime,
+                           fetch: Callable[[datetime, datetime], pd.DataFrame],
+                           limit: Optional[int] = None) -> pd.DataFrame:
+        """Get OHLCV bars for a range, fetching only what is not cached
+
+        Args:
+            provider: Provider name
+            symbol: Trading symbol
+            timeframe: Timeframe (e.g., '1m', '1h', '1d')
+            start_date: Range start (inclusive)
+            end_date: Range end (inclusive)
+            fetch: Callable(start, end) returning an OHLCV DataFrame from the provider
+            limit: Provider candle limit; a response this long is treated as truncated
+
+        Returns:
+            DataFrame with OHLCV data for the range (at most ``limit`` latest bars)
+        """
+        key = (provider, symbol, timeframe)
+        start, end = _to_ns(start_date), _to_ns(end_date)
+
+        with self._series_lock(key):
+            entry = self._get_entry(key)
+            covered = entry.intervals if entry is not None else []
+            gaps = _subtract_intervals(start, end, covered)
+
+            if not gaps:
+                self.stats['hits'] += 1
+            elif len(gaps) == 1 and gaps[0] == (start, end):
+                self.stats['misses'] += 1
+            else:
+                self.stats['partial_hits'] += 1
+
+            if gaps:
+                entry = self._fill_gaps(key, entry, gaps, timeframe, fetch, limit)
+
+            if entry is None:
+                return pd.DataFrame()
+
+            df = entry.slice(start, end)
+
+        if limit is not None and len(df) > limit:
+            df = df.iloc[-limit:]
+        return df
+
+    def missing_ohlcv_ranges(self, provider: str, symbol: str, timeframe: str,
+                             start_date: datetime, end_date: datetime) -> List[Interval]:
+        """Get the parts of a range not yet covered by the cached series
+
+        Args:
+            provider: Provider name
+            symbol: Trading symbol
+            timeframe: Timeframe
+            start_date: Range start (inclusive)
+            end_date: Range end (inclusive)
+
+        Returns:
+            Sorted list of missing [start_ns, end_ns] intervals
+        """
+        key = (provider, symbol, timeframe)
+        with self._series_lock(key):
+            entry = self._get_entry(key)
+        covered = entry.intervals if entry is not None else []
+        return _subtract_intervals(_to_ns(start_date), _to_ns(end_date), covered)
+
+    def merge_ohlcv(self, provider: str, symbol: str, timeframe: str, df: pd.DataFrame,
+                    covered_start: datetime, covered_end: datetime):
+        """Write bars into the store and mark a range as fully fetched
+
+        The series is written through to disk, so an interrupted download
+        keeps every merged range.
+
+        Args:
+            provider: Provider name
+            symbol: Trading symbol
+            timeframe: Timeframe
+            df: OHLCV bars (duplicates of cached bars replace them)
+            covered_start: Start of the range the bars fully cover (inclusive)
+            covered_end: End of the range the bars fully cover (inclusive)
+        """
+        key = (provider, symbol, timeframe)
+        settled = _to_ns(datetime.utcnow() - timeframe_to_timedelta(timeframe))
+        cov_start, cov_end = _to_ns(covered_start), min(_to_ns(covered_end), settled)
+
+        with self._series_lock(key):
+            entry = self._get_entry(key)
+            if df is not None and not df.empty:
+                entry, _ = self._merge_bars(entry, df)
+            if entry is None:
+                return
+            if cov_start <= cov_end:
+                entry.intervals = _merge_intervals(entry.intervals + [(cov_start, cov_end)])
+            self._put_in_memory(key, entry)
+            self._write_to_disk(key, entry)
+
+    def read_ohlcv(self, provider: str, symbol: str, timeframe: str,
+                   start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """Get cached bars for a range without fetching
+
+        Args:
+            provider: Provider name
+            symbol: Trading symbol
+            timeframe: Timeframe
+            start_date: Range start (inclusive)
+            end_date: Range end (inclusive)
+
+        Returns:
+            DataFrame with the cached OHLCV bars in the range (may be empty)
+        """
+        key = (provider, symbol, timeframe)
+        with self._series_lock(key):
+            entry = self._get_entry(key)
+            if entry is None:
+                return pd.DataFrame()
+            return entry.slice(_to_ns(start_date), _to_ns(end_date))
+
+    def invalidate_ohlcv(self, provider: str, symbol: str, timeframe: str):
+        """Drop a cached OHLCV series from both tiers
+
+        Args:
+            provider: Provider name
+            symbol: Trading symbol
+            timeframe: Timeframe
+        """
+        key = (provider, symbol, timeframe)
+        with self._lock:
+            entry = self._series.pop(key, None)
+            if entry is not None:
+                self._memory_bytes -= entry.nbytes
+            self._remove_from_disk(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache metrics
+
+        Returns:
+            Dictionary with hit/miss counters and byte usage per tier
+        """
+        with self._lock:
+            requests = self.stats['hits'] + self.stats['partial_hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': self.stats['hits'] / requests if requests else 0.0,
+                'memory_series': len(self._series),
+                'memory_bytes': self._memory_bytes,
+                'disk_series': len(self._disk_index),
+                'disk_bytes': sum(meta['nbytes'] for meta in self._disk_index.values()),
+                'kv_entries': len(self.memory_cache)
+            }
+
+    def _series_lock(self, key: SeriesKey) -> threading.Lock:
+        """Get the lock serialising fetches for one series"""
+        with self._lock:
+            if key not in self._series_locks:
+                self._series_locks[key] = threading.Lock()
+            return self._series_locks[key]
+
+    def _get_entry(self, key: SeriesKey) -> Optional[_SeriesEntry]:
+        """Get a series from memory, falling back to disk"""
+        with self._lock:
+            entry = self._series.get(key)
+            if entry is not None:
+                self._series.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return entry
+
+        entry = self._read_from_disk(key)
+        if entry is not None:
+            self.stats['disk_hits'] += 1
+            self._put_in_memory(key, entry)
+        return entry
+
+    def _fill_gaps(self, key: SeriesKey, entry: Optional[_SeriesEntry], gaps: List[Interval],
+                   timeframe: str, fetch: Callable[[datetime, datetime], pd.DataFrame],
+                   limit: Optional[int]) -> Optional[_SeriesEntry]:
+        """Fetch missing ranges from the provider and merge them into the series"""
+        # Never mark the still-forming bar as covered
+        settled = _to_ns(datetime.utcnow() - timeframe_to_timedelta(timeframe))
+        changed = False
+
+        for gap_start, gap_end in gaps:
+            df = fetch(pd.Timestamp(gap_start), pd.Timestamp(gap_end))
+            self.stats['fetches'] += 1
+
+            if df is None or df.empty:
+                # Empty responses are not cached: they may be transient errors
+                continue
+
+            entry, timestamps = self._merge_bars(entry, df)
+
+            # A truncated response only covers the span it actually returned
+            cov_start, cov_end = gap_start, gap_end
+            if limit is not None and len(df) >= limit:
+                cov_start = max(gap_start, int(timestamps.min()))
+                cov_end = min(gap_end, int(timestamps.max()))
+            cov_end = min(cov_end, settled)
+            if cov_start <= cov_end:
+                entry.intervals = _merge_intervals(entry.intervals + [(cov_start, cov_end)])
+            changed = True
+
+        if changed:
+            self._put_in_memory(key, entry)
+            self._write_to_disk(key, entry)
+
+        return entry
+
+    def _merge_bars(self, entry: Optional[_SeriesEntry],
+                    df: pd.DataFrame) -> Tuple[_SeriesEntry, np.ndarray]:
+        """Merge a provider frame into a series, creating it if needed"""
+        index = pd.DatetimeIndex(df.index)
+        tz = str(index.tz) if index.tz is not None else None
+        timestamps = index.values.astype('datetime64[ns]').view(np.int64)
+        values = df[list(OHLCV_COLUMNS)].to_numpy(dtype=np.float64)
+
+        self.stats['bars_fetched'] += len(df)
+        self.stats['bytes_fetched'] += int(timestamps.nbytes + values.nbytes)
+
+        if entry is None:
+            entry = _SeriesEntry(np.empty(0, dtype=np.int64),
+                                 np.empty((0, len(OHLCV_COLUMNS)), dtype=np.float64),
+                                 tz=tz)
+        return entry.merge(timestamps, values), timestamps
+
+    def _put_in_memory(self, key: SeriesKey, entry: _SeriesEntry):
+        """Insert or refresh a series in the memory LRU and evict by bytes"""
+        with self._lock:
+            previous = self._series.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous.nbytes
+            self._series[key] = entry
+            self._memory_bytes += entry.nbytes
+
+            while self._memory_bytes > self.max_memory_bytes and len(self._series) > 1:
+                _, evicted = self._series.popitem(last=False)
+                self._memory_bytes -= evicted.nbytes
+                self.stats['memory_evictions'] += 1
+
+    def _series_dir(self, key: SeriesKey) -> str:
+        """Get the on-disk directory for a series"""
+        provider, symbol, timeframe = key
+        digest = hashlib.sha1("|".join(key).encode()).hexdigest()[:10]
+        safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+        safe_provider = re.sub(r'[^A-Za-z0-9_.-]', '_', provider)
+        safe_timeframe = re.sub(r'[^A-Za-z0-9_.-]', '_', timeframe)
+        return os.path.join(self.ohlcv_dir, safe_provider, safe_timeframe, f"{safe_symbol}-{digest}")
+
+    def _scan_disk(self):
+        """Index series already present on disk"""
+        if not os.path.isdir(self.ohlcv_dir):
+            return
+
+        for root, _, files in os.walk(self.ohlcv_dir):
+            if 'meta.json' not in files:
+                continue
+            try:
+                with open(os.path.join(root, 'meta.json')) as f:
+                    meta = json.load(f)
+                key = (meta['provider'], meta['symbol'], meta['timeframe'])
+                self._disk_index[key] = {'nbytes': meta['nbytes'], 'last_access': meta['last_access']}
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable cache entry {root}: {e}")
+
+    def _read_from_disk(self, key: SeriesKey) -> Optional[_SeriesEntry]:
+        """Load a series from its column files"""
+        with self._lock:
+            if key not in self._disk_index:
+                return None
+            self._disk_index[key]['last_access'] = datetime.now().timestamp()
+
+        path = self._series_dir(key)
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+            timestamps = np.load(os.path.join(path, 'timestamp.npy'))
+            values = np.column_stack([np.load(os.path.join(path, f"{column}.npy"))
+                                      for column in OHLCV_COLUMNS])
+        except Exception as e:
+            self.logger.warning(f"Dropping corrupt cache entry for {key}: {e}")
+            self._remove_from_disk(key)
+            return None
+
+        entry = _SeriesEntry(timestamps, values,
+                             intervals=[tuple(interval) for interval in meta['intervals']],
+                             tz=meta.get('tz'))
+        self.stats['bytes_read'] += entry.nbytes
+        return entry
+
+    def _write_to_disk(self, key: SeriesKey, entry: _SeriesEntry):
+        """Persist a series as one .npy file per column and evict by bytes"""
+        path = self._series_dir(key)
+        try:
+            os.makedirs(path, exist_ok=True)
+            np.save(os.path.join(path, 'timestamp.npy'), entry.timestamps)
+            for i, column in enumerate(OHLCV_COLUMNS):
+                np.save(os.path.join(path, f"{column}.npy"), np.ascontiguousarray(entry.values[:, i]))
+
+            meta = {
+                'provider': key[0],
+                'symbol': key[1],
+                'timeframe': key[2],
+                'tz': entry.tz,
+                'intervals': [list(interval) for interval in entry.intervals],
+                'nbytes': entry.nbytes,
+                'last_access': datetime.now().timestamp()
+            }
+            with open(os.path.join(path, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+        except Exception as e:
+            self.logger.error(f"Error writing cache entry for {key}: {e}")
+            return
+
+        with self._lock:
+            self._disk_index[key] = {'nbytes': entry.nbytes, 'last_access': meta['last_access']}
+            self.stats['bytes_written'] += entry.nbytes
+            self._evict_disk(keep=key)
+
+    def _evict_disk(self, keep: SeriesKey):
+        """Remove least recently used series until the disk budget is met"""
+        total = sum(meta['nbytes'] for meta in self._disk_index.values())
+        if total <= self.max_disk_bytes:
+            return
+
+        by_age = sorted(self._disk_index.items(), key=lambda item: item[1]['last_access'])
+        for key, meta in by_age:
+            if total <= self.max_disk_bytes:
+                break
+            if key == keep:
+                continue
+            total -= meta['nbytes']
+            self._remove_from_disk(key)
+            self.stats['disk_evictions'] += 1
+
+    def _remove_from_disk(self, key: SeriesKey):
+        """Delete a series directory"""
+        self._disk_index.pop(key, None)
+        shutil.rmtree(self._series_dir(key), ignore_errors=True)
@@ -13,16 +13,49 @@ from datetime import datetime
 from ..core.interfaces import MarketData
 from ..core.config_manager import ConfigManager
 from .data_provider import DataProvider
+from .cache_manager import CacheManager
 
 
 class DataLoader:
     """Unified data loading interface"""
     
-    def __init__(self, config_manager: ConfigManager):
+    def __init__(self, config_manager: ConfigManager, cache_manager: Optional[CacheManager] = None):
+        """Initialize data loader
+        
+        Args:
+            config_manager: Configuration manager
+            cache_manager: OHLCV cache (optional, built from app_config 'cache' settings if None)
+        """
         self.config_manager = config_manager
         self.logger = logging.getLogger(__name__)
         self.providers: Dict[str, DataProvider] = {}
         self.default_provider = None
+        self.cache_manager = cache_manager or self._create_cache_manager()
+    
+    def _create_cache_manager(self) -> Optional[CacheManager]:
+        """Create the OHLCV cache from configuration
+        
+        Returns:
+            CacheManager if 'ohlcv_enabled' is set in the app_config cache section, else None
+        """
+        if self.config_manager is None:
+            return None
+        
+        try:
+            settings = self.config_manager.get_setting("app_config", "cache", {}) or {}
+            if not settings.get("ohlcv_enabled", False):
+                return None
+            
+            return CacheManager(
+                cache_dir=settings.get("dir", "data/cache"),
+                ttl=settings.get("ttl", 3600),
+                max_items=settings.get("max_size", 1000),
+                max_memory_bytes=int(settings.get("max_memory_mb", 256) * 1024 * 1024),
+                max_disk_bytes=int(settings.get("max_disk_mb", 2048) * 1024 * 1024)
+            )
+        except Exception as e:
+            self.logger.error(f"Error creating OHLCV cache: {e}")
+            return None
     
     def register_provider(self, name: str, provider: DataProvider, is_default: bool = False):
         """Register a data provider
@@ -59,14 +92,46 @@ class DataLoader:
         if provider_name not in self.providers:
             raise ValueError(f"Provider not found: {provider_name}")
         
+        data_provider = self.providers[provider_name]
+        
         try:
-            return self.providers[provider_name].get_historical_data(
+            # Ranged requests go through the cache, which only fetches missing bars
+            if self.cache_manager is not None and start_date is not None and end_date is not None:
+                return self.cache_manager.get_or_fetch_ohlcv(
+                    provider_name, symbol, timeframe, start_date, end_date,
+                    fetch=lambda start, end: data_provider.get_historical_data(
+                        symbol, timeframe, start, end, limit
+                    ),
+                    limit=limit
+                )
+            
+            return data_provider.get_historical_data(
                 symbol, timeframe, start_date, end_date, limit
             )
         except Exception as e:
             self.logger.error(f"Error getting historical data for {symbol}: {e}")
             return pd.DataFrame()
-    
+
+    def get_live_data(self, symbol: str, provider: str = None) -> Optional[MarketData]:
+        """Get the latest market data for a symbol
+
+        Args:
+            symbol: Trading symbol
+            provider: Provider name (optional, uses default if None)
+
+        Returns:
+            MarketData object, or None if it could not be fetched
+        """
+        provider_name = provider or self.default_provider
+        if provider_name not in self.providers:
+            raise ValueError(f"Provider not found: {provider_name}")
+
+        try:
+            return self.providers[provider_name].get_live_data(symbol)
+        except Exception as e:
+            self.logger.error(f"Error getting live data for {symbol}: {e}")
+            return None
+
     def get_available_symbols(self, asset_class: str = None, provider: str = None) -> List[str]:
         """Get available trading symbols
         
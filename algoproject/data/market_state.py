@@ -0,0 +1,228 @@
+"""
+Market State Store
+==================
+
+Rolling OHLCV windows for live scanners.
+
+Scanners that re-run a strategy every few seconds only need the candles
+that changed since the previous cycle. ``MarketStateStore`` keeps a
+fixed-capacity window per symbol, asks the fetch callable for candles from
+the last one it holds onwards, and merges them in place: the still-forming
+candle is replaced, newer candles are appended and the oldest fall off.
+Strategies read the window as contiguous NumPy arrays without rebuilding a
+DataFrame.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .cache_manager import OHLCV_COLUMNS, timeframe_to_timedelta
+
+
+# fetch(symbol, since, limit) -> OHLCV DataFrame; since is None on the first fetch
+FetchFunction = Callable[[str, Optional[pd.Timestamp], int], Optional[pd.DataFrame]]
+
+
+def _frame_arrays(df: pd.DataFrame):
+    """Get int64 ns timestamps and a (n, 5) OHLCV array from a provider frame"""
+    if 'timestamp' in df.columns:
+        times = pd.DatetimeIndex(pd.to_datetime(df['timestamp']))
+    else:
+        times = pd.DatetimeIndex(df.index)
+    if times.tz is not None:
+        times = times.tz_convert('UTC').tz_localize(None)
+    timestamps = times.values.astype('datetime64[ns]').view(np.int64)
+    values = df[list(OHLCV_COLUMNS)].to_numpy(dtype=np.float64)
+
+    order = np.argsort(timestamps, kind='stable')
+    return timestamps[order], values[order]
+
+
+class SymbolWindow:
+    """Fixed-capacity OHLCV window for one symbol
+
+    Bars live in a buffer twice the capacity so the window is always one
+    contiguous slice; when the buffer fills, the window is copied back to
+    the front (amortised O(1) per bar).
+    """
+
+    def __init__(self, symbol: str, capacity: int, clock: Callable[[], float] = time.monotonic):
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.symbol = symbol
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.zeros((2 * capacity, len(OHLCV_COLUMNS)), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+        self._clock = clock
+        self.updated_at: Optional[float] = None  # clock time of the last merge
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        if not len(self):
+            return None
+        return pd.Timestamp(int(self._timestamps[self._end - 1]))
+
+    def merge(self, timestamps: np.ndarray, values: np.ndarray) -> int:
+        """Merge sorted bars into the window
+
+        Bars older than the newest held bar are ignored, a bar with the same
+        timestamp replaces it and newer bars are appended.
+
+        Returns:
+            Number of bars appended
+        """
+        appended = 0
+        last = self._timestamps[self._end - 1] if len(self) else None
+
+        for ts, row in zip(timestamps.tolist(), values):
+            if last is not None and ts < last:
+                continue
+            if last is not None and ts == last:
+                self._values[self._end - 1] = row
+                continue
+            if self._end == len(self._timestamps):
+                # Copy the newest capacity - 1 bars back to the front
+                keep = self.capacity - 1
+                self._timestamps[:keep] = self._timestamps[self._end - keep:self._end]
+                self._values[:keep] = self._values[self._end - keep:self._end]
+                self._start, self._end = 0, keep
+            self._timestamps[self._end] = ts
+            self._values[self._end] = row
+            self._end += 1
+            self._start = max(self._start, self._end - self.capacity)
+            last = ts
+            appended += 1
+
+        self.updated_at = self._clock()
+        return appended
+
+    def reset(self):
+        """Drop all bars"""
+        self._start = self._end = 0
+        self.updated_at = None
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Contiguous views of the window ('timestamp' plus OHLCV columns)"""
+        window = slice(self._start, self._end)
+        columns = {'timestamp': self._timestamps[window]}
+        for i, column in enumerate(OHLCV_COLUMNS):
+            columns[column] = self._values[window, i]
+        return columns
+
+    def to_frame(self) -> pd.DataFrame:
+        """Copy the window into an OHLCV DataFrame indexed by timestamp"""
+        index = pd.DatetimeIndex(self._timestamps[self._start:self._end].view('datetime64[ns]'),
+                                 name='timestamp')
+        return pd.DataFrame(self._values[self._start:self._end].copy(), index=index,
+                            columns=list(OHLCV_COLUMNS))
+
+
+class MarketStateStore:
+    """Per-symbol rolling windows refreshed with incremental fetches"""
+
+    def __init__(self, fetch: FetchFunction, timeframe: str, capacity: int = 100,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the store
+
+        Args:
+            fetch: Callable(symbol, since, limit) returning an OHLCV DataFrame.
+                   ``since`` is the newest held bar (None on the first fetch) and
+                   ``limit`` the number of bars that can have changed since then.
+            timeframe: Bar timeframe (e.g. '5m')
+            capacity: Bars kept per symbol
+            clock: Seconds clock used to estimate how many bars have opened
+        """
+        bar_seconds = timeframe_to_timedelta(timeframe).total_seconds()
+        if bar_seconds <= 0:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+        self.fetch = fetch
+        self.timeframe = timeframe
+        self.capacity = capacity
+        self.bar_seconds = bar_seconds
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self.windows: Dict[str, SymbolWindow] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            'fetches': 0,          # Fetch calls made
+            'full_fetches': 0,     # Fetches of a whole window (first load or gap)
+            'bars_fetched': 0,
+            'bytes_fetched': 0,
+            'bars_appended': 0
+        }
+
+    def _window(self, symbol: str) -> SymbolWindow:
+        with self._lock:
+            if symbol not in self.windows:
+                self.windows[symbol] = SymbolWindow(symbol, self.capacity, self.clock)
+            return self.windows[symbol]
+
+    def _bars_since_update(self, window: SymbolWindow) -> int:
+        """Bars that can have opened since the last merge, the held bar and one spare"""
+        elapsed = self.clock() - window.updated_at
+        return min(self.capacity, math.ceil(elapsed / self.bar_seconds) + 2)
+
+    def update(self, symbol: str) -> Optional[SymbolWindow]:
+        """
+        Bring a symbol's window up to date
+
+        Only candles from the newest held bar onwards are requested. If the
+        response does not reach back to that bar (bars were missed), the
+        window is reloaded in full.
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            The symbol's window, or None if nothing could be fetched
+        """
+        window = self._window(symbol)
+
+        if len(window):
+            df = self._fetch(symbol, window.last_timestamp, self._bars_since_update(window))
+            if df is None or df.empty:
+                return window
+            timestamps, values = _frame_arrays(df)
+            if timestamps[0] <= window.last_timestamp.value:
+                self.stats['bars_appended'] += window.merge(timestamps, values)
+                return window
+            self.logger.debug(f"Gap in {symbol} updates, reloading the window")
+
+        df = self._fetch(symbol, None, self.capacity)
+        self.stats['full_fetches'] += 1
+        if df is None or df.empty:
+            return window if len(window) else None
+        timestamps, values = _frame_arrays(df)
+        window.reset()
+        self.stats['bars_appended'] += window.merge(timestamps, values)
+        return window
+
+    def _fetch(self, symbol: str, since: Optional[pd.Timestamp], limit: int) -> Optional[pd.DataFrame]:
+        df = self.fetch(symbol, since, limit)
+        self.stats['fetches'] += 1
+        if df is not None:
+            self.stats['bars_fetched'] += len(df)
+            self.stats['bytes_fetched'] += int(df.memory_usage(deep=True).sum())
+        return df
+
+    def get(self, symbol: str) -> Optional[SymbolWindow]:
+        """Get a symbol's window without fetching"""
+        return self.windows.get(symbol)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fetch counters and the number of tracked symbols"""
+        return {**self.stats, 'symbols': len(self.windows)}
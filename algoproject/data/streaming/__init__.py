@@ -5,8 +5,15 @@ Real-time Data Streaming
 Real-time data streaming components for AlgoProject.
 """
 
+from .bar_aggregator import Bar, BarAggregator, BarSpec
 from .data_stream import DataStream
+from .dispatcher import OverflowPolicy, StreamDispatcher, SubscriberQueue
+from .recorder import ReplayStream, TickRecorder
 from .stream_manager import StreamManager
+from .tick_ingest import Tick, TickIngestor, TickRingBuffer
 from .websocket_client import WebSocketClient
 
-__all__ = ['DataStream', 'StreamManager', 'WebSocketClient']
\ No newline at end of file
+__all__ = [
+    'Bar', 'BarAggregator', 'BarSpec', 'DataStream', 'OverflowPolicy', 'ReplayStream', 'StreamDispatcher',
+    'StreamManager', 'SubscriberQueue', 'Tick', 'TickIngestor', 'TickRecorder', 'TickRingBuffer', 'WebSocketClient'
+]
\ No newline at end of file
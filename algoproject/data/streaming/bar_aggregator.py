@@ -0,0 +1,382 @@
+"""
+Bar Aggregator
+==============
+
+Streaming tick-to-bar aggregation for AlgoProject.
+
+One tick stream is rolled into time bars (e.g. '1m', '5m', '1h') and
+volume bars (e.g. '500v', one bar per 500 units traded) for several
+timeframes at once. Each symbol's state is allocated once, on its first
+tick, and every tick costs a fixed amount of work per timeframe. Closed
+bars are published to subscribers and kept in a short per-timeframe
+history; the bar still forming can be queried at any time. Time bars of
+quiet symbols are closed by calling flush periodically.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from .dispatcher import OverflowPolicy, StreamDispatcher
+from .tick_ingest import tick_time
+from ..cache_manager import timeframe_to_timedelta
+
+
+@dataclass(frozen=True)
+class BarSpec:
+    """A bar timeframe: fixed duration or fixed traded volume"""
+    name: str
+    kind: str  # 'time' or 'volume'
+    size: float  # Milliseconds for time bars, volume for volume bars
+
+    @classmethod
+    def parse(cls, timeframe: str) -> 'BarSpec':
+        """
+        Parse a timeframe string
+
+        Args:
+            timeframe: Time timeframe ('30s', '1m', '1h', ...) or volume
+                       timeframe ending in 'v' ('500v', '2.5v')
+
+        Returns:
+            BarSpec
+
+        Raises:
+            ValueError: If the timeframe is not recognised
+        """
+        if timeframe.endswith('v'):
+            try:
+                size = float(timeframe[:-1])
+            except ValueError:
+                size = 0.0
+            if size > 0:
+                return cls(timeframe, 'volume', size)
+        else:
+            duration = timeframe_to_timedelta(timeframe)
+            if duration.total_seconds() > 0:
+                return cls(timeframe, 'time', duration.total_seconds() * 1000)
+        raise ValueError(f"Unsupported bar timeframe: {timeframe}")
+
+
+@dataclass
+class Bar:
+    """An OHLCV bar built from ticks"""
+    symbol: str
+    timeframe: str
+    start: datetime
+    end: datetime  # Bucket end for time bars, last tick time for volume bars
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    ticks: int
+    closed: bool = True
+
+
+class _BarState:
+    """Running bar of one symbol and timeframe, updated in place"""
+
+    __slots__ = ('start', 'last', 'open', 'high', 'low', 'close', 'volume', 'ticks')
+
+    def __init__(self):
+        self.start = -1  # Start of the latest bar; ticks in earlier buckets are late
+        self.ticks = 0  # 0 means no bar is forming
+
+    def begin(self, start: int, ts: int, price: float, volume: float):
+        self.start = start
+        self.last = ts
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        self.ticks = 1
+
+    def add(self, ts: int, price: float, volume: float):
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+        self.last = ts
+        self.ticks += 1
+
+
+def _to_datetime(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts / 1000)
+
+
+class BarAggregator:
+    """Rolls ticks into time and volume bars for several timeframes"""
+
+    def __init__(self, timeframes: Sequence[str] = ('1m',), history: int = 500,
+                 cumulative_volume: bool = False, queue_size: int = 1024,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK):
+        """
+        Initialize the aggregator
+
+        Args:
+            timeframes: Bar timeframes, e.g. ['1m', '5m', '1h', '1000v']
+            history: Closed bars kept per symbol and timeframe
+            cumulative_volume: Tick volume is a running total; bars then use the
+                               change between ticks. Required for ticker feeds
+                               (WebSocketClient tickers carry rolling 24h volume);
+                               leave False for per-trade ticks
+            queue_size: Queue size of each async bar subscriber
+            overflow_policy: Policy when an async bar subscriber's queue is full
+        """
+        self.specs = [BarSpec.parse(timeframe) for timeframe in timeframes]
+        if not self.specs:
+            raise ValueError("At least one timeframe is required")
+        self.history = history
+        self.cumulative_volume = cumulative_volume
+        self.logger = logging.getLogger(__name__)
+
+        self.index = {spec.name: i for i, spec in enumerate(self.specs)}
+        # (is time bar, size) per timeframe, read on every tick
+        self._plan = [(spec.kind == 'time', int(spec.size) if spec.kind == 'time' else spec.size)
+                      for spec in self.specs]
+        self.states: Dict[str, List[_BarState]] = {}
+        self.bars: Dict[str, List[Deque[Bar]]] = {}
+        self.last_volume: Dict[str, float] = {}
+
+        self.subscribers: List[Callable] = []
+        self.dispatcher = StreamDispatcher(queue_size, overflow_policy)
+        self.stats = {'ticks': 0, 'late_ticks': 0, 'bars_closed': 0}
+
+    def _symbol_state(self, symbol: str) -> List[_BarState]:
+        states = self.states.get(symbol)
+        if states is None:
+            states = self.states[symbol] = [_BarState() for _ in self.specs]
+            self.bars[symbol] = [deque(maxlen=self.history) for _ in self.specs]
+        return states
+
+    def update(self, data: Any) -> List[Bar]:
+        """
+        Add a tick to every timeframe of its symbol
+
+        Time bars close when a tick lands in a later bucket (intervals
+        without ticks produce no bars); ticks older than the forming bar,
+        or than the last bar flush closed, are counted and skipped. Volume bars close on the tick that brings
+        them to their size.
+
+        Args:
+            data: MarketData or Tick
+
+        Returns:
+            Bars closed by this tick
+        """
+        symbol = data.symbol
+        ts = tick_time(data)
+        price = data.close
+        volume = data.volume
+        if self.cumulative_volume:
+            previous = self.last_volume.get(symbol)
+            self.last_volume[symbol] = volume
+            # A rolling window total can shrink; that is not negative trading
+            volume = max(volume - previous, 0.0) if previous is not None else 0.0
+
+        states = self._symbol_state(symbol)
+        self.stats['ticks'] += 1
+        closed = []
+
+        for i, (is_time, size) in enumerate(self._plan):
+            state = states[i]
+            if is_time:
+                start = ts - ts % size
+                if start == state.start and state.ticks:
+                    state.add(ts, price, volume)
+                elif start > state.start:
+                    if state.ticks:
+                        closed.append(self._close(symbol, i, state))
+                    state.begin(start, ts, price, volume)
+                else:
+                    # Older than the forming bar, or in a bar flush already closed
+                    self.stats['late_ticks'] += 1
+            else:
+                if state.ticks:
+                    state.add(ts, price, volume)
+                else:
+                    state.begin(ts, ts, price, volume)
+                if state.volume >= size:
+                    closed.append(self._close(symbol, i, state))
+                    state.ticks = 0
+
+        return closed
+
+    def _close(self, symbol: str, i: int, state: _BarState) -> Bar:
+        bar = self._bar(symbol, i, state, closed=True)
+        self.bars[symbol][i].append(bar)
+        self.stats['bars_closed'] += 1
+        return bar
+
+    def _bar(self, symbol: str, i: int, state: _BarState, closed: bool) -> Bar:
+        spec = self.specs[i]
+        end = state.start + int(spec.size) if spec.kind == 'time' else state.last
+        return Bar(symbol, spec.name, _to_datetime(state.start), _to_datetime(end), state.open,
+                   state.high, state.low, state.close, state.volume, state.ticks, closed)
+
+    def close_expired(self, now: datetime) -> List[Bar]:
+        """
+        Close time bars whose interval has ended, without publishing them
+
+        Ticks that arrive later for a closed interval are counted as late.
+
+        Args:
+            now: Current time
+
+        Returns:
+            Bars closed
+        """
+        now_ms = int(now.timestamp() * 1000)
+        closed = []
+        for symbol, states in self.states.items():
+            for i, spec in enumerate(self.specs):
+                state = states[i]
+                if spec.kind == 'time' and state.ticks and state.start + spec.size <= now_ms:
+                    closed.append(self._close(symbol, i, state))
+                    state.ticks = 0
+        return closed
+
+    async def flush(self, now: Optional[datetime] = None) -> List[Bar]:
+        """
+        Close and publish time bars whose interval has ended, for quiet symbols
+
+        Args:
+            now: Current time (datetime.now() if None)
+
+        Returns:
+            Bars closed
+        """
+        closed = self.close_expired(now or datetime.now())
+        for bar in closed:
+            await self.publish(bar)
+        return closed
+
+    def get_partial_bar(self, symbol: str, timeframe: str) -> Optional[Bar]:
+        """
+        Get the bar still forming
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Bar timeframe
+
+        Returns:
+            Bar with closed=False, or None if no bar is forming
+        """
+        states = self.states.get(symbol)
+        i = self._spec_index(timeframe)
+        if states is None or not states[i].ticks:
+            return None
+        return self._bar(symbol, i, states[i], closed=False)
+
+    def get_bars(self, symbol: str, timeframe: str, limit: Optional[int] = None) -> List[Bar]:
+        """
+        Get recently closed bars, oldest first
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Bar timeframe
+            limit: Maximum number of bars (all kept bars if None)
+
+        Returns:
+            List of closed bars
+        """
+        i = self._spec_index(timeframe)
+        if symbol not in self.bars:
+            return []
+        bars = self.bars[symbol][i]
+        count = len(bars) if limit is None else min(limit, len(bars))
+        return [bars[j] for j in range(-count, 0)]
+
+    def _spec_index(self, timeframe: str) -> int:
+        if timeframe not in self.index:
+            raise ValueError(f"Timeframe not aggregated: {timeframe}")
+        return self.index[timeframe]
+
+    def add_subscriber(self, callback: Callable, queue_size: Optional[int] = None,
+                       overflow_policy: Optional[OverflowPolicy] = None):
+        """
+        Add a subscriber for closed bars
+
+        Args:
+            callback: Called with each closed Bar; async callbacks get a
+                      bounded queue, sync ones are called inline
+            queue_size: Queue size for an async subscriber (optional)
+            overflow_policy: Overflow policy for an async subscriber (optional)
+        """
+        if asyncio.iscoroutinefunction(callback):
+            self.dispatcher.add(callback, queue_size, overflow_policy)
+        else:
+            self.subscribers.append(callback)
+
+    def remove_subscriber(self, callback: Callable):
+        """
+        Remove a closed-bar subscriber
+
+        Args:
+            callback: Callback function to remove
+        """
+        if self.dispatcher.remove(callback):
+            return
+        try:
+            self.subscribers.remove(callback)
+        except ValueError:
+            pass
+
+    async def on_market_data(self, data: Any):
+        """
+        Aggregate a tick and publish the bars it closes
+
+        Register this as a StreamManager data subscriber (see attach).
+
+        Args:
+            data: MarketData or Tick
+        """
+        for bar in self.update(data):
+            await self.publish(bar)
+
+    async def publish(self, bar: Bar):
+        """
+        Deliver a closed bar to subscribers
+
+        Args:
+            bar: Closed bar
+        """
+        for callback in self.subscribers:
+            try:
+                callback(bar)
+            except Exception as e:
+                self.logger.error(f"Error in bar subscriber callback: {e}")
+        await self.dispatcher.publish(bar)
+
+    def attach(self, stream_manager: Any, queue_size: Optional[int] = None):
+        """
+        Take ticks from a StreamManager
+
+        Args:
+            stream_manager: StreamManager to subscribe to
+            queue_size: Tick queue size (StreamManager default if None)
+        """
+        stream_manager.add_subscriber("data", self.on_market_data, queue_size, OverflowPolicy.BLOCK)
+
+    def detach(self, stream_manager: Any):
+        """
+        Stop taking ticks from a StreamManager
+
+        Args:
+            stream_manager: StreamManager subscribed to with attach
+        """
+        stream_manager.remove_subscriber("data", self.on_market_data)
+
+    async def stop(self):
+        """Stop the async subscriber queues"""
+        await self.dispatcher.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregation statistics"""
+        return {**self.stats, 'symbols': len(self.states),
+                'timeframes': [spec.name for spec in self.specs],
+                'subscribers': self.dispatcher.get_stats()}
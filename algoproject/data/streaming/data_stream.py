@@ -113,6 +113,25 @@ class DataStream(ABC):
                 except Exception as e:
                     self.logger.error(f"Error in subscriber callback: {e}")
     
+    async def publish(self, event_type: str, data: Any):
+        """Deliver an event to all subscribers, awaiting async ones in turn
+        
+        Unlike notify_subscribers this does not spawn a task per callback,
+        so a subscriber that applies backpressure slows the caller down.
+        
+        Args:
+            event_type: Type of event
+            data: Event data
+        """
+        for callback in self.subscribers.get(event_type, ()):
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(data)
+                else:
+                    callback(data)
+            except Exception as e:
+                self.logger.error(f"Error in subscriber callback: {e}")
+    
     def set_status(self, status: StreamStatus):
         """Set stream status and notify subscribers
         
@@ -0,0 +1,276 @@
+"""
+Stream Dispatcher
+=================
+
+Bounded, ordered delivery of stream events to async subscribers.
+
+Each async subscriber gets its own bounded queue drained by one worker
+task, so a subscriber sees events in arrival order (and therefore in
+order per symbol) and a slow subscriber cannot pile up tasks or hold
+back the others. What happens when a queue is full is set by its
+overflow policy.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class OverflowPolicy(Enum):
+    """What a full subscriber queue does with a new event"""
+    BLOCK = "block"              # The publisher waits for room
+    DROP_OLDEST = "drop_oldest"  # The oldest queued event is discarded
+    CONFLATE = "conflate"        # A queued event of the same symbol is replaced
+
+
+def symbol_key(data: Any) -> Any:
+    """Conflation key of an event: its symbol"""
+    return getattr(data, 'symbol', None)
+
+
+class SubscriberQueue:
+    """Bounded queue and worker task feeding one async subscriber"""
+
+    def __init__(self, callback: Callable, maxsize: int = 1024,
+                 policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                 key: Callable[[Any], Any] = symbol_key):
+        """
+        Initialize the queue
+
+        Args:
+            callback: Coroutine function called with each event
+            maxsize: Maximum queued events
+            policy: Overflow policy
+            key: Conflation key of an event (CONFLATE only)
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.callback = callback
+        self.name = getattr(callback, '__qualname__', repr(callback))
+        self.maxsize = maxsize
+        self.policy = policy
+        self.key = key
+        self.logger = logging.getLogger(__name__)
+
+        # Entries are [key, event, enqueue time]; conflation updates them in place
+        self.items: Deque[List[Any]] = deque()
+        self.pending: Dict[Any, List[Any]] = {}
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.task: Optional[asyncio.Task] = None
+
+        self.stats = {'published': 0, 'delivered': 0, 'dropped': 0, 'conflated': 0,
+                      'errors': 0, 'max_depth': 0}
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.lag_last = 0.0
+
+    def start(self):
+        """Start the worker task (needs a running event loop)"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    def close(self):
+        """Cancel the worker task; queued events are discarded"""
+        if self.task:
+            self.task.cancel()
+        self.items.clear()
+        self.pending.clear()
+        self._not_full.set()
+
+    async def stop(self):
+        """Cancel the worker task and wait for it to finish"""
+        task = self.task
+        self.close()
+        self.task = None
+        if task:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def put(self, data: Any):
+        """
+        Queue an event, waiting for room under the BLOCK policy
+
+        Args:
+            data: Event to deliver
+        """
+        if self.policy is OverflowPolicy.BLOCK:
+            while len(self.items) >= self.maxsize:
+                self._not_full.clear()
+                await self._not_full.wait()
+        self.offer(data)
+
+    def offer(self, data: Any) -> bool:
+        """
+        Queue an event without waiting
+
+        Args:
+            data: Event to deliver
+
+        Returns:
+            False if the queue is full under the BLOCK policy and the event
+            was not queued
+        """
+        self.stats['published'] += 1
+
+        key = None
+        if self.policy is OverflowPolicy.CONFLATE:
+            key = self.key(data)
+            entry = self.pending.get(key)
+            if entry is not None:
+                entry[1] = data  # Keeps its place (and age) in the queue
+                self.stats['conflated'] += 1
+                return True
+
+        if len(self.items) >= self.maxsize:
+            if self.policy is OverflowPolicy.BLOCK:
+                self.stats['published'] -= 1
+                return False
+            self._discard(self.items.popleft())
+            self.stats['dropped'] += 1
+
+        entry = [key, data, time.perf_counter()]
+        self.items.append(entry)
+        if self.policy is OverflowPolicy.CONFLATE:
+            self.pending[key] = entry
+        if len(self.items) > self.stats['max_depth']:
+            self.stats['max_depth'] = len(self.items)
+        self._not_empty.set()
+        return True
+
+    def _discard(self, entry: List[Any]):
+        if self.pending.get(entry[0]) is entry:
+            del self.pending[entry[0]]
+
+    async def _run(self):
+        """Deliver queued events one at a time, in order"""
+        while True:
+            if not self.items:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+
+            entry = self.items.popleft()
+            self._discard(entry)
+            self._not_full.set()
+
+            lag = time.perf_counter() - entry[2]
+            self.lag_last = lag
+            self.lag_total += lag
+            if lag > self.lag_max:
+                self.lag_max = lag
+
+            try:
+                await self.callback(entry[1])
+                self.stats['delivered'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.logger.error(f"Error in data subscriber {self.name}: {e}")
+
+    def depth(self) -> int:
+        """Number of queued events"""
+        return len(self.items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics
+
+        Returns:
+            Counters, current depth and queueing lag (time from enqueue to
+            delivery) in milliseconds
+        """
+        taken = self.stats['delivered'] + self.stats['errors']
+        return {
+            **self.stats,
+            'policy': self.policy.value,
+            'depth': len(self.items),
+            'maxsize': self.maxsize,
+            'lag_last_ms': self.lag_last * 1000,
+            'lag_avg_ms': (self.lag_total / taken * 1000) if taken else 0.0,
+            'lag_max_ms': self.lag_max * 1000
+        }
+
+
+class StreamDispatcher:
+    """Fans events out to async subscribers through bounded queues"""
+
+    def __init__(self, maxsize: int = 1024, policy: OverflowPolicy = OverflowPolicy.BLOCK):
+        """
+        Initialize the dispatcher
+
+        Args:
+            maxsize: Default queue size per subscriber
+            policy: Default overflow policy
+        """
+        self.maxsize = maxsize
+        self.policy = policy
+        self.queues: Dict[Callable, SubscriberQueue] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def add(self, callback: Callable, maxsize: Optional[int] = None,
+            policy: Optional[OverflowPolicy] = None) -> SubscriberQueue:
+        """
+        Add an async subscriber
+
+        Args:
+            callback: Coroutine function called with each event
+            maxsize: Queue size (dispatcher default if None)
+            policy: Overflow policy (dispatcher default if None)
+
+        Returns:
+            The subscriber's queue
+        """
+        queue = self.queues.get(callback)
+        if queue is None:
+            queue = self.queues[callback] = SubscriberQueue(
+                callback, maxsize or self.maxsize, policy or self.policy
+            )
+        return queue
+
+    def remove(self, callback: Callable) -> bool:
+        """
+        Remove an async subscriber and cancel its worker
+
+        Args:
+            callback: Subscriber to remove
+
+        Returns:
+            True if it was subscribed
+        """
+        queue = self.queues.pop(callback, None)
+        if queue is None:
+            return False
+        queue.close()
+        return True
+
+    async def publish(self, data: Any):
+        """
+        Queue an event for every subscriber
+
+        Only returns once every BLOCK queue has taken the event, which is
+        how a slow subscriber pushes back on the stream.
+
+        Args:
+            data: Event to deliver
+        """
+        for queue in list(self.queues.values()):
+            if queue.task is None:
+                queue.start()
+            await queue.put(data)
+
+    async def stop(self):
+        """Stop every worker; subscribers stay registered"""
+        for queue in self.queues.values():
+            await queue.stop()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-subscriber queue statistics keyed by subscriber name"""
+        return {queue.name: queue.get_stats() for queue in self.queues.values()}
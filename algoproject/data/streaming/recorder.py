@@ -0,0 +1,349 @@
+"""
+Tick Recorder and Replay
+========================
+
+Record what a StreamManager saw and play it back later.
+
+TickRecorder appends every tick to memory-mapped segment files of
+fixed-size binary records: a 32-byte header holding the record count,
+then RECORD_DTYPE records. A segment is preallocated, filled in place and
+trimmed to its records when it is rotated or the recorder is closed; the
+header count is updated on every write, so a segment left behind by a
+crash is still readable.
+
+ReplayStream is a DataStream that feeds recorded segments back, either
+at the recorded pace (optionally sped up) or as fast as subscribers take
+them, so it can stand in for live streams in StreamManager.add_stream.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .data_stream import DataStream, StreamStatus
+from .tick_ingest import Tick, tick_time
+
+SEGMENT_MAGIC = b'ALGOTICK'
+SEGMENT_VERSION = 1
+SEGMENT_PATTERN = 'ticks-*.bin'
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('record_size', '<u4'),
+    ('count', '<u8'),
+    ('capacity', '<u8'),
+])
+
+RECORD_DTYPE = np.dtype([
+    ('recv_ns', '<i8'),  # Wall-clock arrival time, epoch nanoseconds
+    ('ts', '<i8'),       # Exchange time, epoch milliseconds
+    ('symbol', 'S24'),
+    ('exchange', 'S16'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+
+def read_segment(path: Union[str, Path]) -> np.ndarray:
+    """
+    Map a segment's records read-only
+
+    Args:
+        path: Segment file
+
+    Returns:
+        RECORD_DTYPE array backed by the file
+
+    Raises:
+        ValueError: If the file is not a tick segment
+    """
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header['magic'][0] != SEGMENT_MAGIC:
+        raise ValueError(f"Not a tick segment: {path}")
+    if header['version'][0] != SEGMENT_VERSION or header['record_size'][0] != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Unsupported tick segment format: {path}")
+
+    count = int(header['count'][0])
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_DTYPE.itemsize, shape=(count,))
+
+
+def list_segments(source: Union[str, Path]) -> List[Path]:
+    """
+    Segment files of a recording, in recording order
+
+    Args:
+        source: Recording directory or a single segment file
+
+    Returns:
+        List of segment paths
+    """
+    source = Path(source)
+    if source.is_file():
+        return [source]
+    return sorted(source.glob(SEGMENT_PATTERN))
+
+
+class TickRecorder:
+    """Appends ticks to memory-mapped segment files"""
+
+    def __init__(self, directory: Union[str, Path], segment_records: int = 1_000_000):
+        """
+        Initialize the recorder
+
+        Args:
+            directory: Directory for segment files (created if missing)
+            segment_records: Records per segment before rotating
+        """
+        if segment_records <= 0:
+            raise ValueError("segment_records must be positive")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_records = segment_records
+        self.logger = logging.getLogger(__name__)
+
+        self.segments: List[Path] = []
+        self._header = None
+        self._records = None
+        self._count = 0
+        self._encoded: Dict[str, bytes] = {}
+        self.stats = {'records': 0, 'segments': 0, 'truncated_names': 0}
+
+    def _open_segment(self):
+        # Number after the highest existing segment, so a gap never reuses a name
+        numbers = [int(path.stem[len('ticks-'):]) for path in list_segments(self.directory)
+                   if path.stem[len('ticks-'):].isdigit()]
+        path = self.directory / f"ticks-{max(numbers, default=-1) + 1:06d}.bin"
+        size = HEADER_DTYPE.itemsize + self.segment_records * RECORD_DTYPE.itemsize
+        # 'xb' refuses to overwrite a recording that appeared in the meantime
+        with open(path, 'xb') as f:
+            f.truncate(size)
+
+        self._header = np.memmap(path, dtype=HEADER_DTYPE, mode='r+', shape=(1,))
+        self._header[0] = (SEGMENT_MAGIC, SEGMENT_VERSION, RECORD_DTYPE.itemsize, 0, self.segment_records)
+        self._records = np.memmap(path, dtype=RECORD_DTYPE, mode='r+',
+                                  offset=HEADER_DTYPE.itemsize, shape=(self.segment_records,))
+        self._count = 0
+        self.segments.append(path)
+        self.stats['segments'] += 1
+        self.logger.info(f"Recording ticks to {path}")
+
+    def _close_segment(self):
+        if self._records is None:
+            return
+        self._records.flush()
+        self._header.flush()
+        self._records = self._header = None  # Unmap before trimming
+
+        path = self.segments[-1]
+        os.truncate(path, HEADER_DTYPE.itemsize + self._count * RECORD_DTYPE.itemsize)
+
+    def _encode(self, name: str, width: int) -> bytes:
+        encoded = self._encoded.get(name)
+        if encoded is None:
+            encoded = name.encode()
+            if len(encoded) > width:
+                # Cut on a character boundary so the name still decodes
+                encoded = encoded[:width].decode(errors='ignore').encode()
+                self.stats['truncated_names'] += 1
+                self.logger.warning(f"Name longer than {width} bytes is truncated in recordings: {name}")
+            self._encoded[name] = encoded
+        return encoded
+
+    def record(self, data: Any):
+        """
+        Append a tick
+
+        Args:
+            data: MarketData or Tick
+        """
+        if self._records is None or self._count == self.segment_records:
+            self._close_segment()
+            self._open_segment()
+
+        self._records[self._count] = (
+            time.time_ns(), tick_time(data), self._encode(data.symbol, 24),
+            self._encode(data.exchange, 16), data.open, data.high, data.low, data.close, data.volume
+        )
+        self._count += 1
+        self._header['count'][0] = self._count
+        self.stats['records'] += 1
+
+    def attach(self, stream_manager: Any):
+        """
+        Record every tick a StreamManager receives
+
+        Args:
+            stream_manager: StreamManager to subscribe to
+        """
+        stream_manager.add_subscriber("data", self.record)
+
+    def detach(self, stream_manager: Any):
+        """
+        Stop recording a StreamManager
+
+        Args:
+            stream_manager: StreamManager subscribed to with attach
+        """
+        stream_manager.remove_subscriber("data", self.record)
+
+    def close(self):
+        """Flush and trim the open segment"""
+        self._close_segment()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get recording statistics"""
+        return {**self.stats, 'directory': str(self.directory),
+                'bytes': sum(path.stat().st_size for path in self.segments if path.exists())}
+
+
+class ReplayStream(DataStream):
+    """DataStream that plays back recorded tick segments"""
+
+    def __init__(self, source: Union[str, Path], stream_id: str = "replay", speed: Optional[float] = 1.0,
+                 symbols: Optional[Sequence[str]] = None, batch_size: int = 4096):
+        """
+        Initialize the replay stream
+
+        Args:
+            source: Recording directory or a single segment file
+            stream_id: Unique stream identifier
+            speed: Multiple of the recorded pace (None replays as fast as possible)
+            symbols: Only replay these symbols (all recorded symbols if None)
+            batch_size: Records decoded at a time
+        """
+        super().__init__(stream_id)
+        self.source = Path(source)
+        self.speed = speed
+        self.symbols = set(symbols) if symbols else None
+        self.batch_size = batch_size
+        self.replay_task: Optional[asyncio.Task] = None
+        self.finished = asyncio.Event()
+        self._names: Dict[bytes, str] = {}
+        self.stats = {'replayed': 0, 'skipped': 0, 'elapsed': 0.0}
+
+    async def connect(self) -> bool:
+        """Start replaying
+
+        Returns:
+            True if the recording has segments, False otherwise
+        """
+        segments = list_segments(self.source)
+        if not segments:
+            self.logger.error(f"No tick segments found in {self.source}")
+            self.set_status(StreamStatus.ERROR)
+            return False
+
+        self.finished.clear()
+        self.set_status(StreamStatus.CONNECTED)
+        self.update_heartbeat()
+        self.replay_task = asyncio.create_task(self._replay(segments))
+        return True
+
+    async def disconnect(self):
+        """Stop replaying"""
+        if self.replay_task:
+            self.replay_task.cancel()
+            try:
+                await self.replay_task
+            except asyncio.CancelledError:
+                pass
+            self.replay_task = None
+        if self.status != StreamStatus.DISCONNECTED:
+            self.set_status(StreamStatus.DISCONNECTED)
+
+    async def subscribe(self, symbol: str, data_type: str = "ticker"):
+        """Track a subscription; the recording decides what is replayed
+
+        Args:
+            symbol: Trading symbol
+            data_type: Type of data
+        """
+        self.subscribed_symbols.add(symbol)
+
+    async def unsubscribe(self, symbol: str, data_type: str = "ticker"):
+        """Drop a tracked subscription
+
+        Args:
+            symbol: Trading symbol
+            data_type: Type of data
+        """
+        self.subscribed_symbols.discard(symbol)
+
+    def _name(self, raw: bytes) -> str:
+        name = self._names.get(raw)
+        if name is None:
+            name = self._names[raw] = raw.decode(errors='replace')
+        return name
+
+    def iter_ticks(self, segments: Optional[Sequence[Path]] = None) -> Iterator[tuple]:
+        """
+        Decode recorded ticks in order
+
+        Args:
+            segments: Segment files (the stream's source if None)
+
+        Yields:
+            (recv_ns, Tick) tuples
+        """
+        for path in segments if segments is not None else list_segments(self.source):
+            records = read_segment(path)
+            for start in range(0, len(records), self.batch_size):
+                for recv_ns, ts, symbol, exchange, o, h, l, c, v in records[start:start + self.batch_size].tolist():
+                    yield recv_ns, Tick(self._name(symbol), ts, o, h, l, c, v, self._name(exchange))
+
+    async def _replay(self, segments: List[Path]):
+        """Publish recorded ticks, paced by their arrival times"""
+        started = time.perf_counter()
+        first_recv = None
+        count = 0
+        try:
+            for recv_ns, tick in self.iter_ticks(segments):
+                if self.symbols is not None and tick.symbol not in self.symbols:
+                    self.stats['skipped'] += 1
+                    continue
+
+                if self.speed is not None:
+                    if first_recv is None:
+                        first_recv = recv_ns
+                    delay = (recv_ns - first_recv) / 1e9 / self.speed - (time.perf_counter() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                await self.publish("data", tick)
+                count += 1
+                self.stats['replayed'] += 1
+                if count % self.batch_size == 0:
+                    self.update_heartbeat()
+                    await asyncio.sleep(0)  # Let subscribers' queues drain
+
+            self.stats['elapsed'] = time.perf_counter() - started
+            self.logger.info(f"Replay finished: {count} ticks in {self.stats['elapsed']:.2f}s")
+            self.set_status(StreamStatus.DISCONNECTED)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error during replay: {e}")
+            self.set_status(StreamStatus.ERROR)
+        finally:
+            self.finished.set()
+
+    async def wait_finished(self):
+        """Wait until every recorded tick has been published"""
+        await self.finished.wait()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get replay statistics, including the replay rate in ticks per second"""
+        elapsed = self.stats['elapsed']
+        return {**self.stats, 'rate': self.stats['replayed'] / elapsed if elapsed else 0.0}
@@ -7,11 +7,12 @@ Manages multiple real-time data streams for AlgoProject.
 
 import asyncio
 import logging
-from typing import Dict, List, Callable, Any, Optional
-from datetime import datetime
-import threading
-from concurrent.futures import ThreadPoo
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Callable, Any, Optional, Set
+from datetime import datetime, timedelta
+
 from .data_stream import DataStream, StreamStatus
+from .dispatcher import OverflowPolicy, StreamDispatcher
 from .websocket_client import WebSocketClient, BinanceWebSocketClient, BybitWebSocketClient
 from ...core.interfaces import MarketData
 from ...core.config_manager import ConfigManager
@@ -20,11 +21,14 @@ from ...core.config_manager import ConfigManager
 class StreamManager:
     """Manages multiple real-time data streams"""
     
-    def __init__(self, config_manager: ConfigManager):
+    def __init__(self, config_manager: ConfigManager, queue_size: int = 1024,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK):
         """Initialize stream manager
         
         Args:
             config_manager: Configuration manager
+            queue_size: Default queue size of each async data subscriber
+            overflow_policy: Default policy when a subscriber's queue is full
         """
         self.config_manager = config_manager
         self.logger = logging.getLogger(__name__)
@@ -32,8 +36,11 @@ class StreamManager:
         self.subscribers: Dict[str, List[Callable]] = defaultdict(list)
         self.symbol_streams: Dict[str, Set[str]] = defaultdict(set)  # symbol -> stream_ids
         self.stream_symbols: Dict[str, Set[str]] = defaultdict(set)  # stream_id -> symbols
-        self.data_buffer: Dict[str, List[MarketData]] = defaultdict(list)
         self.buffer_size = 1000
+        # Fixed-size ring per symbol; appends evict the oldest tick in O(1)
+        self.data_buffer: Dict[str, Deque[MarketData]] = defaultdict(lambda: deque(maxlen=self.buffer_size))
+        # Async data subscribers are fed through bounded per-subscriber queues
+        self.dispatcher = StreamDispatcher(queue_size, overflow_policy)
         self.health_check_task = None
         self.health_check_interval = 30  # seconds
         
@@ -59,6 +66,8 @@ class StreamManager:
             except asyncio.CancelledError:
                 pass
         
+        await self.dispatcher.stop()
+        
         # Disconnect all streams
         for stream in self.streams.values():
             await stream.disconnect()
@@ -75,11 +84,15 @@ class StreamManager:
             
             # Initialize crypto streams
             crypto_config = streaming_config.get("crypto", {})
-            if crypto_config.get("binance", {}).get("enabled", False):
-                await self.add_stream("binance", BinanceWebSocketClient())
+            binance_config = crypto_config.get("binance", {})
+            if binance_config.get("enabled", False):
+                await self.add_stream("binance", BinanceWebSocketClient(
+                    fast_ingest=binance_config.get("fast_ingest", False)))
             
-            if crypto_config.get("bybit", {}).get("enabled", False):
-                await self.add_stream("bybit", BybitWebSocketClient())
+            bybit_config = crypto_config.get("bybit", {})
+            if bybit_config.get("enabled", False):
+                await self.add_stream("bybit", BybitWebSocketClient(
+                    fast_ingest=bybit_config.get("fast_ingest", False)))
             
             # Initialize custom streams
             custom_streams = streaming_config.get("custom", [])
@@ -242,14 +255,23 @@ class StreamManager:
             self.logger.error(f"Error unsubscribing from symbol {symbol}: {e}")
             return False
     
-    def add_subscriber(self, event_type: str, callback: Callable):
+    def add_subscriber(self, event_type: str, callback: Callable, queue_size: Optional[int] = None,
+                       overflow_policy: Optional[OverflowPolicy] = None):
         """Add a subscriber for stream events
         
+        Async data subscribers get their own bounded queue and receive ticks
+        in order; synchronous ones are called inline.
+        
         Args:
             event_type: Type of event (data, status, error)
             callback: Callback function
+            queue_size: Queue size for an async data subscriber (optional)
+            overflow_policy: Overflow policy for an async data subscriber (optional)
         """
-        self.subscribers[event_type].append(callback)
+        if event_type == "data" and asyncio.iscoroutinefunction(callback):
+            self.dispatcher.add(callback, queue_size, overflow_policy)
+        else:
+            self.subscribers[event_type].append(callback)
     
     def remove_subscriber(self, event_type: str, callback: Callable):
         """Remove a subscriber for stream events
@@ -258,6 +280,8 @@ class StreamManager:
             event_type: Type of event
             callback: Callback function to remove
         """
+        if event_type == "data" and self.dispatcher.remove(callback):
+            return
         try:
             self.subscribers[event_type].remove(callback)
         except ValueError:
@@ -308,9 +332,11 @@ class StreamManager:
         Returns:
             List of latest MarketData objects
         """
-        if symbol in self.data_buffer:
-            return self.data_buffer[symbol][-limit:]
-        return []
+        buffer = self.data_buffer.get(symbol)
+        if not buffer:
+            return []
+        # Index from the right: O(limit) on the deque instead of copying it
+        return [buffer[i] for i in range(-min(limit, len(buffer)), 0)]
     
     def get_stream_health(self) -> Dict[str, Any]:
         """Get health information for all streams
@@ -331,29 +357,32 @@ class StreamManager:
         
         return health
     
+    def get_dispatch_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue depth, drop and lag statistics of async data subscribers
+        
+        Returns:
+            Dictionary mapping subscriber names to their queue statistics
+        """
+        return self.dispatcher.get_stats()
+    
     async def _handle_stream_data(self, data: MarketData):
         """Handle incoming stream data
         
         Args:
-            data: MarketData object
+            data: MarketData object (or a Tick from a fast-ingest client)
         """
-        # Add to buffer
-        symbol = data.symbol
-        self.data_buffer[symbol].append(data)
-        
-        # Maintain buffer size
-        if len(self.data_buffer[symbol]) > self.buffer_size:
-            self.data_buffer[symbol] = self.data_buffer[symbol][-self.buffer_size:]
+        # Add to buffer (bounded, the oldest tick drops out)
+        self.data_buffer[data.symbol].append(data)
         
         # Notify subscribers
         for callback in self.subscribers["data"]:
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    asyncio.create_task(callback(data))
-                else:
-                    callback(data)
+                callback(data)
             except Exception as e:
                 self.logger.error(f"Error in data subscriber callback: {e}")
+        
+        # Waits for queue room if a BLOCK subscriber is full
+        await self.dispatcher.publish(data)
     
     async def _handle_stream_status(self, status_data: Dict[str, Any]):
         """Handle stream status changes
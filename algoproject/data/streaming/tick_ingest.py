@@ -0,0 +1,291 @@
+"""
+Tick Ingestion
+==============
+
+High-throughput path from raw WebSocket frames to ticks.
+
+Frames are decoded with orjson when it is installed. Each exchange has a
+router that reads a message's event type and a parser per data type;
+the parsers are registered when a data type is subscribed, so a message
+costs one dict lookup instead of chains of field fallbacks. Parsed
+values go straight into a fixed-size per-symbol ring buffer of NumPy
+records, and subscribers receive slotted ``Tick`` objects that carry the
+same fields as ``MarketData``.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from ...core.interfaces import MarketData
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    orjson = None
+    loads = json.loads
+
+
+TICK_DTYPE = np.dtype([
+    ('ts', 'i8'),  # Exchange time, epoch milliseconds
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8'),
+])
+
+
+class Tick:
+    """One market data update; a lightweight stand-in for MarketData"""
+
+    __slots__ = ('symbol', 'ts', 'open', 'high', 'low', 'close', 'volume', 'exchange')
+
+    def __init__(self, symbol: str, ts: int, open: float, high: float, low: float,
+                 close: float, volume: float, exchange: str):
+        self.symbol = symbol
+        self.ts = ts
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.exchange = exchange
+
+    @property
+    def timestamp(self) -> datetime:
+        """Exchange time as a datetime, like MarketData.timestamp"""
+        return datetime.fromtimestamp(self.ts / 1000)
+
+    def to_market_data(self) -> MarketData:
+        return MarketData(self.symbol, self.timestamp, self.open, self.high, self.low,
+                          self.close, self.volume, self.exchange)
+
+    def __repr__(self) -> str:
+        return (f"Tick({self.symbol!r}, ts={self.ts}, close={self.close}, "
+                f"volume={self.volume}, exchange={self.exchange!r})")
+
+
+def tick_time(data: Any) -> int:
+    """Epoch milliseconds of a Tick (``ts``) or MarketData (``timestamp``)"""
+    ts = getattr(data, 'ts', None)
+    if ts is None:
+        ts = int(data.timestamp.timestamp() * 1000)
+    return ts
+
+
+class TickRingBuffer:
+    """Fixed-size ring of the most recent ticks of one symbol"""
+
+    def __init__(self, capacity: int = 4096):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.records = np.zeros(capacity, dtype=TICK_DTYPE)
+        self.count = 0  # Ticks ever written
+
+    def append(self, ts: int, open: float, high: float, low: float, close: float, volume: float):
+        self.records[self.count % self.capacity] = (ts, open, high, low, close, volume)
+        self.count += 1
+
+    def latest(self, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Most recent ticks, oldest first
+
+        Args:
+            limit: Maximum number of ticks (all held ticks if None)
+
+        Returns:
+            Copy of the records as a TICK_DTYPE array
+        """
+        held = len(self)
+        limit = held if limit is None else min(limit, held)
+        end = self.count % self.capacity
+        if limit <= end:
+            return self.records[end - limit:end].copy()
+        return np.concatenate([self.records[self.capacity - (limit - end):], self.records[:end]])
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+
+# A parser reads one routed message and emits its ticks:
+# emit(symbol, ts, open, high, low, close, volume)
+Emit = Callable[[str, int, float, float, float, float, float], None]
+Parser = Callable[[Dict[str, Any], Emit], None]
+
+
+def binance_route(message: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Event type and payload of a raw or combined-stream Binance message"""
+    payload = message.get('data', message)
+    return payload.get('e'), payload
+
+
+def parse_binance_ticker(data: Dict[str, Any], emit: Emit):
+    emit(data['s'], data['E'], float(data['o']), float(data['h']), float(data['l']),
+         float(data['c']), float(data['v']))
+
+
+def parse_binance_trade(data: Dict[str, Any], emit: Emit):
+    price = float(data['p'])
+    emit(data['s'], data['T'], price, price, price, price, float(data['q']))
+
+
+def bybit_route(message: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Topic family ('tickers', 'publicTrade', ...) of a Bybit v5 message"""
+    topic = message.get('topic')
+    return (topic.split('.', 1)[0] if topic else None), message
+
+
+def parse_bybit_ticker(message: Dict[str, Any], emit: Emit):
+    data = message['data']
+    emit(data['symbol'], message['ts'], float(data['prevPrice24h']), float(data['highPrice24h']),
+         float(data['lowPrice24h']), float(data['lastPrice']), float(data['volume24h']))
+
+
+def parse_bybit_trades(message: Dict[str, Any], emit: Emit):
+    for trade in message['data']:
+        price = float(trade['p'])
+        emit(trade['s'], trade['T'], price, price, price, price, float(trade['v']))
+
+
+def generic_route(message: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Combined-stream messages ({"stream": "symbol@type", "data": {...}})"""
+    stream = message.get('stream')
+    if stream is None or 'data' not in message:
+        return None, message
+    return stream.rsplit('@', 1)[-1], message
+
+
+def parse_generic_ticker(message: Dict[str, Any], emit: Emit):
+    data = message['data']
+    emit(message['stream'].split('@')[0].upper(),
+         int(data.get('E', data.get('timestamp', 0))),
+         float(data.get('o', data.get('open', 0))),
+         float(data.get('h', data.get('high', 0))),
+         float(data.get('l', data.get('low', 0))),
+         float(data.get('c', data.get('close', data.get('price', 0)))),
+         float(data.get('v', data.get('volume', 0))))
+
+
+# exchange -> (router, data type -> (routed event, parser))
+EXCHANGE_FORMATS: Dict[str, Tuple[Callable, Dict[str, Tuple[str, Parser]]]] = {
+    'binance': (binance_route, {
+        'ticker': ('24hrTicker', parse_binance_ticker),
+        'trades': ('trade', parse_binance_trade),
+    }),
+    'bybit': (bybit_route, {
+        'ticker': ('tickers', parse_bybit_ticker),
+        'trades': ('publicTrade', parse_bybit_trades),
+    }),
+    'generic': (generic_route, {
+        'ticker': ('ticker', parse_generic_ticker),
+    }),
+}
+
+
+class TickIngestor:
+    """Decodes frames of one exchange into per-symbol ring buffers"""
+
+    def __init__(self, exchange: str, capacity: int = 4096,
+                 on_tick: Optional[Callable[[Tick], None]] = None, source: Optional[str] = None):
+        """
+        Initialize the ingestor
+
+        Args:
+            exchange: Message format, a key of EXCHANGE_FORMATS
+            capacity: Ticks kept per symbol
+            on_tick: Called with a Tick for every parsed update (optional)
+            source: Exchange name stamped on ticks (defaults to `exchange`)
+
+        Raises:
+            ValueError: If the exchange format is unknown
+        """
+        if exchange not in EXCHANGE_FORMATS:
+            raise ValueError(f"Unknown exchange format: {exchange}")
+        self.exchange = exchange
+        self.source = source or exchange
+        self.capacity = capacity
+        self.on_tick = on_tick
+        self.logger = logging.getLogger(__name__)
+        self.route, self.formats = EXCHANGE_FORMATS[exchange]
+        self.parsers: Dict[str, Parser] = {}
+        self.buffers: Dict[str, TickRingBuffer] = {}
+        self.stats = {'messages': 0, 'ticks': 0, 'unrouted': 0, 'errors': 0}
+
+    def enable(self, data_type: str) -> bool:
+        """
+        Register the parser for a subscribed data type
+
+        Args:
+            data_type: Data type (ticker, trades)
+
+        Returns:
+            True if the exchange format has a parser for it
+        """
+        entry = self.formats.get(data_type)
+        if entry is None:
+            self.logger.warning(f"No {self.exchange} parser for {data_type}; messages fall through")
+            return False
+        event, parser = entry
+        self.parsers[event] = parser
+        return True
+
+    def ingest(self, raw: Any) -> bool:
+        """
+        Decode a raw frame and ingest it
+
+        Args:
+            raw: Frame text or bytes
+
+        Returns:
+            True if a parser consumed the message
+        """
+        return self.ingest_message(loads(raw))
+
+    def ingest_message(self, message: Dict[str, Any]) -> bool:
+        """
+        Ingest a decoded message
+
+        Args:
+            message: Decoded message
+
+        Returns:
+            True if a parser consumed the message; False for messages no
+            subscribed parser handles (confirmations, errors, other types)
+        """
+        self.stats['messages'] += 1
+        event, payload = self.route(message)
+        parser = self.parsers.get(event)
+        if parser is None:
+            self.stats['unrouted'] += 1
+            return False
+        try:
+            parser(payload, self._emit)
+        except (KeyError, ValueError, TypeError) as e:
+            self.stats['errors'] += 1
+            self.logger.error(f"Error parsing {self.exchange} {event} message: {e}")
+        return True
+
+    def _emit(self, symbol: str, ts: int, open: float, high: float, low: float, close: float, volume: float):
+        buffer = self.buffers.get(symbol)
+        if buffer is None:
+            buffer = self.buffers[symbol] = TickRingBuffer(self.capacity)
+        buffer.append(ts, open, high, low, close, volume)
+        self.stats['ticks'] += 1
+        if self.on_tick is not None:
+            self.on_tick(Tick(symbol, ts, open, high, low, close, volume, self.source))
+
+    def latest(self, symbol: str, limit: Optional[int] = None) -> np.ndarray:
+        """Most recent ticks of a symbol, oldest first (empty if none)"""
+        buffer = self.buffers.get(symbol)
+        return buffer.latest(limit) if buffer is not None else np.zeros(0, dtype=TICK_DTYPE)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ingestion statistics"""
+        return {**self.stats, 'symbols': len(self.buffers),
+                'decoder': 'orjson' if orjson is not None else 'json'}
@@ -21,19 +21,25 @@ except ImportError:
     InvalidURI = Exception
 
 from .data_stream import DataStream, StreamStatus
+from .tick_ingest import TickIngestor, loads
 from ...core.interfaces import MarketData
 
 
 class WebSocketClient(DataStream):
     """WebSocket client for real-time data streaming"""
     
-    def __init__(self, stream_id: str, url: str, headers: Optional[Dict[str, str]] = None):
+    exchange_format = 'generic'  # Message format key of tick_ingest.EXCHANGE_FORMATS
+    
+    def __init__(self, stream_id: str, url: str, headers: Optional[Dict[str, str]] = None,
+                 fast_ingest: bool = False, buffer_capacity: int = 4096):
         """Initialize WebSocket client
         
         Args:
             stream_id: Unique stream identifier
             url: WebSocket URL
             headers: Optional headers for connection
+            fast_ingest: Parse ticks with the exchange's TickIngestor parsers
+            buffer_capacity: Ticks kept per symbol by the ingestor
         """
         if websockets is None:
             raise ImportError("websockets library not installed. Please install it with 'pip install websockets'")
@@ -46,6 +52,9 @@ class WebSocketClient(DataStream):
         self.ping_task = None
         self.ping_interval = 30  # seconds
         self.message_handlers: Dict[str, Callable] = {}
+        self._ticks = []  # Ticks the ingestor parsed from the current frame
+        self.ingestor = TickIngestor(self.exchange_format, buffer_capacity, self._ticks.append,
+                                     source=stream_id) if fast_ingest else None
         
     async def connect(self) -> bool:
         """Connect to WebSocket
@@ -150,6 +159,8 @@ class WebSocketClient(DataStream):
         
         await self.send_message(message)
         self.subscribed_symbols.add(symbol)
+        if self.ingestor:
+            self.ingestor.enable(data_type)
         self.logger.info(f"Subscribed to {symbol} {data_type}")
     
     async def unsubscribe(self, symbol: str, data_type: str = "ticker"):
@@ -185,8 +196,12 @@ class WebSocketClient(DataStream):
         try:
             async for message in self.websocket:
                 try:
-                    data = json.loads(message)
-                    await self._handle_message(data)
+                    data = loads(message)
+                    # Ticks take the ingestor's parsers; anything else falls through
+                    if self.ingestor is not None and self.ingestor.ingest_message(data):
+                        await self._publish_ticks()
+                    else:
+                        await self._handle_message(data)
                     self.update_heartbeat()
                 except json.JSONDecodeError as e:
                     self.logger.error(f"Invalid JSON received: {e}")
@@ -226,13 +241,21 @@ class WebSocketClient(DataStream):
             # Parse market data
             market_data = self._parse_market_data(stream_name, stream_data)
             if market_data:
-                self.notify_subscribers("data", market_data)
+                await self.publish("data", market_data)
         
         # Handle custom message types
         message_type = data.get('e') or data.get('type') or 'unknown'
         if message_type in self.message_handlers:
             await self.message_handlers[message_type](data)
     
+    async def _publish_ticks(self):
+        """Deliver the ticks the ingestor parsed from the current frame"""
+        try:
+            for tick in self._ticks:
+                await self.publish("data", tick)
+        finally:
+            self._ticks.clear()
+    
     def _parse_market_data(self, stream_name: str, data: Dict[str, Any]) -> Optional[MarketData]:
         """Parse stream data into MarketData object
         
@@ -288,8 +311,11 @@ class WebSocketClient(DataStream):
 class BinanceWebSocketClient(WebSocketClient):
     """Binance-specific WebSocket client"""
     
-    def __init__(self):
-        super().__init__("binance", "wss://stream.binance.com:9443/ws/")
+    exchange_format = 'binance'
+    
+    def __init__(self, fast_ingest: bool = False, buffer_capacity: int = 4096):
+        super().__init__("binance", "wss://stream.binance.com:9443/ws/",
+                         fast_ingest=fast_ingest, buffer_capacity=buffer_capacity)
     
     async def subscribe(self, symbol: str, data_type: str = "ticker"):
         """Subscribe to Binance stream
@@ -314,14 +340,19 @@ class BinanceWebSocketClient(WebSocketClient):
         
         await self.send_message(message)
         self.subscribed_symbols.add(symbol)
+        if self.ingestor:
+            self.ingestor.enable(data_type)
         self.logger.info(f"Subscribed to Binance {symbol} {data_type}")
 
 
 class BybitWebSocketClient(WebSocketClient):
     """Bybit-specific WebSocket client"""
     
-    def __init__(self):
-        super().__init__("bybit", "wss://stream.bybit.com/v5/public/spot")
+    exchange_format = 'bybit'
+    
+    def __init__(self, fast_ingest: bool = False, buffer_capacity: int = 4096):
+        super().__init__("bybit", "wss://stream.bybit.com/v5/public/spot",
+                         fast_ingest=fast_ingest, buffer_capacity=buffer_capacity)
     
     async def subscribe(self, symbol: str, data_type: str = "ticker"):
         """Subscribe to Bybit stream
@@ -343,4 +374,6 @@ class BybitWebSocketClient(WebSocketClient):
         
         await self.send_message(message)
         self.subscribed_symbols.add(symbol)
+        if self.ingestor:
+            self.ingestor.enable(data_type)
         self.logger.info(f"Subscribed to Bybit {symbol} {data_type}")
\ No newline at end of file
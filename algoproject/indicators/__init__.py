@@ -0,0 +1,21 @@
+"""
+AlgoProject Indicators
+======================
+
+Streaming technical indicators with constant-time updates, and batch NumPy
+counterparts that produce the same values over whole arrays.
+"""
+
+from .streaming import SMA, EMA, RSI, MACD, BollingerBands, ATR, VWAP
+from . import batch
+
+__all__ = [
+    'SMA',
+    'EMA',
+    'RSI',
+    'MACD',
+    'BollingerBands',
+    'ATR',
+    'VWAP',
+    'batch'
+]
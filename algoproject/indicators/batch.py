@@ -0,0 +1,218 @@
+"""
+Batch Indicators
+================
+
+Vectorized NumPy counterparts of the streaming indicators.
+
+Each function takes whole arrays and returns arrays of the same length, with
+NaN wherever the matching streaming indicator is not yet ready. Values are
+identical to feeding the same data bar by bar through
+``algoproject.indicators.streaming``, except Bollinger Bands, whose Welford
+window statistics agree to within floating-point rounding.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Tuple
+
+
+def _as_array(values) -> np.ndarray:
+    """Convert input to a 1-D float64 array"""
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+
+def _check_period(period: int):
+    if period < 1:
+        raise ValueError(f"Period must be at least 1, got {period}")
+
+
+def _seeded_ema(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """Exponential smoothing seeded with the simple average of the first `period` values
+
+    Args:
+        values: Input array
+        period: Seed length
+        alpha: Smoothing factor
+
+    Returns:
+        Smoothed array, NaN before the seed is complete
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+
+    seed = np.cumsum(values[:period])[-1] / period
+    tail = np.concatenate(([seed], values[period:]))
+    out[period - 1:] = pd.Series(tail).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+def sma(values, period: int) -> np.ndarray:
+    """Simple moving average
+
+    Args:
+        values: Input prices
+        period: Window length
+
+    Returns:
+        SMA array
+    """
+    _check_period(period)
+    values = _as_array(values)
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+
+    cumulative = np.cumsum(values)
+    previous = np.concatenate(([0.0], cumulative[:-period]))
+    out[period - 1:] = (cumulative[period - 1:] - previous) / period
+    return out
+
+
+def ema(values, period: int) -> np.ndarray:
+    """Exponential moving average with alpha = 2 / (period + 1), seeded with the SMA
+
+    Args:
+        values: Input prices
+        period: EMA period
+
+    Returns:
+        EMA array
+    """
+    _check_period(period)
+    return _seeded_ema(_as_array(values), period, 2.0 / (period + 1))
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing
+
+    Args:
+        close: Close prices
+        period: RSI period
+
+    Returns:
+        RSI array (0-100), first value available at index ``period``
+    """
+    _check_period(period)
+    close = _as_array(close)
+    out = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return out
+
+    change = np.diff(close)
+    avg_gain = _seeded_ema(np.maximum(change, 0.0), period, 1.0 / period)[period - 1:]
+    avg_loss = _seeded_ema(np.maximum(-change, 0.0), period, 1.0 / period)[period - 1:]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    values[avg_loss == 0] = 100.0
+    values[(avg_loss == 0) & (avg_gain == 0)] = 50.0
+
+    out[period:] = values
+    return out
+
+
+def macd(close, fast_period: int = 12, slow_period: int = 26,
+         signal_period: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Moving Average Convergence Divergence
+
+    Args:
+        close: Close prices
+        fast_period: Fast EMA period
+        slow_period: Slow EMA period
+        signal_period: Signal line EMA period
+
+    Returns:
+        Tuple of (macd line, signal line, histogram)
+    """
+    if fast_period >= slow_period:
+        raise ValueError("fast_period must be shorter than slow_period")
+    close = _as_array(close)
+
+    line = ema(close, fast_period) - ema(close, slow_period)
+    signal = np.full(len(close), np.nan)
+    start = slow_period - 1
+    if len(close) > start:
+        signal[start:] = ema(line[start:], signal_period)
+
+    return line, signal, line - signal
+
+
+def bollinger_bands(close, period: int = 20,
+                    num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands using the population standard deviation of the window
+
+    Args:
+        close: Close prices
+        period: Window length
+        num_std: Band width in standard deviations
+
+    Returns:
+        Tuple of (middle, upper, lower)
+    """
+    _check_period(period)
+    close = _as_array(close)
+    middle = np.full(len(close), np.nan)
+    std = np.full(len(close), np.nan)
+
+    if len(close) >= period:
+        windows = sliding_window_view(close, period)
+        middle[period - 1:] = windows.mean(axis=1)
+        std[period - 1:] = windows.std(axis=1)
+
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range; the first bar uses high - low
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+
+    Returns:
+        True range array
+    """
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    ranges = np.vstack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    return np.fmax.reduce(ranges, axis=0)
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period: ATR period
+
+    Returns:
+        ATR array
+    """
+    _check_period(period)
+    return _seeded_ema(true_range(high, low, close), period, 1.0 / period)
+
+
+def vwap(high, low, close, volume) -> np.ndarray:
+    """Cumulative volume-weighted average of the typical price
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        volume: Volumes
+
+    Returns:
+        VWAP array, NaN until some volume has traded
+    """
+    typical = (_as_array(high) + _as_array(low) + _as_array(close)) / 3.0
+    volume = _as_array(volume)
+    cumulative_volume = np.cumsum(volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.cumsum(typical * volume) / cumulative_volume
+    out[cumulative_volume == 0] = np.nan
+    return out
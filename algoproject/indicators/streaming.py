@@ -0,0 +1,368 @@
+"""
+Streaming Indicators
+====================
+
+Stateful technical indicators with constant-time updates.
+
+Each indicator consumes one bar per ``update`` call and keeps only the state
+it needs, so strategies no longer rebuild price windows on every bar.
+``update`` returns the current value, or None while the indicator warms up.
+"""
+
+import math
+from collections import deque
+from typing import Optional, Tuple
+
+
+def _check_period(period: int):
+    if period < 1:
+        raise ValueError(f"Period must be at least 1, got {period}")
+
+
+class SMA:
+    """Simple moving average
+
+    Keeps a running cumulative sum and the cumulative sums of the last
+    ``period`` bars, so each update is a subtraction and a division.
+    """
+
+    def __init__(self, period: int):
+        """Initialize SMA
+
+        Args:
+            period: Window length
+        """
+        _check_period(period)
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """Clear all state"""
+        self._cumulative = 0.0
+        self._history = deque([0.0], maxlen=self.period + 1)
+        self.count = 0
+        self.value: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, price: float) -> Optional[float]:
+        """Add a price
+
+        Args:
+            price: New price
+
+        Returns:
+            Current SMA, or None during warm-up
+        """
+        self._cumulative += price
+        self._history.append(self._cumulative)
+        self.count += 1
+
+        if self.count >= self.period:
+            self.value = (self._cumulative - self._history[0]) / self.period
+        return self.value
+
+
+class EMA:
+    """Exponential moving average seeded with the SMA of the first bars"""
+
+    def __init__(self, period: int, alpha: Optional[float] = None):
+        """Initialize EMA
+
+        Args:
+            period: EMA period (also the seed length)
+            alpha: Smoothing factor (default 2 / (period + 1))
+        """
+        _check_period(period)
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self._decay = 1.0 - self.alpha
+        self.reset()
+
+    def reset(self):
+        """Clear all state"""
+        self._seed_sum = 0.0
+        self.count = 0
+        self.value: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, price: float) -> Optional[float]:
+        """Add a price
+
+        Args:
+            price: New price
+
+        Returns:
+            Current EMA, or None during warm-up
+        """
+        self.count += 1
+
+        if self.value is not None:
+            self.value = self._decay * self.value + self.alpha * price
+        else:
+            self._seed_sum += price
+            if self.count == self.period:
+                self.value = self._seed_sum / self.period
+        return self.value
+
+
+class RSI:
+    """Relative Strength Index with Wilder smoothing"""
+
+    def __init__(self, period: int = 14):
+        """Initialize RSI
+
+        Args:
+            period: RSI period
+        """
+        _check_period(period)
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """Clear all state"""
+        self._avg_gain = EMA(self.period, alpha=1.0 / self.period)
+        self._avg_loss = EMA(self.period, alpha=1.0 / self.period)
+        self._prev_close: Optional[float] = None
+        self.value: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, close: float) -> Optional[float]:
+        """Add a close price
+
+        Args:
+            close: New close
+
+        Returns:
+            Current RSI (0-100), or None during warm-up
+        """
+        prev_close, self._prev_close = self._prev_close, close
+        if prev_close is None:
+            return None
+
+        change = close - prev_close
+        avg_gain = self._avg_gain.update(max(change, 0.0))
+        avg_loss = self._avg_loss.update(max(-change, 0.0))
+        if avg_gain is None:
+            return None
+
+        if avg_loss == 0:
+            self.value = 100.0 if avg_gain > 0 else 50.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        return self.value
+
+
+class MACD:
+    """Moving Average Convergence Divergence"""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        """Initialize MACD
+
+        Args:
+            fast_period: Fast EMA period
+            slow_period: Slow EMA period
+            signal_period: Signal line EMA period
+        """
+        if fast_period >= slow_period:
+            raise ValueError("fast_period must be shorter than slow_period")
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self.reset()
+
+    def reset(self):
+        """Clear all state"""
+        self._fast = EMA(self.fast_period)
+        self._slow = EMA(self.slow_period)
+        self._signal = EMA(self.signal_period)
+        self.line: Optional[float] = None
+        self.signal: Optional[float] = None
+        self.histogram: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.signal is not None
+
+    def update(self, close: float) -> Optional[Tuple[float, float, float]]:
+        """Add a close price
+
+        Args:
+            close: New close
+
+        Returns:
+            Tuple of (macd line, signal line, histogram), or None until the
+            signal line is available
+        """
+        fast = self._fast.update(close)
+        slow = self._slow.update(close)
+        if slow is None:
+            return None
+
+        self.line = fast - slow
+        self.signal = self._signal.update(self.line)
+        if self.signal is None:
+            return None
+
+        self.histogram = self.line - self.signal
+        return self.line, self.signal, self.histogram
+
+
+class BollingerBands:
+    """Bollinger Bands over a rolling window
+
+    The window mean and variance are maintained with Welford's update,
+    replacing the oldest price with the newest in one step.
+    """
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        """Initialize Bollinger Bands
+
+        Args:
+            period: Window length
+            num_std: Band width in standard deviations
+        """
+        _check_period(period)
+        self.period = period
+        self.num_std = num_std
+        self.reset()
+
+    def reset(self):
+        """Clear all state"""
+        self._window = deque(maxlen=self.period)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.middle: Optional[float] = None
+        self.upper: Optional[float] = None
+        self.lower: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.middle is not None
+
+    @property
+    def std(self) -> Optional[float]:
+        """Population standard deviation of the window"""
+        if not self._window:
+            return None
+        return math.sqrt(max(self._m2, 0.0) / len(self._window))
+
+    def update(self, close: float) -> Optional[Tuple[float, float, float]]:
+        """Add a close price
+
+        Args:
+            close: New close
+
+        Returns:
+            Tuple of (middle, upper, lower), or None during warm-up
+        """
+        if len(self._window) == self.period:
+            oldest = self._window[0]
+            old_mean = self._mean
+            self._mean += (close - oldest) / self.period
+            self._m2 += (close - oldest) * (close - self._mean + oldest - old_mean)
+        else:
+            delta = close - self._mean
+            self._mean += delta / (len(self._window) + 1)
+            self._m2 += delta * (close - self._mean)
+        self._window.append(close)
+
+        if len(self._window) < self.period:
+            return None
+
+        width = self.num_std * self.std
+        self.middle = self._mean
+        self.upper = self._mean + width
+        self.lower = self._mean - width
+        return self.middle, self.upper, self.lower
+
+
+class ATR:
+    """Average True Range with Wilder smoothing"""
+
+    def __init__(self, period: int = 14):
+        """Initialize ATR
+
+        Args:
+            period: ATR period
+        """
+        _check_period(period)
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """Clear all state"""
+        self._average = EMA(self.period, alpha=1.0 / self.period)
+        self._prev_close: Optional[float] = None
+        self.value: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        """Add a bar
+
+        Args:
+            high: Bar high
+            low: Bar low
+            close: Bar close
+
+        Returns:
+            Current ATR, or None during warm-up
+        """
+        true_range = high - low
+        if self._prev_close is not None:
+            true_range = max(true_range, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+
+        self.value = self._average.update(true_range)
+        return self.value
+
+
+class VWAP:
+    """Cumulative volume-weighted average price
+
+    Call ``reset`` at session boundaries for a session VWAP.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear all state"""
+        self._price_volume = 0.0
+        self._volume = 0.0
+        self.value: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, high: float, low: float, close: float, volume: float) -> Optional[float]:
+        """Add a bar
+
+        Args:
+            high: Bar high
+            low: Bar low
+            close: Bar close
+            volume: Bar volume
+
+        Returns:
+            Current VWAP, or None until some volume has traded
+        """
+        typical = (high + low + close) / 3.0
+        self._price_volume += typical * volume
+        self._volume += volume
+
+        if self._volume != 0:
+            self.value = self._price_volume / self._volume
+        return self.value
@@ -8,6 +8,7 @@ Abstract base class for all trading strategies in AlgoProject.
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 from ..core.interfaces import IStrategy, MarketData, Signal, TradingContext
@@ -40,6 +41,48 @@ class BaseStrategy(IStrategy):
         """Process new market data and generate signals"""
         pass
     
+    def on_bar(self, bar: Any) -> List[Signal]:
+        """Process a closed bar from a live engine's bar aggregator (optional)
+        
+        Engines that aggregate streaming ticks into bars call this with each
+        closed ``Bar`` (symbol, timeframe, start, end and OHLCV), so the
+        strategy does not have to re-fetch candles. The default ignores bars.
+        
+        Args:
+            bar: Closed bar
+            
+        Returns:
+            List of signals
+        """
+        return []
+    
+    def generate_signals_batch(self, ohlcv_arrays: Dict[str, np.ndarray]) -> Optional[Dict[str, np.ndarray]]:
+        """Generate signals for a whole symbol history at once (optional)
+        
+        Strategies whose signals depend only on the symbol's own bars can
+        override this with array operations. The backtest engine then places
+        the returned orders directly instead of calling ``next()`` per bar.
+        Return None (the default) to use ``next()``.
+        
+        Args:
+            ohlcv_arrays: Arrays for one symbol keyed by 'timestamp', 'open',
+                'high', 'low', 'close' and 'volume', plus the 'symbol' name
+            
+        Returns:
+            Dictionary with 'action' (1 buy, -1 sell, 0 none per bar) and
+            'quantity' (scalar or per-bar array), or None if not supported
+        """
+        return None
+    
+    def get_lookback(self) -> Optional[int]:
+        """Bars of context history the strategy reads per symbol
+        
+        The backtest engine keeps only this many bars in the context's
+        history (a fixed-size ring buffer per symbol). Return None (the
+        default) to keep every bar.
+        """
+        return None
+    
     def get_parameters(self) -> Dict[str, Any]:
         """Get strategy parameters"""
         return self.parameters.copy()
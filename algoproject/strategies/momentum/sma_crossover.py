@@ -5,22 +5,24 @@ SMA Crossover Strategy
 Simple Moving Average crossover strategy for trend following.
 """
 
-from typing import Dict, Any, List
-import pandas as pd
-from collections import deque
+import logging
+from typing import Dict, Any, List, Tuple
 
 from ..base_strategy import BaseStrategy
 from ...core.interfaces import Signal, MarketData
+from ...indicators import SMA
 
 
 class SMACrossoverStrategy(BaseStrategy):
     """Simple Moving Average Crossover Strategy"""
-    
-    def __init__(self):
-        super().__init__()
-        self.price_history = deque(maxlen=200)  # Keep last 200 prices
-        self.last_signal = None
-    
+
+    def __init__(self, name: str = "SMA Crossover", parameters: Dict[str, Any] = None):
+        super().__init__(name, {**self._default_parameters(), **(parameters or {})})
+        self.logger = logging.getLogger(__name__)
+        self.averages: Dict[str, Tuple[SMA, SMA]] = {}
+        self.previous: Dict[str, Tuple[float, float]] = {}
+        self.last_signal: Dict[str, str] = {}
+
     def _default_parameters(self) -> Dict[str, Any]:
         """Default parameters for SMA crossover"""
         return {
@@ -30,77 +32,85 @@ class SMACrossoverStrategy(BaseStrategy):
             'stop_loss_pct': 0.05,
             'take_profit_pct': 0.10
         }
-    
+
+    def get_lookback(self) -> int:
+        """The averages keep their own windows; no more context history is needed"""
+        return self.parameters['slow_period']
+
+    def next(self, data: MarketData) -> List[Signal]:
+        """Process new market data and generate signals"""
+        return self._generate_signals(data)
+
     def _generate_signals(self, data: MarketData) -> List[Signal]:
         """Generate signals based on SMA crossover"""
         signals = []
-        
-        # Add current price to history
-        self.price_history.append(data.close)
-        
+
+        # Update per-symbol moving averages in constant time
+        if data.symbol not in self.averages:
+            self.averages[data.symbol] = (SMA(self.parameters['fast_period']),
+                                          SMA(self.parameters['slow_period']))
+        fast, slow = self.averages[data.symbol]
+        fast_sma = fast.update(data.close)
+        slow_sma = slow.update(data.close)
+
         # Need enough data for calculation
-        if len(self.price_history) < self.parameters['slow_period']:
+        if slow_sma is None:
             return signals
-        
-        # Calculate SMAs
-        prices = list(self.price_history)
-        fast_sma = sum(prices[-self.parameters['fast_period']:]) / self.parameters['fast_period']
-        slow_sma = sum(prices[-self.parameters['slow_period']:]) / self.parameters['slow_period']
-        
+
         # Previous SMAs for crossover detection
-        if len(self.price_history) >= self.parameters['slow_period'] + 1:
-            prev_prices = prices[:-1]
-            prev_fast_sma = sum(prev_prices[-self.parameters['fast_period']:]) / self.parameters['fast_period']
-            prev_slow_sma = sum(prev_prices[-self.parameters['slow_period']:]) / self.parameters['slow_period']
-            
-            # Detect crossovers
-            bullish_crossover = (fast_sma > slow_sma and prev_fast_sma <= prev_slow_sma)
-            bearish_crossover = (fast_sma < slow_sma and prev_fast_sma >= prev_slow_sma)
-            
-            if bullish_crossover and self.last_signal != 'buy':
-                # Generate buy signal
-                position_size = self.get_position_size(data.symbol, data.close)
-                if position_size > 0:
-                    signal = self._create_signal(
-                        symbol=data.symbol,
-                        action='buy',
-                        quantity=position_size,
-                        price=data.close,
-                        confidence=0.8,
-                        metadata={
-                            'fast_sma': fast_sma,
-                            'slow_sma': slow_sma,
-                            'crossover_type': 'bullish'
-                        }
-                    )
-                    if signal:
-                        signals.append(signal)
-                        self.last_signal = 'buy'
-            
-            elif bearish_crossover and self.last_signal != 'sell':
-                # Generate sell signal
-                current_position = self.context.positions.get(data.symbol, 0)
-                if current_position > 0:
-                    signal = self._create_signal(
-                        symbol=data.symbol,
-                        action='sell',
-                        quantity=current_position,
-                        price=data.close,
-                        confidence=0.8,
-                        metadata={
-                            'fast_sma': fast_sma,
-                            'slow_sma': slow_sma,
-                            'crossover_type': 'bearish'
-                        }
-                    )
-                    if signal:
-                        signals.append(signal)
-                        self.last_signal = 'sell'
-        
+        previous = self.previous.get(data.symbol)
+        self.previous[data.symbol] = (fast_sma, slow_sma)
+        if previous is None:
+            return signals
+        prev_fast_sma, prev_slow_sma = previous
+
+        # Detect crossovers
+        bullish_crossover = (fast_sma > slow_sma and prev_fast_sma <= prev_slow_sma)
+        bearish_crossover = (fast_sma < slow_sma and prev_fast_sma >= prev_slow_sma)
+        last_signal = self.last_signal.get(data.symbol)
+
+        if bullish_crossover and last_signal != 'buy':
+            # Generate buy signal
+            risk_amount = self.context.portfolio_value * self.parameters['risk_per_trade']
+            position_size = self.calculate_position_size(data.symbol, data.close, risk_amount)
+            if position_size > 0:
+                signals.append(self.create_signal(
+                    symbol=data.symbol,
+                    action='buy',
+                    quantity=position_size,
+                    price=data.close,
+                    confidence=0.8,
+                    metadata={
+                        'fast_sma': fast_sma,
+                        'slow_sma': slow_sma,
+                        'crossover_type': 'bullish'
+                    }
+                ))
+                self.last_signal[data.symbol] = 'buy'
+
+        elif bearish_crossover and last_signal != 'sell':
+            # Generate sell signal
+            current_position = self.context.get_position(data.symbol)
+            if current_position > 0:
+                signals.append(self.create_signal(
+                    symbol=data.symbol,
+                    action='sell',
+                    quantity=current_position,
+                    price=data.close,
+                    confidence=0.8,
+                    metadata={
+                        'fast_sma': fast_sma,
+                        'slow_sma': slow_sma,
+                        'crossover_type': 'bearish'
+                    }
+                ))
+                self.last_signal[data.symbol] = 'sell'
+
         return signals
-    
+
     def _on_initialize(self) -> None:
         """Initialize strategy-specific data"""
-        self.price_history.clear()
-        self.last_signal = None
-        self.logger.info(f"SMA Crossover initialized with fast={self.parameters['fast_period']}, slow={self.parameters['slow_period']}")
\ No newline at end of file
+        self.averages.clear()
+        self.previous.clear()
+        self.last_signal.clear()
+        self.logger.info(f"SMA Crossover initialized with fast={self.parameters['fast_period']}, slow={self.parameters['slow_period']}")
@@ -5,8 +5,8 @@ AlgoProject Trading Module
 Live trading components for real exchange integration.
 """
 
-from .live_engine import LiveTradingEngine
+from .live_engine import FeedMode, LiveTradingEngine
 from .demo_engine import DemoTradingEngine
 from .monitoring import TradingMonitor
 
-__all__ = ['LiveTradingEngine', 'DemoTradingEngine', 'TradingMonitor']
\ No newline at end of file
+__all__ = ['LiveTradingEngine', 'FeedMode', 'DemoTradingEngine', 'TradingMonitor']
\ No newline at end of file
@@ -18,6 +18,7 @@ from ..core.risk_manager import RiskManager
 from ..strategies.base_strategy import BaseStrategy
 from ..data.data_loader import DataLoader
 from ..data.streaming.stream_manager import StreamManager
+from ..data.streaming.bar_aggregator import Bar, BarAggregator
 from ..backtesting.portfolio import Portfolio
 
 
@@ -51,7 +52,8 @@ class DemoTradingEngine(ITradingEngine):
     
     def __init__(self, data_loader: DataLoader, stream_manager: StreamManager,
                  initial_capital: float = 100000.0, commission: float = 0.001,
-                 slippage: float = 0.0005):
+                 slippage: float = 0.0005, bar_aggregator: Optional[BarAggregator] = None,
+                 bar_flush_interval: float = 1.0):
         """Initialize demo trading engine
         
         Args:
@@ -60,9 +62,22 @@ class DemoTradingEngine(ITradingEngine):
             initial_capital: Starting capital
             commission: Commission rate
             slippage: Slippage factor
+            bar_aggregator: Builds bars from the stream for strategies' on_bar (optional).
+                            The stream carries ticker snapshots whose volume is a rolling
+                            24h total, so it must use cumulative_volume=True
+            bar_flush_interval: Seconds between closing the time bars of quiet symbols
+
+        Raises:
+            ValueError: If bar_aggregator sums tick volume instead of cumulative volume
         """
+        if bar_aggregator is not None and not bar_aggregator.cumulative_volume:
+            raise ValueError("Ticker volume is a rolling 24h total; "
+                             "use BarAggregator(cumulative_volume=True)")
         self.data_loader = data_loader
         self.stream_manager = stream_manager
+        self.bar_aggregator = bar_aggregator
+        self.bar_flush_interval = bar_flush_interval
+        self.bar_flush_task: Optional[asyncio.Task] = None
         self.initial_capital = initial_capital
         self.commission = commission
         self.slippage = slippage
@@ -117,6 +132,10 @@ class DemoTradingEngine(ITradingEngine):
             # Subscribe to market data events
             self.stream_manager.add_subscriber("data", self._handle_market_data)
             self.stream_manager.add_subscriber("status", self._handle_stream_status)
+            if self.bar_aggregator:
+                self.bar_aggregator.attach(self.stream_manager)
+                self.bar_aggregator.add_subscriber(self._handle_bar)
+                self.bar_flush_task = asyncio.create_task(self._bar_flush_loop())
             
             # Start main trading loop
             asyncio.create_task(self._trading_loop())
@@ -141,6 +160,17 @@ class DemoTradingEngine(ITradingEngine):
             
             # Stop stream manager
             await self.stream_manager.stop()
+            if self.bar_flush_task:
+                self.bar_flush_task.cancel()
+                try:
+                    await self.bar_flush_task
+                except asyncio.CancelledError:
+                    pass
+                self.bar_flush_task = None
+            if self.bar_aggregator:
+                self.bar_aggregator.detach(self.stream_manager)
+                self.bar_aggregator.remove_subscriber(self._handle_bar)
+                await self.bar_aggregator.stop()
             
             self.logger.info("Demo trading engine stopped")
             
@@ -343,6 +373,15 @@ class DemoTradingEngine(ITradingEngine):
         except Exception as e:
             self.logger.error(f"Error in trading loop: {e}")
     
+    async def _bar_flush_loop(self):
+        """Close and publish time bars that ended without a later tick"""
+        while self.is_running:
+            await asyncio.sleep(self.bar_flush_interval)
+            try:
+                await self.bar_aggregator.flush()
+            except Exception as e:
+                self.logger.error(f"Error flushing bars: {e}")
+
     async def _handle_market_data(self, data: MarketData):
         """Handle incoming market data"""
         try:
@@ -367,6 +406,17 @@ class DemoTradingEngine(ITradingEngine):
         except Exception as e:
             self.logger.error(f"Error handling market data: {e}")
     
+    async def _handle_bar(self, bar: Bar):
+        """Handle a closed bar from the bar aggregator"""
+        try:
+            for strategy_name in self.active_strategies:
+                if strategy_name in self.strategies:
+                    for signal in self.strategies[strategy_name].on_bar(bar):
+                        await self._execute_signal(signal)
+            
+        except Exception as e:
+            self.logger.error(f"Error handling bar: {e}")
+    
     async def _handle_stream_status(self, status_data: Dict[str, Any]):
         """Handle stream status changes"""
         self.logger.info(f"Stream status update: {status_data}")
@@ -379,7 +429,8 @@ class DemoTradingEngine(ITradingEngine):
                 signal=signal,
                 portfolio_value=self.portfolio.get_total_value(),
                 current_positions=self.portfolio.positions,
-                market_data=self.current_data
+                market_data=self.current_data,
+                current_exposure=self.portfolio.get_total_exposure()
             )
             
             if not is_valid:
@@ -3,17 +3,29 @@ Live Trading Engine
 ==================
 
 Real exchange integration for live trading.
+
+Market data reaches strategies in one of two feed modes: POLL fetches
+each traded symbol once per interval from the data loader, PUSH takes
+every tick from a StreamManager as it arrives. Either way a tick is
+routed through a symbol -> strategies index to only the strategies that
+trade it, and the time from receiving a tick to having executed its
+signals is recorded per tick.
 """
 
 import logging
 import asyncio
+import time
+from collections import deque
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from enum import Enum
 
+import numpy as np
+
 from ..core.interfaces import ITradingEngine, Signal, MarketData
 from ..security.api_key_manager import APIKeyManager
 from ..data.data_loader import DataLoader
+from ..data.streaming.stream_manager import StreamManager
 from ..strategies.base_strategy import BaseStrategy
 
 
@@ -24,27 +36,49 @@ class TradingMode(Enum):
     SANDBOX = "sandbox"
 
 
+class FeedMode(Enum):
+    """How market data reaches the strategies"""
+    POLL = "poll"  # Fetch each symbol from the data loader every poll interval
+    PUSH = "push"  # Dispatch StreamManager ticks as they arrive
+
+
 class LiveTradingEngine(ITradingEngine):
     """Live trading engine with real exchange integration"""
     
-    def __init__(self, api_key_manager: APIKeyManager, data_loader: DataLoader):
+    def __init__(self, api_key_manager: APIKeyManager, data_loader: DataLoader,
+                 stream_manager: Optional[StreamManager] = None,
+                 poll_interval: float = 1.0, latency_window: int = 10000):
         """Initialize live trading engine
         
         Args:
             api_key_manager: API key manager for secure credentials
             data_loader: Data loader for market data
+            stream_manager: Running stream manager; when given, ticks are
+                            pushed to strategies instead of polled
+            poll_interval: Seconds between polls in POLL mode
+            latency_window: Number of recent ticks latency statistics cover
         """
         self.api_key_manager = api_key_manager
         self.data_loader = data_loader
+        self.stream_manager = stream_manager
+        self.feed_mode = FeedMode.PUSH if stream_manager is not None else FeedMode.POLL
+        self.poll_interval = poll_interval
         self.logger = logging.getLogger(__name__)
         
         # Trading state
         self.is_running = False
         self.trading_mode = TradingMode.PAPER
-        self.active_strategies: Dict[str, BaseStrategy] = {}
+        self.active_strategies: Dict[str, Dict[str, Any]] = {}
+        self.symbol_strategies: Dict[str, List[str]] = {}  # symbol -> strategy ids
+        self._strategy_counter = 0
         self.positions: Dict[str, float] = {}
         self.orders: Dict[str, Dict[str, Any]] = {}
         
+        # Tick-to-signal latency
+        self.latencies: deque = deque(maxlen=latency_window)
+        self.ticks_processed = 0
+        self.ticks_ignored = 0
+        
         # Performance tracking
         self.total_trades = 0
         self.successful_trades = 0
@@ -67,10 +101,17 @@ class LiveTradingEngine(ITradingEngine):
             self.start_time = datetime.now()
             self.emergency_stop = False
             
-            self.logger.info(f"Live trading engine started in {self.trading_mode.value} mode")
+            self.logger.info(f"Live trading engine started in {self.trading_mode.value} mode "
+                             f"({self.feed_mode.value} feed)")
             
-            # Start main trading loop
-            asyncio.create_task(self._trading_loop())
+            if self.feed_mode == FeedMode.PUSH:
+                # Ticks arrive through the stream manager; one subscription per symbol
+                self.stream_manager.add_subscriber("data", self._on_market_data)
+                for symbol in self.symbol_strategies:
+                    asyncio.create_task(self.stream_manager.subscribe_symbol(symbol))
+            else:
+                # Start main trading loop
+                asyncio.create_task(self._trading_loop())
             
         except Exception as e:
             self.logger.error(f"Failed to start trading engine: {e}")
@@ -81,6 +122,8 @@ class LiveTradingEngine(ITradingEngine):
         """Stop the live trading engine"""
         try:
             self.is_running = False
+            if self.feed_mode == FeedMode.PUSH:
+                self.stream_manager.remove_subscriber("data", self._on_market_data)
             self.logger.info("Live trading engine stopped")
             
             # Close all positions if in live mode
@@ -104,8 +147,38 @@ class LiveTradingEngine(ITradingEngine):
             'success_rate': self.successful_trades / max(self.total_trades, 1),
             'total_pnl': self.total_pnl,
             'positions': len(self.positions),
-            'emergency_stop': self.emergency_stop
+            'emergency_stop': self.emergency_stop,
+            'feed_mode': self.feed_mode.value,
+            'symbols': len(self.symbol_strategies),
+            'latency': self.get_latency_stats()
+        }
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """Get tick-to-signal latency statistics
+        
+        Latency runs from the engine receiving a tick to every subscribed
+        strategy having processed it and its signals having executed.
+        
+        Returns:
+            Dictionary with tick counts and latency percentiles in microseconds
+            over the most recent ticks
+        """
+        stats = {
+            'ticks_processed': self.ticks_processed,
+            'ticks_ignored': self.ticks_ignored,
+            'window': len(self.latencies)
         }
+        if self.latencies:
+            samples = np.fromiter(self.latencies, dtype=float, count=len(self.latencies)) * 1e6
+            p50, p99 = np.percentile(samples, [50, 99])
+            stats.update({
+                'last_us': float(samples[-1]),
+                'mean_us': float(samples.mean()),
+                'p50_us': float(p50),
+                'p99_us': float(p99),
+                'max_us': float(samples.max())
+            })
+        return stats
     
     def add_strategy(self, strategy: BaseStrategy, symbols: List[str]) -> str:
         """Add strategy to live trading
@@ -118,7 +191,9 @@ class LiveTradingEngine(ITradingEngine):
             Strategy ID
         """
         try:
-            strategy_id = f"{strategy.name}_{len(self.active_strategies)}"
+            # A counter, not the live count, so ids stay unique after removals
+            strategy_id = f"{strategy.name}_{self._strategy_counter}"
+            self._strategy_counter += 1
             
             # Initialize strategy
             from ..backtesting.backtest_context import BacktestContext
@@ -134,6 +209,14 @@ class LiveTradingEngine(ITradingEngine):
                 'trades_executed': 0
             }
             
+            # Index it by symbol; a new symbol needs its one stream subscription
+            for symbol in dict.fromkeys(symbols):
+                if symbol not in self.symbol_strategies:
+                    self.symbol_strategies[symbol] = []
+                    if self.is_running and self.feed_mode == FeedMode.PUSH:
+                        asyncio.create_task(self.stream_manager.subscribe_symbol(symbol))
+                self.symbol_strategies[symbol].append(strategy_id)
+            
             self.logger.info(f"Added strategy {strategy.name} for symbols {symbols}")
             return strategy_id
             
@@ -152,7 +235,13 @@ class LiveTradingEngine(ITradingEngine):
         """
         try:
             if strategy_id in self.active_strategies:
-                del self.active_strategies[strategy_id]
+                strategy_data = self.active_strategies.pop(strategy_id)
+                for symbol in dict.fromkeys(strategy_data['symbols']):
+                    self.symbol_strategies[symbol].remove(strategy_id)
+                    if not self.symbol_strategies[symbol]:
+                        del self.symbol_strategies[symbol]
+                        if self.is_running and self.feed_mode == FeedMode.PUSH:
+                            asyncio.create_task(self.stream_manager.unsubscribe_symbol(symbol))
                 self.logger.info(f"Removed strategy {strategy_id}")
                 return True
             return False
@@ -218,46 +307,61 @@ class LiveTradingEngine(ITradingEngine):
         
         # Stop all strategies
         self.active_strategies.clear()
+        self.symbol_strategies.clear()
     
     async def _trading_loop(self):
-        """Main trading loop"""
+        """Polling loop: fetch each traded symbol once and dispatch it"""
         try:
             while self.is_running:
                 if self.emergency_stop:
                     break
                 
-                # Process each active strategy
-                for strategy_id, strategy_data in self.active_strategies.items():
+                for symbol in list(self.symbol_strategies):
                     try:
-                        await self._process_strategy(strategy_id, strategy_data)
+                        market_data = self.data_loader.get_live_data(symbol)
                     except Exception as e:
-                        self.logger.error(f"Error processing strategy {strategy_id}: {e}")
+                        self.logger.error(f"Error fetching live data for {symbol}: {e}")
+                        continue
+                    if market_data:
+                        self._dispatch(market_data)
                 
                 # Sleep before next iteration
-                await asyncio.sleep(1)  # 1 second intervals
+                await asyncio.sleep(self.poll_interval)
                 
         except Exception as e:
             self.logger.error(f"Error in trading loop: {e}")
         finally:
             self.is_running = False
     
-    async def _process_strategy(self, strategy_id: str, strategy_data: Dict[str, Any]):
-        """Process individual strategy"""
-        strategy = strategy_data['strategy']
-        symbols = strategy_data['symbols']
+    def _on_market_data(self, data: MarketData):
+        """StreamManager data subscriber (push mode)
+        
+        Synchronous, so the stream manager calls it inline for each tick
+        rather than scheduling a task.
+        """
+        if self.is_running and not self.emergency_stop:
+            self._dispatch(data)
+    
+    def _dispatch(self, market_data: MarketData):
+        """Run one tick through the strategies trading its symbol
         
-        for symbol in symbols:
+        Args:
+            market_data: Latest market data for a symbol
+        """
+        received = time.perf_counter()
+        strategy_ids = self.symbol_strategies.get(market_data.symbol)
+        if not strategy_ids:
+            self.ticks_ignored += 1
+            return
+        
+        for strategy_id in strategy_ids:
+            strategy_data = self.active_strategies[strategy_id]
             try:
-                # Get latest market data
-                market_data = self.data_loader.get_live_data(symbol)
-                if not market_data:
-                    continue
-                
                 # Generate signals
-                signals = strategy.next(market_data)
+                signals = strategy_data['strategy'].next(market_data)
                 
                 # Execute signals
-                for signal in signals:
+                for signal in signals or []:
                     result = self.execute_signal(signal)
                     if result.get('success'):
                         strategy_data['trades_executed'] += 1
@@ -265,7 +369,10 @@ class LiveTradingEngine(ITradingEngine):
                     strategy_data['signals_generated'] += 1
                 
             except Exception as e:
-                self.logger.error(f"Error processing {symbol} for strategy {strategy_id}: {e}")
+                self.logger.error(f"Error processing {market_data.symbol} for strategy {strategy_id}: {e}")
+        
+        self.ticks_processed += 1
+        self.latencies.append(time.perf_counter() - received)
     
     def _validate_signal(self, signal: Signal) -> bool:
         """Validate trading signal"""
@@ -10,6 +10,13 @@ from typing import Dict, Optional, Any, List
 from dataclasses import dataclass
 from enum import Enum
 import asyncio
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto.exchange_pool import ExchangePool, exchange_pool
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -37,8 +44,9 @@ class ExchangeConfig:
 class CCXTService:
     """CCXT Service with tiered authentication support"""
     
-    def __init__(self):
+    def __init__(self, pool: Optional[ExchangePool] = None):
         self.ccxt = None
+        self.pool = pool or exchange_pool
         self.exchanges: Dict[str, Any] = {}
         self.supported_exchanges = [
             'binance', 'coinbase', 'kraken', 'kucoin', 
@@ -68,16 +76,13 @@ class CCXTService:
             bool: True if initialization successful
         """
         try:
-            ccxt_lib = self._ensure_ccxt()
+            self._ensure_ccxt()
             
             # Validate exchange support
             if config.exchange_id not in self.supported_exchanges:
                 logger.error(f"❌ Exchange {config.exchange_id} not supported")
                 return False
             
-            # Get exchange class
-            exchange_class = getattr(ccxt_lib, config.exchange_id)
-            
             # Base configuration
             exchange_config = {
                 'enableRateLimit': True,
@@ -121,13 +126,13 @@ class CCXTService:
                 if config.credentials.passphrase:
                     exchange_config['passphrase'] = config.credentials.passphrase
             
-            # Initialize exchange
-            exchange = exchange_class(exchange_config)
+            # Reuse the pooled client for this exchange and configuration
+            exchange = self.pool.get_client(config.exchange_id, exchange_config)
             
-            # Test connection (public markets)
+            # Test connection (public markets, cached on disk by the pool)
             try:
                 markets = await asyncio.get_event_loop().run_in_executor(
-                    None, exchange.load_markets
+                    None, self.pool.get_markets, config.exchange_id, exchange
                 )
                 logger.info(f"✅ {config.exchange_id} connected - {len(markets)} markets loaded")
                 
@@ -157,7 +162,7 @@ class CCXTService:
         """Test account access for live trading"""
         try:
             balance = await asyncio.get_event_loop().run_in_executor(
-                None, exchange.fetch_balance
+                None, self.pool.call, exchange_id, exchange.fetch_balance
             )
             logger.info(f"✅ {exchange_id} account access verified")
         except Exception as e:
@@ -202,7 +207,7 @@ class CCXTService:
             
             # Fetch OHLCV data (public endpoint, no credentials needed)
             ohlcv = await asyncio.get_event_loop().run_in_executor(
-                None, exchange.fetch_ohlcv, symbol, timeframe, None, limit
+                None, self.pool.call, exchange_id, exchange.fetch_ohlcv, symbol, timeframe, None, limit
             )
             
             logger.info(f"📊 Fetched {len(ohlcv)} {timeframe} candles for {symbol} from {exchange_id}")
@@ -242,7 +247,7 @@ class CCXTService:
             
             # Place order
             order = await asyncio.get_event_loop().run_in_executor(
-                None, exchange.create_order, symbol, order_type, side, amount, price
+                None, self.pool.call, exchange_id, exchange.create_order, symbol, order_type, side, amount, price
             )
             
             logger.info(f"📝 Order placed on {exchange_id}: {side} {amount} {symbol} @ {price}")
@@ -26,11 +26,19 @@ from fyers_user_service import (
 from settings_api import router as settings_router
 
 # Import Market Data API router
-from market_data_api import router as market_data_router
+from market_data_api import router as market_data_router, quote_cache, quote_engine
 
 # Import User Preferences API router
 from user_preferences_api import router as user_preferences_router
 
+# Import WebSocket broadcaster
+from ws_broadcaster import WebSocketBroadcaster, price_topic
+
+# Import backtest job service (market_data_api puts the project root on the path)
+from algoproject.backtesting.job_service import BacktestJobService, BacktestJobSpec, JobQueueFullError
+from algoproject.backtesting.result_cache import DEFAULT_RESULT_CACHE_DIR
+from crypto.history_fetcher import create_history_data_loader
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -64,6 +72,9 @@ class BacktestRequest(BaseModel):
     start_date: date = Field(..., description="Backtest start date")
     end_date: date = Field(..., description="Backtest end date")
     initial_capital: float = Field(10000, description="Initial capital amount")
+    symbols: Optional[List[str]] = Field(None, description="Symbols to trade together (overrides symbol)")
+    timeframe: str = Field("1d", description="Bar timeframe")
+    parameters: Dict[str, Any] = Field(default_factory=dict, description="Strategy parameters")
 
 class BacktestResults(BaseModel):
     metrics: Dict[str, float]
@@ -135,46 +146,17 @@ class OrderRequest(BaseModel):
     amount: float = Field(..., description="Order amount")
     price: Optional[float] = Field(None, description="Order price (for limit orders)")
 
-# WebSocket Connection Manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+# WebSocket broadcaster: per-client queues and topic subscriptions
+manager = WebSocketBroadcaster()
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"✅ WebSocket client connected. Total connections: {len(self.active_connections)}")
+# Backtests run in worker processes; job events are relayed to the 'backtest' topic
+backtest_jobs = BacktestJobService(create_history_data_loader, max_workers=2, max_queued=16,
+                                   result_cache_dir=DEFAULT_RESULT_CACHE_DIR)
 
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        logger.info(f"❌ WebSocket client disconnected. Total connections: {len(self.active_connections)}")
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        try:
-            await websocket.send_text(message)
-        except Exception as e:
-            logger.error(f"Failed to send personal message: {e}")
-
-    async def broadcast(self, message: dict):
-        if not self.active_connections:
-            return
-        
-        message_str = json.dumps(message)
-        disconnected = []
-        
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_str)
-            except Exception as e:
-                logger.error(f"Failed to broadcast to connection: {e}")
-                disconnected.append(connection)
-        
-        # Remove disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
-
-manager = ConnectionManager()
+# Strategy names accepted by POST /backtest
+BACKTEST_STRATEGIES = {
+    "sma_crossover": "algoproject.strategies.momentum.sma_crossover.SMACrossoverStrategy"
+}
 
 # Global state (In production, use proper database)
 trading_status = TradingStatus(is_active=False, positions_count=0)
@@ -199,7 +181,10 @@ async def health_check():
             "api": "running",
             "websocket": "running",
             "trading_engine": "ready"
-        }
+        },
+        "websocket": manager.get_stats(),
+        "quote_cache": quote_cache.get_stats(),
+        "backtest_jobs": backtest_jobs.get_stats()
     }
 
 @app.get("/portfolio", response_model=Portfolio)
@@ -225,78 +210,58 @@ async def get_portfolio():
         logger.error(f"Failed to get portfolio: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve portfolio")
 
-@app.post("/backtest", response_model=BacktestResults)
+@app.post("/backtest")
 async def run_backtest(request: BacktestRequest):
-    """Execute strategy backtest"""
+    """Queue a strategy backtest; progress and results arrive on the 'backtest' topic"""
+    strategy_path = BACKTEST_STRATEGIES.get(request.strategy)
+    if strategy_path is None:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy: {request.strategy}")
+    spec = BacktestJobSpec(
+        strategy=strategy_path,
+        symbols=request.symbols or [request.symbol],
+        start_date=datetime.combine(request.start_date, datetime.min.time()),
+        end_date=datetime.combine(request.end_date, datetime.min.time()),
+        timeframe=request.timeframe,
+        parameters=request.parameters,
+        initial_capital=request.initial_capital,
+        exchange=request.exchange,
+        strategy_name=request.strategy
+    )
     try:
-        logger.info(f"🧪 Starting backtest: {request.strategy} on {request.symbol}")
-        
-        # Simulate backtest execution
-        await asyncio.sleep(0.5)  # Simulate processing time
-        
-        # Generate sample backtest results
-        days = (request.end_date - request.start_date).days
-        equity_curve = []
-        current_value = request.initial_capital
-        
-        for i in range(days):
-            # Simulate random walk with positive drift
-            daily_return = np.random.normal(0.001, 0.02)  # 0.1% daily return, 2% volatility
-            current_value *= (1 + daily_return)
-            equity_curve.append(current_value)
-        
-        # Calculate metrics
-        returns = np.array(equity_curve[1:]) / np.array(equity_curve[:-1]) - 1
-        total_return = (equity_curve[-1] / request.initial_capital - 1) * 100
-        
-        # Calculate Sharpe ratio (simplified)
-        sharpe_ratio = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0
-        
-        # Calculate max drawdown
-        running_max = np.maximum.accumulate(equity_curve)
-        drawdowns = (np.array(equity_curve) - running_max) / running_max
-        max_drawdown = np.min(drawdowns) * 100
-        
-        # Win rate (simplified)
-        win_rate = len(returns[returns > 0]) / len(returns) * 100 if len(returns) > 0 else 0
-        
-        results = BacktestResults(
-            metrics={
-                "total_return": round(total_return, 2),
-                "sharpe_ratio": round(sharpe_ratio, 2),
-                "max_drawdown": round(max_drawdown, 2),
-                "win_rate": round(win_rate, 2),
-                "total_trades": np.random.randint(50, 200),
-                "profitable_trades": np.random.randint(30, 120)
-            },
-            equity_curve=equity_curve,
-            trades=[],  # Simplified for now
-            summary={
-                "strategy": request.strategy,
-                "symbol": request.symbol,
-                "exchange": request.exchange,
-                "duration_days": days,
-                "initial_capital": request.initial_capital,
-                "final_value": equity_curve[-1]
-            }
-        )
-        
-        # Broadcast backtest completion
-        await manager.broadcast({
-            "type": "backtest_complete",
-            "data": {
-                "strategy": request.strategy,
-                "symbol": request.symbol,
-                "total_return": total_return
-            }
-        })
-        
-        logger.info(f"✅ Backtest completed: {total_return:.2f}% return")
-        return results
-        
-    except Exception as e:
-        logger.error(f"❌ Backtest failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Backtest execution failed: {str(e)}")
+        job_id = backtest_jobs.submit(spec)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"🧪 Queued backtest {job_id}: {request.strategy} on {spec.symbols}")
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/backtest/{job_id}")
+async def get_backtest(job_id: str):
+    """Get a backtest job's status and summary"""
+    job = backtest_jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return job
+
+@app.get("/backtest/{job_id}/results")
+async def get_backtest_results(job_id: str, section: str = "trade_log", offset: int = 0, limit: int = 500):
+    """Get a page of a completed backtest's trade log, equity curve or per-bar equity"""
+    try:
+        page = await asyncio.to_thread(backtest_jobs.get_results, job_id, section, offset, min(limit, 5000))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page is None:
+        raise HTTPException(status_code=404, detail="Backtest results not available")
+    return page
+
+@app.delete("/backtest/{job_id}")
+async def cancel_backtest(job_id: str):
+    """Cancel a queued or running backtest"""
+    if not backtest_jobs.cancel(job_id):
+        raise HTTPException(status_code=404, detail="No active backtest job with this id")
+    return {"job_id": job_id, "status": "cancelling"}
 
 @app.get("/strategies", response_model=List[Strategy])
 async def get_strategies():
@@ -346,7 +311,7 @@ async def deploy_strategy(strategy_data: dict):
         # Simulate strategy deployment
         await asyncio.sleep(0.5)
         
-        await manager.broadcast({
+        manager.publish("trading", {
             "type": "strategy_deployed",
             "data": {"strategy_id": strategy_id, "status": "deployed"}
         })
@@ -397,7 +362,7 @@ async def close_position(position_id: str):
         # Simulate position closing
         await asyncio.sleep(0.5)
         
-        await manager.broadcast({
+        manager.publish("trading", {
             "type": "position_closed",
             "data": {"position_id": position_id, "status": "closed"}
         })
@@ -417,7 +382,7 @@ async def start_trading():
         
         logger.info("▶️ Live trading started")
         
-        await manager.broadcast({
+        manager.publish("trading", {
             "type": "trading_status",
             "data": {"status": "started", "timestamp": datetime.now().isoformat()}
         })
@@ -437,7 +402,7 @@ async def stop_trading():
         
         logger.info("⏹️ Live trading stopped")
         
-        await manager.broadcast({
+        manager.publish("trading", {
             "type": "trading_status",
             "data": {"status": "stopped", "timestamp": datetime.now().isoformat()}
         })
@@ -453,7 +418,7 @@ async def pause_trading():
     try:
         logger.info("⏸️ Live trading paused")
         
-        await manager.broadcast({
+        manager.publish("trading", {
             "type": "trading_status",
             "data": {"status": "paused", "timestamp": datetime.now().isoformat()}
         })
@@ -905,10 +870,10 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     try:
         # Send initial connection confirmation
-        await websocket.send_text(json.dumps({
+        manager.send(websocket, {
             "type": "connection_established",
             "data": {"message": "Connected to trading platform", "timestamp": datetime.now().isoformat()}
-        }))
+        })
         
         # Keep connection alive and handle incoming messages
         while True:
@@ -919,20 +884,27 @@ async def websocket_endpoint(websocket: WebSocket):
                 
                 # Handle different message types
                 if message.get("type") == "ping":
-                    await websocket.send_text(json.dumps({"type": "pong", "timestamp": datetime.now().isoformat()}))
+                    manager.send(websocket, {"type": "pong", "timestamp": datetime.now().isoformat()})
                 elif message.get("type") == "subscribe":
-                    # Handle subscription requests
-                    await websocket.send_text(json.dumps({
+                    # Route topics (price:<symbol>, portfolio, backtest, trading) to this client
+                    channels = manager.subscribe(websocket, message.get("channels", []))
+                    manager.send(websocket, {
+                        "type": "subscription_confirmed",
+                        "data": {"channels": channels}
+                    })
+                elif message.get("type") == "unsubscribe":
+                    channels = manager.unsubscribe(websocket, message.get("channels", []))
+                    manager.send(websocket, {
                         "type": "subscription_confirmed",
-                        "data": {"channels": message.get("channels", [])}
-                    }))
+                        "data": {"channels": channels}
+                    })
                     
             except asyncio.TimeoutError:
                 # Send periodic updates even if no client messages
-                await websocket.send_text(json.dumps({
+                manager.send(websocket, {
                     "type": "heartbeat",
                     "timestamp": datetime.now().isoformat()
-                }))
+                })
                 
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -945,10 +917,23 @@ async def websocket_endpoint(websocket: WebSocket):
 async def startup_event():
     """Start background tasks"""
     asyncio.create_task(periodic_updates())
+
+    # Job events come from the service's threads; publish them on the event loop
+    loop = asyncio.get_running_loop()
+    backtest_jobs.add_listener(
+        lambda message: loop.call_soon_threadsafe(manager.publish, "backtest", message)
+    )
     logger.info("🚀 Institution Grade Algo Trading Platform API started")
     logger.info("📡 WebSocket server ready for connections")
     logger.info("🔗 API documentation available at http://localhost:8000/docs")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the backtest workers and the quote engine's threads"""
+    backtest_jobs.shutdown(wait=False)
+    if quote_engine:
+        quote_engine.close(wait=False)
+
 async def periodic_updates():
     """Send periodic updates to connected clients"""
     while True:
@@ -964,18 +949,19 @@ async def periodic_updates():
                     "timestamp": datetime.now().isoformat()
                 }
             }
-            await manager.broadcast(portfolio_update)
+            manager.publish("portfolio", portfolio_update)
             
-            # Send price updates
-            price_update = {
-                "type": "price_update",
-                "data": {
-                    "BTC/USDT": 45000 + np.random.normal(0, 1000),
-                    "ETH/USDT": 3000 + np.random.normal(0, 100),
-                    "timestamp": datetime.now().isoformat()
-                }
+            # Send price updates, one topic per symbol
+            prices = {
+                "BTC/USDT": 45000 + np.random.normal(0, 1000),
+                "ETH/USDT": 3000 + np.random.normal(0, 100)
             }
-            await manager.broadcast(price_update)
+            timestamp = datetime.now().isoformat()
+            for symbol, price in prices.items():
+                manager.publish(price_topic(symbol), {
+                    "type": "price_update",
+                    "data": {symbol: price, "timestamp": timestamp}
+                })
             
         except Exception as e:
             logger.error(f"Error in periodic updates: {e}")
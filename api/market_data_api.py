@@ -12,6 +12,7 @@ This allows development and testing without FYERS API subscription.
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 import sys
 import os
@@ -25,11 +26,15 @@ logger = logging.getLogger(__name__)
 # This provides real-time NSE market data without any configuration
 try:
     from stocks.nse_free_data_provider import NSEFreeDataProvider
+    from stocks.nse_quote_engine import AsyncQuoteEngine
     nse_provider = NSEFreeDataProvider()
+    # Concurrent quote fan-out so large watchlists don't block the event loop
+    quote_engine = AsyncQuoteEngine(nse_provider)
     logger.info("✅ NSE Free Data Provider loaded successfully (NO CONFIG NEEDED)")
 except Exception as e:
     logger.error(f"❌ Failed to load NSE Free Provider: {e}")
     nse_provider = None
+    quote_engine = None
 
 # ===== FYERS PROVIDER (SECONDARY - ONLY FOR TRADING) =====
 # This is OPTIONAL and only needed for actual order execution
@@ -63,6 +68,27 @@ except ImportError:
         def get_nifty_option_chain(expiry="current"):
             return {"data": []}
 
+# ===== SHARED QUOTE CACHE =====
+# Identical requests from many tabs/widgets hit upstream once per TTL.
+# When the market is closed, expired quotes are served stale and refreshed
+# in the background.
+try:
+    from api.quote_cache import QuoteCache
+except ImportError:
+    from quote_cache import QuoteCache
+
+try:
+    try:
+        from api.market_hours import should_fetch_live_data
+    except ImportError:
+        from market_hours import should_fetch_live_data
+except ImportError as e:
+    logger.warning(f"Market hours not available, treating the market as open: {e}")
+    should_fetch_live_data = None
+
+QUOTE_CACHE_TTL = 2.0  # seconds
+quote_cache = QuoteCache(ttl=QUOTE_CACHE_TTL, is_live=should_fetch_live_data)
+
 router = APIRouter(prefix="/api/market", tags=["Market Data"])
 
 # Data Models
@@ -86,7 +112,8 @@ async def health_check():
         return {
             "status": "ok",
             "message": "Market data service is operational",
-            "market_status": data.get("market_status", {})
+            "market_status": data.get("market_status", {}),
+            "quote_cache": quote_cache.get_stats()
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -125,21 +152,36 @@ async def get_quotes(request: QuoteRequest):
     Data Source Priority:
     1. NSE Free Provider (real-time NSE data - NO CONFIG)
     2. FYERS Provider (if configured - for trading)
+    
+    Symbols are fetched concurrently; any still pending after the engine's
+    timeout are left out of the response. Each quote's `data_source` tells
+    where it came from (NSE_FREE, YAHOO_FINANCE or MOCK). Quotes are cached
+    for QUOTE_CACHE_TTL seconds.
     """
     try:
         # PRIMARY: Use FREE NSE provider (no credentials needed)
-        if nse_provider:
-            quotes = nse_provider.get_quote(request.symbols, request.exchange)
+        if quote_engine:
+            async def fetch_nse(symbols):
+                return await quote_engine.get_quotes(symbols, request.exchange)
+            
+            quotes = await quote_cache.get_many(f"nse:{request.exchange}", request.symbols, fetch_nse)
             logger.info(f"✅ Fetched quotes for {len(quotes)} symbols from FREE NSE provider")
             return quotes
         
         # SECONDARY: Use FYERS if NSE provider fails (requires credentials)
         elif fyers_provider:
-            quotes = {}
-            for symbol in request.symbols:
-                quote = fyers_provider.get_quote(symbol, request.exchange)
-                if quote:
-                    quotes[symbol] = quote
+            def fetch_fyers_sync(symbols):
+                quotes = {}
+                for symbol in symbols:
+                    quote = fyers_provider.get_quote(symbol, request.exchange)
+                    if quote:
+                        quotes[symbol] = quote
+                return quotes
+            
+            async def fetch_fyers(symbols):
+                return await asyncio.to_thread(fetch_fyers_sync, symbols)
+            
+            quotes = await quote_cache.get_many(f"fyers:{request.exchange}", request.symbols, fetch_fyers)
             logger.info(f"Fetched quotes using FYERS provider")
             return quotes
         
@@ -204,7 +246,13 @@ async def get_indices():
     try:
         # PRIMARY: Use FREE NSE provider
         if nse_provider:
-            indices_data = nse_provider.get_nifty_indices()
+            async def fetch_indices():
+                return await asyncio.to_thread(nse_provider.get_nifty_indices)
+            
+            async def fetch_status():
+                return await asyncio.to_thread(nse_provider.get_market_status)
+            
+            indices_data = await quote_cache.get("nse:indices", "NIFTY_INDICES", fetch_indices) or {}
             
             # Convert to frontend format
             indices = []
@@ -222,7 +270,7 @@ async def get_indices():
                 })
             
             # Get market status
-            market_status = nse_provider.get_market_status()
+            market_status = await quote_cache.get("nse:indices", "MARKET_STATUS", fetch_status)
             
             logger.info(f"✅ Fetched {len(indices)} indices from FREE NSE provider")
             
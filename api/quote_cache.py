@@ -0,0 +1,222 @@
+"""
+Quote Cache
+===========
+
+Short-TTL cache shared by the market data routes.
+
+Dashboards poll the same symbols from many tabs and widgets at once. The
+cache keeps each symbol's last quote for a few seconds and makes sure only
+one upstream request per symbol is in flight: concurrent misses wait for
+the same fetch. While the market is closed, expired entries are served
+immediately and refreshed in the background (stale-while-revalidate),
+since prices do not move until the next session.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+# fetch_many(keys) -> {key: value}; keys it cannot resolve are left out
+FetchMany = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class QuoteCache:
+    """In-memory TTL cache with single-flight misses and stale-while-revalidate"""
+
+    def __init__(self, ttl: float = 2.0, ttl_overrides: Optional[Dict[Hashable, float]] = None,
+                 is_live: Optional[Callable[[], bool]] = None, max_entries: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds an entry is fresh
+            ttl_overrides: Per-key TTLs (e.g. {'NIFTY 50': 1.0})
+            is_live: Returns False while the market is closed; expired entries
+                     are then served stale and refreshed in the background
+            max_entries: Entries kept before the least recently stored are evicted
+            clock: Seconds clock
+        """
+        self.ttl = ttl
+        self.ttl_overrides = dict(ttl_overrides or {})
+        self.is_live = is_live or (lambda: True)
+        self.max_entries = max_entries
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        # (namespace, key) -> (stored_at, value)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._refreshes: set = set()
+
+        self.stats: Dict[str, int] = {
+            'hits': 0,
+            'stale_hits': 0,    # Expired entries served while the market is closed
+            'misses': 0,
+            'coalesced': 0,     # Misses that waited for another request's fetch
+            'refreshes': 0,     # Background revalidations started
+            'errors': 0,
+            'evictions': 0
+        }
+
+    def ttl_for(self, key: Hashable) -> float:
+        """Get the TTL for a key"""
+        return self.ttl_overrides.get(key, self.ttl)
+
+    async def get_many(self, namespace: str, keys: Iterable[Hashable],
+                       fetch_many: FetchMany) -> Dict[Hashable, Any]:
+        """
+        Get values for many keys, fetching only those that are missing or expired
+
+        Args:
+            namespace: Groups keys fetched by the same function (e.g. 'quotes:NSE')
+            keys: Keys to look up
+            fetch_many: Async callable fetching a list of keys in one call
+
+        Returns:
+            Values keyed by key; keys the fetch could not resolve are left out
+        """
+        keys = list(dict.fromkeys(keys))
+        now = self.clock()
+        live = None
+
+        results: Dict[Hashable, Any] = {}
+        waiting: Dict[Hashable, asyncio.Future] = {}
+        missing: List[Hashable] = []
+        stale: List[Hashable] = []
+
+        for key in keys:
+            cache_key = (namespace, key)
+            entry = self._entries.get(cache_key)
+            if entry is not None and now - entry[0] < self.ttl_for(key):
+                self.stats['hits'] += 1
+                results[key] = entry[1]
+                continue
+            if entry is not None:
+                if live is None:
+                    live = self.is_live()
+                if not live:
+                    self.stats['stale_hits'] += 1
+                    results[key] = entry[1]
+                    if cache_key not in self._inflight:
+                        stale.append(key)
+                    continue
+            if cache_key in self._inflight:
+                self.stats['coalesced'] += 1
+                waiting[key] = self._inflight[cache_key]
+            else:
+                self.stats['misses'] += 1
+                missing.append(key)
+
+        if stale:
+            self.stats['refreshes'] += 1
+            self._start_flights(namespace, stale)
+            task = asyncio.ensure_future(self._fetch(namespace, stale, fetch_many))
+            self._refreshes.add(task)
+            task.add_done_callback(self._refresh_done)
+
+        if missing:
+            waiting.update(zip(missing, self._start_flights(namespace, missing)))
+            await self._fetch(namespace, missing, fetch_many, raise_errors=True)
+
+        for key, future in waiting.items():
+            value = await future
+            if value is not None:
+                results[key] = value
+
+        return {key: results[key] for key in keys if key in results}
+
+    async def get(self, namespace: str, key: Hashable,
+                  fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get one value, fetching it if missing or expired
+
+        Args:
+            namespace: Key namespace
+            key: Key to look up
+            fetch: Async callable returning the value (None is not cached)
+
+        Returns:
+            The value, or None if it could not be fetched
+        """
+        async def fetch_one(keys):
+            value = await fetch()
+            return {key: value} if value is not None else {}
+
+        return (await self.get_many(namespace, [key], fetch_one)).get(key)
+
+    def _start_flights(self, namespace: str, keys: List[Hashable]) -> List[asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for key in keys:
+            future = loop.create_future()
+            self._inflight[(namespace, key)] = future
+            futures.append(future)
+        return futures
+
+    async def _fetch(self, namespace: str, keys: List[Hashable], fetch_many: FetchMany,
+                     raise_errors: bool = False):
+        """Fetch keys, store the results and settle their in-flight futures"""
+        try:
+            values = await fetch_many(keys)
+        except asyncio.CancelledError:
+            # Don't leave waiters hanging on a cancelled request
+            self._settle(namespace, keys, {})
+            raise
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.logger.error(f"Error fetching {namespace} {keys[:5]}: {e}")
+            values = {}
+            self._settle(namespace, keys, values, error=e if raise_errors else None)
+            if raise_errors:
+                raise
+            return
+
+        now = self.clock()
+        for key, value in values.items():
+            if value is not None:
+                self._store((namespace, key), now, value)
+        self._settle(namespace, keys, values)
+
+    def _settle(self, namespace: str, keys: List[Hashable], values: Dict[Hashable, Any],
+                error: Optional[Exception] = None):
+        for key in keys:
+            future = self._inflight.pop((namespace, key), None)
+            if future is None or future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+                # Only other waiters see it; don't warn if there are none
+                future.exception()
+            else:
+                future.set_result(values.get(key))
+
+    def _store(self, cache_key: Tuple[str, Hashable], now: float, value: Any):
+        self._entries[cache_key] = (now, value)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _refresh_done(self, task: asyncio.Future):
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Background refresh failed: {task.exception()}")
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters and the hit rate"""
+        lookups = sum(self.stats[name] for name in ('hits', 'stale_hits', 'misses', 'coalesced'))
+        served = lookups - self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'in_flight': len(self._inflight),
+            'hit_rate': round(served / lookups, 4) if lookups else 0.0
+        }
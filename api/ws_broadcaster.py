@@ -0,0 +1,255 @@
+"""
+WebSocket Broadcaster
+=====================
+
+Topic-routed fan-out to WebSocket clients.
+
+Each client gets a bounded outbound queue drained by its own writer task,
+so publishing never waits on a socket and a slow client only delays
+itself. Messages are serialized once per publish and the same string is
+queued for every subscriber. Price updates are conflated per symbol: a
+queued update that has not been sent yet is replaced by the newer one.
+When a queue is full the oldest message is dropped.
+
+Topics:
+    price:<symbol>  Price updates for one symbol (conflated)
+    portfolio       Portfolio value and P&L
+    backtest        Backtest progress and results
+    trading         Trading status, strategy and position events
+
+Clients subscribe with ``{"type": "subscribe", "channels": [...]}``; a
+channel ending in ``*`` (e.g. ``price:*``) matches every topic with that
+prefix. Until a client's first subscribe it receives every topic.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+
+PRICE_TOPIC_PREFIX = 'price:'
+
+
+def price_topic(symbol: str) -> str:
+    """Topic for a symbol's price updates"""
+    return f"{PRICE_TOPIC_PREFIX}{symbol}"
+
+
+class ClientConnection:
+    """One WebSocket client: subscriptions, outbound queue and writer task"""
+
+    def __init__(self, websocket: Any, max_queue: int):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.subscriptions: Set[str] = {'*'}
+        self.subscribed = False  # False until the client's first subscribe
+        self.closed = False
+        self.writer: Optional[asyncio.Task] = None
+
+        # Conflated messages are keyed by their key, others by a sequence number
+        self._queue: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._seq = itertools.count()
+        self._ready = asyncio.Event()
+
+        self.sent = 0
+        self.conflated = 0
+        self.dropped = 0
+
+    def enqueue(self, payload: str, conflate_key: Optional[str] = None):
+        """Queue a serialized message without waiting"""
+        if self.closed:
+            return
+        if conflate_key is not None:
+            key = ('conflate', conflate_key)
+            if key in self._queue:
+                self._queue[key] = payload
+                self.conflated += 1
+                return
+        else:
+            key = ('seq', next(self._seq))
+
+        if len(self._queue) >= self.max_queue:
+            self._queue.popitem(last=False)
+            self.dropped += 1
+        self._queue[key] = payload
+        self._ready.set()
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    async def run_writer(self):
+        """Send queued messages in order until the connection fails or closes"""
+        while not self.closed:
+            await self._ready.wait()
+            self._ready.clear()
+            while self._queue and not self.closed:
+                _, payload = self._queue.popitem(last=False)
+                await self.websocket.send_text(payload)
+                self.sent += 1
+
+
+class WebSocketBroadcaster:
+    """Routes published messages to subscribed clients through per-client queues"""
+
+    def __init__(self, max_queue: int = 256):
+        """
+        Initialize the broadcaster
+
+        Args:
+            max_queue: Messages queued per client before the oldest is dropped
+        """
+        self.max_queue = max_queue
+        self.logger = logging.getLogger(__name__)
+
+        self.clients: Dict[Any, ClientConnection] = {}
+        # Exact topic -> clients, and wildcard prefix -> clients
+        self._exact: Dict[str, Set[ClientConnection]] = {}
+        self._prefixes: Dict[str, Set[ClientConnection]] = {}
+
+        self.stats: Dict[str, int] = {
+            'published': 0,
+            'queued': 0,        # Client deliveries queued
+            'disconnects': 0
+        }
+
+    @property
+    def active_connections(self) -> List[Any]:
+        return list(self.clients)
+
+    async def connect(self, websocket: Any) -> ClientConnection:
+        """Accept a WebSocket and start its writer task"""
+        await websocket.accept()
+        client = ClientConnection(websocket, self.max_queue)
+        self.clients[websocket] = client
+        self._index(client, client.subscriptions)
+        client.writer = asyncio.create_task(self._write(client))
+        self.logger.info(f"✅ WebSocket client connected. Total connections: {len(self.clients)}")
+        return client
+
+    async def _write(self, client: ClientConnection):
+        try:
+            await client.run_writer()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Failed to send to WebSocket client: {e}")
+            self.disconnect(client.websocket)
+
+    def disconnect(self, websocket: Any):
+        """Forget a client and stop its writer"""
+        client = self.clients.pop(websocket, None)
+        if client is None:
+            return
+        client.closed = True
+        self._unindex(client, client.subscriptions)
+        if client.writer is not None and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        self.stats['disconnects'] += 1
+        self.logger.info(f"❌ WebSocket client disconnected. Total connections: {len(self.clients)}")
+
+    def subscribe(self, websocket: Any, channels: Iterable[str]) -> List[str]:
+        """
+        Subscribe a client to topics
+
+        The first subscribe replaces the default of receiving every topic.
+
+        Returns:
+            The client's subscriptions
+        """
+        client = self.clients.get(websocket)
+        if client is None:
+            return []
+        if not client.subscribed:
+            self._unindex(client, client.subscriptions)
+            client.subscriptions = set()
+            client.subscribed = True
+
+        channels = {channel for channel in channels if isinstance(channel, str) and channel}
+        self._index(client, channels - client.subscriptions)
+        client.subscriptions |= channels
+        return sorted(client.subscriptions)
+
+    def unsubscribe(self, websocket: Any, channels: Iterable[str]) -> List[str]:
+        """Unsubscribe a client from topics and return its subscriptions"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return []
+        channels = set(channels) & client.subscriptions
+        self._unindex(client, channels)
+        client.subscriptions -= channels
+        client.subscribed = True
+        return sorted(client.subscriptions)
+
+    def _index(self, client: ClientConnection, channels: Iterable[str]):
+        for channel in channels:
+            if channel.endswith('*'):
+                self._prefixes.setdefault(channel[:-1], set()).add(client)
+            else:
+                self._exact.setdefault(channel, set()).add(client)
+
+    def _unindex(self, client: ClientConnection, channels: Iterable[str]):
+        for channel in channels:
+            index, key = ((self._prefixes, channel[:-1]) if channel.endswith('*')
+                          else (self._exact, channel))
+            members = index.get(key)
+            if members is not None:
+                members.discard(client)
+                if not members:
+                    del index[key]
+
+    def subscribers(self, topic: str) -> Set[ClientConnection]:
+        """Clients subscribed to a topic"""
+        recipients = set(self._exact.get(topic, ()))
+        for prefix, members in self._prefixes.items():
+            if topic.startswith(prefix):
+                recipients |= members
+        return recipients
+
+    def publish(self, topic: str, message: Dict[str, Any], conflate: Optional[bool] = None) -> int:
+        """
+        Queue a message for every subscriber of a topic
+
+        Args:
+            topic: Message topic (e.g. 'portfolio', price_topic('BTC/USDT'))
+            message: JSON-serializable message
+            conflate: Replace this topic's unsent message instead of queueing
+                      another (default: True for price topics)
+
+        Returns:
+            Number of clients the message was queued for
+        """
+        recipients = self.subscribers(topic)
+        self.stats['published'] += 1
+        if not recipients:
+            return 0
+
+        if conflate is None:
+            conflate = topic.startswith(PRICE_TOPIC_PREFIX)
+        payload = json.dumps(message, default=str)
+        conflate_key = topic if conflate else None
+        for client in recipients:
+            client.enqueue(payload, conflate_key)
+        self.stats['queued'] += len(recipients)
+        return len(recipients)
+
+    def send(self, websocket: Any, message: Dict[str, Any]):
+        """Queue a message for one client"""
+        client = self.clients.get(websocket)
+        if client is not None:
+            client.enqueue(json.dumps(message, default=str))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get publish counters and per-client queue totals"""
+        clients = list(self.clients.values())
+        return {
+            **self.stats,
+            'clients': len(clients),
+            'sent': sum(client.sent for client in clients),
+            'conflated': sum(client.conflated for client in clients),
+            'dropped': sum(client.dropped for client in clients),
+            'max_queue_depth': max((client.queued for client in clients), default=0)
+        }
@@ -12,6 +12,8 @@ from tabulate import tabulate
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from crypto.exchange_pool import exchange_pool
+
 # Lazy import CCXT to avoid hanging on module load
 ccxt = None
 
@@ -44,13 +46,12 @@ def get_available_exchanges():
     
     print("🔍 Checking available exchanges...")
     
-    ccxt_lib = _ensure_ccxt()
+    _ensure_ccxt()
     
     for exchange_id in popular_exchanges:
         try:
-            exchange_class = getattr(ccxt_lib, exchange_id, None)
-            if exchange_class:
-                exchange = exchange_class()
+            exchange = exchange_pool.get_client(exchange_id)
+            if exchange:
                 exchanges.append({
                     'id': exchange_id,
                     'name': exchange.name if hasattr(exchange, 'name') else exchange_id.title(),
@@ -68,15 +69,14 @@ def fetch_symbols_from_exchange(exchange_id, quote_currencies=None):
         quote_currencies = ['USDT', 'USD', 'EUR', 'BTC', 'ETH']
     
     try:
-        # Initialize exchange
-        ccxt_lib = _ensure_ccxt()
-        exchange_class = getattr(ccxt_lib, exchange_id.lower())
-        exchange = exchange_class()
+        # Reuse the pooled client for this exchange
+        _ensure_ccxt()
+        exchange = exchange_pool.get_client(exchange_id)
         
         print(f"🔄 Fetching symbols from {exchange.name}...")
         
-        # Fetch markets
-        markets = exchange.fetch_markets()
+        # Markets come from the pool's cache when fresh
+        markets = exchange_pool.get_markets(exchange_id, exchange).values()
         
         # Group symbols by quote currency
         symbol_groups = {}
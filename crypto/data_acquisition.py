@@ -7,10 +7,14 @@ Crypto Data Acquisition Module for AlgoProject
 import pandas as pd
 import threading
 import os
+import time
 import warnings
 import logging
 from datetime import datetime
 
+from crypto.exchange_pool import exchange_pool
+from crypto.history_fetcher import fetch_ohlcv_pages, timeframe_to_ms
+
 # Suppress warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 
@@ -38,7 +42,14 @@ def _ensure_ccxt():
     return ccxt
 
 
-def fetch_data(symbol, exchange, interval, bars, data_source="auto", fetch_timeout=15):
+def _load_markets(exchange, timeout_ms):
+    """Get an exchange's markets through the pooled public client"""
+    _ensure_ccxt()
+    client = exchange_pool.get_client(exchange, {'timeout': timeout_ms})
+    return exchange_pool.get_markets(exchange, client)
+
+
+def fetch_data(symbol, exchange, interval, bars, data_source="auto", fetch_timeout=15, since=None):
     """
     Crypto-specific data fetching function using CCXT only.
     
@@ -49,16 +60,17 @@ def fetch_data(symbol, exchange, interval, bars, data_source="auto", fetch_timeo
         bars (int): Number of historical bars to fetch
         data_source (str): Always "ccxt" for crypto (maintained for compatibility)
         fetch_timeout (int): Timeout in seconds for data fetching
+        since (datetime or int, optional): Only fetch bars from this time (UTC) or epoch ms onwards
     
     Returns:
         pandas.DataFrame: OHLCV data with columns [timestamp, open, high, low, close, volume]
     """
     
     # Always use CCXT for crypto data
-    return _fetch_ccxt_data(symbol, exchange, interval, bars, fetch_timeout)
+    return _fetch_ccxt_data(symbol, exchange, interval, bars, fetch_timeout, since)
 
 
-def _fetch_ccxt_data(symbol, exchange, interval, bars, fetch_timeout=15):
+def _fetch_ccxt_data(symbol, exchange, interval, bars, fetch_timeout=15, since=None):
     """
     Fetch crypto data using CCXT library.
     
@@ -68,6 +80,7 @@ def _fetch_ccxt_data(symbol, exchange, interval, bars, fetch_timeout=15):
         interval (str): Time interval (e.g., "5m", "1h", "1d")
         bars (int): Number of historical bars to fetch
         fetch_timeout (int): Timeout in seconds
+        since (datetime or int, optional): Only fetch bars from this time (UTC) or epoch ms onwards
     
     Returns:
         pandas.DataFrame: OHLCV data
@@ -87,24 +100,21 @@ def _fetch_ccxt_data(symbol, exchange, interval, bars, fetch_timeout=15):
             logger.warning(f"Invalid symbol format: {symbol}. Expected format: BASE/QUOTE")
             return None
             
-        # Initialize exchange with better error handling
+        # Reuse the pooled client for this exchange
         try:
-            exchange_class = getattr(ccxt_lib, exchange.lower())
-        except AttributeError:
+            exchange_instance = exchange_pool.get_client(exchange, {
+                'apiKey': '',
+                'secret': '',
+                'timeout': fetch_timeout * 1000,
+                'sandbox': False,  # Ensure production mode
+            })
+        except ValueError:
             logger.error(f"Exchange {exchange} not supported by CCXT")
             return None
-            
-        exchange_instance = exchange_class({
-            'apiKey': '',
-            'secret': '',
-            'timeout': fetch_timeout * 1000,
-            'enableRateLimit': True,
-            'sandbox': False,  # Ensure production mode
-        })
 
-        # Load markets first to validate symbol
+        # Validate symbol against the cached markets table
         try:
-            markets = exchange_instance.load_markets()
+            markets = exchange_pool.get_markets(exchange, exchange_instance)
             if symbol not in markets:
                 logger.warning(f"Symbol {symbol} not available on {exchange}")
                 return None
@@ -112,8 +122,26 @@ def _fetch_ccxt_data(symbol, exchange, interval, bars, fetch_timeout=15):
             logger.warning(f"Could not load markets for {exchange}: {e}")
             # Continue anyway, symbol might still work
 
-        # Fetch OHLCV data
-        ohlcv = exchange_instance.fetch_ohlcv(symbol, interval, limit=bars)
+        # Fetch OHLCV data. Venues cap one response anywhere from a few hundred
+        # bars up, so every multi-bar request is paged
+        since_ms = None
+        if since is not None:
+            since_ms = since if isinstance(since, int) else pd.Timestamp(since).value // 1_000_000
+        if bars == 1:
+            ohlcv = exchange_pool.call(exchange, exchange_instance.fetch_ohlcv, symbol, interval,
+                                       since=since_ms, limit=bars)
+        else:
+            now_ms = int(time.time() * 1000)
+            tf_ms = timeframe_to_ms(interval)
+            if since_ms is not None:
+                start_ms, end_ms = since_ms, min(now_ms, since_ms + (bars - 1) * tf_ms)
+            else:
+                start_ms, end_ms = now_ms - bars * tf_ms, now_ms
+            ohlcv = fetch_ohlcv_pages(
+                exchange_instance, symbol, interval, start_ms=start_ms, end_ms=end_ms,
+                call=lambda method, *args: exchange_pool.call(exchange, method, *args)
+            )
+            ohlcv = ohlcv[:bars] if since_ms is not None else ohlcv[-bars:]
         
         if not ohlcv:
             logger.warning(f"No data received for {symbol} from {exchange}")
@@ -178,15 +206,11 @@ def test_exchange_connection(exchange_name):
         bool: True if connection successful, False otherwise
     """
     try:
-        ccxt_lib = _ensure_ccxt()
-        exchange_class = getattr(ccxt_lib, exchange_name.lower())
-        exchange_instance = exchange_class({
-            'timeout': 10000,
-            'enableRateLimit': True,
-        })
+        _ensure_ccxt()
+        exchange_instance = exchange_pool.get_client(exchange_name, {'timeout': 10000})
         
         # Try to fetch markets (doesn't require authentication)
-        markets = exchange_instance.load_markets()
+        markets = exchange_pool.get_markets(exchange_name, exchange_instance, reload=True)
         logger.info(f"Successfully connected to {exchange_name} - {len(markets)} markets available")
         return True
         
@@ -207,14 +231,7 @@ def get_crypto_symbols(exchange='kraken', limit=50):
         list: List of trading symbols
     """
     try:
-        ccxt_lib = _ensure_ccxt()
-        exchange_class = getattr(ccxt_lib, exchange.lower())
-        exchange_instance = exchange_class({
-            'timeout': 15000,
-            'enableRateLimit': True,
-        })
-        
-        markets = exchange_instance.load_markets()
+        markets = _load_markets(exchange, 15000)
         
         # Filter for USDT pairs (most liquid)
         usdt_pairs = [symbol for symbol in markets.keys() if '/USDT' in symbol]
@@ -268,16 +285,8 @@ def health_check():
         for exchange in test_exchanges:
             results['exchanges_tested'].append(exchange)
             try:
-                # Quick connection test with timeout
-                ccxt_lib = _ensure_ccxt()
-                exchange_class = getattr(ccxt_lib, exchange.lower())
-                exchange_instance = exchange_class({
-                    'timeout': 5000,  # 5 second timeout
-                    'enableRateLimit': True,
-                })
-                
-                # Try to load markets with timeout
-                markets = exchange_instance.load_markets()
+                # Quick connection test with timeout (markets come from the pool cache)
+                markets = _load_markets(exchange, 5000)  # 5 second timeout
                 if markets:
                     results['working_exchanges'].append(exchange)
                     
@@ -0,0 +1,254 @@
+"""
+Exchange Client Pool
+====================
+
+Process-wide pool of reusable CCXT exchange clients.
+
+Building a CCXT exchange and calling ``load_markets()`` costs one to three
+seconds on the larger exchanges before any data arrives. The pool keeps one
+client per exchange id and option set, caches the markets table on disk
+with a TTL so new processes skip the download, and spaces requests to each
+exchange by its rate limit across every client and thread.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+DEFAULT_MARKETS_TTL = 6 * 3600  # seconds
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cache', 'markets'
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Spaces calls at least ``interval`` seconds apart across threads"""
+
+    def __init__(self, interval: float):
+        self.interval = max(0.0, interval)
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Reserve the next slot and sleep until it starts
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.interval
+        wait = start - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class ExchangePool:
+    """Reusable CCXT clients with cached markets and per-exchange rate limits"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 markets_ttl: float = DEFAULT_MARKETS_TTL, ccxt_module: Any = None):
+        """
+        Initialize the pool
+
+        Args:
+            cache_dir: Directory for cached markets tables (None disables the disk cache)
+            markets_ttl: Seconds before a cached markets table is refreshed
+            ccxt_module: CCXT module to build clients from (imported lazily if None)
+        """
+        self.cache_dir = cache_dir
+        self.markets_ttl = markets_ttl
+        self.logger = logging.getLogger(__name__)
+
+        self._ccxt = ccxt_module
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._markets: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.RLock()
+        self._market_locks: Dict[str, threading.Lock] = {}
+
+    def _ensure_ccxt(self):
+        """Import CCXT on first use"""
+        if self._ccxt is None:
+            import ccxt
+            self._ccxt = ccxt
+        return self._ccxt
+
+    @staticmethod
+    def _options_key(options: Dict[str, Any]) -> str:
+        """Stable key for a client option set (credentials are hashed, not stored)"""
+        encoded = json.dumps(options, sort_keys=True, default=str).encode()
+        return hashlib.sha1(encoded).hexdigest()
+
+    def get_client(self, exchange_id: str, options: Optional[Dict[str, Any]] = None):
+        """
+        Get the pooled client for an exchange id and option set
+
+        Args:
+            exchange_id: CCXT exchange id (e.g. 'kraken')
+            options: Constructor options passed to the CCXT exchange class
+
+        Returns:
+            CCXT exchange instance
+
+        Raises:
+            ValueError: If CCXT does not support the exchange
+        """
+        exchange_id = exchange_id.lower()
+        options = {'enableRateLimit': True, **(options or {})}
+        key = (exchange_id, self._options_key(options))
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                exchange_class = getattr(self._ensure_ccxt(), exchange_id, None)
+                if exchange_class is None:
+                    raise ValueError(f"Exchange {exchange_id} not supported by CCXT")
+                client = exchange_class(options)
+                self._clients[key] = client
+                self.logger.debug(f"Created {exchange_id} client ({len(self._clients)} pooled)")
+
+            # Reuse markets already loaded for this exchange
+            cached = self._markets.get(exchange_id)
+            if cached is not None and not getattr(client, 'markets', None):
+                client.set_markets(cached[1])
+
+        return client
+
+    def get_markets(self, exchange_id: str, client: Any = None,
+                    reload: bool = False) -> Dict[str, Any]:
+        """
+        Get the markets table for an exchange and attach it to the client
+
+        Markets come from memory, then the disk cache, and are only downloaded
+        when both are missing or older than the TTL.
+
+        Args:
+            exchange_id: CCXT exchange id
+            client: Client to attach the markets to (pooled default client if None)
+            reload: Force a download
+
+        Returns:
+            Markets dict keyed by symbol
+        """
+        exchange_id = exchange_id.lower()
+        client = client if client is not None else self.get_client(exchange_id)
+
+        with self._lock:
+            market_lock = self._market_locks.setdefault(exchange_id, threading.Lock())
+
+        # One download per exchange; concurrent callers wait for it
+        with market_lock:
+            markets = None if reload else self._cached_markets(exchange_id)
+            if markets is None:
+                self.throttle(exchange_id, client)
+                markets = client.load_markets(reload=True)
+                self._store_markets(exchange_id, markets)
+                self.logger.info(f"Loaded {len(markets)} markets from {exchange_id}")
+            elif not getattr(client, 'markets', None):
+                client.set_markets(markets)
+
+        return markets
+
+    def _cached_markets(self, exchange_id: str) -> Optional[Dict[str, Any]]:
+        """Get fresh markets from memory or disk"""
+        now = time.time()
+        cached = self._markets.get(exchange_id)
+        if cached is not None and now - cached[0] < self.markets_ttl:
+            return cached[1]
+
+        path = self._markets_path(exchange_id)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                payload = json.load(f)
+            fetched_at = float(payload['fetched_at'])
+            if now - fetched_at >= self.markets_ttl:
+                return None
+            markets = payload['markets']
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable markets cache for {exchange_id}: {e}")
+            return None
+
+        with self._lock:
+            self._markets[exchange_id] = (fetched_at, markets)
+        return markets
+
+    def _store_markets(self, exchange_id: str, markets: Dict[str, Any]) -> None:
+        """Keep markets in memory and write them to the disk cache"""
+        fetched_at = time.time()
+        with self._lock:
+            self._markets[exchange_id] = (fetched_at, markets)
+
+        path = self._markets_path(exchange_id)
+        if path is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'fetched_at': fetched_at, 'markets': markets}, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Could not write markets cache for {exchange_id}: {e}")
+
+    def _markets_path(self, exchange_id: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{exchange_id}.json")
+
+    def throttle(self, exchange_id: str, client: Any = None) -> float:
+        """
+        Wait for the exchange's next request slot
+
+        Args:
+            exchange_id: CCXT exchange id
+            client: Client whose ``rateLimit`` (ms) sets the spacing on first use
+
+        Returns:
+            Seconds spent waiting
+        """
+        exchange_id = exchange_id.lower()
+        with self._lock:
+            limiter = self._limiters.get(exchange_id)
+            if limiter is None:
+                rate_limit_ms = getattr(client, 'rateLimit', 0) or 0
+                limiter = self._limiters[exchange_id] = RateLimiter(rate_limit_ms / 1000.0)
+        return limiter.acquire()
+
+    def call(self, exchange_id: str, method: Callable, *args, **kwargs) -> Any:
+        """Call a client method once the exchange's rate limit allows it"""
+        self.throttle(exchange_id, getattr(method, '__self__', None))
+        return method(*args, **kwargs)
+
+    def clear(self) -> None:
+        """Drop pooled clients and in-memory markets (the disk cache is kept)"""
+        with self._lock:
+            self._clients.clear()
+            self._markets.clear()
+            self._limiters.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'exchanges': sorted({exchange_id for exchange_id, _ in self._clients}),
+                'markets_cached': sorted(self._markets),
+                'cache_dir': self.cache_dir,
+                'markets_ttl': self.markets_ttl
+            }
+
+
+# Global pool instance
+exchange_pool = ExchangePool()
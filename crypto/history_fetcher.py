@@ -0,0 +1,309 @@
+"""
+History Fetcher
+===============
+
+Paginated, concurrent deep-history OHLCV downloads.
+
+Exchanges cap a single ``fetch_ohlcv`` response at a few hundred to a
+thousand candles. ``fetch_ohlcv_pages`` walks ``since`` cursors backwards
+from the end of a range, one window of candles at a time, so any number of
+bars can be fetched. ``HistoryFetcher`` runs those walks for many symbols
+in parallel under each exchange's rate limit and merges every window into
+the OHLCV store as soon as it arrives. Windows that are already stored are
+skipped, so an interrupted download resumes where it stopped.
+``create_history_data_loader`` puts the store behind a ``DataLoader`` for
+backtests.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from algoproject.core.interfaces import MarketData
+from algoproject.data.cache_manager import CacheManager, timeframe_to_timedelta
+from algoproject.data.data_loader import DataLoader
+from algoproject.data.data_provider import DataProvider
+from crypto.exchange_pool import ExchangePool, exchange_pool
+
+
+DEFAULT_PAGE_LIMIT = 1000
+# Consecutive empty windows taken as the beginning of the exchange's history
+DEFAULT_MAX_EMPTY_WINDOWS = 2
+
+logger = logging.getLogger(__name__)
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Convert a timeframe string (e.g. '1h') to milliseconds
+
+    Raises:
+        ValueError: If the timeframe is not recognised
+    """
+    ms = int(timeframe_to_timedelta(timeframe).total_seconds() * 1000)
+    if ms <= 0:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return ms
+
+
+def candles_to_frame(candles: List[List[float]]) -> pd.DataFrame:
+    """Convert CCXT candles to an OHLCV DataFrame indexed by timestamp"""
+    df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df.set_index('timestamp').sort_index()
+
+
+def fetch_ohlcv_pages(client: Any, symbol: str, timeframe: str, start_ms: int, end_ms: int,
+                      page_limit: int = DEFAULT_PAGE_LIMIT, call: Optional[Callable] = None,
+                      on_window: Optional[Callable] = None,
+                      max_empty_windows: int = DEFAULT_MAX_EMPTY_WINDOWS) -> List[List[float]]:
+    """Fetch candles in [start_ms, end_ms] by walking ``since`` cursors backwards
+
+    Each window of ``page_limit`` candles is requested with ``since`` at its
+    start. If the exchange returns fewer candles than asked, the rest of the
+    window is requested from the last candle onwards, and later windows use
+    the smaller page size. The walk stops at ``start_ms`` or after
+    ``max_empty_windows`` windows in a row come back empty (the beginning of
+    the exchange's history). Missing candles inside a window, including at
+    its start, do not stop the walk.
+
+    Args:
+        client: CCXT exchange instance
+        symbol: Trading symbol
+        timeframe: Candle timeframe
+        start_ms: Range start in epoch milliseconds (inclusive)
+        end_ms: Range end in epoch milliseconds (inclusive)
+        page_limit: Candles requested per call
+        call: Wrapper used to invoke ``client.fetch_ohlcv`` (e.g. a rate limiter)
+        on_window: Callback(window_start_ms, window_end_ms, candles) per non-empty window
+        max_empty_windows: Consecutive empty windows that end the walk
+
+    Returns:
+        Candles sorted by timestamp with duplicates removed
+    """
+    if page_limit <= 0:
+        raise ValueError("page_limit must be positive")
+    if max_empty_windows <= 0:
+        raise ValueError("max_empty_windows must be positive")
+    call = call or (lambda method, *args: method(*args))
+    tf = timeframe_to_ms(timeframe)
+    limit = page_limit
+    candles: Dict[int, List[float]] = {}
+    empty_windows = 0
+
+    cursor = end_ms - end_ms % tf
+    window_end = end_ms
+    while cursor >= start_ms:
+        window_start = max(start_ms, cursor - (limit - 1) * tf)
+        window: Dict[int, List[float]] = {}
+        since = window_start
+        first_page_size = None
+
+        while since <= cursor:
+            raw = call(client.fetch_ohlcv, symbol, timeframe, since, limit) or []
+            page = [candle for candle in raw if since <= candle[0] <= cursor]
+            if not page:
+                break
+            if first_page_size is None:
+                first_page_size = len(raw)
+            elif first_page_size < limit:
+                # The window continued past a short page: the exchange caps its pages
+                limit = first_page_size
+            window.update((int(candle[0]), candle) for candle in page)
+            last = int(page[-1][0])
+            if last >= cursor:
+                break
+            since = last + tf
+
+        if window:
+            empty_windows = 0
+            candles.update(window)
+            if on_window is not None:
+                on_window(window_start, window_end, [window[ts] for ts in sorted(window)])
+        else:
+            empty_windows += 1
+            if empty_windows >= max_empty_windows:
+                # Nothing older is listed
+                break
+        cursor = window_start - tf
+        window_end = cursor
+
+    return [candles[ts] for ts in sorted(candles)]
+
+
+class HistoryFetcher:
+    """Downloads deep OHLCV history into the OHLCV store"""
+
+    def __init__(self, store: CacheManager, pool: Optional[ExchangePool] = None,
+                 page_limit: int = DEFAULT_PAGE_LIMIT, max_workers: int = 8):
+        """
+        Initialize the fetcher
+
+        Args:
+            store: OHLCV store the windows are merged into
+            pool: Exchange client pool (the process-wide pool if None)
+            page_limit: Candles requested per call
+            max_workers: Symbols fetched concurrently
+        """
+        self.store = store
+        self.pool = pool or exchange_pool
+        self.page_limit = page_limit
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def provider_name(exchange_id: str) -> str:
+        """Store provider name for an exchange"""
+        return f"ccxt:{exchange_id.lower()}"
+
+    def fetch_symbol(self, exchange_id: str, symbol: str, timeframe: str,
+                     start_date: datetime, end_date: Optional[datetime] = None) -> int:
+        """
+        Fetch the parts of a range that are not stored yet
+
+        Args:
+            exchange_id: CCXT exchange id
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            start_date: Range start (inclusive, UTC)
+            end_date: Range end (inclusive, UTC; now if None)
+
+        Returns:
+            Number of candles downloaded
+        """
+        end_date = end_date or datetime.utcnow()
+        provider = self.provider_name(exchange_id)
+        client = self.pool.get_client(exchange_id)
+        call = lambda method, *args: self.pool.call(exchange_id, method, *args)
+
+        def store_window(window_start: int, window_end: int, candles: List[List[float]]):
+            self.store.merge_ohlcv(provider, symbol, timeframe, candles_to_frame(candles),
+                                   pd.Timestamp(window_start, unit='ms'),
+                                   pd.Timestamp(window_end, unit='ms'))
+
+        downloaded = 0
+        gaps = self.store.missing_ohlcv_ranges(provider, symbol, timeframe, start_date, end_date)
+        # Newest gaps first, matching the backwards walk
+        for gap_start, gap_end in reversed(gaps):
+            candles = fetch_ohlcv_pages(
+                client, symbol, timeframe,
+                start_ms=-(-gap_start // 1_000_000), end_ms=gap_end // 1_000_000,
+                page_limit=self.page_limit, call=call, on_window=store_window
+            )
+            downloaded += len(candles)
+
+        self.logger.info(f"Fetched {downloaded} {timeframe} candles for {symbol} from {exchange_id} "
+                         f"({len(gaps)} missing ranges)")
+        return downloaded
+
+    def fetch(self, exchange_id: str, symbols: List[str], timeframe: str,
+              start_date: datetime, end_date: Optional[datetime] = None) -> Dict[str, Optional[int]]:
+        """
+        Fetch a range for many symbols concurrently
+
+        Args:
+            exchange_id: CCXT exchange id
+            symbols: Trading symbols
+            timeframe: Candle timeframe
+            start_date: Range start (inclusive, UTC)
+            end_date: Range end (inclusive, UTC; now if None)
+
+        Returns:
+            Candles downloaded per symbol (None if the symbol failed)
+        """
+        end_date = end_date or datetime.utcnow()
+        # Load markets once before the workers start
+        self.pool.get_markets(exchange_id)
+
+        results: Dict[str, Optional[int]] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.fetch_symbol, exchange_id, symbol, timeframe,
+                                start_date, end_date): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error fetching history for {symbol} from {exchange_id}: {e}")
+                    results[symbol] = None
+        return results
+
+    def get_history(self, exchange_id: str, symbol: str, timeframe: str,
+                    start_date: datetime, end_date: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Fetch what is missing and return the stored range
+
+        Args:
+            exchange_id: CCXT exchange id
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            start_date: Range start (inclusive, UTC)
+            end_date: Range end (inclusive, UTC; now if None)
+
+        Returns:
+            OHLCV DataFrame indexed by timestamp
+        """
+        end_date = end_date or datetime.utcnow()
+        self.fetch_symbol(exchange_id, symbol, timeframe, start_date, end_date)
+        return self.store.read_ohlcv(self.provider_name(exchange_id), symbol, timeframe,
+                                     start_date, end_date)
+
+
+class HistoryDataProvider(DataProvider):
+    """DataProvider serving one exchange's candles through a HistoryFetcher"""
+
+    def __init__(self, exchange_id: str, fetcher: HistoryFetcher):
+        """
+        Initialize the provider
+
+        Args:
+            exchange_id: CCXT exchange id
+            fetcher: Fetcher that downloads missing ranges into its store
+        """
+        self.exchange_id = exchange_id
+        self.fetcher = fetcher
+
+    def get_historical_data(self, symbol: str, timeframe: str,
+                            start_date: Optional[datetime] = None,
+                            end_date: Optional[datetime] = None,
+                            limit: int = 1000) -> pd.DataFrame:
+        end_date = end_date or datetime.utcnow()
+        start_date = start_date or end_date - timeframe_to_timedelta(timeframe) * limit
+        return self.fetcher.get_history(self.exchange_id, symbol, timeframe, start_date, end_date)
+
+    def get_live_data(self, symbol: str) -> Optional[MarketData]:
+        return None
+
+    def get_available_symbols(self, asset_class: str = None) -> List[str]:
+        return list(self.fetcher.pool.get_markets(self.exchange_id))
+
+    def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
+        return self.fetcher.pool.get_markets(self.exchange_id).get(symbol, {})
+
+
+def create_history_data_loader(exchange_id: Optional[str] = None,
+                               cache_dir: str = 'data/cache') -> DataLoader:
+    """
+    Build a DataLoader whose default provider downloads missing history
+
+    Used as the data loader factory for backtest jobs.
+
+    Args:
+        exchange_id: CCXT exchange id (Binance if None)
+        cache_dir: Directory of the OHLCV store
+
+    Returns:
+        DataLoader backed by the OHLCV store
+    """
+    exchange_id = exchange_id or 'binance'
+    # The fetcher's store already caches every window, so the loader needs no cache of its own
+    loader = DataLoader(None)
+    fetcher = HistoryFetcher(CacheManager(cache_dir))
+    loader.register_provider(exchange_id, HistoryDataProvider(exchange_id, fetcher),
+                             is_default=True)
+    return loader
@@ -13,6 +13,8 @@ Features:
 - Comprehensive performance comparison tables
 - Best strategy identification per timeframe
 - Detailed performance metrics and rankings
+- In-process execution: data is fetched once per symbol/timeframe and
+  shared by every strategy (use --subprocess for isolated runs)
 """
 
 import argparse
@@ -193,6 +195,145 @@ def parse_backtest_results(output_dir, strategy, timeframe):
     
     return results
 
+def load_backtest_class():
+    """Import EnhancedCryptoBacktest once for in-process runs"""
+    scripts_dir = str(Path(__file__).resolve().parent)
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    from enhanced_crypto_backtest import EnhancedCryptoBacktest
+    return EnhancedCryptoBacktest
+
+def fetch_market_data(backtest_class, symbols, timeframes, bars, exchange, max_workers=4):
+    """Fetch every symbol/timeframe pair once and return {(symbol, timeframe): DataFrame}"""
+    pairs = [(symbol, timeframe) for timeframe in timeframes for symbol in symbols]
+    fetchers = {timeframe: backtest_class(bars=bars, interval=timeframe, exchange=exchange)
+                for timeframe in timeframes}
+    market_data = {}
+
+    print(f"📥 Fetching {len(pairs)} symbol/timeframe datasets...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_pair = {
+            executor.submit(fetchers[timeframe].fetch_symbol_data, symbol): (symbol, timeframe)
+            for symbol, timeframe in pairs
+        }
+        for future in as_completed(future_to_pair):
+            symbol, timeframe = future_to_pair[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"\n⚠️  Fetch failed for {symbol} on {timeframe}: {e}")
+                data = None
+            if data is not None and len(data) > 0:
+                market_data[(symbol, timeframe)] = data
+
+    print(f"\n✅ Fetched {len(market_data)}/{len(pairs)} datasets")
+    return market_data
+
+def summarize_combination(strategy, timeframe, symbol_results):
+    """Aggregate per-symbol results into one comparison row"""
+    df = pd.DataFrame(symbol_results)
+    total_return = df['total_return'].sum()
+    max_drawdown = max(df['max_drawdown_pct'], key=abs) if 'max_drawdown_pct' in df else 0
+
+    return {
+        'Strategy': strategy,
+        'Timeframe': timeframe,
+        'Total Return (%)': round(total_return, 2),
+        'Max Drawdown (%)': round(max_drawdown, 2),
+        'Sharpe Ratio': round(df['sharpe_ratio'].mean(), 3) if 'sharpe_ratio' in df else 0,
+        'Win Rate (%)': round(df['win_rate'].mean(), 2),
+        'Total Trades': int(df['total_trades'].sum()),
+        'Risk-Adjusted Return': round(total_return / max(abs(max_drawdown), 1), 2)
+    }
+
+def run_combination_in_process(backtest_class, market_data, symbols, strategy, timeframe,
+                               bars, capital, position, exchange, output_dir):
+    """Backtest one strategy/timeframe on pre-fetched data
+
+    Returns:
+        (comparison rows, per-symbol result dicts)
+    """
+    backtest = backtest_class(
+        initial_capital=capital,
+        position_size=position,
+        bars=bars,
+        interval=timeframe,
+        exchange=exchange,
+        strategy=strategy
+    )
+
+    symbol_results = []
+    for symbol in symbols:
+        data = market_data.get((symbol, timeframe))
+        if data is None:
+            continue
+        # Indicators are written into the frame, so each run gets its own copy
+        result = backtest.process_data(symbol, data.copy())
+        if result:
+            symbol_results.append(result)
+
+    if not symbol_results:
+        return [], []
+
+    # Keep the same on-disk layout as the subprocess runs
+    summary_columns = ['symbol', 'strategy', 'timeframe', 'total_trades',
+                       'win_rate', 'total_return', 'avg_return']
+    pd.DataFrame(symbol_results)[summary_columns].to_csv(Path(output_dir) / "summary.csv", index=False)
+    all_trades = [trade for result in symbol_results for trade in result['trades']]
+    pd.DataFrame(all_trades).to_csv(Path(output_dir) / "trades.csv", index=False)
+
+    return [summarize_combination(strategy, timeframe, symbol_results)], symbol_results
+
+def run_in_process_backtests(symbols, strategies, timeframes, bars, capital, position, exchange,
+                             output_dir, max_workers=4):
+    """Run all strategy/timeframe combinations in this process
+
+    The backtest module is imported once and each symbol/timeframe is
+    fetched once; combinations then share that data across a thread pool.
+
+    Returns:
+        (comparison rows, per-symbol result dicts)
+    """
+    backtest_class = load_backtest_class()
+    strategy_names = [s['name'] if isinstance(s, dict) else s for s in strategies]
+    combinations = [(strategy, timeframe) for strategy in strategy_names for timeframe in timeframes]
+
+    print(f"🧠 IN-PROCESS MODE (Workers: {max_workers})")
+    print(f"🎯 Total tests to run: {len(combinations)}")
+    print("=" * 80)
+
+    start_time = time.time()
+    market_data = fetch_market_data(backtest_class, symbols, timeframes, bars, exchange, max_workers)
+
+    all_results = []
+    symbol_results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_test = {}
+        for strategy, timeframe in combinations:
+            test_output_dir = Path(output_dir) / f"{strategy.replace(' ', '_')}_{timeframe}"
+            test_output_dir.mkdir(exist_ok=True)
+            future = executor.submit(
+                run_combination_in_process, backtest_class, market_data, symbols, strategy,
+                timeframe, bars, capital, position, exchange, test_output_dir
+            )
+            future_to_test[future] = (strategy, timeframe)
+
+        for completed, future in enumerate(as_completed(future_to_test), start=1):
+            strategy, timeframe = future_to_test[future]
+            try:
+                rows, results = future.result()
+            except Exception as e:
+                print(f"\n❌ Error in {strategy} on {timeframe}: {e}")
+                continue
+
+            all_results.extend(rows)
+            symbol_results.extend(results)
+            status = "✅" if rows else "❌"
+            print(f"\n{status} [{completed}/{len(combinations)}] {strategy} on {timeframe}")
+
+    print(f"\n⏱️  Total execution time: {time.time() - start_time:.1f} seconds")
+    return all_results, symbol_results
+
 def generate_comparison_report(all_results, output_dir):
     """Generate comprehensive comparison report"""
     if not all_results:
@@ -296,9 +437,27 @@ def generate_comparison_report(all_results, output_dir):
         print(f"🛡️ Most Conservative: {cons['Strategy']} ({cons['Timeframe']}) - {cons['Max Drawdown (%)']}% max drawdown")
     print("="*80)
 
-def run_comprehensive_backtest(symbols, strategies, timeframes, bars, capital, position, exchange, output_dir, parallel=False, max_workers=4):
+def run_comprehensive_backtest(symbols, strategies, timeframes, bars, capital, position, exchange, output_dir, parallel=False, max_workers=4, in_process=False):
     """Run comprehensive backtest across all strategies and timeframes"""
     
+    if in_process:
+        all_results, _ = run_in_process_backtests(
+            symbols=symbols,
+            strategies=strategies,
+            timeframes=timeframes,
+            bars=bars,
+            capital=capital,
+            position=position,
+            exchange=exchange,
+            output_dir=output_dir,
+            max_workers=max_workers if parallel else 1
+        )
+        if all_results:
+            generate_comparison_report(all_results, output_dir)
+        else:
+            print("❌ No successful results to analyze")
+        return len(all_results) > 0
+
     if parallel:
         print(f"⚡ Using PARALLEL processing with {max_workers} workers")
         return run_parallel_backtests(
@@ -694,6 +853,10 @@ def main():
 - Optimized_Crypto_V2
 - SMA_Cross
 
+⚙️ EXECUTION:
+Tests run in-process by default; --parallel uses --max-workers threads.
+Use --subprocess to run each test as a separate enhanced_crypto_backtest.py process.
+
 🎯 RECOMMENDED USAGE:
 Quick test: python batch_runner.py --auto --limit-symbols 2 --bars 100
 Full test:  python batch_runner.py --auto
@@ -726,6 +889,8 @@ Full test:  python batch_runner.py --auto
                         help="Use legacy mode (single strategy, single timeframe)")
     parser.add_argument("--parallel", action="store_true",
                         help="Run backtests in parallel for faster execution")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="Run each test in its own subprocess instead of in-process")
     parser.add_argument("--max-workers", type=int, default=4,
                         help="Maximum number of parallel workers (default: 4)")
     parser.add_argument("--limit-symbols", type=int, 
@@ -788,7 +953,8 @@ Full test:  python batch_runner.py --auto
             exchange=args.exchange,
             output_dir=str(batch_output_dir),
             parallel=args.parallel,
-            max_workers=args.max_workers
+            max_workers=args.max_workers,
+            in_process=not args.subprocess
         )
         
     elif args.legacy:
@@ -845,7 +1011,10 @@ Full test:  python batch_runner.py --auto
             capital=args.capital,
             position=args.position,
             exchange=args.exchange,
-            output_dir=str(batch_output_dir)
+            output_dir=str(batch_output_dir),
+            parallel=args.parallel,
+            max_workers=args.max_workers,
+            in_process=not args.subprocess
         )
     
     if success:
@@ -853,12 +1022,13 @@ Full test:  python batch_runner.py --auto
         print(f"📁 Results saved to: {batch_output_dir}")
         
         # Generate comprehensive summary tables
-        generate_comprehensive_summary(
-            output_dir=str(batch_output_dir),
-            symbols=symbols,
-            strategies=discovered_strategies,
-            timeframes=timeframes
-        )
+        if not args.legacy:
+            generate_comprehensive_summary(
+                output_dir=str(batch_output_dir),
+                symbols=symbols,
+                strategies=[{'name': name} for name in strategy_names],
+                timeframes=timeframes
+            )
         
         print(f"📊 Check the comprehensive report for detailed insights!")
     else:
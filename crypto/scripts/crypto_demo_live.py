@@ -19,6 +19,7 @@ import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from crypto.data_acquisition import fetch_data
+from algoproject.data.market_state import MarketStateStore
 from tabulate import tabulate
 
 try:
@@ -255,31 +256,52 @@ def setup_logging():
     return log_filename
 
 
-def scan_single_symbol(symbol, strategy, current_time):
+def fetch_scan_bars(symbol, since=None, bars=30):
+    """Fetch 5m Kraken bars for scanning (only bars from `since` onwards if given)."""
+    return fetch_data(
+        symbol=symbol,
+        exchange="kraken",
+        interval="5m",
+        bars=bars,
+        data_source="ccxt",
+        fetch_timeout=8,  # Increased timeout slightly
+        since=since
+    )
+
+
+def create_market_state(bars=30):
+    """Rolling 5m windows so each scan only fetches the newest candles."""
+    return MarketStateStore(fetch=fetch_scan_bars, timeframe="5m", capacity=bars)
+
+
+def scan_single_symbol(symbol, strategy, current_time, market_state=None):
     """Scan a single symbol for signals with improved error handling."""
     try:
         # Add random delay to prevent rate limiting
         time.sleep(0.1 + (hash(symbol) % 100) / 1000)  # 0.1-0.2 second delay
         
-        # Fetch real-time data with timeout
-        data = fetch_data(
-            symbol=symbol,
-            exchange="kraken",
-            interval="5m",
-            bars=30,
-            data_source="ccxt",
-            fetch_timeout=8  # Increased timeout slightly
-        )
-        
-        if data is None or data.empty:
-            logging.debug(f"No data for {symbol}")
-            return None
+        if market_state is not None:
+            # Incremental update of the symbol's rolling window
+            window = market_state.update(symbol)
+            if window is None or not len(window):
+                logging.debug(f"No data for {symbol}")
+                return None
+            bars = window.arrays()
+            data = window.to_frame()
+        else:
+            # Fetch real-time data with timeout
+            data = fetch_scan_bars(symbol)
+            if data is None or data.empty:
+                logging.debug(f"No data for {symbol}")
+                return None
+            bars = {column: data[column].to_numpy(dtype=float)
+                    for column in ('high', 'low', 'close', 'volume')}
         
-        current_price = data['close'].iloc[-1]
+        current_price = bars['close'][-1]
         
         # Generate signal with error handling
         try:
-            signal = strategy.generate_signal(data)
+            signal = strategy.generate_signal_arrays(**bars)
         except Exception as e:
             logging.warning(f"Strategy error for {symbol}: {e}")
             signal = None
@@ -297,7 +319,7 @@ def scan_single_symbol(symbol, strategy, current_time):
         return None
 
 
-def parallel_scan_symbols(symbols, strategy, current_time, max_workers=8):
+def parallel_scan_symbols(symbols, strategy, current_time, max_workers=8, market_state=None):
     """Scan multiple symbols in parallel with improved error handling and timeout management."""
     results = {}
     completed_count = 0
@@ -311,7 +333,7 @@ def parallel_scan_symbols(symbols, strategy, current_time, max_workers=8):
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all scanning tasks
             future_to_symbol = {
-                executor.submit(scan_single_symbol, symbol, strategy, current_time): symbol
+                executor.submit(scan_single_symbol, symbol, strategy, current_time, market_state): symbol
                 for symbol in symbols
             }
             
@@ -407,6 +429,9 @@ def run_crypto_demo_live():
     strategy_duration = time.time() - strategy_start
     print(f"{Fore.GREEN}✅ Strategy loaded in {strategy_duration:.2f}s{Style.RESET_ALL}")
     
+    # Rolling per-symbol windows: after the first scan only new candles are fetched
+    market_state = create_market_state()
+    
     print(f"{Fore.YELLOW}🔄 Initializing demo portfolio...{Style.RESET_ALL}")
     portfolio = DemoPortfolio(initial_balance=10000)
     print(f"{Fore.GREEN}✅ Portfolio initialized with $10,000 balance{Style.RESET_ALL}")
@@ -432,7 +457,8 @@ def run_crypto_demo_live():
             print(f"{Fore.CYAN}📋 Symbols to scan: {', '.join(symbols[:10])}{'...' if len(symbols) > 10 else ''}{Style.RESET_ALL}")
             scan_start_time = time.time()
             
-            scan_results = parallel_scan_symbols(symbols, strategy, current_time, max_workers=6)
+            scan_results = parallel_scan_symbols(symbols, strategy, current_time, max_workers=6,
+                                                 market_state=market_state)
             
             scan_duration = time.time() - scan_start_time
             success_rate = (len(scan_results) / len(symbols)) * 100 if symbols else 0
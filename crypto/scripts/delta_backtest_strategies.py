@@ -16,9 +16,15 @@ import requests
 from datetime import datetime, timedelta
 import argparse
 
+import numpy as np
+
 # Add crypto module to path for data acquisition
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
+from algoproject.backtesting.fill_simulator import simulate_fills
+from algoproject.core import kpi_kernel as kernel
+from crypto.history_fetcher import fetch_ohlcv_pages
+
 # Import crypto data acquisition and CCXT
 try:
     from crypto.data_acquisition import fetch_data
@@ -71,25 +77,24 @@ class ComprehensiveKPICalculator:
             return self._get_empty_kpis()
         
         # Trade data extraction
-        returns = [t['profit_pct'] for t in self.trades]
-        profits = [t['profit'] for t in self.trades]
-        durations = [(t['exit_time'] - t['entry_time']).total_seconds() / 86400 for t in self.trades]
+        table = kernel.TradeTable.from_records(self.trades, pnl='profit', pnl_pct='profit_pct')
+        stats = {key: value[0] for key, value in kernel.trade_stats(table, 1, table.pnl_pct).items()}
+        profits = {key: value[0] for key, value in kernel.trade_stats(table, 1).items()}
+        durations = table.duration_days
         
         # Basic statistics
-        total_trades = len(self.trades)
-        winning_trades = len([r for r in returns if r > 0])
-        losing_trades = len([r for r in returns if r < 0])
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+        total_trades = len(table)
+        win_rate = stats['wins'] / total_trades * 100
         
         # Return calculations
-        total_return = sum(returns)
-        avg_return = sum(returns) / len(returns) if returns else 0
-        best_trade = max(returns) if returns else 0
-        worst_trade = min(returns) if returns else 0
+        total_return = float(table.pnl_pct.sum())
+        avg_return = float(stats['mean'])
+        best_trade = float(stats['best'])
+        worst_trade = float(stats['worst'])
         
         # Duration calculations
-        max_duration = max(durations) if durations else 0
-        avg_duration = sum(durations) / len(durations) if durations else 0
+        max_duration = float(durations.max())
+        avg_duration = float(durations.mean())
         
         # Time period calculations
         start_date = min([t['entry_time'] for t in self.trades])
@@ -97,25 +102,23 @@ class ComprehensiveKPICalculator:
         duration_days = (end_date - start_date).days + 1
         
         # Equity calculations
-        final_equity = self.initial_capital + sum(profits)
+        final_equity = self.initial_capital + float(table.pnl.sum())
         peak_equity = max([eq['equity'] for eq in self.equity_curve]) if self.equity_curve else final_equity
         
         # Profit factor calculation
-        gross_profit = sum([p for p in profits if p > 0])
-        gross_loss = abs(sum([p for p in profits if p < 0]))
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
+        profit_factor = float(kernel.profit_factor(profits['gross_profit'], profits['gross_loss']))
         
         # Annualized calculations
         years = max(duration_days / 365.25, 1/365.25)
         annual_return = (((final_equity / self.initial_capital) ** (1/years)) - 1) * 100
         
         # Volatility calculations
-        volatility_daily = self._calculate_volatility(returns)
+        volatility_daily = self._calculate_volatility(table.pnl_pct)
         volatility_annual = volatility_daily * math.sqrt(252)
         
         # Risk ratios
         sharpe_ratio = annual_return / volatility_annual if volatility_annual > 0 else 0
-        sortino_ratio = self._calculate_sortino_ratio(returns, annual_return)
+        sortino_ratio = self._calculate_sortino_ratio(table.pnl_pct, annual_return)
         
         # Drawdown calculations
         max_dd, avg_dd, max_dd_duration, avg_dd_duration = self._calculate_comprehensive_drawdowns()
@@ -193,17 +196,15 @@ class ComprehensiveKPICalculator:
         """Calculate return volatility."""
         if len(returns) < 2:
             return 0
-        mean_return = sum(returns) / len(returns)
-        variance = sum([(r - mean_return) ** 2 for r in returns]) / (len(returns) - 1)
-        return math.sqrt(variance)
+        return float(kernel.nan_std(kernel.as_runs(returns))[0])
 
     def _calculate_sortino_ratio(self, returns, annual_return):
         """Calculate Sortino ratio."""
-        downside_returns = [r for r in returns if r < 0]
-        if not downside_returns:
+        downside_returns = returns[returns < 0]
+        if not len(downside_returns):
             return float('inf')
         
-        downside_deviation = math.sqrt(sum([r ** 2 for r in downside_returns]) / len(downside_returns))
+        downside_deviation = math.sqrt(float(np.mean(downside_returns ** 2)))
         downside_deviation_annual = downside_deviation * math.sqrt(252)
         return annual_return / downside_deviation_annual if downside_deviation_annual > 0 else 0
 
@@ -212,37 +213,26 @@ class ComprehensiveKPICalculator:
         if not self.equity_curve:
             return 0, 0, 0, 0
         
-        peak = self.equity_curve[0]['equity']
-        max_drawdown = 0
-        current_drawdown = 0
-        drawdown_start = None
-        drawdown_durations = []
-        all_drawdowns = []
+        equity = kernel.as_runs([point['equity'] for point in self.equity_curve])
+        timestamps = np.array([np.datetime64(point['timestamp'], 'ns') for point in self.equity_curve])
+        peak = kernel.running_peak(equity)
         
-        for i, point in enumerate(self.equity_curve):
-            equity = point['equity']
-            
-            # Update peak
-            if equity > peak:
-                # End of drawdown period
-                if drawdown_start is not None:
-                    duration = (point['timestamp'] - drawdown_start).days
-                    drawdown_durations.append(duration)
-                    drawdown_start = None
-                peak = equity
-                current_drawdown = 0
-            else:
-                # In drawdown
-                if drawdown_start is None:
-                    drawdown_start = point['timestamp']
-                
-                current_drawdown = ((peak - equity) / peak) * 100
-                all_drawdowns.append(current_drawdown)
-                max_drawdown = max(max_drawdown, current_drawdown)
+        # Every point that does not set a new high counts as in drawdown
+        in_drawdown = np.ones(equity.shape, dtype=bool)
+        in_drawdown[:, 1:] = equity[:, 1:] <= peak[:, :-1]
+        all_drawdowns = ((peak - equity) / peak * 100)[in_drawdown]
         
-        avg_drawdown = sum(all_drawdowns) / len(all_drawdowns) if all_drawdowns else 0
-        max_dd_duration = max(drawdown_durations) if drawdown_durations else 0
-        avg_dd_duration = sum(drawdown_durations) / len(drawdown_durations) if drawdown_durations else 0
+        # A drawdown lasts in calendar days until the next new high
+        periods = kernel.find_periods(in_drawdown)
+        closed = ~periods.open
+        drawdown_durations = np.floor(
+            (timestamps[periods.end[closed]] - timestamps[periods.start[closed]]) / kernel.DAY
+        )
+        
+        max_drawdown = float(all_drawdowns.max())
+        avg_drawdown = float(all_drawdowns.mean())
+        max_dd_duration = int(drawdown_durations.max()) if len(drawdown_durations) else 0
+        avg_dd_duration = float(drawdown_durations.mean()) if len(drawdown_durations) else 0
         
         return max_drawdown, avg_drawdown, max_dd_duration, avg_dd_duration
 
@@ -471,12 +461,19 @@ class DeltaExchangeAPI:
                 }
                 
                 minutes_per_candle = timeframe_minutes.get(timeframe, 60)
-                limit = min(int(days * 1440 / minutes_per_candle), 1000)  # API limit
+                limit = int(days * 1440 / minutes_per_candle)
                 
                 print(f"[CHART] Fetching real {timeframe} data for {symbol} from Delta Exchange...")
                 
-                # Fetch OHLCV data with automatic rate limiting
-                ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+                # Fetch OHLCV data with automatic rate limiting, paging past the API's per-call cap
+                if limit > 1:
+                    end_ms = int(time.time() * 1000)
+                    ohlcv = fetch_ohlcv_pages(
+                        self.exchange, symbol, timeframe,
+                        start_ms=end_ms - limit * minutes_per_candle * 60000, end_ms=end_ms
+                    )[-limit:]
+                else:
+                    ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
                 
                 if not ohlcv:
                     return None
@@ -689,46 +686,33 @@ class MultiStrategyBacktester:
         # Reset KPI calculator
         self.kpi_calculator.reset()
         
-        # Execute trades
-        position = None
+        # Simulate fills over the signal list in one pass
+        action_codes = {'buy': 1, 'sell': -1}
+        simulation = simulate_fills(
+            [signal['price'] for signal in signals],
+            [action_codes.get(signal['action'], 0) for signal in signals],
+            initial_capital=self.initial_capital,
+            notional=self.position_size
+        )
+        
         trades = []
-        current_equity = self.initial_capital
-        
-        for signal in signals:
-            if signal['action'] == 'buy' and position is None:
-                # Open long position
-                shares = self.position_size / signal['price']
-                position = {
-                    'entry_time': signal['timestamp'],
-                    'entry_price': signal['price'],
-                    'shares': shares,
-                    'type': 'long'
-                }
-                
-            elif signal['action'] == 'sell' and position is not None:
-                # Close position
-                exit_price = signal['price']
-                profit = (exit_price - position['entry_price']) * position['shares']
-                profit_pct = ((exit_price - position['entry_price']) / position['entry_price']) * 100
-                
-                trade = {
-                    'entry_time': position['entry_time'],
-                    'exit_time': signal['timestamp'],
-                    'entry_price': position['entry_price'],
-                    'exit_price': exit_price,
-                    'shares': position['shares'],
-                    'profit': profit,
-                    'profit_pct': profit_pct,
-                    'duration': signal['timestamp'] - position['entry_time']
-                }
-                
-                trades.append(trade)
-                self.kpi_calculator.add_trade(trade)
-                
-                current_equity += profit
-                self.kpi_calculator.add_equity_point(signal['timestamp'], current_equity)
-                
-                position = None
+        closed = simulation.trades
+        realized = simulation.realized_equity.tolist()
+        for k, (entry, exit_) in enumerate(zip(closed['entry_index'].tolist(), closed['exit_index'].tolist())):
+            trade = {
+                'entry_time': signals[entry]['timestamp'],
+                'exit_time': signals[exit_]['timestamp'],
+                'entry_price': signals[entry]['price'],
+                'exit_price': signals[exit_]['price'],
+                'shares': float(closed['quantity'][k]),
+                'profit': float(closed['pnl'][k]),
+                'profit_pct': float(closed['pnl_pct'][k]),
+                'duration': signals[exit_]['timestamp'] - signals[entry]['timestamp']
+            }
+            
+            trades.append(trade)
+            self.kpi_calculator.add_trade(trade)
+            self.kpi_calculator.add_equity_point(signals[exit_]['timestamp'], realized[exit_])
         
         # Calculate KPIs
         kpis = self.kpi_calculator.calculate_all_29_kpis()
@@ -25,6 +25,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from crypto.data_acquisition import fetch_data
 from tabulate import tabulate
 from crypto.tools.backtest_evaluator import BacktestEvaluator
+from algoproject.backtesting.fill_simulator import simulate_fills
 
 # Lazy imports for strategies to prevent hanging
 def import_strategy(strategy_name):
@@ -176,52 +177,35 @@ class EnhancedCryptoBacktest:
             rs = gain / loss
             data['rsi'] = 100 - (100 / (1 + rs))
 
-            signals = []
+            # Generate signals with crossover detection, all rows at once
+            fast = data['sma_fast'].to_numpy(dtype=float)
+            slow = data['sma_slow'].to_numpy(dtype=float)
+            rsi = data['rsi'].to_numpy(dtype=float)
+            prev_fast = np.concatenate(([np.nan], fast[:-1]))
+            prev_slow = np.concatenate(([np.nan], slow[:-1]))
+
+            # Start after SMA calculation period, skipping rows without data
+            valid = np.arange(len(data)) >= 31
+            valid &= ~np.isnan(fast) & ~np.isnan(slow)
+            rows = np.flatnonzero(valid)
+            if len(rows) == 0:
+                return pd.DataFrame()
 
-            # Generate signals with crossover detection
-            for i in range(31, len(data)):  # Start after SMA calculation period
-                current = data.iloc[i]
-                prev = data.iloc[i-1]
-                
-                # Check for valid data
-                if pd.isna(current['sma_fast']) or pd.isna(current['sma_slow']):
-                    continue
-                
-                signal_strength = 0
-                signal_type = 'hold'
-                
-                # Bullish crossover: fast SMA crosses above slow SMA
-                if (current['sma_fast'] > current['sma_slow'] and 
-                    prev['sma_fast'] <= prev['sma_slow']):
-                    signal_type = 'buy'
-                    signal_strength = 3  # Strong signal
-                    
-                    # Additional confirmation with RSI
-                    if not pd.isna(current['rsi']) and current['rsi'] < 70:
-                        signal_strength = 4  # Very strong signal
-                
-                # Bearish crossover: fast SMA crosses below slow SMA
-                elif (current['sma_fast'] < current['sma_slow'] and 
-                      prev['sma_fast'] >= prev['sma_slow']):
-                    signal_type = 'sell'
-                    signal_strength = 3  # Strong signal
-                    
-                    # Additional confirmation with RSI
-                    if not pd.isna(current['rsi']) and current['rsi'] > 30:
-                        signal_strength = 4  # Very strong signal
-
-                signals.append({
-                    'timestamp': data.index[i],
-                    'signal': signal_type,
-                    'score': signal_strength,
-                    'price': current['close'],
-                    'sma_fast': current['sma_fast'],
-                    'sma_slow': current['sma_slow'],
-                    'rsi': current['rsi'] if not pd.isna(current['rsi']) else 50,
-                    'macd': np.nan
-                })
-
-            return pd.DataFrame(signals)
+            # Bullish / bearish crossover, confirmed by RSI for a very strong signal
+            buy = (fast > slow) & (prev_fast <= prev_slow)
+            sell = ~buy & (fast < slow) & (prev_fast >= prev_slow)
+            strength = np.where(buy, np.where(rsi < 70, 4, 3), np.where(sell, np.where(rsi > 30, 4, 3), 0))
+
+            return pd.DataFrame({
+                'timestamp': data.index[rows],
+                'signal': np.where(buy, 'buy', np.where(sell, 'sell', 'hold'))[rows],
+                'score': strength[rows],
+                'price': data['close'].to_numpy()[rows],
+                'sma_fast': fast[rows],
+                'sma_slow': slow[rows],
+                'rsi': np.where(np.isnan(rsi), 50, rsi)[rows],
+                'macd': np.nan
+            })
 
         except Exception as e:
             print(f"WARNING: Error generating SMA_Cross signals: {e}")
@@ -359,148 +343,116 @@ class EnhancedCryptoBacktest:
             # Fallback to RSI_MACD_VWAP for optimized crypto
             return self.generate_simple_signals(data, 'RSI_MACD_VWAP')
 
+    def generate_simple_signals_batch(self, data, strategy_name):
+        """Compute fallback signals for every row at once.
+
+        Returns an int8 array with 1 for buy, -1 for sell and 0 for no signal.
+        """
+        column = lambda name: data[name].to_numpy(dtype=float)
+        close = column('close')
+        action = np.zeros(len(data), dtype=np.int8)
+
+        if strategy_name == 'RSI_MACD_VWAP':
+            # RSI oversold + MACD positive + price below VWAP, or the reverse
+            rsi, macd, macd_signal, vwap = column('rsi'), column('macd'), column('macd_signal'), column('vwap')
+            buy = (rsi < 35) & (macd > macd_signal) & (close < vwap)
+            sell = (rsi > 65) & (macd < macd_signal) & (close > vwap)
+            start = 50
+
+        elif strategy_name == 'BB_RSI':
+            # Price at a Bollinger Band extreme + RSI oversold/overbought
+            rsi, bb_lower, bb_upper = column('rsi'), column('bb_lower'), column('bb_upper')
+            buy = (close <= bb_lower) & (rsi < 30)
+            sell = (close >= bb_upper) & (rsi > 70)
+            start = 30
+
+        elif strategy_name == 'MACD_Only':
+            # MACD crossing its signal line
+            macd, macd_signal = column('macd'), column('macd_signal')
+            prev_macd = np.concatenate(([np.nan], macd[:-1]))
+            prev_signal = np.concatenate(([np.nan], macd_signal[:-1]))
+            buy = (macd > macd_signal) & (prev_macd <= prev_signal)
+            sell = (macd < macd_signal) & (prev_macd >= prev_signal)
+            start = 30
+
+        else:
+            return action
+
+        # NaN indicators never satisfy a comparison, so those rows stay at 0
+        action[start:][sell[start:]] = -1
+        action[start:][buy[start:]] = 1
+        return action
+
     def generate_simple_signals(self, data, strategy_name):
         """Fallback simple signal generation when strategy classes fail."""
         try:
-            signals = []
-            
-            if strategy_name == 'RSI_MACD_VWAP':
-                # Simple RSI + MACD + VWAP signals
-                for i in range(50, len(data)):
-                    current = data.iloc[i]
-                    
-                    if pd.isna(current['rsi']) or pd.isna(current['macd']) or pd.isna(current['vwap']):
-                        continue
-                        
-                    # Buy signal: RSI oversold + MACD positive + Price below VWAP
-                    if (current['rsi'] < 35 and current['macd'] > current['macd_signal'] and 
-                        current['close'] < current['vwap']):
-                        signals.append({
-                            'timestamp': data.index[i],
-                            'signal': 'buy',
-                            'price': current['close'],
-                            'rsi': current['rsi'],
-                            'macd': current['macd'],
-                            'score': 3
-                        })
-                    
-                    # Sell signal: RSI overbought + MACD negative + Price above VWAP  
-                    elif (current['rsi'] > 65 and current['macd'] < current['macd_signal'] and
-                          current['close'] > current['vwap']):
-                        signals.append({
-                            'timestamp': data.index[i],
-                            'signal': 'sell',
-                            'price': current['close'],
-                            'rsi': current['rsi'],
-                            'macd': current['macd'],
-                            'score': 3
-                        })
-                        
-            elif strategy_name == 'BB_RSI':
-                # Simple Bollinger Bands + RSI signals
-                for i in range(30, len(data)):
-                    current = data.iloc[i]
-                    
-                    if pd.isna(current['rsi']) or pd.isna(current['bb_lower']) or pd.isna(current['bb_upper']):
-                        continue
-                        
-                    # Buy signal: Price at lower BB + RSI oversold
-                    if current['close'] <= current['bb_lower'] and current['rsi'] < 30:
-                        signals.append({
-                            'timestamp': data.index[i],
-                            'signal': 'buy',
-                            'price': current['close'],
-                            'rsi': current['rsi'],
-                            'macd': np.nan,
-                            'score': 3
-                        })
-                    
-                    # Sell signal: Price at upper BB + RSI overbought
-                    elif current['close'] >= current['bb_upper'] and current['rsi'] > 70:
-                        signals.append({
-                            'timestamp': data.index[i],
-                            'signal': 'sell',
-                            'price': current['close'],
-                            'rsi': current['rsi'],
-                            'macd': np.nan,
-                            'score': 3
-                        })
-                        
-            elif strategy_name == 'MACD_Only':
-                # Simple MACD crossover signals
-                for i in range(30, len(data)):
-                    current = data.iloc[i]
-                    prev = data.iloc[i-1]
-                    
-                    if pd.isna(current['macd']) or pd.isna(current['macd_signal']):
-                        continue
-                        
-                    # Buy signal: MACD crosses above signal
-                    if (current['macd'] > current['macd_signal'] and 
-                        prev['macd'] <= prev['macd_signal']):
-                        signals.append({
-                            'timestamp': data.index[i],
-                            'signal': 'buy',
-                            'price': current['close'],
-                            'rsi': np.nan,
-                            'macd': current['macd'],
-                            'score': 3
-                        })
-                    
-                    # Sell signal: MACD crosses below signal
-                    elif (current['macd'] < current['macd_signal'] and 
-                          prev['macd'] >= prev['macd_signal']):
-                        signals.append({
-                            'timestamp': data.index[i],
-                            'signal': 'sell',
-                            'price': current['close'],
-                            'rsi': np.nan,
-                            'macd': current['macd'],
-                            'score': 3
-                        })
-                        
-            return pd.DataFrame(signals)
-            
+            action = self.generate_simple_signals_batch(data, strategy_name)
+            rows = np.flatnonzero(action)
+            if len(rows) == 0:
+                return pd.DataFrame()
+
+            return pd.DataFrame({
+                'timestamp': data.index[rows],
+                'signal': np.where(action[rows] > 0, 'buy', 'sell'),
+                'price': data['close'].to_numpy()[rows],
+                'rsi': data['rsi'].to_numpy()[rows] if strategy_name != 'MACD_Only' else np.nan,
+                'macd': data['macd'].to_numpy()[rows] if strategy_name != 'BB_RSI' else np.nan,
+                'score': 3
+            })
+
         except Exception as e:
             print(f"ERROR in simple signal generation: {e}")
             return pd.DataFrame()
 
+    def fetch_symbol_data(self, symbol):
+        """Fetch OHLCV data for a symbol with retries; None if unavailable."""
+        max_retries = 2  # Reduced retries
+        data = None
+
+        for attempt in range(max_retries):
+            try:
+                print(f"fetching data (attempt {attempt + 1})...", end=" ")
+                # Add explicit timeout and reduce bars for faster fetching
+                data = fetch_data(
+                    symbol=symbol, 
+                    bars=min(self.bars, 100),  # Limit bars to prevent hanging
+                    interval=self.interval,
+                    exchange=self.exchange,
+                    fetch_timeout=5  # Strict 5 second timeout
+                )
+                if data is not None and len(data) > 0:
+                    print(f"success ({len(data)} bars)...", end=" ")
+                    break
+                else:
+                    print("no data...", end=" ")
+                    
+            except Exception as e:
+                print(f"error ({str(e)[:30]})...", end=" ")
+                if attempt < max_retries - 1:
+                    print(f"retry...", end=" ")
+                    time.sleep(0.5)  # Shorter wait
+                    continue
+                else:
+                    print(f"failed...", end=" ")
+                    return None
+
+        return data
+
     def process_symbol(self, symbol):
         """Process a single symbol and return analysis."""
         print(f"Processing {symbol}...", end=" ")
         
         try:
-            # Fetch data with retry logic and timeout
-            max_retries = 2  # Reduced retries
-            data = None
-            
-            for attempt in range(max_retries):
-                try:
-                    print(f"fetching data (attempt {attempt + 1})...", end=" ")
-                    # Add explicit timeout and reduce bars for faster fetching
-                    data = fetch_data(
-                        symbol=symbol, 
-                        bars=min(self.bars, 100),  # Limit bars to prevent hanging
-                        interval=self.interval,
-                        exchange=self.exchange,
-                        fetch_timeout=5  # Strict 5 second timeout
-                    )
-                    if data is not None and len(data) > 0:
-                        print(f"success ({len(data)} bars)...", end=" ")
-                        break
-                    else:
-                        print("no data...", end=" ")
-                        
-                except Exception as e:
-                    print(f"error ({str(e)[:30]})...", end=" ")
-                    if attempt < max_retries - 1:
-                        print(f"retry...", end=" ")
-                        time.sleep(0.5)  # Shorter wait
-                        continue
-                    else:
-                        print(f"failed...", end=" ")
-                        return None
-            
+            data = self.fetch_symbol_data(symbol)
+        except Exception as e:
+            print(f"Error: {e}")
+            return None
+
+        return self.process_data(symbol, data)
+
+    def process_data(self, symbol, data):
+        """Run indicators, signals and the backtest on already-fetched data."""
+        try:
             if data is None or len(data) < 50:
                 print("Insufficient data")
                 return None
@@ -563,66 +515,52 @@ class EnhancedCryptoBacktest:
             # Store evaluator for later use
             self.evaluators[symbol] = evaluator
             
-            # Execute trades based on signals
-            position = None
-            trades = []
-            current_equity = self.initial_capital
+            # Simulate fills over the signal rows in one pass
+            timestamps = signals['timestamp'].tolist()
+            actions = np.select([signals['signal'] == 'buy', signals['signal'] == 'sell'], [1, -1], 0)
+            simulation = simulate_fills(
+                signals['price'].to_numpy(dtype=float), actions,
+                initial_capital=self.initial_capital,
+                notional=self.position_size
+            )
             
-            for _, signal in signals.iterrows():
-                current_price = signal['price']
-                signal_type = signal['signal']
-                timestamp = signal['timestamp']
-                
-                # Add equity curve point
-                evaluator.add_equity_point(timestamp, current_equity)
-                
-                if signal_type == 'buy' and position is None:
-                    # Enter long position
-                    position = {
-                        'type': 'long',
-                        'entry_price': current_price,
-                        'entry_time': timestamp,
-                        'quantity': self.position_size / current_price
-                    }
-                    
-                elif signal_type == 'sell' and position is not None:
-                    # Exit position
-                    if position['type'] == 'long':
-                        profit = (current_price - position['entry_price']) * position['quantity']
-                        profit_percent = ((current_price - position['entry_price']) / position['entry_price']) * 100
-                        
-                        # Update equity
-                        current_equity += profit
-                        
-                        trade = {
-                            'symbol': symbol,
-                            'entry_time': position['entry_time'],
-                            'exit_time': timestamp,
-                            'entry_price': position['entry_price'],
-                            'exit_price': current_price,
-                            'quantity': position['quantity'],
-                            'profit': profit,
-                            'profit_percent': profit_percent,
-                            'type': position['type']
-                        }
-                        trades.append(trade)
-                        
-                        # Update evaluator with correct interface
-                        evaluator.add_trade({
-                            'entry_time': position['entry_time'],
-                            'exit_time': timestamp,
-                            'entry_price': position['entry_price'],
-                            'exit_price': current_price,
-                            'position_size': position['quantity'],
-                            'trade_type': 'Long',
-                            'pnl_dollars': profit,
-                            'pnl_percent': profit_percent
-                        })
-                        
-                        # Add final equity point
-                        evaluator.add_equity_point(timestamp, current_equity)
-                        
-                        position = None
+            closed = simulation.trades
+            trades = [
+                {
+                    'symbol': symbol,
+                    'entry_time': timestamps[entry],
+                    'exit_time': timestamps[exit_],
+                    'entry_price': entry_price,
+                    'exit_price': exit_price,
+                    'quantity': quantity,
+                    'profit': profit,
+                    'profit_percent': profit_percent,
+                    'type': 'long'
+                }
+                for entry, exit_, entry_price, exit_price, quantity, profit, profit_percent in zip(
+                    closed['entry_index'].tolist(), closed['exit_index'].tolist(), closed['entry_price'],
+                    closed['exit_price'], closed['quantity'], closed['pnl'], closed['pnl_pct'])
+            ]
+            
+            # Feed the evaluator in signal order: closed-trade equity at every
+            # signal, and the trade plus updated equity at each exit
+            realized = simulation.realized_equity.tolist()
+            exits = dict(zip(closed['exit_index'].tolist(), trades))
+            for i, timestamp in enumerate(timestamps):
+                evaluator.add_equity_point(timestamp, realized[i - 1] if i else self.initial_capital)
+                trade = exits.get(i)
+                if trade is not None:
+                    evaluator.add_trade({
+                        'entry_time': trade['entry_time'],
+                        'exit_time': trade['exit_time'],
+                        'entry_price': trade['entry_price'],
+                        'exit_price': trade['exit_price'],
+                        'position_size': trade['quantity'],
+                        'trade_type': 'Long',
+                        'pnl_dollars': trade['profit'],
+                        'pnl_percent': trade['profit_percent']
+                    })
+                    evaluator.add_equity_point(timestamp, realized[i])
             
             if not trades:
                 return None
@@ -31,7 +31,14 @@ except ImportError:
     RICH_AVAILABLE = False
     print("⚠️  Rich not available. Install with: pip install rich")
 
-from tabulate import tabulate
+try:
+    from tabulate import tabulate
+    TABULATE_AVAILABLE = True
+except ImportError:
+    TABULATE_AVAILABLE = False
+    print("⚠️  Tabulate not available. Install with: pip install tabulate")
+
+from algoproject.core import kpi_kernel as kernel
 
 
 class BacktestEvaluator:
@@ -46,6 +53,7 @@ class BacktestEvaluator:
         self.trades = []
         self.equity_curve = []
         self.drawdown_curve = []
+        self.peak_equity = None
         self.start_date = None
         self.end_date = None
         
@@ -106,12 +114,9 @@ class BacktestEvaluator:
         
     def _calculate_drawdown(self, current_equity: float) -> float:
         """Calculate current drawdown percentage"""
-        if not self.equity_curve:
-            return 0.0
-            
-        peak_equity = max([point['equity'] for point in self.equity_curve] + [current_equity])
-        drawdown = (peak_equity - current_equity) / peak_equity * 100
-        return drawdown
+        if self.peak_equity is None or current_equity > self.peak_equity:
+            self.peak_equity = current_equity
+        return (self.peak_equity - current_equity) / self.peak_equity * 100
         
     def calculate_comprehensive_kpis(self) -> Dict:
         """Calculate all performance KPIs"""
@@ -120,15 +125,15 @@ class BacktestEvaluator:
             
         # Basic info
         df_trades = pd.DataFrame(self.trades)
-        df_equity = pd.DataFrame(self.equity_curve)
+        equity = kernel.as_runs([point['equity'] for point in self.equity_curve])
         
         self.start_date = df_trades['entry_time'].min()
         self.end_date = df_trades['exit_time'].max()
         duration = (self.end_date - self.start_date).days
         
         # Equity metrics
-        equity_final = df_equity['equity'].iloc[-1]
-        equity_peak = df_equity['equity'].max()
+        equity_final = float(equity[0, -1])
+        equity_peak = float(equity.max())
         
         # Returns
         total_return = (equity_final - self.initial_capital) / self.initial_capital * 100
@@ -148,10 +153,9 @@ class BacktestEvaluator:
             annualized_return = 0
             
         # Volatility (annualized)
-        if len(df_equity) > 1:
-            daily_returns = df_equity['equity'].pct_change().dropna()
-            daily_volatility = daily_returns.std()
-            annualized_volatility = daily_volatility * np.sqrt(252) * 100
+        daily_returns = kernel.simple_returns(equity)
+        if daily_returns.size:
+            annualized_volatility = float(kernel.nan_std(daily_returns)[0]) * np.sqrt(252) * 100
         else:
             annualized_volatility = 0
             
@@ -163,10 +167,10 @@ class BacktestEvaluator:
             sharpe_ratio = 0
             
         # Sortino Ratio (downside deviation)
-        if len(df_equity) > 1:
-            negative_returns = daily_returns[daily_returns < 0]
-            if len(negative_returns) > 0:
-                downside_deviation = negative_returns.std() * np.sqrt(252) * 100
+        if daily_returns.size:
+            negative = daily_returns < 0
+            if negative.any():
+                downside_deviation = float(kernel.nan_std(kernel.masked(daily_returns, negative))[0]) * np.sqrt(252) * 100
                 sortino_ratio = (annualized_return - risk_free_rate) / downside_deviation if downside_deviation > 0 else 0
             else:
                 sortino_ratio = float('inf')
@@ -174,30 +178,32 @@ class BacktestEvaluator:
             sortino_ratio = 0
             
         # Drawdown metrics
-        max_drawdown = df_equity['drawdown'].max()
-        avg_drawdown = df_equity['drawdown'].mean()
+        drawdown = -kernel.drawdowns(equity) * 100
+        max_drawdown = float(drawdown.max())
+        avg_drawdown = float(drawdown.mean())
         
         # Calmar Ratio
         calmar_ratio = annualized_return / max_drawdown if max_drawdown > 0 else 0
         
         # Trade statistics
-        total_trades = len(df_trades)
-        winning_trades = len(df_trades[df_trades['outcome'] == 'Win'])
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+        table = kernel.TradeTable.from_records(self.trades, pnl='pnl_dollars', pnl_pct='pnl_percent')
+        pnl_stats = {key: value[0] for key, value in kernel.trade_stats(table, 1).items()}
+        pct_stats = {key: value[0] for key, value in kernel.trade_stats(table, 1, table.pnl_pct).items()}
+        total_trades = len(table)
+        win_rate = pnl_stats['wins'] / total_trades * 100
         
         # P&L statistics
-        best_trade = df_trades['pnl_percent'].max()
-        worst_trade = df_trades['pnl_percent'].min()
-        avg_trade = df_trades['pnl_percent'].mean()
+        best_trade = float(pct_stats['best'])
+        worst_trade = float(pct_stats['worst'])
+        avg_trade = float(pct_stats['mean'])
         
         # Trade duration
-        max_trade_duration = df_trades['duration_days'].max()
-        avg_trade_duration = df_trades['duration_days'].mean()
+        durations = table.duration_days
+        max_trade_duration = float(durations.max())
+        avg_trade_duration = float(durations.mean())
         
         # Profit Factor
-        gross_profit = df_trades[df_trades['pnl_dollars'] > 0]['pnl_dollars'].sum()
-        gross_loss = abs(df_trades[df_trades['pnl_dollars'] < 0]['pnl_dollars'].sum())
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
+        profit_factor = float(kernel.profit_factor(pnl_stats['gross_profit'], pnl_stats['gross_loss']))
         
         # Expectancy
         expectancy = avg_trade
@@ -292,7 +298,12 @@ class BacktestEvaluator:
             'Position Size', 'P&L ($)', 'P&L (%)', 'Duration', 'Type', 'Outcome'
         ]
         
-        print(tabulate(table_data, headers=headers, tablefmt='grid'))
+        if TABULATE_AVAILABLE:
+            print(tabulate(table_data, headers=headers, tablefmt='grid'))
+        else:
+            print(' | '.join(headers))
+            for row in table_data:
+                print(' | '.join(str(value) for value in row))
         
     def display_kpi_summary(self, kpis: Dict):
         """Display KPI summary with colors"""
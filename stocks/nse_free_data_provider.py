@@ -23,19 +23,27 @@ class NSEFreeDataProvider:
     3. NSE indices data (NIFTY 50, BANK NIFTY, etc.)
     """
     
-    def __init__(self):
-        """Initialize NSE free data provider"""
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize NSE free data provider
+        
+        Args:
+            session: Ready HTTP session to use instead of opening a new one
+        """
         self.base_url = "https://www.nseindia.com/api"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
             'Accept-Language': 'en-US,en;q=0.9',
         }
-        # Create session for cookies
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-        # Get cookies by visiting homepage
-        self._init_session()
+        if session is not None:
+            self.session = session
+        else:
+            # Create session for cookies
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            # Get cookies by visiting homepage
+            self._init_session()
         logger.info("✅ NSE Free Data Provider initialized")
     
     def _init_session(self):
@@ -111,7 +119,7 @@ class NSEFreeDataProvider:
             yahoo_symbol = f"{symbol}.NS"  # NSE suffix for Yahoo
             url = f"https://query1.finance.yahoo.com/v8/finance/chart/{yahoo_symbol}"
             
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 result = data['chart']['result'][0]
@@ -152,6 +160,50 @@ class NSEFreeDataProvider:
             'data_source': 'MOCK'
         }
     
+    def get_index_quotes(self, index_name: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get quotes for every constituent of an NSE index in one request
+        Endpoint: https://www.nseindia.com/api/equity-stockIndices?index=NIFTY%2050
+        
+        Args:
+            index_name: NSE index name (e.g. "NIFTY 50", "NIFTY 500")
+        
+        Returns:
+            Dictionary of quotes keyed by symbol (empty on failure)
+        """
+        try:
+            url = f"{self.base_url}/equity-stockIndices"
+            response = self.session.get(url, params={'index': index_name}, timeout=10)
+            
+            if response.status_code == 200:
+                data = response.json()
+                quotes = {}
+                timestamp = datetime.now().isoformat()
+                
+                for item in data.get('data', []):
+                    symbol = item.get('symbol')
+                    # The first row is the index itself
+                    if not symbol or symbol == index_name:
+                        continue
+                    quotes[symbol] = {
+                        'symbol': symbol,
+                        'ltp': item.get('lastPrice', 0),
+                        'open': item.get('open', 0),
+                        'high': item.get('dayHigh', 0),
+                        'low': item.get('dayLow', 0),
+                        'close': item.get('previousClose', 0),
+                        'volume': item.get('totalTradedVolume', 0),
+                        'change': item.get('change', 0),
+                        'change_percent': item.get('pChange', 0),
+                        'timestamp': timestamp,
+                        'data_source': 'NSE_FREE'
+                    }
+                
+                return quotes
+        except Exception as e:
+            logger.error(f"Error fetching {index_name} constituents: {e}")
+        return {}
+    
     def get_nifty_indices(self) -> Dict[str, Any]:
         """
         Get NIFTY indices data (NIFTY 50, BANK NIFTY, etc.)
@@ -0,0 +1,242 @@
+"""
+NSE Async Quote Engine
+======================
+
+Concurrent quote fan-out on top of ``NSEFreeDataProvider``.
+
+``NSEFreeDataProvider.get_quote`` requests one symbol at a time, so a large
+watchlist blocks for the sum of every request and its fallbacks. The
+engine instead:
+
+1. Serves as many symbols as possible from bulk index endpoints (one
+   request returns every constituent of e.g. NIFTY 500)
+2. Fetches the rest concurrently, bounded by a semaphore, over the
+   provider's pooled HTTP session
+3. Shares in-flight requests, so overlapping calls fetch a symbol once
+4. Returns what has arrived when the deadline passes; each quote carries
+   its ``data_source`` tag
+
+Example:
+    async with AsyncQuoteEngine(NSEFreeDataProvider()) as engine:
+        quotes = await engine.get_quotes(["RELIANCE", "TCS", "INFY"])
+
+A long-lived engine is stopped with ``close()``, which shuts down its
+worker threads.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Tried in order until every symbol is found; NIFTY 500 covers most of the market
+DEFAULT_BULK_INDICES = ('NIFTY 50', 'NIFTY 500')
+
+
+class AsyncQuoteEngine:
+    """Concurrent, coalescing quote fetcher for an NSEFreeDataProvider"""
+
+    def __init__(self, provider: Any, max_concurrency: int = 16,
+                 bulk_indices: Sequence[str] = DEFAULT_BULK_INDICES,
+                 bulk_min_symbols: int = 5, timeout: float = 15.0):
+        """
+        Initialize the engine
+
+        Args:
+            provider: NSEFreeDataProvider whose session and parsers are used
+            max_concurrency: Requests in flight at once
+            bulk_indices: Index constituent lists tried before per-symbol requests
+            bulk_min_symbols: Smallest request that uses the bulk endpoints
+            timeout: Seconds to wait before returning partial results
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.bulk_indices = tuple(bulk_indices)
+        self.bulk_min_symbols = bulk_min_symbols
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix='nse-quotes')
+        # Keep one pooled connection per worker
+        if isinstance(provider.session, requests.Session):
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency)
+            provider.session.mount('https://', adapter)
+
+        # Event-loop bound state, created on first use in a loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_indices: Dict[str, asyncio.Future] = {}
+        self._closed = False
+
+        self.stats: Dict[str, int] = {
+            'requests': 0,
+            'symbols': 0,
+            'coalesced': 0,       # Symbols served by another call's request
+            'bulk_requests': 0,
+            'bulk_hits': 0,       # Symbols served by a bulk endpoint
+            'nse_requests': 0,
+            'yahoo_requests': 0,
+            'mock': 0,
+            'timed_out': 0        # Symbols left out of a result by the deadline
+        }
+
+    def _bind_loop(self):
+        """Reset loop-bound state when called from a new event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._inflight = {}
+            self._inflight_indices = {}
+
+    async def __aenter__(self) -> 'AsyncQuoteEngine':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self, wait: bool = True):
+        """
+        Cancel requests in flight and shut down the worker threads
+
+        Args:
+            wait: Wait for requests already running in the threads to finish
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for task in list(self._inflight.values()) + list(self._inflight_indices.values()):
+            if not task.done() and not task.get_loop().is_closed():
+                task.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def get_quotes(self, symbols: List[str], exchange: str = "NSE",
+                         timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get quotes for many symbols concurrently
+
+        Args:
+            symbols: Stock symbols (e.g. ["RELIANCE", "TCS"])
+            exchange: Exchange name; bulk index endpoints are NSE only
+            timeout: Seconds to wait (engine default if None)
+
+        Returns:
+            Quotes keyed by symbol. Symbols still pending at the deadline are
+            left out; their requests keep running for later calls.
+
+        Raises:
+            RuntimeError: If the engine is closed
+        """
+        if self._closed:
+            raise RuntimeError("AsyncQuoteEngine is closed")
+        self._bind_loop()
+        timeout = self.timeout if timeout is None else timeout
+        symbols = list(dict.fromkeys(symbols))
+        self.stats['requests'] += 1
+        self.stats['symbols'] += len(symbols)
+        if not symbols:
+            return {}
+
+        new = [symbol for symbol in symbols if symbol not in self._inflight]
+        self.stats['coalesced'] += len(symbols) - len(new)
+
+        bulk = None
+        if exchange == "NSE" and self.bulk_indices and len(new) >= self.bulk_min_symbols:
+            bulk = asyncio.ensure_future(self._bulk_quotes(frozenset(new)))
+        for symbol in new:
+            self._track(self._inflight, symbol, self._quote_symbol(symbol, bulk))
+
+        tasks = {symbol: self._inflight[symbol] for symbol in symbols}
+        done, _ = await asyncio.wait(set(tasks.values()), timeout=timeout)
+
+        quotes = {}
+        for symbol, task in tasks.items():
+            if task not in done:
+                self.stats['timed_out'] += 1
+                continue
+            if task.cancelled() or task.exception() is not None:
+                self.logger.error(f"Error fetching quote for {symbol}: {task.exception()}")
+                quotes[symbol] = self._mock(symbol)
+                continue
+            quotes[symbol] = task.result()
+
+        if len(quotes) < len(symbols):
+            self.logger.warning(f"Returning {len(quotes)}/{len(symbols)} quotes after {timeout}s")
+        return quotes
+
+    def _track(self, inflight: Dict[str, asyncio.Future], key: str, coro) -> asyncio.Future:
+        """Start a coroutine and list it as in flight until it finishes"""
+        task = asyncio.ensure_future(coro)
+        inflight[key] = task
+
+        def _done(finished, key=key):
+            if inflight.get(key) is finished:
+                del inflight[key]
+
+        task.add_done_callback(_done)
+        return task
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """Run a blocking provider call in the pool, bounded by the semaphore"""
+        async with self._semaphore:
+            return await self._loop.run_in_executor(self._executor, func, *args)
+
+    async def _quote_symbol(self, symbol: str, bulk: Optional[asyncio.Future]) -> Dict[str, Any]:
+        """Resolve one symbol: bulk result, NSE quote, Yahoo, then mock"""
+        if bulk is not None:
+            try:
+                found = await bulk
+            except Exception as e:
+                self.logger.warning(f"Bulk quote lookup failed: {e}")
+                found = {}
+            if symbol in found:
+                return found[symbol]
+
+        self.stats['nse_requests'] += 1
+        quote = await self._run(self.provider._get_nse_quote, symbol)
+        if quote:
+            return quote
+
+        self.stats['yahoo_requests'] += 1
+        quote = await self._run(self.provider._get_yahoo_quote, symbol)
+        if quote:
+            if quote.get('data_source') == 'MOCK':
+                self.stats['mock'] += 1
+            return quote
+        return self._mock(symbol)
+
+    async def _bulk_quotes(self, needed: FrozenSet[str]) -> Dict[str, Dict[str, Any]]:
+        """Look symbols up in index constituent lists until all are found"""
+        found: Dict[str, Dict[str, Any]] = {}
+        for index_name in self.bulk_indices:
+            task = self._inflight_indices.get(index_name)
+            if task is None:
+                self.stats['bulk_requests'] += 1
+                task = self._track(self._inflight_indices, index_name,
+                                   self._run(self.provider.get_index_quotes, index_name))
+            constituents = await task or {}
+            for symbol in needed.difference(found):
+                if symbol in constituents:
+                    found[symbol] = constituents[symbol]
+            if len(found) == len(needed):
+                break
+
+        self.stats['bulk_hits'] += len(found)
+        return found
+
+    def _mock(self, symbol: str) -> Dict[str, Any]:
+        self.stats['mock'] += 1
+        return self.provider._get_mock_quote(symbol)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request counters and the number of symbols in flight"""
+        return {**self.stats, 'in_flight': len(self._inflight)}
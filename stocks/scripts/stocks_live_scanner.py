@@ -11,10 +11,12 @@ import pandas as pd
 from datetime import datetime
 import pytz
 
-# Add parent directory to path
+# Add parent and project directories to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from tabulate import tabulate
+from algoproject.data.market_state import MarketStateStore
 
 
 def load_stock_assets():
@@ -30,8 +32,7 @@ def load_stock_assets():
 
 def load_strategy():
     """Load the trading strategy."""
-    sys.path.append('src/strategies')
-    from VWAPSigma2Strategy import VWAPSigma2Strategy
+    from strategies.VWAPSigma2Strategy import VWAPSigma2Strategy
     return VWAPSigma2Strategy()
 
 
@@ -81,6 +82,13 @@ def run_stocks_live_scan():
     # Load strategy
     strategy = load_strategy()
     
+    # Rolling 20-bar windows: after the first scan only the newest bars are fetched
+    market_state = MarketStateStore(
+        fetch=lambda symbol, since, limit: fetch_data_tv(tv, symbol, bars=limit),
+        timeframe='5m',
+        capacity=20
+    )
+    
     ist = pytz.timezone('Asia/Kolkata')
     scan_count = 0
     
@@ -96,14 +104,15 @@ def run_stocks_live_scan():
             
             for i, symbol in enumerate(symbols, 1):
                 try:
-                    # Fetch real-time data
-                    data = fetch_data_tv(tv, symbol, bars=20)
+                    # Fetch only the bars newer than the symbol's window
+                    window = market_state.update(symbol)
                     
-                    if data is None or data.empty:
+                    if window is None or not len(window):
                         continue
                     
                     # Apply strategy for real-time signal
-                    signal = strategy.generate_signal(data)
+                    bars = window.arrays()
+                    signal = strategy.generate_signal_arrays(**bars)
                     
                     # Check for actionable signals
                     if signal and signal != "HOLD":
@@ -111,8 +120,8 @@ def run_stocks_live_scan():
                             'Time': current_time,
                             'Symbol': symbol,
                             'Signal': signal.split('(')[0].strip(),  # Extract BUY/SELL part
-                            'Price': f"₹{data['close'].iloc[-1]:.2f}",
-                            'Volume': f"{data['volume'].iloc[-1]:,.0f}"
+                            'Price': f"₹{bars['close'][-1]:.2f}",
+                            'Volume': f"{bars['volume'][-1]:,.0f}"
                         })
                     
                     # Progress indicator
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 class VWAPSigma2Strategy:
@@ -14,39 +15,95 @@ class VWAPSigma2Strategy:
                  "SELL (VWAP +2σ breakdown)", 
                  "BUY (VWAP -2σ breakout)", or "HOLD".
         """
-        typical_price = (df["high"] + df["low"] + df["close"]) / 3
-        vwap = (typical_price * df["volume"]).cumsum() / df["volume"].cumsum()
-        std = typical_price.rolling(window=20).std()
+        return self.generate_signal_arrays(
+            df["high"].to_numpy(dtype=float), df["low"].to_numpy(dtype=float),
+            df["close"].to_numpy(dtype=float), df["volume"].to_numpy(dtype=float)
+        )
+
+    def generate_signal_arrays(self, high, low, close, volume, **_):
+        """
+        Generate the same signal as generate_signal from NumPy arrays.
+
+        Only the last two bars are evaluated, so a live scanner can pass the
+        views of a rolling market-state window directly.
+
+        Parameters:
+            high, low, close, volume (np.ndarray): Aligned bar arrays, oldest first.
+
+        Returns:
+            str: Trading signal (see generate_signal).
+        """
+        typical_price = (high + low + close) / 3
+        # VWAP is anchored at the first bar of the window
+        cum_pv = np.cumsum(typical_price * volume)
+        cum_vol = np.cumsum(volume)
+        vwap = cum_pv[-2:] / cum_vol[-2:]
+        std = self._rolling_last_two(typical_price, np.std, ddof=1)
+        avg_vol = self._rolling_last_two(volume, np.mean)
         upper_band = vwap + 2 * std
         lower_band = vwap - 2 * std
-        avg_vol = df["volume"].rolling(window=20).mean()
-        last_close = df["close"].iloc[-1]
-        last_lower = lower_band.iloc[-1]
-        last_vwap = vwap.iloc[-1]
-        last_vol = df["volume"].iloc[-1]
-        last_avg_vol = avg_vol.iloc[-1]
+        last_close, prev_close = close[-1], close[-2]
+        last_vol = volume[-1]
 
         # Buy logic: Price crosses above lower band (VWAP-2σ) and volume is at least 2x average, and previous bar closed below lower band
         if (
-            last_close > last_lower
-            and df["close"].iloc[-2] < lower_band.iloc[-2]
-            and last_vol >= 2 * last_avg_vol
+            last_close > lower_band[1]
+            and prev_close < lower_band[0]
+            and last_vol >= 2 * avg_vol[1]
         ):
             return "BUY (VWAP -2σ reversal + 2x volume)"
         # Sell logic: Price crosses below upper band (VWAP+2σ) and volume is at least 2x average, and previous bar closed above upper band
         elif (
-            last_close < upper_band.iloc[-1]
-            and df["close"].iloc[-2] > upper_band.iloc[-2]
-            and last_vol >= 2 * last_avg_vol
+            last_close < upper_band[1]
+            and prev_close > upper_band[0]
+            and last_vol >= 2 * avg_vol[1]
         ):
             return "SELL (VWAP +2σ reversal + 2x volume)"
-        elif last_close > upper_band.iloc[-1]:
+        elif last_close > upper_band[1]:
             return "SELL (VWAP +2σ breakdown)"
-        elif last_close < lower_band.iloc[-1]:
+        elif last_close < lower_band[1]:
             return "BUY (VWAP -2σ breakout)"
         else:
             return "HOLD"
 
+    @staticmethod
+    def _rolling_last_two(values, func, window=20, **kwargs):
+        """Rolling statistic for the previous and last bar (NaN while warming up)"""
+        n = len(values)
+        return np.array([
+            func(values[end - window:end], **kwargs) if end >= window else np.nan
+            for end in (n - 1, n)
+        ])
+
+    def generate_signals_batch(self, ohlcv_arrays):
+        """
+        Flag every VWAP -2σ reversal entry at once.
+
+        Parameters:
+            ohlcv_arrays (dict): Arrays for 'high', 'low', 'close' and 'volume'.
+
+        Returns:
+            dict: 'action' (1 on entry bars, else 0) plus the 'vwap',
+                  'lower_band' and 'avg_vol' arrays behind it.
+        """
+        high, low, close, volume = (pd.Series(np.asarray(ohlcv_arrays[k], dtype=float))
+                                    for k in ("high", "low", "close", "volume"))
+        typical_price = (high + low + close) / 3
+        vwap = (typical_price * volume).cumsum() / volume.cumsum()
+        std = typical_price.rolling(window=20).std()
+        lower_band = (vwap - 2 * std).to_numpy()
+        avg_vol = volume.rolling(window=20).mean().to_numpy()
+        close = close.to_numpy()
+
+        entry = np.zeros(len(close), dtype=bool)
+        entry[20:] = (
+            (close[20:] > lower_band[20:])
+            & (close[19:-1] < lower_band[19:-1])
+            & (volume.to_numpy()[20:] >= 2 * avg_vol[20:])
+        )
+        return {"action": entry.astype(np.int8), "quantity": 1.0,
+                "vwap": vwap.to_numpy(), "lower_band": lower_band, "avg_vol": avg_vol}
+
     def backtest(self, df: pd.DataFrame):
         """
         Backtest the VWAP -2σ reversal strategy.
@@ -66,75 +123,47 @@ class VWAPSigma2Strategy:
         else:
             raise ValueError("DataFrame must contain a 'datetime_ist' or 'datetime' column.")
 
-        typical_price = (df["high"] + df["low"] + df["close"]) / 3
-        vwap = (typical_price * df["volume"]).cumsum() / df["volume"].cumsum()
-        std = typical_price.rolling(window=20).std()
-        lower_band = vwap - 2 * std
-        avg_vol = df["volume"].rolling(window=20).mean()
+        close = df["close"].to_numpy(dtype=float)
+        times = df[datetime_col]
+        entries = np.flatnonzero(self.generate_signals_batch({
+            "high": df["high"].to_numpy(), "low": df["low"].to_numpy(),
+            "close": close, "volume": df["volume"].to_numpy()
+        })["action"])
 
-        position = None
-        entry_price = 0
-        entry_time = None
         trades = []
         take_profit = 0.0628  # 6.28%
         stop_loss = -0.0314   # -3.14%
 
-        for i in range(20, len(df)):
-            close = df["close"].iloc[i]
-            prev_close = df["close"].iloc[i-1]
-            lb = lower_band.iloc[i]
-            prev_lb = lower_band.iloc[i-1]
-            vol = df["volume"].iloc[i]
-            avgv = avg_vol.iloc[i]
-            dt = df[datetime_col].iloc[i]
-
-            # Check for open position and apply TP/SL
-            if position == "long":
-                change = (close - entry_price) / entry_price
-                if change >= take_profit:
-                    trades.append({
-                        "entry_time": entry_time,
-                        "exit_time": dt,
-                        "side": "BUY_TP",
-                        "entry_price": entry_price,
-                        "exit_price": close,
-                        "pnl": close - entry_price
-                    })
-                    position = None
-                    entry_price = 0
-                    entry_time = None
-                elif change <= stop_loss:
-                    trades.append({
-                        "entry_time": entry_time,
-                        "exit_time": dt,
-                        "side": "BUY_SL",
-                        "entry_price": entry_price,
-                        "exit_price": close,
-                        "pnl": close - entry_price
-                    })
-                    position = None
-                    entry_price = 0
-                    entry_time = None
-
-            # Entry signal (VWAP -2σ reversal + 2x volume)
-            if (
-                position is None
-                and close > lb
-                and prev_close < prev_lb
-                and vol >= 2 * avgv
-            ):
-                position = "long"
-                entry_price = close
-                entry_time = dt
-
-        if position == "long":
+        # Jump from entry to exit: only TP/SL bars and entry candidates are visited
+        i = entries[0] if len(entries) else len(df)
+        while i < len(df):
+            entry_price = close[i]
+            entry_time = times.iloc[i]
+            change = (close[i + 1:] - entry_price) / entry_price
+            hits = np.flatnonzero((change >= take_profit) | (change <= stop_loss))
+
+            if not len(hits):
+                trades.append({
+                    "entry_time": entry_time,
+                    "exit_time": times.iloc[-1],
+                    "side": "BUY_EOD",
+                    "entry_price": entry_price,
+                    "exit_price": close[-1],
+                    "pnl": close[-1] - entry_price
+                })
+                break
+
+            # A new entry may open on the same bar a position is closed
+            exit_idx = i + 1 + hits[0]
             trades.append({
                 "entry_time": entry_time,
-                "exit_time": df[datetime_col].iloc[-1],
-                "side": "BUY_EOD",
+                "exit_time": times.iloc[exit_idx],
+                "side": "BUY_TP" if change[hits[0]] >= take_profit else "BUY_SL",
                 "entry_price": entry_price,
-                "exit_price": df["close"].iloc[-1],
-                "pnl": df["close"].iloc[-1] - entry_price
+                "exit_price": close[exit_idx],
+                "pnl": close[exit_idx] - entry_price
             })
+            following = entries[np.searchsorted(entries, exit_idx):]
+            i = following[0] if len(following) else len(df)
 
         return pd.DataFrame(trades)
@@ -49,49 +49,57 @@ class BB_RSI_Strategy:
         
         return data
     
+    def generate_signals_batch(self, ohlcv_arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Compute signals for every bar at once.
+
+        Args:
+            ohlcv_arrays: Dict of arrays with at least 'close'
+
+        Returns:
+            Dict with 'action' (1 buy, -1 sell, 0 none) and the
+            'rsi', 'bb_upper' and 'bb_lower' arrays behind it
+        """
+        close = pd.Series(np.asarray(ohlcv_arrays['close'], dtype=float))
+        indicators = self.calculate_indicators(pd.DataFrame({'close': close}))
+        bb_upper = indicators['bb_upper'].to_numpy()
+        bb_lower = indicators['bb_lower'].to_numpy()
+        rsi = indicators['rsi'].to_numpy()
+        close = close.to_numpy()
+
+        # Start after indicator calculation period; NaN comparisons are False
+        valid = np.zeros(len(close), dtype=bool)
+        valid[max(self.bb_period, self.rsi_period):] = True
+        buy = valid & (close <= bb_lower) & (rsi < self.rsi_oversold)
+        sell = valid & ~buy & (close >= bb_upper) & (rsi > self.rsi_overbought)
+
+        action = np.zeros(len(close), dtype=np.int8)
+        action[buy] = 1
+        action[sell] = -1
+        return {'action': action, 'quantity': 1.0, 'rsi': rsi,
+                'bb_upper': bb_upper, 'bb_lower': bb_lower}
+
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """Generate trading signals using Bollinger Bands and RSI."""
-        data = self.calculate_indicators(df)
-        signals = []
-        
-        # Start after indicator calculation period
-        start_idx = max(self.bb_period, self.rsi_period)
-        
-        for i in range(start_idx, len(data)):
-            current = data.iloc[i]
-            
-            # Skip if any indicator is NaN
-            if pd.isna(current['bb_lower']) or pd.isna(current['bb_upper']) or pd.isna(current['rsi']):
-                continue
-            
-            # Buy signal: Price touches lower BB and RSI oversold
-            if (current['close'] <= current['bb_lower'] and current['rsi'] < self.rsi_oversold):
-                signals.append({
-                    'timestamp': current.name,
-                    'signal': 'BUY',
-                    'price': current['close'],
-                    'rsi': current['rsi'],
-                    'macd': np.nan,
-                    'score': 3,
-                    'bb_position': (current['close'] - current['bb_lower']) / (current['bb_upper'] - current['bb_lower']),
-                    'signal_strength': 'Strong'
-                })
-            
-            # Sell signal: Price touches upper BB and RSI overbought
-            elif (current['close'] >= current['bb_upper'] and current['rsi'] > self.rsi_overbought):
-                signals.append({
-                    'timestamp': current.name,
-                    'signal': 'SELL',
-                    'price': current['close'],
-                    'rsi': current['rsi'],
-                    'macd': np.nan,
-                    'score': 3,
-                    'bb_position': (current['close'] - current['bb_lower']) / (current['bb_upper'] - current['bb_lower']),
-                    'signal_strength': 'Strong'
-                })
-        
-        return pd.DataFrame(signals)
-    
+        batch = self.generate_signals_batch({'close': df['close'].to_numpy()})
+        rows = np.flatnonzero(batch['action'])
+        if len(rows) == 0:
+            return pd.DataFrame()
+
+        close = df['close'].to_numpy(dtype=float)[rows]
+        bb_lower = batch['bb_lower'][rows]
+        bb_upper = batch['bb_upper'][rows]
+
+        return pd.DataFrame({
+            'timestamp': df.index[rows],
+            'signal': np.where(batch['action'][rows] > 0, 'BUY', 'SELL'),
+            'price': close,
+            'rsi': batch['rsi'][rows],
+            'macd': np.nan,
+            'score': 3,
+            'bb_position': (close - bb_lower) / (bb_upper - bb_lower),
+            'signal_strength': 'Strong'
+        })
+
     def get_strategy_name(self) -> str:
         """Return strategy name."""
         return "BB_RSI"
@@ -0,0 +1,183 @@
+"""
+Backtest Job Service Tests
+==========================
+
+Background jobs on the process pool: results paging, queue limits and
+cancellation.
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, '.')
+
+from algoproject.backtesting.job_service import (
+    BacktestJobService, BacktestJobSpec, JobQueueFullError, resolve_strategy_class
+)
+from algoproject.data.data_loader import DataLoader
+from algoproject.data.data_provider import DataProvider
+
+
+SMA_CROSSOVER = 'algoproject.strategies.momentum.sma_crossover.SMACrossoverStrategy'
+
+
+class SineProvider(DataProvider):
+    """Hourly sine-wave bars so the SMA crossover trades"""
+
+    def get_historical_data(self, symbol, timeframe, start_date=None, end_date=None, limit=1000):
+        dates = pd.date_range(start_date, end_date, freq='h')
+        close = 100 + 10 * np.sin(np.arange(len(dates)) / 15.0)
+        return pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1,
+                             'close': close, 'volume': 1000.0}, index=dates)
+
+    def get_live_data(self, symbol):
+        return None
+
+    def get_available_symbols(self, asset_class=None):
+        return []
+
+    def get_symbol_info(self, symbol):
+        return {}
+
+
+def make_loader(exchange):
+    loader = DataLoader(None)
+    loader.register_provider('sine', SineProvider(), is_default=True)
+    return loader
+
+
+def make_spec(days=30, **kwargs):
+    return BacktestJobSpec(strategy=SMA_CROSSOVER, symbols=['BTC/USDT'],
+                           start_date=datetime(2020, 1, 1),
+                           end_date=datetime(2020, 1, 1) + timedelta(days=days),
+                           timeframe='1h', parameters={'short_window': 5, 'long_window': 20},
+                           **kwargs)
+
+
+class TestBacktestJobService(unittest.TestCase):
+    """Test background backtest jobs"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.events = []
+        self.finished = threading.Event()
+
+    def tearDown(self):
+        self.service.shutdown()
+        self.tmp.cleanup()
+
+    def make_service(self, **kwargs):
+        self.service = BacktestJobService(make_loader, results_dir=self.tmp.name,
+                                          progress_interval=0.0, **kwargs)
+        self.service.add_listener(self.on_event)
+        return self.service
+
+    def on_event(self, message):
+        self.events.append(message)
+        if message['type'] in ('backtest_complete', 'backtest_failed', 'backtest_cancelled'):
+            self.finished.set()
+
+    def test_job_completes_and_results_page(self):
+        service = self.make_service()
+        job_id = service.submit(make_spec())
+        self.assertTrue(self.finished.wait(60))
+
+        job = service.get_job(job_id)
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['progress'], 1.0)
+        # One equity point per trade, and one per hourly bar
+        self.assertEqual(job['summary']['rows'],
+                         {'equity_curve': 14, 'bar_equity': 30 * 24 + 1, 'trade_log': 14})
+
+        types = [event['type'] for event in self.events]
+        self.assertEqual(types[0], 'backtest_queued')
+        self.assertIn('backtest_progress', types)
+        self.assertEqual(types[-1], 'backtest_complete')
+
+        page = service.get_results(job_id, 'equity_curve', offset=10, limit=50)
+        self.assertEqual((page['total'], page['offset'], len(page['rows'])), (14, 10, 4))
+        first = service.get_results(job_id, 'trade_log', offset=0, limit=1)['rows']
+        self.assertEqual(len(first), 1)
+        self.assertEqual(first[0]['symbol'], 'BTC/USDT')
+        self.assertTrue(first[0]['timestamp'].startswith('2020-01-0'))
+        self.assertEqual(service.get_results(job_id, 'trade_log', offset=10**6)['rows'], [])
+        with self.assertRaises(ValueError):
+            service.get_results(job_id, 'positions')
+
+    def test_repeated_job_uses_result_cache(self):
+        service = self.make_service(result_cache_dir=self.tmp.name + '/cache')
+        first = service.submit(make_spec())
+        self.assertTrue(self.finished.wait(60))
+        self.finished.clear()
+        second = service.submit(make_spec(strategy_name='again'))
+        self.assertTrue(self.finished.wait(60))
+
+        first, second = service.get_job(first), service.get_job(second)
+        self.assertFalse(first['summary']['cached'])
+        self.assertTrue(second['summary']['cached'])
+        self.assertEqual(second['summary']['strategy_name'], 'again')
+        self.assertEqual(first['summary']['performance'], second['summary']['performance'])
+        self.assertEqual(service.get_results(second['job_id'], 'trade_log')['total'],
+                         first['summary']['rows']['trade_log'])
+
+    def test_queue_limit_and_bad_strategy(self):
+        service = self.make_service(max_workers=1, max_queued=1)
+        with self.assertRaises(ValueError):
+            service.submit(BacktestJobSpec('os.path.join', ['BTC/USDT'],
+                                           datetime(2024, 1, 1), datetime(2024, 1, 2)))
+
+        first = service.submit(make_spec(days=2000))
+        second = service.submit(make_spec())
+        with self.assertRaises(JobQueueFullError):
+            service.submit(make_spec())
+
+        # Cancelling frees a slot
+        self.assertTrue(service.cancel(second))
+        self.assertTrue(service.cancel(first))
+        deadline = time.monotonic() + 60
+        while service.get_stats()['cancelled'] < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(service.get_stats()['cancelled'], 2)
+        service.submit(make_spec())
+
+    def test_running_job_can_be_cancelled(self):
+        service = self.make_service()
+        job_id = service.submit(make_spec(days=2000))
+
+        deadline = time.monotonic() + 60
+        while service.get_job(job_id)['status'] != 'running' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(service.cancel(job_id))
+        self.assertTrue(self.finished.wait(60))
+
+        job = service.get_job(job_id)
+        self.assertEqual(job['status'], 'cancelled')
+        self.assertLess(job['progress'], 1.0)
+        self.assertIsNone(service.get_results(job_id, 'trade_log'))
+        self.assertFalse(service.cancel(job_id))
+
+
+class TestResolveStrategyClass(unittest.TestCase):
+    """Strategy paths come from API clients, so only the strategies package is importable"""
+
+    def test_path_outside_package_is_not_imported(self):
+        with patch('importlib.import_module') as import_module:
+            for path in ['os.system', 'subprocess.Popen', 'algoproject.strategiesx.Evil', 'SMACrossoverStrategy']:
+                with self.assertRaises(ValueError):
+                    resolve_strategy_class(path)
+        import_module.assert_not_called()
+        with self.assertRaises(ValueError):
+            resolve_strategy_class('algoproject.strategies.base_strategy.BaseStrategyMissing')
+        self.assertEqual(resolve_strategy_class(SMA_CROSSOVER).__name__, 'SMACrossoverStrategy')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Bar Aggregator Tests
+====================
+
+Time and volume bars from one tick stream, partial bars and closed-bar events.
+"""
+
+import asyncio
+import unittest
+import sys
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.core.config_manager import ConfigManager
+from algoproject.core.interfaces import MarketData
+from algoproject.data.streaming.bar_aggregator import BarAggregator, BarSpec
+from algoproject.data.streaming.stream_manager import StreamManager
+from algoproject.data.streaming.tick_ingest import Tick
+from algoproject.trading.demo_engine import DemoTradingEngine
+
+T0 = 1699999200000  # Aligned to a 1h boundary
+
+
+def tick(seconds, price, volume=1.0, symbol='BTCUSDT'):
+    return Tick(symbol, T0 + int(seconds * 1000), price, price, price, price, volume, 'test')
+
+
+class TestBarSpec(unittest.TestCase):
+    """Timeframe strings map to time and volume bars"""
+
+    def test_parse(self):
+        self.assertEqual(BarSpec.parse('5m'), BarSpec('5m', 'time', 300000))
+        self.assertEqual(BarSpec.parse('250v'), BarSpec('250v', 'volume', 250.0))
+        for bad in ('5x', 'v', '0v', 'abc'):
+            with self.assertRaises(ValueError):
+                BarSpec.parse(bad)
+
+
+class TestBarAggregator(unittest.TestCase):
+    """One tick stream feeds every timeframe at once"""
+
+    def test_time_bars_for_several_timeframes(self):
+        aggregator = BarAggregator(['1m', '5m'])
+        closed = []
+        prices = [(0, 100.0), (20, 103.0), (40, 99.0), (59, 101.0),  # minute 0
+                  (61, 102.0), (150, 104.0),                         # minutes 1 and 2
+                  (301, 105.0)]                                      # next 5m bucket
+        for seconds, price in prices:
+            closed.extend(aggregator.update(tick(seconds, price)))
+
+        one_minute = [bar for bar in closed if bar.timeframe == '1m']
+        self.assertEqual([(b.open, b.high, b.low, b.close, b.volume, b.ticks) for b in one_minute],
+                         [(100.0, 103.0, 99.0, 101.0, 4.0, 4), (102.0, 102.0, 102.0, 102.0, 1.0, 1),
+                          (104.0, 104.0, 104.0, 104.0, 1.0, 1)])
+        self.assertEqual(one_minute[0].start, datetime.fromtimestamp(T0 / 1000))
+        self.assertEqual((one_minute[0].end - one_minute[0].start).total_seconds(), 60)
+
+        five_minute = [bar for bar in closed if bar.timeframe == '5m']
+        self.assertEqual(len(five_minute), 1)
+        self.assertEqual((five_minute[0].open, five_minute[0].high, five_minute[0].close,
+                          five_minute[0].ticks), (100.0, 104.0, 104.0, 6))
+
+        partial = aggregator.get_partial_bar('BTCUSDT', '5m')
+        self.assertFalse(partial.closed)
+        self.assertEqual((partial.open, partial.ticks), (105.0, 1))
+        self.assertEqual([b.close for b in aggregator.get_bars('BTCUSDT', '1m', limit=2)], [102.0, 104.0])
+
+        # Ticks older than the forming bar are skipped
+        self.assertEqual(aggregator.update(tick(10, 1.0)), [])
+        self.assertEqual(aggregator.get_stats()['late_ticks'], 2)
+
+    def test_volume_bars_and_cumulative_volume(self):
+        aggregator = BarAggregator(['10v'], cumulative_volume=True)
+        closed = []
+        # 24h volume totals: first tick sets the baseline, the drop to 1015 counts as 0
+        for seconds, (price, total) in enumerate([(1.0, 1000), (2.0, 1004), (3.0, 1012), (4.0, 1020),
+                                                  (5.0, 1015), (6.0, 1026)]):
+            closed.extend(aggregator.update(tick(seconds, price, total)))
+
+        self.assertEqual([(b.open, b.close, b.volume, b.ticks) for b in closed],
+                         [(1.0, 3.0, 12.0, 3), (4.0, 6.0, 19.0, 3)])
+        self.assertIsNone(aggregator.get_partial_bar('BTCUSDT', '10v'))
+        with self.assertRaises(ValueError):
+            aggregator.get_bars('BTCUSDT', '1m')
+
+    def test_flush_closes_quiet_time_bars(self):
+        aggregator = BarAggregator(['1m', '1h'])
+        aggregator.update(tick(5, 100.0))
+        closed = aggregator.close_expired(datetime.fromtimestamp((T0 + 61000) / 1000))
+        self.assertEqual([bar.timeframe for bar in closed], ['1m'])
+        self.assertIsNone(aggregator.get_partial_bar('BTCUSDT', '1m'))
+        self.assertIsNotNone(aggregator.get_partial_bar('BTCUSDT', '1h'))
+
+        # A tick for the closed minute arrives late and does not reopen it
+        self.assertEqual(aggregator.update(tick(50, 101.0)), [])
+        self.assertEqual(aggregator.stats['late_ticks'], 1)
+        self.assertIsNone(aggregator.get_partial_bar('BTCUSDT', '1m'))
+        self.assertEqual(len(aggregator.get_bars('BTCUSDT', '1m')), 1)
+
+    def test_market_data_ticks(self):
+        aggregator = BarAggregator(['1m'])
+        for seconds in (0, 30, 60):
+            when = datetime.fromtimestamp((T0 + seconds * 1000) / 1000)
+            closed = aggregator.update(MarketData('ETHUSDT', when, 1.0, 1.0, 1.0, 2.0 + seconds, 3.0, 'test'))
+        self.assertEqual([(b.symbol, b.close, b.volume) for b in closed], [('ETHUSDT', 32.0, 6.0)])
+
+
+class TestBarAggregatorStream(unittest.TestCase):
+    """Attached to a StreamManager, closed bars reach bar subscribers"""
+
+    def test_closed_bar_events(self):
+        async def run():
+            manager = StreamManager(Mock(spec=ConfigManager))
+            aggregator = BarAggregator(['1m', '3v'])
+            inline, queued = [], []
+
+            async def on_bar(bar):
+                queued.append((bar.symbol, bar.timeframe, bar.close))
+
+            aggregator.attach(manager)
+            aggregator.add_subscriber(lambda bar: inline.append(bar.timeframe))
+            aggregator.add_subscriber(on_bar)
+
+            for seconds, price, symbol in [(0, 1.0, 'AAA'), (1, 2.0, 'BBB'), (2, 3.0, 'AAA'),
+                                           (3, 4.0, 'AAA'), (61, 5.0, 'AAA')]:
+                await manager._handle_stream_data(tick(seconds, price, symbol=symbol))
+            await asyncio.sleep(0.01)
+
+            aggregator.detach(manager)
+            await manager._handle_stream_data(tick(200, 6.0, symbol='AAA'))
+            await asyncio.sleep(0.01)
+            await aggregator.stop()
+            await manager.stop()
+            return inline, queued, aggregator
+
+        inline, queued, aggregator = asyncio.run(run())
+        self.assertEqual(queued, [('AAA', '3v', 4.0), ('AAA', '1m', 4.0)])
+        self.assertEqual(inline, ['3v', '1m'])
+        self.assertEqual(aggregator.get_stats()['ticks'], 5)
+
+    def test_flush_publishes_closed_bars(self):
+        async def run():
+            aggregator = BarAggregator(['1m'])
+            inline, queued = [], []
+
+            async def on_bar(bar):
+                queued.append((bar.symbol, bar.close))
+
+            aggregator.add_subscriber(lambda bar: inline.append(bar.symbol))
+            aggregator.add_subscriber(on_bar)
+            await aggregator.on_market_data(tick(5, 100.0, symbol='QUIET'))
+            self.assertEqual(await aggregator.flush(datetime.fromtimestamp((T0 + 30000) / 1000)), [])
+            closed = await aggregator.flush(datetime.fromtimestamp((T0 + 60000) / 1000))
+            await asyncio.sleep(0.01)
+            await aggregator.stop()
+            return closed, inline, queued
+
+        closed, inline, queued = asyncio.run(run())
+        self.assertEqual(len(closed), 1)
+        self.assertEqual(inline, ['QUIET'])
+        self.assertEqual(queued, [('QUIET', 100.0)])
+
+    def test_demo_engine_expects_cumulative_ticker_volume(self):
+        manager = StreamManager(Mock(spec=ConfigManager))
+        with self.assertRaises(ValueError):
+            DemoTradingEngine(Mock(), manager, bar_aggregator=BarAggregator(['1m']))
+        aggregator = BarAggregator(['1m'], cumulative_volume=True)
+        self.assertIs(DemoTradingEngine(Mock(), manager, bar_aggregator=aggregator).bar_aggregator, aggregator)
+
+
+if __name__ == "__main__":
+    unittest.main()
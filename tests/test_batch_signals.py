@@ -0,0 +1,128 @@
+"""
+Batch Signal Tests
+==================
+
+Whole-array strategy signals and the BacktestEngine fast path.
+"""
+
+import unittest
+import sys
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.backtesting.backtest_engine import BacktestEngine
+from algoproject.data.data_loader import DataLoader
+from algoproject.indicators import SMA, batch
+from algoproject.strategies.base_strategy import BaseStrategy
+from strategies.bb_rsi_strategy import BB_RSI_Strategy
+
+
+def make_frame(periods, seed, freq='D'):
+    """Create a deterministic random-walk OHLCV frame"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2023-01-01', periods=periods, freq=freq)
+    close = 100.0 * np.cumprod(1 + rng.normal(0, 0.02, periods))
+    return pd.DataFrame({
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.uniform(100, 1000, periods)
+    }, index=dates)
+
+
+# BBB starts later, so the aligned timeline has a leading gap
+FRAMES = {'AAA': make_frame(300, 1), 'BBB': make_frame(300, 2).iloc[20:]}
+
+
+class PriceCrossStrategy(BaseStrategy):
+    """Buys when the close crosses above its SMA and sells when it crosses below"""
+
+    def _on_initialize(self):
+        self.averages = {}
+        self.above = {}
+
+    def next(self, data):
+        average = self.averages.setdefault(data.symbol, SMA(5)).update(data.close)
+        if average is None:
+            return []
+        above, was_above = data.close > average, self.above.get(data.symbol)
+        self.above[data.symbol] = above
+        if was_above is None or above == was_above:
+            return []
+        return [self.create_signal(data.symbol, 'buy' if above else 'sell', 2.0)]
+
+    def generate_signals_batch(self, ohlcv_arrays):
+        above = (ohlcv_arrays['close'] > batch.sma(ohlcv_arrays['close'], 5)).astype(np.int8)
+        crossed = np.zeros_like(above)
+        crossed[5:] = np.diff(above)[4:]
+        return {'action': crossed, 'quantity': 2.0}
+
+
+class EventOnlyCrossStrategy(PriceCrossStrategy):
+    """Same strategy without the batch hook"""
+
+    def generate_signals_batch(self, ohlcv_arrays):
+        return None
+
+
+def run(strategy_class, **engine_kwargs):
+    data_loader = Mock(spec=DataLoader)
+    data_loader.get_historical_data.side_effect = lambda symbol, **kwargs: FRAMES[symbol]
+    engine = BacktestEngine(data_loader, **engine_kwargs)
+    strategy = strategy_class('cross')
+    strategy.next = Mock(side_effect=strategy.next)
+    results = engine.run_backtest(strategy, ['AAA', 'BBB'], datetime(2023, 1, 1), datetime(2024, 1, 1))
+    return results, strategy
+
+
+class TestBatchFastPath(unittest.TestCase):
+    """Batch signals must reproduce the per-bar event loop"""
+
+    def test_batch_matches_event_loop(self):
+        """Trades, equity and metrics match without calling next()"""
+        batch_results, batch_strategy = run(PriceCrossStrategy)
+        event_results, event_strategy = run(EventOnlyCrossStrategy)
+
+        self.assertEqual(batch_strategy.next.call_count, 0)
+        self.assertGreater(event_strategy.next.call_count, 0)
+        self.assertGreater(len(event_results['trade_log']), 10)
+        self.assertEqual(batch_results['trade_log'], event_results['trade_log'])
+        self.assertEqual(batch_results['performance'], event_results['performance'])
+        self.assertEqual(batch_results['equity_curve'], event_results['equity_curve'])
+
+    def test_engine_can_disable_batch(self):
+        """use_batch_signals=False and the vectorized mode still call next()"""
+        _, strategy = run(PriceCrossStrategy, use_batch_signals=False, mode='vectorized')
+        self.assertGreater(strategy.next.call_count, 0)
+
+
+class TestScriptStrategyBatch(unittest.TestCase):
+    """Script strategies expose the same signals as arrays"""
+
+    def test_bb_rsi_actions_match_row_rules(self):
+        df = make_frame(2000, 3, freq='h')
+        strategy = BB_RSI_Strategy()
+        action = strategy.generate_signals_batch({'close': df['close'].to_numpy()})['action']
+
+        data = strategy.calculate_indicators(df)
+        expected = np.zeros(len(df), dtype=np.int8)
+        for i in range(max(strategy.bb_period, strategy.rsi_period), len(data)):
+            row = data.iloc[i]
+            if row['close'] <= row['bb_lower'] and row['rsi'] < strategy.rsi_oversold:
+                expected[i] = 1
+            elif row['close'] >= row['bb_upper'] and row['rsi'] > strategy.rsi_overbought:
+                expected[i] = -1
+
+        np.testing.assert_array_equal(action, expected)
+        self.assertGreater(np.count_nonzero(action), 0)
+        signals = strategy.generate_signals(df)
+        self.assertEqual(list(signals['timestamp']), list(df.index[np.flatnonzero(action)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
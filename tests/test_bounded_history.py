@@ -0,0 +1,146 @@
+"""
+Bounded History Tests
+=====================
+
+Ring-buffer history, columnar equity/trade logs and memory reporting.
+"""
+
+import unittest
+import sys
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.backtesting.backtest_engine import BacktestEngine
+from algoproject.backtesting.backtest_context import BacktestContext
+from algoproject.backtesting.columnar import BarRingBuffer, ColumnarLog
+from algoproject.core.interfaces import MarketData
+from algoproject.data.data_loader import DataLoader
+from algoproject.strategies.base_strategy import BaseStrategy
+
+
+def make_frame(periods, seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2023-01-01', periods=periods, freq='h')
+    close = 100.0 * np.cumprod(1 + rng.normal(0, 0.01, periods))
+    return pd.DataFrame({'open': close, 'high': close * 1.01, 'low': close * 0.99,
+                         'close': close, 'volume': rng.uniform(100, 1000, periods)}, index=dates)
+
+
+class BreakoutStrategy(BaseStrategy):
+    """Buys above the high of the last `window` bars and sells below their low"""
+
+    def get_lookback(self):
+        return self.get_parameter('window') + 1
+
+    def next(self, data):
+        window = self.get_parameter('window')
+        bars = self.context.get_historical_data(data.symbol, window + 1)
+        if len(bars) <= window:
+            return []
+        previous = bars[:-1]
+        position = self.context.get_position(data.symbol)
+        if data.close > max(bar.high for bar in previous) and position == 0:
+            return [self.create_signal(data.symbol, 'buy', 5.0)]
+        if data.close < min(bar.low for bar in previous) and position > 0:
+            return [self.create_signal(data.symbol, 'sell', position)]
+        return []
+
+
+class UnboundedBreakoutStrategy(BreakoutStrategy):
+    """The same strategy keeping the full history"""
+
+    def get_lookback(self):
+        return None
+
+
+def bar(i):
+    close = float(i)
+    return MarketData('AAA', pd.Timestamp('2023-01-01') + pd.Timedelta(hours=i),
+                      close, close + 1, close - 1, close, 10.0 * i, 'test')
+
+
+class TestColumnarStorage(unittest.TestCase):
+    """Test the ring buffer and columnar log"""
+
+    def test_ring_buffer_keeps_last_bars(self):
+        buffer = BarRingBuffer('AAA', 4)
+        for i in range(10):
+            buffer.append(bar(i))
+
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual([b.close for b in buffer.tail()], [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual([vars(b) for b in buffer.tail(2)], [vars(bar(8)), vars(bar(9))])
+        np.testing.assert_array_equal(buffer.arrays(3)['volume'], [70.0, 80.0, 90.0])
+        self.assertEqual(buffer.tail(0), [])
+        with self.assertRaises(ValueError):
+            BarRingBuffer('AAA', 0)
+
+    def test_log_grows_and_keeps_types(self):
+        log = ColumnarLog({'timestamp': 'datetime64[ns]', 'value': np.float64, 'note': object},
+                          capacity=2)
+        for i in range(5):
+            log.append({'timestamp': pd.Timestamp('2023-01-01', tz='Asia/Kolkata') + pd.Timedelta(days=i),
+                        'value': None if i == 2 else i * 1.5, 'note': {'i': i}})
+
+        self.assertEqual(len(log), 5)
+        self.assertEqual(log.last('value'), 6.0)
+        self.assertTrue(np.isnan(log.column('value')[2]))
+        frame = log.to_frame(index='timestamp')
+        self.assertEqual(str(frame.index.tz), 'Asia/Kolkata')
+        self.assertEqual(frame.index[0], pd.Timestamp('2023-01-01', tz='Asia/Kolkata'))
+        self.assertEqual(frame['note'].iloc[4], {'i': 4})
+        with self.assertRaises(ValueError):
+            log.column('value')[0] = 1.0
+
+
+class TestBoundedBacktest(unittest.TestCase):
+    """Bounded and unbounded history must give the same backtest"""
+
+    def setUp(self):
+        frames = {'AAA': make_frame(3000, 1), 'BBB': make_frame(3000, 2)}
+        self.data_loader = Mock(spec=DataLoader)
+        self.data_loader.get_historical_data.side_effect = lambda symbol, **kwargs: frames[symbol]
+
+    def _run(self, strategy_class, **kwargs):
+        engine = BacktestEngine(self.data_loader, **kwargs)
+        results = engine.run_backtest(strategy_class("Breakout", {'window': 20}), ['AAA', 'BBB'],
+                                      datetime(2023, 1, 1), datetime(2023, 6, 1), '1h')
+        return engine, results
+
+    def test_lookback_bounds_history_without_changing_results(self):
+        bounded_engine, bounded = self._run(BreakoutStrategy)
+        _, full = self._run(UnboundedBreakoutStrategy)
+        _, overridden = self._run(UnboundedBreakoutStrategy, lookback=50)
+
+        self.assertGreater(len(bounded['trade_log']), 10)
+        self.assertEqual(bounded['trade_log'], full['trade_log'])
+        self.assertEqual(bounded['equity_curve'], full['equity_curve'])
+        self.assertEqual(bounded['performance'], full['performance'])
+
+        self.assertEqual(bounded['memory']['lookback'], 21)
+        self.assertEqual(len(bounded_engine.context.get_historical_data('AAA')), 21)
+        # Two 21-bar buffers of a timestamp and five floats each
+        self.assertEqual(bounded['memory']['history_bytes'], 2 * 21 * 48)
+        self.assertGreater(full['memory']['history_bytes'], 100 * bounded['memory']['history_bytes'])
+        self.assertGreater(bounded['memory']['equity_curve_bytes'], 0)
+
+        # An engine lookback bounds strategies that declare none
+        self.assertEqual(overridden['memory']['lookback'], 50)
+        self.assertEqual(overridden['trade_log'], full['trade_log'])
+
+    def test_context_without_lookback_keeps_everything(self):
+        context = BacktestContext()
+        for i in range(50):
+            context.update_market_data(bar(i))
+        self.assertEqual(len(context.get_historical_data('AAA')), 50)
+        self.assertEqual(context.get_historical_arrays('AAA', 5)['close'].tolist(),
+                         [45.0, 46.0, 47.0, 48.0, 49.0])
+        self.assertIsNone(context.lookback)
+
+
+if __name__ == "__main__":
+    unittest.main()
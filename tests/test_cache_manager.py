@@ -0,0 +1,135 @@
+"""
+Cache Manager Tests
+===================
+
+Tiered OHLCV cache behind DataLoader.
+"""
+
+import unittest
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+sys.path.insert(0, '.')
+
+from algoproject.data.cache_manager import CacheManager
+from algoproject.data.data_loader import DataLoader
+from algoproject.data.data_provider import DataProvider
+
+
+class FakeProvider(DataProvider):
+    """Daily bars for any range, recording every request"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_historical_data(self, symbol, timeframe, start_date=None, end_date=None, limit=1000):
+        self.requests.append((start_date, end_date))
+        dates = pd.date_range(pd.Timestamp(start_date).ceil('D'), end_date, freq='D')
+        close = np.array([float(d.dayofyear) for d in dates])
+        return pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1,
+                             'close': close, 'volume': close * 10}, index=dates)
+
+    def get_live_data(self, symbol):
+        return None
+
+    def get_available_symbols(self, asset_class=None):
+        return []
+
+    def get_symbol_info(self, symbol):
+        return {}
+
+
+class TestTieredCache(unittest.TestCase):
+    """Test the OHLCV cache through DataLoader"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.provider = FakeProvider()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _loader(self, **kwargs):
+        loader = DataLoader(None, cache_manager=CacheManager(cache_dir=self.tmp.name, **kwargs))
+        loader.register_provider('fake', self.provider)
+        return loader
+
+    def test_repeat_request_is_served_from_memory(self):
+        """A second identical request does not reach the provider"""
+        loader = self._loader()
+        first = loader.get_historical_data('BTC', '1d', start_date=datetime(2023, 1, 1),
+                                           end_date=datetime(2023, 1, 31))
+        second = loader.get_historical_data('BTC', '1d', start_date=datetime(2023, 1, 1),
+                                            end_date=datetime(2023, 1, 31))
+
+        self.assertEqual(len(self.provider.requests), 1)
+        self.assertEqual(len(first), 31)
+        pd.testing.assert_frame_equal(first, second)
+        stats = loader.cache_manager.get_stats()
+        self.assertEqual((stats['misses'], stats['hits']), (1, 1))
+
+    def test_partial_range_fetches_only_missing_bars(self):
+        """Extending a cached range fetches just the uncovered edges"""
+        loader = self._loader()
+        loader.get_historical_data('BTC', '1d', start_date=datetime(2023, 2, 1), end_date=datetime(2023, 2, 28))
+        df = loader.get_historical_data('BTC', '1d', start_date=datetime(2023, 1, 15), end_date=datetime(2023, 3, 15))
+
+        self.assertEqual(len(df), 60)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        gap_requests = self.provider.requests[1:]
+        self.assertEqual(len(gap_requests), 2)
+        self.assertEqual(gap_requests[0][0], datetime(2023, 1, 15))
+        self.assertLess(gap_requests[0][1], datetime(2023, 2, 1))
+        self.assertGreater(gap_requests[1][0], datetime(2023, 2, 28))
+        self.assertEqual(loader.cache_manager.get_stats()['partial_hits'], 1)
+
+    def test_disk_tier_survives_restart(self):
+        """A new cache instance reads columns back from disk"""
+        self._loader().get_historical_data('BTC/USDT', '1d', start_date=datetime(2023, 1, 1),
+                                           end_date=datetime(2023, 1, 31))
+        loader = self._loader()
+        df = loader.get_historical_data('BTC/USDT', '1d', start_date=datetime(2023, 1, 10),
+                                        end_date=datetime(2023, 1, 20))
+
+        self.assertEqual(len(self.provider.requests), 1)
+        self.assertEqual(len(df), 11)
+        self.assertEqual(df['close'].iloc[0], 10.0)
+        stats = loader.cache_manager.get_stats()
+        self.assertEqual(stats['disk_hits'], 1)
+        self.assertGreater(stats['bytes_read'], 0)
+
+    def test_eviction_by_bytes(self):
+        """Memory and disk tiers stay within their byte budgets"""
+        loader = self._loader(max_memory_bytes=3000, max_disk_bytes=3000)
+        for symbol in ['A', 'B', 'C']:
+            loader.get_historical_data(symbol, '1d', start_date=datetime(2023, 1, 1), end_date=datetime(2023, 1, 31))
+
+        stats = loader.cache_manager.get_stats()
+        self.assertLessEqual(stats['memory_bytes'], 3000)
+        self.assertLessEqual(stats['disk_bytes'], 3000)
+        self.assertGreater(stats['memory_evictions'], 0)
+        self.assertGreater(stats['disk_evictions'], 0)
+
+        # The most recent series is still cached
+        loader.get_historical_data('C', '1d', start_date=datetime(2023, 1, 1), end_date=datetime(2023, 1, 31))
+        self.assertEqual(len(self.provider.requests), 3)
+
+    def test_growing_series_counts_against_memory_budget(self):
+        """Extending a cached series adds its new bytes and can evict others"""
+        loader = self._loader(max_memory_bytes=3000)
+        for symbol in ['A', 'B']:
+            loader.get_historical_data(symbol, '1d', start_date=datetime(2023, 1, 1), end_date=datetime(2023, 1, 31))
+        self.assertEqual(loader.cache_manager.get_stats()['memory_bytes'], 2 * 31 * 48)
+
+        # B grows to 60 daily bars (48 bytes each), pushing A out
+        loader.get_historical_data('B', '1d', start_date=datetime(2023, 1, 1), end_date=datetime(2023, 3, 1))
+        stats = loader.cache_manager.get_stats()
+        self.assertEqual(stats['memory_evictions'], 1)
+        self.assertEqual(stats['memory_bytes'], 60 * 48)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Exchange Pool Tests
+===================
+
+Pooled CCXT clients, the markets cache and rate limiting.
+"""
+
+import unittest
+import sys
+import shutil
+import tempfile
+import time
+import types
+
+sys.path.insert(0, '.')
+
+from crypto.exchange_pool import ExchangePool, RateLimiter
+
+
+MARKETS = {'BTC/USDT': {'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT',
+                        'active': True, 'spot': True, 'id': 'XBTUSDT'}}
+
+
+class FakeExchange:
+    """Minimal stand-in for a CCXT exchange class"""
+    load_count = 0
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.rateLimit = 50
+        self.markets = None
+
+    def load_markets(self, reload=False):
+        type(self).load_count += 1
+        self.markets = dict(MARKETS)
+        return self.markets
+
+    def set_markets(self, markets):
+        self.markets = dict(markets)
+
+
+class TestExchangePool(unittest.TestCase):
+    """Test client reuse and the markets cache"""
+
+    def setUp(self):
+        FakeExchange.load_count = 0
+        self.cache_dir = tempfile.mkdtemp()
+        self.ccxt = types.SimpleNamespace(kraken=FakeExchange)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def make_pool(self, **kwargs):
+        return ExchangePool(cache_dir=self.cache_dir, ccxt_module=self.ccxt, **kwargs)
+
+    def test_clients_are_pooled_by_options(self):
+        pool = self.make_pool()
+        client = pool.get_client('Kraken', {'timeout': 5000})
+
+        self.assertIs(pool.get_client('kraken', {'timeout': 5000}), client)
+        self.assertIsNot(pool.get_client('kraken', {'timeout': 9000}), client)
+        self.assertTrue(client.config['enableRateLimit'])
+        with self.assertRaises(ValueError):
+            pool.get_client('nosuchexchange')
+
+    def test_markets_cached_in_memory_and_on_disk(self):
+        pool = self.make_pool()
+        self.assertEqual(pool.get_markets('kraken'), MARKETS)
+        pool.get_markets('kraken', pool.get_client('kraken', {'timeout': 1}))
+        self.assertEqual(FakeExchange.load_count, 1)
+
+        # A new process-level pool reads the disk cache instead of downloading
+        fresh = self.make_pool()
+        client = fresh.get_client('kraken')
+        self.assertEqual(fresh.get_markets('kraken', client), MARKETS)
+        self.assertEqual(client.markets, MARKETS)
+        self.assertEqual(FakeExchange.load_count, 1)
+
+        # An expired cache or an explicit reload downloads again
+        self.make_pool(markets_ttl=0).get_markets('kraken')
+        fresh.get_markets('kraken', reload=True)
+        self.assertEqual(FakeExchange.load_count, 3)
+
+    def test_calls_are_rate_limited_per_exchange(self):
+        pool = self.make_pool()
+        client = pool.get_client('kraken')
+
+        start = time.monotonic()
+        for _ in range(3):
+            pool.call('kraken', client.load_markets)
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+        limiter = RateLimiter(0.0)
+        self.assertEqual(limiter.acquire(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Fill Simulator Tests
+====================
+
+NumPy position/PnL simulation for signal-array backtests.
+"""
+
+import unittest
+import sys
+import numpy as np
+
+sys.path.insert(0, '.')
+
+from algoproject.backtesting.fill_simulator import simulate_fills, PositionMode
+
+
+PRICES = np.array([100.0, 102.0, 101.0, 105.0, 103.0, 98.0, 99.0, 104.0])
+SIGNALS = np.array([1, 1, 0, -1, -1, 1, 0, -1])
+
+
+class TestFillSimulator(unittest.TestCase):
+    """Test fills, positions and equity"""
+
+    def test_long_only_fixed_notional(self):
+        """Repeated buys are ignored and sells close the long"""
+        sim = simulate_fills(PRICES, SIGNALS, initial_capital=1000.0, notional=500.0)
+
+        np.testing.assert_array_equal(sim.trades['entry_index'], [0, 5])
+        np.testing.assert_array_equal(sim.trades['exit_index'], [3, 7])
+        np.testing.assert_allclose(sim.trades['pnl'], [25.0, 500.0 / 98.0 * 6.0])
+        np.testing.assert_allclose(sim.trades['pnl_pct'], [5.0, 6.0 / 98.0 * 100])
+        np.testing.assert_array_equal(sim.position > 0, [1, 1, 1, 0, 0, 1, 1, 0])
+        self.assertAlmostEqual(sim.equity[2], 1000.0 + 5.0 * 1.0)
+        self.assertAlmostEqual(sim.equity[-1], 1000.0 + sim.trades['pnl'].sum())
+        np.testing.assert_allclose(sim.realized_equity[:3], 1000.0)
+
+    def test_long_short_reverses(self):
+        """Opposite signals close and reverse on the same bar"""
+        sim = simulate_fills(PRICES, SIGNALS, initial_capital=1000.0, notional=500.0,
+                             mode=PositionMode.LONG_SHORT)
+
+        np.testing.assert_array_equal(sim.trades['side'], [1, -1, 1])
+        np.testing.assert_array_equal(sim.trades['entry_index'], [0, 3, 5])
+        np.testing.assert_array_equal(sim.trades['exit_index'], [3, 5, 7])
+        self.assertAlmostEqual(sim.trades['pnl'][1], 500.0 / 105.0 * 7.0)
+        self.assertLess(sim.position[4], 0)
+        self.assertGreater(sim.position[6], 0)
+        self.assertLess(sim.position[-1], 0)
+        self.assertAlmostEqual(sim.equity[-1], 1000.0 + sim.trades['pnl'].sum())
+
+    def test_costs_and_equity_fraction(self):
+        """Commission and slippage reduce PnL; equity sizing compounds"""
+        sim = simulate_fills(PRICES, SIGNALS, initial_capital=1000.0, sizing='equity_fraction',
+                             fraction=0.5, commission=0.001, slippage=0.002)
+
+        entry = 100.0 * 1.002
+        exit_ = 105.0 * 0.998
+        quantity = 500.0 / entry
+        commission = (entry + exit_) * quantity * 0.001
+        self.assertAlmostEqual(sim.trades['pnl'][0], (exit_ - entry) * quantity - commission)
+        self.assertAlmostEqual(sim.trades['commission'][0], commission)
+        self.assertAlmostEqual(sim.trades['quantity'][1],
+                               0.5 * sim.realized_equity[3] / (98.0 * 1.002))
+        self.assertAlmostEqual(sim.equity[-1], 1000.0 + sim.trades['pnl'].sum())
+
+    def test_trades_frame_and_validation(self):
+        sim = simulate_fills(PRICES, SIGNALS)
+        frame = sim.trades_frame(timestamps=np.arange(len(PRICES)) * 10)
+        self.assertEqual(list(frame['exit_time']), [30, 70])
+        self.assertEqual(sim.trade_count, 2)
+
+        with self.assertRaises(ValueError):
+            simulate_fills(PRICES, SIGNALS[:-1])
+        with self.assertRaises(ValueError):
+            simulate_fills(PRICES, SIGNALS, mode='both')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+History Fetcher Tests
+=====================
+
+Backwards pagination, concurrent downloads and resuming into the OHLCV store.
+"""
+
+import unittest
+import sys
+import shutil
+import tempfile
+import threading
+import types
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, '.')
+
+from algoproject.data.cache_manager import CacheManager
+from crypto.exchange_pool import ExchangePool
+from crypto.history_fetcher import HistoryFetcher, fetch_ohlcv_pages
+
+
+HOUR = 3600 * 1000
+LISTED = int(datetime(2023, 1, 1).timestamp() * 1000) // HOUR * HOUR
+END = LISTED + 5000 * HOUR
+
+
+def make_candles(seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, 5001))
+    return [[LISTED + i * HOUR, c, c * 1.01, c * 0.99, c, 10.0] for i, c in enumerate(close)]
+
+
+CANDLES = {'BTC/USDT': make_candles(1), 'ETH/USDT': make_candles(2), 'SOL/USDT': make_candles(3)}
+# Missing the first candle of every 100-candle window walked back from END,
+# and the whole window at 2001..2100 (an exchange outage)
+GAPPY_CANDLES = [c for i, c in enumerate(make_candles(4)) if i % 100 != 1 and not 2001 <= i <= 2100]
+
+
+class FakeExchange:
+    """Serves CANDLES like a CCXT exchange that caps pages at 300 candles"""
+    max_page = 300
+    fail_after = None
+    calls = 0
+    lock = threading.Lock()
+
+    def __init__(self, config=None):
+        self.rateLimit = 0
+        self.markets = None
+
+    def load_markets(self, reload=False):
+        self.markets = {symbol: {'symbol': symbol} for symbol in CANDLES}
+        return self.markets
+
+    def set_markets(self, markets):
+        self.markets = dict(markets)
+
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+        with FakeExchange.lock:
+            FakeExchange.calls += 1
+            if FakeExchange.fail_after is not None and FakeExchange.calls > FakeExchange.fail_after:
+                raise ConnectionError("exchange went away")
+        candles = [c for c in CANDLES[symbol] if since is None or c[0] >= since]
+        return [list(c) for c in candles[:min(limit or self.max_page, self.max_page)]]
+
+
+class GappyExchange(FakeExchange):
+    """Serves GAPPY_CANDLES in pages of up to 1000 candles"""
+    max_page = 1000
+
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+        FakeExchange.calls += 1
+        candles = [c for c in GAPPY_CANDLES if since is None or c[0] >= since]
+        return [list(c) for c in candles[:min(limit or self.max_page, self.max_page)]]
+
+
+class TestHistoryFetcher(unittest.TestCase):
+    """Test paging and the store-backed fetcher"""
+
+    def setUp(self):
+        FakeExchange.calls = 0
+        FakeExchange.fail_after = None
+        self.cache_dir = tempfile.mkdtemp()
+        self.pool = ExchangePool(cache_dir=None, ccxt_module=types.SimpleNamespace(fake=FakeExchange))
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def make_fetcher(self):
+        return HistoryFetcher(CacheManager(cache_dir=self.cache_dir), pool=self.pool, page_limit=1000)
+
+    def test_pages_walk_back_past_the_page_cap(self):
+        client = FakeExchange()
+        windows = []
+        candles = fetch_ohlcv_pages(client, 'BTC/USDT', '1h', LISTED + 100 * HOUR, END,
+                                    page_limit=1000,
+                                    on_window=lambda start, end, c: windows.append((start, end)))
+
+        self.assertEqual(candles, CANDLES['BTC/USDT'][100:])
+        # Windows run newest first and shrink to the exchange's page size
+        self.assertEqual(windows[0][1], END)
+        self.assertGreater(windows[0][0], windows[-1][0])
+        # 4 calls fill the first window, then 300-candle pages (4900 / 300 -> 14 more)
+        self.assertLessEqual(FakeExchange.calls, 18)
+
+        # Asking for more than was listed stops at the first candle
+        FakeExchange.calls = 0
+        candles = fetch_ohlcv_pages(client, 'BTC/USDT', '1h', LISTED - 10000 * HOUR, LISTED + 50 * HOUR)
+        self.assertEqual(candles, CANDLES['BTC/USDT'][:51])
+        self.assertLessEqual(FakeExchange.calls, 3)
+
+    def test_short_pages_fill_requests_under_the_page_limit(self):
+        # A venue capping responses at 500 bars, asked for 900
+        client = FakeExchange()
+        client.max_page = 500
+        candles = fetch_ohlcv_pages(client, 'ETH/USDT', '1h', END - 899 * HOUR, END)
+
+        self.assertEqual(candles, CANDLES['ETH/USDT'][-900:])
+        self.assertEqual(FakeExchange.calls, 2)
+
+    def test_gaps_at_window_starts_do_not_end_the_walk(self):
+        windows = []
+        candles = fetch_ohlcv_pages(GappyExchange(), 'GAP/USDT', '1h', LISTED, END, page_limit=100,
+                                    on_window=lambda start, end, c: windows.append(start))
+
+        self.assertEqual(candles, GAPPY_CANDLES)
+        # 51 windows reach LISTED; the outage window is empty and not reported
+        self.assertEqual(len(windows), 50)
+        self.assertNotIn(LISTED + 2001 * HOUR, windows)
+
+        # Two empty windows in a row are the beginning of history
+        FakeExchange.calls = 0
+        candles = fetch_ohlcv_pages(GappyExchange(), 'GAP/USDT', '1h', LISTED - 10000 * HOUR,
+                                    LISTED + 50 * HOUR, page_limit=100)
+        self.assertEqual(candles, GAPPY_CANDLES[:50])
+        self.assertEqual(FakeExchange.calls, 3)
+
+    def test_many_symbols_into_store(self):
+        fetcher = self.make_fetcher()
+        start, end = datetime.utcfromtimestamp(LISTED / 1000), datetime.utcfromtimestamp(END / 1000)
+        results = fetcher.fetch('fake', list(CANDLES), '1h', start, end)
+
+        self.assertEqual(results, {symbol: 5001 for symbol in CANDLES})
+        for symbol, candles in CANDLES.items():
+            df = fetcher.get_history('fake', symbol, '1h', start, end)
+            np.testing.assert_array_equal(df['close'].to_numpy(), [c[4] for c in candles])
+            self.assertTrue(df.index.is_unique)
+
+        # Everything is stored: a second pass makes no requests
+        calls = FakeExchange.calls
+        self.assertEqual(fetcher.fetch('fake', list(CANDLES), '1h', start, end),
+                         {symbol: 0 for symbol in CANDLES})
+        self.assertEqual(FakeExchange.calls, calls)
+
+    def test_resume_after_interruption(self):
+        start, end = datetime.utcfromtimestamp(LISTED / 1000), datetime.utcfromtimestamp(END / 1000)
+        FakeExchange.fail_after = 8
+        self.assertEqual(self.make_fetcher().fetch('fake', ['BTC/USDT'], '1h', start, end),
+                         {'BTC/USDT': None})
+
+        # A new fetcher over the same store only downloads what is missing
+        FakeExchange.fail_after = None
+        FakeExchange.calls = 0
+        fetcher = self.make_fetcher()
+        df = fetcher.get_history('fake', 'BTC/USDT', '1h', start, end)
+
+        np.testing.assert_array_equal(df['close'].to_numpy(), [c[4] for c in CANDLES['BTC/USDT']])
+        # A full download takes 18 calls; 8 were stored before the failure
+        self.assertLessEqual(FakeExchange.calls, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Indicator Tests
+===============
+
+Streaming indicators against their batch NumPy counterparts.
+"""
+
+import unittest
+import sys
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.indicators import SMA, EMA, RSI, MACD, BollingerBands, ATR, VWAP, batch
+from algoproject.backtesting.backtest_engine import BacktestEngine
+from algoproject.data.data_loader import DataLoader
+from algoproject.strategies.momentum import SMACrossoverStrategy
+
+
+rng = np.random.default_rng(7)
+CLOSE = 100.0 * np.cumprod(1 + rng.normal(0, 0.01, 1000))
+HIGH = CLOSE * (1 + rng.uniform(0, 0.01, 1000))
+LOW = CLOSE * (1 - rng.uniform(0, 0.01, 1000))
+VOLUME = rng.uniform(10, 100, 1000)
+
+
+def stream(indicator, *columns, attr='value'):
+    """Feed columns bar by bar and collect an attribute (NaN while warming up)"""
+    values = []
+    for row in zip(*columns):
+        indicator.update(*row)
+        value = getattr(indicator, attr)
+        values.append(np.nan if value is None else value)
+    return np.array(values)
+
+
+class TestStreamingMatchesBatch(unittest.TestCase):
+    """Streaming updates must reproduce the batch arrays"""
+
+    def assertSame(self, streamed, batched):
+        np.testing.assert_array_equal(streamed, batched)
+
+    def test_moving_averages(self):
+        self.assertSame(stream(SMA(20), CLOSE), batch.sma(CLOSE, 20))
+        self.assertSame(stream(EMA(20), CLOSE), batch.ema(CLOSE, 20))
+        np.testing.assert_allclose(batch.sma(CLOSE, 20)[19:],
+                                   pd.Series(CLOSE).rolling(20).mean().to_numpy()[19:], rtol=1e-12)
+
+    def test_rsi(self):
+        streamed = stream(RSI(14), CLOSE)
+        self.assertSame(streamed, batch.rsi(CLOSE, 14))
+        self.assertTrue(np.isnan(streamed[13]))
+        self.assertTrue(np.all((streamed[14:] >= 0) & (streamed[14:] <= 100)))
+        self.assertEqual(batch.rsi(np.arange(30.0), 14)[-1], 100.0)
+
+    def test_macd(self):
+        line, signal, histogram = batch.macd(CLOSE)
+        self.assertSame(stream(MACD(), CLOSE, attr='line'), line)
+        self.assertSame(stream(MACD(), CLOSE, attr='signal'), signal)
+        self.assertSame(stream(MACD(), CLOSE, attr='histogram'), histogram)
+        self.assertEqual(np.isnan(signal).sum(), 26 + 9 - 2)
+
+    def test_bollinger_bands(self):
+        middle, upper, lower = batch.bollinger_bands(CLOSE, 20, 2.0)
+        np.testing.assert_allclose(stream(BollingerBands(20, 2.0), CLOSE, attr='middle'), middle, rtol=1e-12)
+        np.testing.assert_allclose(stream(BollingerBands(20, 2.0), CLOSE, attr='upper'), upper, rtol=1e-12)
+        np.testing.assert_allclose(stream(BollingerBands(20, 2.0), CLOSE, attr='lower'), lower, rtol=1e-12)
+
+    def test_atr_and_vwap(self):
+        self.assertSame(stream(ATR(14), HIGH, LOW, CLOSE), batch.atr(HIGH, LOW, CLOSE, 14))
+        self.assertSame(stream(VWAP(), HIGH, LOW, CLOSE, VOLUME), batch.vwap(HIGH, LOW, CLOSE, VOLUME))
+
+    def test_invalid_period(self):
+        with self.assertRaises(ValueError):
+            SMA(0)
+        with self.assertRaises(ValueError):
+            batch.macd(CLOSE, 26, 12)
+
+
+class TestSMACrossoverStrategy(unittest.TestCase):
+    """The ported strategy runs in the backtest engine"""
+
+    def test_crossover_trades(self):
+        dates = pd.date_range('2023-01-01', periods=len(CLOSE), freq='D')
+        frame = pd.DataFrame({'open': CLOSE, 'high': HIGH, 'low': LOW,
+                              'close': CLOSE, 'volume': VOLUME}, index=dates)
+        data_loader = Mock(spec=DataLoader)
+        data_loader.get_historical_data.side_effect = lambda symbol, **kwargs: frame
+
+        strategy = SMACrossoverStrategy(parameters={'fast_period': 5})
+        results = BacktestEngine(data_loader).run_backtest(
+            strategy, ['AAA'], datetime(2023, 1, 1), datetime(2025, 12, 31))
+
+        fast, slow = batch.sma(CLOSE, 5), batch.sma(CLOSE, 20)
+        above = fast > slow
+        crossings = np.count_nonzero(above[20:] & ~above[19:-1])
+        buys = [s for s in strategy.signals_history if s.action == 'buy']
+
+        self.assertEqual(strategy.get_parameter('slow_period'), 20)
+        self.assertEqual(len(buys), crossings)
+        self.assertGreater(len(results['trade_log']), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,506 @@
+"""
+KPI Kernel Tests
+================
+
+Vectorized KPIs over many equity curves, and parity of the KPI
+calculators built on the kernel with the numbers they produced before.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import warnings
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, '.')
+
+from algoproject.core import kpi_kernel as kernel
+from algoproject.core.kpi_calculator import KPICalculator
+
+
+def make_equity(seed, periods=400, start='2022-01-03'):
+    """Daily random-walk equity with a flat stretch and an exact retest of a peak"""
+    rng = np.random.default_rng(seed)
+    values = 100000.0 * np.cumprod(1 + rng.normal(0.0006, 0.012, periods))
+    if periods > 160:
+        values[60:66] = values[59]
+        peak = int(np.argmax(values[:150]))
+        values[peak + 10] = values[peak]
+    return pd.Series(values, index=pd.date_range(start, periods=periods, freq='D'))
+
+
+def make_closed_trades(seed, count=60, start=datetime(2022, 1, 3)):
+    """Closed trades carrying the field names each calculator expects"""
+    rng = np.random.default_rng(seed)
+    trades = []
+    entry = start
+    for i in range(count):
+        entry = entry + timedelta(hours=float(rng.uniform(5, 90)))
+        exit_ = entry + timedelta(hours=float(rng.uniform(1, 200)))
+        price = float(rng.uniform(90, 110))
+        pnl_pct = 0.0 if i == 7 else float(rng.normal(0.3, 2.5))
+        pnl = pnl_pct / 100 * price * 10
+        trades.append({
+            'pnl': pnl, 'price': price, 'entry_time': entry, 'exit_time': exit_,
+            'profit': pnl, 'profit_pct': pnl_pct,
+            'pnl_dollars': pnl, 'pnl_percent': pnl_pct,
+            'entry_price': price, 'exit_price': price * (1 + pnl_pct / 100),
+            'position_size': 10.0, 'trade_type': 'Long'
+        })
+    return trades
+
+
+def make_trade_log(equity, seed):
+    """Buy/sell fills indexed by timestamp, as BacktestContext logs them"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(5, len(equity) - 5, 9):
+        price = float(rng.uniform(95, 105))
+        rows.append({'timestamp': equity.index[i], 'symbol': 'AAA' if (i // 18) % 2 else 'BBB',
+                     'action': 'buy' if (i // 9) % 2 == 0 else 'sell',
+                     'quantity': float(rng.integers(1, 4)), 'executed_price': price})
+    return pd.DataFrame(rows).set_index('timestamp')
+
+
+# Outputs of the calculators before they moved onto the kernel, produced
+# from the fixtures above (PerformanceAnalyzer with month-end 'ME' bins,
+# as 'M' no longer parses in pandas 3)
+GOLDEN = {
+    'kpi_calculator': {
+        'total_trades': 60,
+        'winning_trades': 30,
+        'losing_trades': 29,
+        'initial_capital': 100000,
+        'final_capital': 108644.13966893965,
+        'total_return_pct': 8.64413966893965,
+        'final_return_pct': 8.64413966893965,
+        'cagr_pct': 5.361991842875113,
+        'annualized_return_pct': 5.361991842875113,
+        'volatility_pct': 19.205833388346775,
+        'annualized_volatility_pct': 19.205833388346775,
+        'sharpe_ratio': 0.2548635853867163,
+        'sortino_ratio': 0.44360612732630045,
+        'calmar_ratio': 0.3254709646488645,
+        'win_rate_pct': 50.0,
+        'avg_trade': 1.1916802340047243,
+        'avg_trade_pct': 1.1853688176715158,
+        'avg_winning_trade': 18.584318838205565,
+        'avg_losing_trade': -16.759612107099432,
+        'profit_factor': 1.1471123135773231,
+        'expectancy': 0.9123533655530665,
+        'expectancy_pct': 0.9075213294340664,
+        'best_trade': 57.061302107168636,
+        'worst_trade': -38.42031198809479,
+        'best_trade_pct': 56.7590921486271,
+        'worst_trade_pct': -38.21682905895889,
+        'gross_profit': 557.529565146167,
+        'gross_loss': 486.0287511058835,
+        'max_drawdown_pct': -21.18427849664721,
+        'avg_drawdown_pct': -7.334971121898001,
+        'max_drawdown_duration': 69,
+        'avg_drawdown_duration': 14.0,
+        'avg_trade_duration_hours': 106.68606200039352,
+        'max_trade_duration_hours': 199.8061505825,
+        'min_trade_duration_hours': 6.2704252319444445,
+        'information_ratio': 0.3589986135086154,
+        'recovery_factor': 0.39337521777126244,
+        'max_consecutive_wins': 6,
+        'max_consecutive_losses': 9,
+    },
+    'kpi_calculator_rising': {
+        'total_trades': 3,
+        'winning_trades': 2,
+        'losing_trades': 1,
+        'initial_capital': 100000,
+        'final_capital': 120000.0,
+        'total_return_pct': 20.0,
+        'final_return_pct': 20.0,
+        'cagr_pct': 362.51142671463816,
+        'annualized_return_pct': 362.51142671463816,
+        'volatility_pct': 0.5379294976909696,
+        'annualized_volatility_pct': 0.5379294976909696,
+        'sharpe_ratio': 291.7326609258917,
+        'sortino_ratio': 0,
+        'calmar_ratio': 0,
+        'win_rate_pct': 66.66666666666666,
+        'avg_trade': 2.9052718777990982,
+        'avg_trade_pct': 2.862266266988994,
+        'avg_winning_trade': 18.094835392984006,
+        'avg_losing_trade': -27.473855152570717,
+        'profit_factor': 1.3172403576052836,
+        'expectancy': 2.905271877799093,
+        'expectancy_pct': 2.8622662669889887,
+        'best_trade': 18.676743711506905,
+        'worst_trade': -27.473855152570717,
+        'best_trade_pct': 18.400279130895743,
+        'worst_trade_pct': -27.067170349274544,
+        'gross_profit': 36.18967078596801,
+        'gross_loss': 27.473855152570717,
+        'max_drawdown_pct': 0.0,
+        'avg_drawdown_pct': 0,
+        'max_drawdown_duration': 0,
+        'avg_drawdown_duration': 0,
+        'avg_trade_duration_hours': 93.95616748324073,
+        'max_trade_duration_hours': 190.1422755688889,
+        'min_trade_duration_hours': 6.484263535277778,
+        'information_ratio': 295.4506202655168,
+        'recovery_factor': 0,
+        'max_consecutive_wins': 2,
+        'max_consecutive_losses': 1,
+    },
+    'performance_analyzer': {
+        'total_return': 0.41722017277808005,
+        'total_return_pct': 41.72201727780801,
+        'cagr': 0.3760296034391546,
+        'cagr_pct': 37.602960343915456,
+        'avg_daily_return': 0.0009484402683919995,
+        'avg_monthly_return': 0.01991724563623199,
+        'avg_annual_return': 0.2390069476347839,
+        'final_return_pct': 41.72201727780801,
+        'volatility': 0.19349253505138791,
+        'daily_volatility': 0.012188884006986209,
+        'sharpe_ratio': 1.1318625164356844,
+        'sortino_ratio': 1.7495779592368383,
+        'calmar_ratio': 3.112840899467839,
+        'var_95': -0.020032413598639165,
+        'var_99': -0.030026204362259508,
+        'expected_shortfall_95': -0.02668454337059274,
+        'expected_shortfall_99': -0.03581924333954173,
+        'max_drawdown': 0.12079949331925038,
+        'max_drawdown_pct': 12.079949331925038,
+        'avg_drawdown': 0.04604306207381522,
+        'avg_drawdown_pct': 4.604306207381522,
+        'max_drawdown_duration': 89,
+        'avg_drawdown_duration': 14.28,
+        'recovery_factor': 3.4538238639415932,
+        'total_trades': 44,
+        'buy_trades': 22,
+        'sell_trades': 22,
+        'closed_trades': 22,
+        'winning_trades': 14,
+        'losing_trades': 8,
+        'win_rate': 0.6363636363636364,
+        'win_rate_pct': 63.63636363636363,
+        'avg_trade_return': 0.013352964131466022,
+        'avg_trade_return_pct': 1.3352964131466023,
+        'avg_winning_trade': 0.03353424623720797,
+        'avg_losing_trade': -0.02196427955358239,
+        'profit_factor': 2.6718350024616404,
+        'expectancy': 0.013352964131466022,
+        'expectancy_pct': 1.3352964131466023,
+        'trades_per_day': 0.11369509043927649,
+        'trades_per_month': 3.410852713178295,
+        'skewness': -0.14220978350501348,
+        'kurtosis': 0.6169847263553705,
+        'tail_ratio': 1.0364751285751843,
+        'return_stability': 0.7863946143916017,
+        'consistency_score': 0.6428571428571429,
+        'positive_months': 9,
+        'total_months': 14,
+        'star_rating': 3,
+    },
+    'performance_analyzer_short': {
+        'total_return': 0.031958928170813306,
+        'total_return_pct': 3.1958928170813303,
+        'cagr': 1.2721792547058168,
+        'cagr_pct': 127.21792547058169,
+        'avg_daily_return': 0.0023459119287670732,
+        'avg_monthly_return': 0.04926415050410854,
+        'avg_annual_return': 0.5911698060493025,
+        'final_return_pct': 3.1958928170813303,
+        'volatility': 0.2288617876991408,
+        'daily_volatility': 0.014416937496609232,
+        'sharpe_ratio': 2.4956975639819614,
+        'sortino_ratio': 4.089151158481523,
+        'calmar_ratio': 34.10471989968482,
+        'var_95': -0.02085621452624775,
+        'var_99': -0.02320374620883412,
+        'expected_shortfall_95': -0.02379062912948071,
+        'expected_shortfall_99': -0.02379062912948071,
+        'max_drawdown': 0.03730214640225132,
+        'max_drawdown_pct': 3.7302146402251317,
+        'avg_drawdown': 0.016397826004274058,
+        'avg_drawdown_pct': 1.6397826004274059,
+        'max_drawdown_duration': 5,
+        'avg_drawdown_duration': 2.6666666666666665,
+        'recovery_factor': 0.8567584241984657,
+        'skewness': -0.03443722860387088,
+        'kurtosis': 0.27370974289227235,
+        'tail_ratio': 0,
+        'return_stability': float('nan'),
+        'consistency_score': 1.0,
+        'positive_months': 1,
+        'total_months': 1,
+        'star_rating': 2,
+    },
+    'engine_metrics': {
+        'total_return': -0.39740441011117034,
+        'annualized_return': -0.2737786367691062,
+        'volatility': 0.20279480179615633,
+        'sharpe_ratio': -1.3500278820968046,
+        'max_drawdown': -0.4559825603602972,
+        'avg_drawdown': -0.288464702080751,
+        'avg_trade_duration': 216.0,
+        'profit_factor': 0.7768002608516235,
+    },
+    'backtest_evaluator': {
+        'strategy_name': 'S',
+        'symbol': 'BTC/USDT',
+        'start_date': pd.Timestamp('2022-01-06 01:25:30.894666'),
+        'end_date': pd.Timestamp('2022-05-01 16:49:51.034155'),
+        'duration_days': 115,
+        'exposure_time_pct': 100.0,
+        'equity_final': 128213.21497675557,
+        'equity_peak': 140299.4304663526,
+        'total_return_pct': 28.21321497675557,
+        'buy_hold_return_pct': -0.04422363688189877,
+        'cagr_pct': 120.19321250791552,
+        'annualized_return_pct': 120.19321250791552,
+        'annualized_volatility_pct': 19.621616901146044,
+        'sharpe_ratio': 6.023622472264871,
+        'sortino_ratio': 10.320034764019793,
+        'calmar_ratio': 7.049233713017364,
+        'alpha_pct': 118.19321250791552,
+        'beta': 1.0,
+        'max_drawdown_pct': 17.050535902358078,
+        'avg_drawdown_pct': 6.302081146020497,
+        'max_drawdown_duration': 115,
+        'avg_drawdown_duration': 57.5,
+        'total_trades': 60,
+        'win_rate_pct': 50.0,
+        'best_trade_pct': 6.379331257113031,
+        'worst_trade_pct': -5.6946631816953,
+        'avg_trade_pct': 0.009217252305076555,
+        'max_trade_duration': 8.326501954085648,
+        'avg_trade_duration': 4.197141359904322,
+        'profit_factor': 0.986428823472725,
+        'expectancy_pct': 0.009217252305076555,
+    },
+    'comprehensive': {
+        'start_date': '2022-01-05',
+        'end_date': '2022-05-02',
+        'duration_days': 118,
+        'exposure_time_pct': 100.0,
+        'equity_final': 99945.18830338618,
+        'equity_peak': 119035.4589101615,
+        'return_pct': -5.158905359987521,
+        'buy_hold_return_pct': 4.84599589322382,
+        'return_ann_pct': -0.1695633738260538,
+        'volatility_ann_pct': 31.506064223805257,
+        'cagr_pct': -0.1695633738260538,
+        'sharpe_ratio': -0.005381928146326053,
+        'sortino_ratio': -0.005486000388357558,
+        'calmar_ratio': -0.009080986079580428,
+        'alpha_pct': -15.169563373826055,
+        'beta': 1.0,
+        'max_drawdown_pct': 18.67235257714305,
+        'avg_drawdown_pct': 6.211131192184246,
+        'max_drawdown_duration': 93,
+        'avg_drawdown_duration': 23.0,
+        'total_trades': 60,
+        'win_rate_pct': 46.666666666666664,
+        'best_trade_pct': 5.301041365856057,
+        'worst_trade_pct': -4.974951135773697,
+        'avg_trade_pct': -0.08598175599979202,
+        'max_trade_duration': 8.170773142719908,
+        'avg_trade_duration': 4.357270854002893,
+        'profit_factor': 0.8888683583119327,
+        'expectancy_pct': -0.08598175599979202,
+    },
+}
+
+
+def assert_matches(case, got, expected):
+    """Same keys and values, floats to 1e-9 relative"""
+    case.assertEqual(set(got), set(expected))
+    for key, value in expected.items():
+        with case.subTest(key=key):
+            if isinstance(value, float):
+                if np.isnan(value):
+                    case.assertTrue(np.isnan(got[key]))
+                elif np.isinf(value):
+                    case.assertEqual(got[key], value)
+                else:
+                    case.assertAlmostEqual(got[key], value, delta=1e-9 * max(1.0, abs(value)))
+            else:
+                case.assertEqual(got[key], value)
+
+
+def trade_table(runs):
+    """One TradeTable from the closed trades of each run"""
+    tables = [kernel.TradeTable.from_records(trades, run=run, pnl_pct='profit_pct')
+              for run, trades in runs.items()]
+    return kernel.TradeTable(*(np.concatenate([getattr(t, field) for t in tables])
+                               for field in ('run', 'pnl', 'pnl_pct', 'entry_time', 'exit_time')))
+
+
+class TestCalculatorParity(unittest.TestCase):
+    """Every calculator reports the numbers it did before moving onto the kernel"""
+
+    def test_kpi_calculator(self):
+        calculator = KPICalculator()
+        assert_matches(self, calculator.calculate_all_kpis(make_closed_trades(1), list(make_equity(2).values), 100000),
+                       GOLDEN['kpi_calculator'])
+        rising = list(np.linspace(100000, 120000, 30))
+        assert_matches(self, calculator.calculate_all_kpis(make_closed_trades(1, count=3), rising, 100000),
+                       GOLDEN['kpi_calculator_rising'])
+
+    def test_performance_analyzer(self):
+        from algoproject.backtesting.reporting.performance_analyzer import PerformanceAnalyzer
+        analyzer = PerformanceAnalyzer()
+        equity = make_equity(3)
+        metrics = analyzer.calculate_comprehensive_metrics(pd.DataFrame({'portfolio_value': equity}),
+                                                           make_trade_log(equity, 4))
+        assert_matches(self, metrics, GOLDEN['performance_analyzer'])
+
+        short = make_equity(9, periods=15)
+        metrics = analyzer.calculate_comprehensive_metrics(pd.DataFrame({'portfolio_value': short}), pd.DataFrame())
+        assert_matches(self, metrics, GOLDEN['performance_analyzer_short'])
+
+    def test_engine_metrics(self):
+        from unittest.mock import Mock
+        from algoproject.backtesting.backtest_engine import BacktestEngine
+        engine = BacktestEngine(Mock())
+        equity = make_equity(10)
+        trade_log = make_trade_log(equity, 11)
+        # As a column, and indexed by timestamp as BacktestContext logs it
+        for log in (trade_log.reset_index(), trade_log):
+            metrics = engine._calculate_additional_metrics(pd.DataFrame({'portfolio_value': equity}), log)
+            assert_matches(self, metrics, GOLDEN['engine_metrics'])
+
+    def test_backtest_evaluator(self):
+        from crypto.tools.backtest_evaluator import BacktestEvaluator
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)  # The evaluator creates ./output
+            try:
+                evaluator = BacktestEvaluator('S', 'BTC/USDT', 100000)
+                for trade in make_closed_trades(5):
+                    evaluator.add_trade(trade)
+                for timestamp, value in make_equity(6).items():
+                    evaluator.add_equity_point(timestamp.to_pydatetime(), float(value))
+                kpis = evaluator.calculate_comprehensive_kpis()
+            finally:
+                os.chdir(cwd)
+        assert_matches(self, kpis, GOLDEN['backtest_evaluator'])
+
+    def test_comprehensive_calculator(self):
+        from crypto.scripts.delta_backtest_strategies import ComprehensiveKPICalculator
+        calculator = ComprehensiveKPICalculator(100000)
+        for trade in make_closed_trades(7):
+            calculator.add_trade(trade)
+        for timestamp, value in make_equity(8).items():
+            calculator.add_equity_point(timestamp.to_pydatetime(), float(value))
+        assert_matches(self, calculator.calculate_all_29_kpis(), GOLDEN['comprehensive'])
+
+
+class TestKPIKernel(unittest.TestCase):
+    """Batched KPIs agree with scoring each curve on its own"""
+
+    def setUp(self):
+        self.timestamps = make_equity(0).index.to_numpy()
+        self.equity = np.vstack([make_equity(seed).to_numpy() for seed in range(6)])
+        # Ragged runs end early and are NaN-padded
+        self.lengths = [400, 250, 400, 31, 400, 2]
+        for row, length in enumerate(self.lengths):
+            self.equity[row, length:] = np.nan
+        self.trades = {run: make_closed_trades(run + 20, count=10 + run) for run in (0, 1, 3, 4)}
+
+    def test_batch_matches_single_runs(self):
+        benchmark = make_equity(99).to_numpy()
+        batch = kernel.compute_kpis(self.equity, self.timestamps, trade_table(self.trades),
+                                    initial_capital=100000, benchmark=benchmark)
+        self.assertEqual(list(batch), list(kernel.KPI_NAMES))
+        self.assertEqual(len(kernel.KPI_NAMES), 29)
+
+        for run, length in enumerate(self.lengths):
+            trades = trade_table({0: self.trades[run]}) if run in self.trades else None
+            single = kernel.compute_kpis(self.equity[run, :length], self.timestamps[:length], trades,
+                                         initial_capital=100000, benchmark=benchmark[:length])
+            for name in kernel.KPI_NAMES:
+                with self.subTest(run=run, kpi=name):
+                    if name.endswith('_date'):
+                        self.assertEqual(batch[name][run], single[name][0])
+                    else:
+                        np.testing.assert_allclose(batch[name][run], single[name][0], rtol=1e-12, equal_nan=True)
+
+        self.assertEqual(batch['total_trades'][2], 0)
+        self.assertEqual(batch['end_date'][3], self.timestamps[30])
+
+    def test_primitives_match_pandas(self):
+        returns = kernel.simple_returns(self.equity)
+        for run, length in enumerate(self.lengths):
+            series = pd.Series(self.equity[run, :length], index=self.timestamps[:length]).pct_change().dropna()
+            with self.subTest(run=run):
+                np.testing.assert_allclose(kernel.nan_std(returns)[run], series.std(), equal_nan=True)
+                np.testing.assert_allclose(kernel.nan_skew(returns)[run], series.skew(), equal_nan=True)
+                np.testing.assert_allclose(kernel.nan_kurtosis(returns)[run], series.kurtosis(), equal_nan=True)
+                np.testing.assert_allclose(kernel.rolling_mean(returns, 21)[run, :length - 1],
+                                           series.rolling(21).mean().to_numpy(), equal_nan=True)
+
+                monthly, inside = kernel.monthly_returns(returns, self.timestamps[1:])
+                expected = series.resample('ME').apply(lambda x: (1 + x).prod() - 1).to_numpy()
+                np.testing.assert_allclose(monthly[run][inside[run]], expected, atol=1e-12)
+
+    def test_drawdown_periods_and_streaks(self):
+        equity = np.array([[100, 90, 95, 100, 101, 99, 98, 102, 101, np.nan],
+                           [100, 101, 102, 103, 100, 100, 100, 100, 100, 100.0]])
+        periods = kernel.find_periods(kernel.drawdowns(equity) < 0, kernel.run_lengths(equity))
+        self.assertEqual(list(zip(periods.run, periods.start, periods.length, periods.open)),
+                         [(0, 1, 2, False), (0, 5, 2, False), (0, 8, 1, True), (1, 4, 6, True)])
+
+        run = np.array([0, 0, 0, 0, 1, 1, 1, 2])
+        wins = np.array([1, 1, 0, 1, 1, 1, 1, 0], dtype=bool)
+        self.assertEqual(kernel.max_streak(wins, run, 4).tolist(), [2, 3, 0, 0])
+        self.assertEqual(kernel.max_streak(~wins, run, 4).tolist(), [1, 0, 1, 0])
+
+    def test_no_losing_trades(self):
+        equity = list(make_equity(2).values)
+        winners = [dict(trade, pnl=abs(trade['pnl']) + 1.0) for trade in make_closed_trades(1, count=5)]
+        flat = [dict(trade, pnl=0.0) for trade in make_closed_trades(1, count=5)]
+
+        kpis = KPICalculator().calculate_all_kpis(winners, equity, 100000)
+        self.assertEqual(kpis['profit_factor'], float('inf'))
+        self.assertEqual(kpis['gross_loss'], 0.0)
+        self.assertEqual(KPICalculator().calculate_all_kpis(flat, equity, 100000)['profit_factor'], 0.0)
+
+        self.assertEqual(kernel.profit_factor(3.0, 0.0).tolist(), float('inf'))
+        self.assertEqual(kernel.profit_factor([3.0, 0.0, 2.0], [0.0, 0.0, 4.0], no_trades=0).tolist(),
+                         [float('inf'), 0.0, 0.5])
+
+    def test_kpi_columns_do_not_share_arrays(self):
+        for trades in (None, trade_table({0: self.trades[0]})):
+            kpis = kernel.compute_kpis(self.equity[:2], trades=trades)
+            shared = [(a, b) for i, a in enumerate(kernel.KPI_NAMES) for b in kernel.KPI_NAMES[i + 1:]
+                      if np.shares_memory(kpis[a], kpis[b])]
+            self.assertEqual(shared, [])
+
+    def test_timezone_aware_timestamps(self):
+        index = pd.DatetimeIndex(self.timestamps).tz_localize('UTC').tz_convert('Asia/Kolkata')
+        trades = [dict(trade, entry_time=pd.Timestamp(trade['entry_time'], tz='UTC'),
+                       exit_time=pd.Timestamp(trade['exit_time'], tz='UTC').tz_convert('US/Eastern'))
+                  for trade in self.trades[0]]
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            aware = kernel.compute_kpis(self.equity[0], index, kernel.TradeTable.from_records(trades))
+            aware_monthly = kernel.monthly_returns(kernel.simple_returns(self.equity), index[1:].to_numpy())
+        naive = kernel.compute_kpis(self.equity[0], self.timestamps, trade_table({0: self.trades[0]}))
+        self.assertEqual(aware['start_date'][0], self.timestamps[0])
+        np.testing.assert_allclose(aware['avg_trade_duration'], naive['avg_trade_duration'])
+        np.testing.assert_allclose(aware_monthly[0],
+                                   kernel.monthly_returns(kernel.simple_returns(self.equity), self.timestamps[1:])[0])
+
+    def test_calculate_batch(self):
+        frame = KPICalculator().calculate_batch(self.equity, self.timestamps, trade_table(self.trades))
+        self.assertEqual(frame.shape, (6, 29))
+        self.assertEqual(list(frame.columns), list(kernel.KPI_NAMES))
+        self.assertAlmostEqual(frame['equity_final'][1], self.equity[1, 249])
+        self.assertEqual(frame['total_trades'].tolist(), [10, 11, 0, 13, 14, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
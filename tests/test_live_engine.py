@@ -0,0 +1,152 @@
+"""
+Live Trading Engine Tests
+=========================
+
+Push and poll market data feeds, symbol routing and tick latency.
+"""
+
+import asyncio
+import unittest
+import sys
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.core.config_manager import ConfigManager
+from algoproject.core.interfaces import MarketData, Signal
+from algoproject.data.data_loader import DataLoader
+from algoproject.data.streaming.data_stream import DataStream, StreamStatus
+from algoproject.data.streaming.stream_manager import StreamManager
+from algoproject.security.api_key_manager import APIKeyManager
+from algoproject.strategies.base_strategy import BaseStrategy
+from algoproject.trading.live_engine import FeedMode, LiveTradingEngine
+
+
+def tick(symbol, price=100.0):
+    return MarketData(symbol, datetime(2024, 1, 1), price, price, price, price, 1.0, 'test')
+
+
+class FakeStream(DataStream):
+    """A connected stream whose ticks are pushed by the test"""
+
+    def __init__(self):
+        super().__init__('fake')
+        self.subscribe_calls = []
+        self.unsubscribe_calls = []
+
+    async def connect(self):
+        self.status = StreamStatus.CONNECTED
+        return True
+
+    async def disconnect(self):
+        self.status = StreamStatus.DISCONNECTED
+
+    async def subscribe(self, symbol, data_type="ticker"):
+        self.subscribe_calls.append(symbol)
+        self.subscribed_symbols.add(symbol)
+
+    async def unsubscribe(self, symbol, data_type="ticker"):
+        self.unsubscribe_calls.append(symbol)
+        self.subscribed_symbols.discard(symbol)
+
+    def push(self, data):
+        self.notify_subscribers("data", data)
+
+
+class RecordingStrategy(BaseStrategy):
+    """Buys a small amount on every tick it sees"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.seen = []
+
+    def next(self, data):
+        self.seen.append(data.symbol)
+        return [Signal(data.symbol, 'buy', 0.001, price=data.close)]
+
+
+async def settle():
+    await asyncio.sleep(0.01)
+
+
+class TestLiveTradingEnginePush(unittest.TestCase):
+    """Ticks from a StreamManager go straight to the strategies trading them"""
+
+    def test_ticks_route_to_subscribed_strategies(self):
+        async def run():
+            manager = StreamManager(Mock(spec=ConfigManager))
+            stream = FakeStream()
+            self.assertTrue(await manager.add_stream('fake', stream))
+
+            engine = LiveTradingEngine(Mock(spec=APIKeyManager), Mock(spec=DataLoader), stream_manager=manager)
+            both, only_a = RecordingStrategy('both'), RecordingStrategy('only_a')
+            both_id = engine.add_strategy(both, ['AAA', 'BBB'])
+            engine.add_strategy(only_a, ['AAA', 'AAA'])
+            engine.start()
+            await settle()
+
+            # One subscription per symbol, however many strategies trade it
+            self.assertEqual(sorted(stream.subscribe_calls), ['AAA', 'BBB'])
+
+            for symbol in ['AAA', 'BBB', 'CCC', 'AAA']:
+                stream.push(tick(symbol))
+            await settle()
+
+            # Dispatch happens before the tick handler returns, without polling
+            self.assertEqual(both.seen, ['AAA', 'BBB', 'AAA'])
+            self.assertEqual(only_a.seen, ['AAA', 'AAA'])
+            self.assertEqual(engine.total_trades, 5)
+            self.assertEqual(engine.active_strategies[both_id]['signals_generated'], 3)
+
+            latency = engine.get_status()['latency']
+            self.assertEqual((latency['ticks_processed'], latency['ticks_ignored']), (3, 1))
+            self.assertGreater(latency['p99_us'], 0)
+            self.assertLessEqual(latency['p50_us'], latency['max_us'])
+
+            # Dropping the only strategy on BBB drops its subscription
+            self.assertTrue(engine.remove_strategy(both_id))
+            await settle()
+            self.assertEqual(stream.unsubscribe_calls, ['BBB'])
+            self.assertEqual(engine.symbol_strategies, {'AAA': ['only_a_1']})
+
+            engine.stop()
+            stream.push(tick('AAA'))
+            await settle()
+            self.assertEqual(len(only_a.seen), 2)
+            return engine
+
+        engine = asyncio.run(run())
+        self.assertEqual(engine.feed_mode, FeedMode.PUSH)
+
+
+class TestLiveTradingEnginePoll(unittest.TestCase):
+    """Polling fetches each symbol once per interval, not once per strategy"""
+
+    def test_each_symbol_fetched_once_per_poll(self):
+        data_loader = Mock(spec=DataLoader)
+        data_loader.get_live_data.side_effect = lambda symbol: tick(symbol)
+
+        async def run():
+            engine = LiveTradingEngine(Mock(spec=APIKeyManager), data_loader, poll_interval=0.005)
+            first, second = RecordingStrategy('first'), RecordingStrategy('second')
+            engine.add_strategy(first, ['AAA', 'BBB'])
+            engine.add_strategy(second, ['AAA'])
+            engine.start()
+            await asyncio.sleep(0.05)
+            engine.stop()
+            await settle()
+            return engine, first, second
+
+        engine, first, second = asyncio.run(run())
+        fetched = [call.args[0] for call in data_loader.get_live_data.call_args_list]
+        polls = fetched.count('AAA')
+        self.assertGreater(polls, 1)
+        self.assertEqual(fetched.count('BBB'), polls)
+        self.assertEqual(second.seen, ['AAA'] * polls)
+        self.assertEqual(first.seen.count('AAA'), polls)
+        self.assertEqual(engine.get_latency_stats()['ticks_processed'], 2 * polls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Market State Tests
+==================
+
+Rolling OHLCV windows refreshed with incremental fetches.
+"""
+
+import unittest
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, '.')
+
+from algoproject.data.market_state import MarketStateStore, SymbolWindow
+from strategies.VWAPSigma2Strategy import VWAPSigma2Strategy
+
+
+BAR = pd.Timedelta(minutes=5)
+START = pd.Timestamp('2024-01-01')
+
+
+class FakeFeed:
+    """5m bars up to a moving clock; the last bar is still forming"""
+
+    def __init__(self, seed=0, bars=400):
+        rng = np.random.default_rng(seed)
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.01, bars))
+        self.frame = pd.DataFrame({
+            'open': close, 'high': close * 1.01, 'low': close * 0.99,
+            'close': close, 'volume': rng.lognormal(0, 1, bars)
+        }, index=pd.date_range(START, periods=bars, freq='5min'))
+        self.now = 40
+        self.clock = 0.0
+        self.ignore_since = False
+
+    def advance(self, bars):
+        self.now += bars
+        self.clock += bars * 300.0
+
+    def visible(self):
+        df = self.frame.iloc[:self.now + 1].copy()
+        # The forming bar only has part of its volume
+        df.iloc[-1, df.columns.get_loc('volume')] *= 0.5
+        return df
+
+    def fetch(self, symbol, since, limit):
+        df = self.visible()
+        if since is None or self.ignore_since:
+            return df.iloc[-limit:]
+        # CCXT semantics: the first `limit` bars from `since`
+        return df[df.index >= since].iloc[:limit]
+
+
+class TestSymbolWindow(unittest.TestCase):
+    """Test merging into the fixed-capacity buffer"""
+
+    def test_merge_replaces_appends_and_rolls(self):
+        window = SymbolWindow('AAA', capacity=3)
+        values = np.arange(25, dtype=float).reshape(5, 5)
+        self.assertEqual(window.merge(np.array([1, 2]), values[:2]), 2)
+        self.assertEqual(window.merge(np.array([1, 2, 3]), values[2:5]), 1)
+
+        self.assertEqual(list(window.arrays()['timestamp']), [1, 2, 3])
+        np.testing.assert_array_equal(window.arrays()['close'], [3.0, 18.0, 23.0])
+
+        for ts in range(4, 20):
+            window.merge(np.array([ts]), values[:1] + ts)
+        self.assertEqual(len(window), 3)
+        self.assertEqual(list(window.arrays()['timestamp']), [17, 18, 19])
+        self.assertEqual(window.arrays()['open'][-1], 19.0)
+
+
+class TestMarketStateStore(unittest.TestCase):
+    """Incremental updates must match full refetches"""
+
+    def run_cycles(self, feed, store, strategy, steps):
+        for step in steps:
+            feed.advance(step)
+            window = store.update('AAA')
+            expected = feed.visible().iloc[-30:]
+            pd.testing.assert_frame_equal(window.to_frame(), expected, check_freq=False,
+                                          check_names=False, check_index_type=False)
+            self.assertEqual(strategy.generate_signal_arrays(**window.arrays()),
+                             strategy.generate_signal(expected))
+
+    def test_incremental_updates_match_full_fetch(self):
+        feed = FakeFeed()
+        store = MarketStateStore(feed.fetch, timeframe='5m', capacity=30, clock=lambda: feed.clock)
+        strategy = VWAPSigma2Strategy()
+
+        # Several scans per bar, and occasionally a few bars between scans
+        self.run_cycles(feed, store, strategy, [0, 0, 1, 0, 0, 1, 3, 0, 1] * 30)
+
+        stats = store.get_stats()
+        self.assertEqual(stats['full_fetches'], 1)
+        full_refetch_bars = 30 * stats['fetches']
+        self.assertLess(stats['bars_fetched'] * 10, full_refetch_bars)
+
+    def test_gap_reloads_window(self):
+        feed = FakeFeed()
+        feed.ignore_since = True  # Latest `limit` bars only, like TradingView
+        store = MarketStateStore(feed.fetch, timeframe='5m', capacity=30, clock=lambda: feed.clock)
+        store.update('AAA')
+
+        # Bars the estimate can reach are merged without a reload
+        feed.advance(2)
+        store.update('AAA')
+        self.assertEqual(store.get_stats()['full_fetches'], 1)
+
+        # The feed skipped ahead further than the clock suggests
+        feed.now += 50
+        window = store.update('AAA')
+        pd.testing.assert_frame_equal(window.to_frame(), feed.visible().iloc[-30:],
+                                      check_freq=False, check_names=False, check_index_type=False)
+        self.assertEqual(store.get_stats()['full_fetches'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Matrix Backtest Engine Tests
+============================
+
+Thread and process backends of MatrixBacktestEngine.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.backtesting.matrix_backtest import MatrixBacktestEngine, ExecutionBackend
+from algoproject.backtesting.shared_market_data import SharedMarketDataStore, attach_frame
+from algoproject.backtesting.dataset_registry import DatasetRegistry
+from algoproject.data.data_loader import DataLoader
+from algoproject.strategies.base_strategy import BaseStrategy
+
+
+def make_frame(periods, seed):
+    """Create a deterministic random-walk OHLCV frame"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2023-01-01', periods=periods, freq='D')
+    close = 100.0 * np.cumprod(1 + rng.normal(0, 0.02, periods))
+    return pd.DataFrame({
+        'open': close * 0.999,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.uniform(100, 1000, periods)
+    }, index=dates)
+
+
+FRAMES = {'AAA': make_frame(150, 1), 'BBB': make_frame(150, 2)}
+
+
+class MomentumStrategy(BaseStrategy):
+    """Buys after `lookback` rising closes and sells after a falling close"""
+
+    def _on_initialize(self):
+        self.closes = []
+
+    def next(self, data):
+        self.closes.append(data.close)
+        lookback = self.get_parameter('lookback', 2)
+        if len(self.closes) <= lookback:
+            return []
+        recent = self.closes[-lookback - 1:]
+        if all(b > a for a, b in zip(recent, recent[1:])):
+            return [self.create_signal(data.symbol, 'buy', 3.0)]
+        if recent[-1] < recent[-2] and self.context.get_position(data.symbol) > 0:
+            return [self.create_signal(data.symbol, 'sell', 3.0)]
+        return []
+
+
+def make_engine(backend):
+    data_loader = Mock(spec=DataLoader)
+    data_loader.get_historical_data.side_effect = lambda symbol, **kwargs: FRAMES[symbol]
+    engine = MatrixBacktestEngine(data_loader, max_workers=2, backend=backend)
+    engine.add_parameter_sweep(MomentumStrategy, {'lookback': [1, 2, 3]}, ['AAA', 'BBB'],
+                               datetime(2023, 1, 1), datetime(2023, 6, 1))
+    return engine, data_loader
+
+
+class TestSharedMarketData(unittest.TestCase):
+    """Test shared-memory frame publishing"""
+
+    def test_attach_is_zero_copy_and_read_only(self):
+        """Attached frames view the shared block directly"""
+        key = ('AAA', '1d', None, None)
+        with SharedMarketDataStore() as store:
+            handle = store.add(key, FRAMES['AAA'])
+            df, shm = attach_frame(handle)
+
+            pd.testing.assert_frame_equal(df, FRAMES['AAA'][list(df.columns)], check_freq=False,
+                                          check_index_type=False)
+            block = np.ndarray((shm.size,), dtype=np.uint8, buffer=shm.buf)
+            self.assertTrue(np.shares_memory(df['close'].to_numpy(), block))
+            with self.assertRaises(ValueError):
+                df['close'].to_numpy()[0] = 0.0
+
+            del df, block
+            shm.close()
+
+
+class TestDatasetRegistry(unittest.TestCase):
+    """Test run-scoped dataset loading"""
+
+    def test_sweep_loads_each_series_once(self):
+        """A parameter sweep hits the provider once per distinct series"""
+        engine, data_loader = make_engine('thread')
+        results = engine.run_matrix_backtest()
+
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(data_loader.get_historical_data.call_count, 2)
+        self.assertEqual(engine.get_dataset_stats(),
+                         {'datasets': 2, 'loads': 2, 'hits': 6, 'misses': 0})
+        self.assertEqual(engine.get_results_summary()['dataset_stats']['hits'], 6)
+
+    def test_views_are_read_only_and_loads_coalesce(self):
+        """Concurrent misses share one load and views cannot be written"""
+        data_loader = Mock(spec=DataLoader)
+        data_loader.get_historical_data.side_effect = lambda symbol, **kwargs: FRAMES[symbol]
+        registry = DatasetRegistry(data_loader)
+        key = ('AAA', '1d', None, None)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            frames = list(executor.map(lambda _: registry.get(key), range(16)))
+
+        self.assertEqual(data_loader.get_historical_data.call_count, 1)
+        self.assertEqual(registry.get_stats()['misses'] + registry.get_stats()['hits'], 16)
+        with self.assertRaises(ValueError):
+            frames[0]['close'].to_numpy()[0] = 0.0
+
+
+class TestMatrixBackends(unittest.TestCase):
+    """Thread and process backends must agree"""
+
+    def test_process_backend_matches_threads(self):
+        """Process pool results, progress callbacks and exports match the thread pool"""
+        thread_engine, _ = make_engine(ExecutionBackend.THREAD)
+        thread_results = {r.job_id: r for r in thread_engine.run_matrix_backtest()}
+
+        process_engine, data_loader = make_engine('thread')
+        progress = []
+        process_engine.set_progress_callback(progress.append)
+        process_results = {r.job_id: r for r in process_engine.run_matrix_backtest(backend='process')}
+
+        # Each distinct series is loaded once in the parent
+        self.assertEqual(data_loader.get_historical_data.call_count, 2)
+
+        self.assertEqual(set(thread_results), set(process_results))
+        for job_id, result in thread_results.items():
+            self.assertTrue(result.success, result.error_message)
+            self.assertTrue(process_results[job_id].success, process_results[job_id].error_message)
+            self.assertEqual(result.results['trade_log'], process_results[job_id].results['trade_log'])
+            self.assertEqual(result.results['performance'], process_results[job_id].results['performance'])
+
+        self.assertEqual([p['completed'] for p in progress], list(range(1, 7)))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'results.json')
+            process_engine.export_results(path)
+            with open(path) as f:
+                self.assertEqual(len(json.load(f)), 6)
+
+    def test_stream_yields_as_jobs_finish(self):
+        """stream_matrix_backtest yields every result and records them"""
+        engine, _ = make_engine('process')
+        streamed = [result.job_id for result in engine.stream_matrix_backtest()]
+
+        self.assertEqual(sorted(streamed), sorted(job.job_id for job in engine.jobs))
+        self.assertEqual(len(engine.results), 6)
+        self.assertFalse(engine.is_backtest_running())
+
+
+if __name__ == "__main__":
+    unittest.main()
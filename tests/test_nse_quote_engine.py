@@ -0,0 +1,145 @@
+"""
+NSE Quote Engine Tests
+======================
+
+Bulk lookups, concurrent fallbacks, request coalescing and deadlines.
+"""
+
+import asyncio
+import unittest
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, '.')
+
+from stocks.nse_free_data_provider import NSEFreeDataProvider
+from stocks.nse_quote_engine import AsyncQuoteEngine
+
+
+NIFTY_50 = [f"LARGE{i}" for i in range(30)]
+NIFTY_500 = NIFTY_50 + [f"MID{i}" for i in range(5)]
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Answers NSE and Yahoo URLs after a fixed delay and counts requests"""
+
+    def __init__(self, delay=0.05, slow=()):
+        self.delay = delay
+        self.slow = set(slow)
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self.lock:
+            self.calls[url.split('?')[0].rsplit('/', 1)[-1]] += 1
+        time.sleep(self.delay)
+
+        if url.endswith('equity-stockIndices'):
+            members = {'NIFTY 50': NIFTY_50, 'NIFTY 500': NIFTY_500}[params['index']]
+            rows = [{'symbol': params['index'], 'lastPrice': 1.0}]
+            rows += [{'symbol': s, 'lastPrice': 100.0, 'previousClose': 99.0} for s in members]
+            return FakeResponse(200, {'data': rows})
+
+        if 'quote-equity' in url:
+            symbol = url.split('symbol=')[1]
+            if symbol in self.slow:
+                time.sleep(1.0)
+            if symbol.startswith('SMALL'):
+                return FakeResponse(200, {'priceInfo': {'lastPrice': 50.0}})
+            return FakeResponse(404)
+
+        if 'finance/chart' in url:
+            if 'YAHOO' in url:
+                return FakeResponse(200, {'chart': {'result': [{
+                    'meta': {'regularMarketPrice': 10.0, 'previousClose': 9.0},
+                    'indicators': {'quote': [{}]}
+                }]}})
+            return FakeResponse(500)
+
+        return FakeResponse(404)
+
+
+class TestAsyncQuoteEngine(unittest.TestCase):
+    """Test the concurrent quote fan-out"""
+
+    def make_engine(self, session, **kwargs):
+        engine = AsyncQuoteEngine(NSEFreeDataProvider(session=session), **kwargs)
+        self.addCleanup(engine.close)
+        return engine
+
+    def test_bulk_then_concurrent_fallbacks(self):
+        session = FakeSession()
+        engine = self.make_engine(session)
+        symbols = NIFTY_500 + ['SMALL0', 'SMALL1', 'SMALL2', 'YAHOO0', 'GONE0']
+
+        start = time.monotonic()
+        quotes = asyncio.run(engine.get_quotes(symbols))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(list(quotes), symbols)
+        sources = Counter(quote['data_source'] for quote in quotes.values())
+        self.assertEqual(sources, {'NSE_FREE': 38, 'YAHOO_FINANCE': 1, 'MOCK': 1})
+        self.assertEqual(quotes['MID3']['ltp'], 100.0)
+
+        # Two bulk requests cover 35 symbols; only the other 5 go one by one
+        self.assertEqual(session.calls['equity-stockIndices'], 2)
+        self.assertEqual(session.calls['quote-equity'], 5)
+        self.assertEqual(session.calls['YAHOO0.NS'] + session.calls['GONE0.NS'], 2)
+        # Bulk, NSE and Yahoo rounds run back to back, not 12 sequential requests
+        self.assertLess(elapsed, 0.45)
+
+    def test_duplicate_requests_are_coalesced(self):
+        session = FakeSession()
+        engine = self.make_engine(session)
+
+        async def scan():
+            return await asyncio.gather(
+                engine.get_quotes(['SMALL0', 'SMALL1', 'SMALL0']),
+                engine.get_quotes(['SMALL1', 'SMALL0'])
+            )
+
+        first, second = asyncio.run(scan())
+        self.assertEqual(first, second)
+        self.assertEqual(session.calls['quote-equity'], 2)
+        self.assertEqual(engine.get_stats()['coalesced'], 2)
+        self.assertEqual(engine.get_stats()['in_flight'], 0)
+
+    def test_deadline_returns_partial_results(self):
+        session = FakeSession(slow={'SMALL9'})
+        engine = self.make_engine(session, bulk_min_symbols=10)
+
+        quotes = asyncio.run(engine.get_quotes(['SMALL0', 'SMALL9'], timeout=0.3))
+        self.assertEqual(list(quotes), ['SMALL0'])
+        self.assertEqual(engine.get_stats()['timed_out'], 1)
+
+    def test_close_stops_worker_threads(self):
+        session = FakeSession()
+
+        async def scan():
+            async with AsyncQuoteEngine(NSEFreeDataProvider(session=session)) as engine:
+                quotes = await engine.get_quotes(['SMALL0', 'SMALL1'])
+            return engine, quotes
+
+        engine, quotes = asyncio.run(scan())
+        self.assertEqual(list(quotes), ['SMALL0', 'SMALL1'])
+        threads = list(engine._executor._threads)
+        self.assertTrue(threads)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        with self.assertRaises(RuntimeError):
+            asyncio.run(engine.get_quotes(['SMALL0']))
+        engine.close()  # Closing again is a no-op
+
+
+if __name__ == "__main__":
+    unittest.main()
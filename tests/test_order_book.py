@@ -0,0 +1,150 @@
+"""
+Order Book Tests
+================
+
+Heap-indexed resting orders, range triggers and OCO brackets.
+"""
+
+import unittest
+import sys
+import numpy as np
+from datetime import datetime
+
+sys.path.insert(0, '.')
+
+from algoproject.backtesting.backtest_context import BacktestContext
+from algoproject.backtesting.order_book import BookSide, OrderBook
+from algoproject.backtesting.trade_executor import (
+    ExecutionMode, Order, OrderStatus, TradeExecutor
+)
+from algoproject.core.interfaces import MarketData
+
+
+SIDES = {
+    BookSide.BUY_LIMIT: ('buy', ExecutionMode.LIMIT),
+    BookSide.SELL_LIMIT: ('sell', ExecutionMode.LIMIT),
+    BookSide.BUY_STOP: ('buy', ExecutionMode.STOP),
+    BookSide.SELL_STOP: ('sell', ExecutionMode.STOP),
+}
+
+
+def bar(symbol, open_, high, low, close):
+    return MarketData(symbol, datetime(2024, 1, 1), open_, high, low, close, 1000.0, 'test')
+
+
+class TestOrderBook(unittest.TestCase):
+    """The book must trigger exactly what a full scan would"""
+
+    def test_matches_linear_scan(self):
+        rng = np.random.default_rng(11)
+        book = OrderBook()
+        executor = TradeExecutor(BacktestContext())
+        resting = {}
+        symbols = [f"S{i}" for i in range(20)]
+
+        for i in range(4000):
+            side = list(SIDES)[rng.integers(4)]
+            action, order_type = SIDES[side]
+            price = float(np.round(rng.uniform(90, 110), 1))
+            order = Order(f"O{i}", symbols[rng.integers(len(symbols))], action, 1.0, order_type,
+                          price=price, stop_price=price)
+            book.add(order.order_id, order.symbol, side, price, order)
+            resting[order.order_id] = order
+
+        # Cancel most of them, enough to force compactions
+        for order_id in [order_id for i, order_id in enumerate(resting) if i % 5]:
+            self.assertIs(book.remove(order_id), resting.pop(order_id))
+        self.assertIsNone(book.remove('O1'))
+        self.assertGreater(book.get_stats()['compactions'], 0)
+        self.assertEqual(len(book), len(resting))
+
+        for _ in range(300):
+            symbol = symbols[rng.integers(len(symbols))]
+            low = float(rng.uniform(85, 110))
+            data = bar(symbol, low, low + float(rng.uniform(0, 3)), low, low)
+            expected = [order for order in resting.values()
+                        if order.symbol == symbol and executor._should_execute_order(order, data)]
+            triggered = book.pop_triggered(symbol, data.high, data.low)
+            self.assertEqual(triggered, expected)
+            for order in triggered:
+                del resting[order.order_id]
+
+        self.assertEqual(len(book), len(resting))
+        self.assertEqual(book.orders('S3'), [o for o in resting.values() if o.symbol == 'S3'])
+        with self.assertRaises(ValueError):
+            next_id = next(iter(resting))
+            book.add(next_id, 'S0', BookSide.BUY_LIMIT, 1.0, None)
+
+
+class TestTradeExecutorOrders(unittest.TestCase):
+    """Resting orders and OCO brackets in the executor"""
+
+    def setUp(self):
+        self.context = BacktestContext(initial_capital=100000.0, commission=0.0)
+        self.executor = TradeExecutor(self.context, slippage=0.0)
+        self.feed(bar('AAA', 100, 100, 100, 100))
+
+    def feed(self, data):
+        self.context.update_market_data(data)
+        self.executor.process_market_data(data)
+
+    def test_limit_triggers_on_range_and_fills_through_gaps(self):
+        limit_id = self.executor.place_order('AAA', 'buy', 10, ExecutionMode.LIMIT, price=95.0)
+        stop_id = self.executor.place_order('AAA', 'buy', 5, ExecutionMode.STOP, stop_price=104.0)
+        self.assertEqual(len(self.executor.get_pending_orders('AAA')), 2)
+
+        # Closes above the limit but the low reaches it
+        self.feed(bar('AAA', 98, 99, 94, 98))
+        self.assertEqual(self.context.get_position('AAA'), 10)
+        self.assertEqual(self.executor.filled_orders[-1].avg_fill_price, 95.0)
+
+        # Gaps over the stop: filled at the open
+        self.feed(bar('AAA', 106, 107, 105, 106))
+        self.assertEqual(self.context.get_position('AAA'), 15)
+        self.assertEqual(self.executor.filled_orders[-1].avg_fill_price, 106.0)
+        self.assertEqual(self.executor.get_pending_orders(), [])
+        self.assertEqual([o.order_id for o in self.executor.filled_orders], [limit_id, stop_id])
+
+        with self.assertRaises(ValueError):
+            self.executor.place_order('AAA', 'buy', 1, ExecutionMode.STOP)
+        with self.assertRaises(ValueError):
+            self.executor.place_order('AAA', 'buy', 1, ExecutionMode.STOP_LIMIT, price=1, stop_price=1)
+
+    def test_bracket_fill_cancels_the_other_leg(self):
+        self.executor.place_order('AAA', 'buy', 10, ExecutionMode.MARKET)
+        take_id, stop_id = self.executor.place_bracket('AAA', 'sell', 10, take_profit=110.0, stop_loss=95.0)
+
+        self.feed(bar('AAA', 104, 111, 103, 108))
+        self.assertEqual(self.context.get_position('AAA'), 0)
+        self.assertEqual(self.executor.filled_orders[-1].order_id, take_id)
+        self.assertEqual(self.executor.filled_orders[-1].avg_fill_price, 110.0)
+        self.assertEqual(self.executor.pending_orders, {})
+        self.assertEqual(self.executor.oco_groups, {})
+        self.assertFalse(self.executor.cancel_order(stop_id))
+        self.assertEqual(self.executor.order_book.get_stats()['resting'], 0)
+
+        with self.assertRaises(ValueError):
+            self.executor.place_bracket('AAA', 'sell', 10, take_profit=90.0, stop_loss=95.0)
+
+    def test_bracket_hit_on_both_sides_in_one_bar_stops_out(self):
+        self.executor.place_order('AAA', 'buy', 10, ExecutionMode.MARKET)
+        take_id, stop_id = self.executor.place_bracket('AAA', 'sell', 10, take_profit=110.0, stop_loss=95.0)
+
+        take = self.executor.pending_orders[take_id]
+        self.feed(bar('AAA', 100, 112, 90, 100))
+        filled = self.executor.filled_orders[-1]
+        self.assertEqual((filled.order_id, filled.avg_fill_price), (stop_id, 95.0))
+        self.assertEqual(take.status, OrderStatus.CANCELLED)
+        self.assertEqual(self.context.get_position('AAA'), 0)
+        self.assertEqual(self.executor.get_execution_summary()['pending_orders'], 0)
+
+    def test_cancelled_orders_never_fill(self):
+        order_id = self.executor.place_order('AAA', 'buy', 10, ExecutionMode.LIMIT, price=99.0)
+        self.assertTrue(self.executor.cancel_order(order_id))
+        self.feed(bar('AAA', 98, 98, 97, 98))
+        self.assertEqual(self.context.get_position('AAA'), 0)
+        self.assertEqual(self.executor.order_book.get_stats()['stale_entries'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
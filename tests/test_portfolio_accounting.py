@@ -0,0 +1,150 @@
+"""
+Portfolio Accounting Tests
+==========================
+
+Running portfolio totals, O(1) risk exposure and the per-bar equity curve.
+"""
+
+import unittest
+import sys
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.backtesting.backtest_engine import BacktestEngine
+from algoproject.backtesting.portfolio import Portfolio
+from algoproject.core.interfaces import MarketData, Signal
+from algoproject.core.risk_manager import RiskManager
+from algoproject.data.data_loader import DataLoader
+from algoproject.strategies.base_strategy import BaseStrategy
+
+
+def scan_positions_value(portfolio):
+    return sum(p.quantity * portfolio.market_prices[s] for s, p in portfolio.positions.items())
+
+
+class AlternatingStrategy(BaseStrategy):
+    """Buys every tenth bar and sells on the fifth bar after"""
+
+    def _on_initialize(self):
+        self.bars = 0
+
+    def next(self, data):
+        self.bars += 1
+        if self.bars % 10 == 0:
+            return [self.create_signal(data.symbol, 'buy', 10.0)]
+        if self.bars % 10 == 5 and self.context.get_position(data.symbol) > 0:
+            return [self.create_signal(data.symbol, 'sell', 10.0)]
+        return []
+
+
+class TestPortfolioTotals(unittest.TestCase):
+    """Running totals must match a scan over the positions"""
+
+    def test_totals_track_fills_and_prices(self):
+        rng = np.random.default_rng(7)
+        portfolio = Portfolio(initial_cash=1e9)
+        symbols = [f"S{i}" for i in range(200)]
+
+        for step in range(5000):
+            symbol = symbols[rng.integers(len(symbols))]
+            price = float(rng.uniform(10, 100))
+            action = rng.integers(3)
+            if action == 0:
+                portfolio.buy(symbol, float(rng.integers(1, 50)), price, commission=1.0)
+            elif action == 1 and symbol in portfolio.positions:
+                portfolio.sell(symbol, portfolio.get_position_quantity(symbol) / 2, price, commission=1.0)
+            else:
+                portfolio.update_market_price(symbol, price)
+
+        expected_value = scan_positions_value(portfolio)
+        expected_pnl = sum(p.quantity * (portfolio.market_prices[s] - p.avg_price)
+                           for s, p in portfolio.positions.items())
+        self.assertGreater(len(portfolio.positions), 100)
+        self.assertAlmostEqual(portfolio.get_total_positions_value(), expected_value, places=4)
+        self.assertAlmostEqual(portfolio.get_total_value(), portfolio.cash + expected_value, places=4)
+        self.assertAlmostEqual(portfolio.get_total_pnl(), expected_pnl, places=4)
+        self.assertEqual(portfolio.get_total_exposure(), portfolio.get_total_positions_value())
+
+        self.assertLess(abs(portfolio.reconcile()), 1e-3)
+        self.assertEqual(portfolio.get_total_positions_value(), expected_value)
+
+    def test_closing_everything_returns_to_cash(self):
+        portfolio = Portfolio(initial_cash=10000.0)
+        portfolio.buy('AAA', 10, 100.0)
+        portfolio.update_market_price('AAA', 110.0)
+        self.assertEqual(portfolio.positions['AAA'].market_price, 110.0)
+        self.assertEqual(portfolio.get_total_value(), 10100.0)
+
+        self.assertFalse(portfolio.sell('AAA', 11, 120.0))
+        self.assertTrue(portfolio.sell('AAA', 10, 120.0))
+        self.assertEqual(portfolio.get_total_positions_value(), 0.0)
+        self.assertEqual(portfolio.get_total_pnl(), 0.0)
+        self.assertEqual(portfolio.get_total_value(), 10200.0)
+
+    def test_risk_manager_uses_running_exposure(self):
+        portfolio = Portfolio(initial_cash=100000.0)
+        for i in range(50):
+            portfolio.buy(f"S{i}", 10, 180.0)
+        market_data = {'NEW': MarketData('NEW', datetime(2024, 1, 1), 100, 100, 100, 100, 0, 'test')}
+        signal = Signal('NEW', 'buy', 60.0, None, datetime(2024, 1, 1), 'test')
+        manager = RiskManager()
+
+        scanned = manager.validate_signal(signal, portfolio.get_total_value(), portfolio.positions,
+                                          market_data)
+        running = manager.validate_signal(signal, portfolio.get_total_value(), portfolio.positions,
+                                          market_data, current_exposure=portfolio.get_total_exposure())
+        self.assertEqual(running, scanned)
+        self.assertEqual(running[:2], (False, "Maximum portfolio exposure exceeded"))
+
+
+class TestBarEquity(unittest.TestCase):
+    """The backtest records equity on every bar"""
+
+    def test_every_bar_is_marked_to_market(self):
+        rng = np.random.default_rng(3)
+        dates = pd.date_range('2023-01-01', periods=300, freq='h')
+        frames = {}
+        for symbol in ('AAA', 'BBB'):
+            close = 100.0 * np.cumprod(1 + rng.normal(0, 0.01, len(dates)))
+            frames[symbol] = pd.DataFrame({'open': close, 'high': close, 'low': close,
+                                           'close': close, 'volume': 1000.0}, index=dates)
+        data_loader = Mock(spec=DataLoader)
+        data_loader.get_historical_data.side_effect = lambda symbol, **kwargs: frames[symbol]
+
+        engine = BacktestEngine(data_loader, slippage=0.0)
+        results = engine.run_backtest(AlternatingStrategy("Alternating", {}), ['AAA', 'BBB'],
+                                      datetime(2023, 1, 1), datetime(2023, 2, 1), '1h')
+
+        bar_equity = results['bar_equity']
+        self.assertEqual(len(bar_equity), len(dates))
+        self.assertLess(len(results['equity_curve']), len(bar_equity))
+        self.assertEqual([row['timestamp'] for row in bar_equity], list(dates))
+        self.assertAlmostEqual(bar_equity[-1]['portfolio_value'],
+                               results['final_portfolio']['total_value'], places=6)
+
+        # Each bar is valued at that bar's closes
+        context = engine.context
+        held = {symbol: 0.0 for symbol in frames}
+        trades = iter(results['trade_log'])
+        trade = next(trades, None)
+        for row in bar_equity:
+            while trade is not None and trade['timestamp'] == row['timestamp']:
+                held[trade['symbol']] += trade['quantity'] if trade['action'] == 'buy' else -trade['quantity']
+                trade = next(trades, None)
+            expected = sum(held[s] * frames[s].loc[row['timestamp'], 'close'] for s in frames)
+            self.assertAlmostEqual(row['positions_value'], expected, places=6)
+            self.assertAlmostEqual(row['portfolio_value'], row['cash'] + row['positions_value'], places=6)
+
+        values = pd.Series([row['portfolio_value'] for row in bar_equity])
+        drawdown = ((values - values.cummax()) / values.cummax()).min()
+        self.assertAlmostEqual(results['metrics']['max_drawdown'], drawdown)
+        self.assertGreater(results['memory']['bar_equity_bytes'], 0)
+        self.assertEqual(len(context.get_bar_equity_df()), len(dates))
+
+
+if __name__ == "__main__":
+    unittest.main()
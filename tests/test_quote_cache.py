@@ -0,0 +1,117 @@
+"""
+Quote Cache Tests
+=================
+
+TTL expiry, single-flight misses and stale-while-revalidate.
+"""
+
+import asyncio
+import unittest
+import sys
+
+sys.path.insert(0, '.')
+
+from api.quote_cache import QuoteCache
+
+
+class FakeUpstream:
+    """Counts fetches and returns a new version of each quote per call"""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.version = 0
+
+    async def fetch(self, symbols):
+        self.calls.append(list(symbols))
+        self.version += 1
+        await asyncio.sleep(self.delay)
+        return {symbol: {'symbol': symbol, 'version': self.version}
+                for symbol in symbols if symbol != 'UNKNOWN'}
+
+
+class TestQuoteCache(unittest.TestCase):
+    """Test the shared quote cache"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.live = True
+        self.upstream = FakeUpstream()
+        self.cache = QuoteCache(ttl=2.0, ttl_overrides={'FAST': 0.5},
+                                is_live=lambda: self.live, clock=lambda: self.now)
+
+    def get(self, symbols):
+        return self.cache.get_many('nse:NSE', symbols, self.upstream.fetch)
+
+    def test_ttl_and_partial_refetch(self):
+        async def run():
+            first = await self.get(['TCS', 'INFY', 'FAST', 'UNKNOWN'])
+            self.assertEqual(set(first), {'TCS', 'INFY', 'FAST'})
+
+            self.now = 1.0
+            await self.get(['TCS', 'INFY', 'FAST'])
+            self.now = 2.5
+            return await self.get(['TCS', 'INFY', 'FAST', 'WIPRO'])
+
+        quotes = asyncio.run(run())
+        # One fetch for the first call, FAST at 1s, then the expired and new ones
+        self.assertEqual(self.upstream.calls, [['TCS', 'INFY', 'FAST', 'UNKNOWN'], ['FAST'],
+                                               ['TCS', 'INFY', 'FAST', 'WIPRO']])
+        self.assertEqual(quotes['TCS']['version'], 3)
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['entries'], 4)
+
+    def test_concurrent_misses_share_one_fetch(self):
+        async def run():
+            return await asyncio.gather(*[self.get(['TCS', 'INFY']) for _ in range(20)],
+                                        self.get(['INFY', 'WIPRO']))
+
+        results = asyncio.run(run())
+        self.assertEqual(self.upstream.calls, [['TCS', 'INFY'], ['WIPRO']])
+        self.assertTrue(all(r == results[0] for r in results[:20]))
+        self.assertEqual(results[-1]['INFY'], results[0]['INFY'])
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['coalesced'], 39)
+        self.assertEqual(stats['in_flight'], 0)
+        self.assertGreater(stats['hit_rate'], 0.9)
+
+    def test_stale_while_revalidate_when_closed(self):
+        async def run():
+            await self.get(['TCS'])
+            self.live = False
+            self.now = 60.0
+
+            stale = await self.get(['TCS'])
+            # A second caller during the refresh doesn't start another
+            await self.get(['TCS'])
+            await asyncio.sleep(0.05)
+            fresh = await self.get(['TCS'])
+            return stale, fresh
+
+        stale, fresh = asyncio.run(run())
+        self.assertEqual(stale['TCS']['version'], 1)
+        self.assertEqual(fresh['TCS']['version'], 2)
+        self.assertEqual(len(self.upstream.calls), 2)
+        self.assertEqual(self.cache.get_stats()['stale_hits'], 2)
+
+    def test_fetch_errors_reach_every_waiter(self):
+        async def failing(symbols):
+            await asyncio.sleep(0.01)
+            raise ConnectionError("upstream down")
+
+        async def run():
+            return await asyncio.gather(self.cache.get_many('nse:NSE', ['TCS'], failing),
+                                        self.cache.get_many('nse:NSE', ['TCS'], failing),
+                                        return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+        self.assertEqual(self.cache.get_stats()['in_flight'], 0)
+        self.assertEqual(self.cache.get_stats()['errors'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
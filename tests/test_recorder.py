@@ -0,0 +1,172 @@
+"""
+Tick Recorder Tests
+===================
+
+Segment files, crash-safe headers and replay through StreamManager.
+"""
+
+import asyncio
+import shutil
+import tempfile
+import time
+import unittest
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.core.config_manager import ConfigManager
+from algoproject.core.interfaces import MarketData
+from algoproject.data.streaming.data_stream import StreamStatus
+from algoproject.data.streaming.recorder import (
+    HEADER_DTYPE, RECORD_DTYPE, ReplayStream, TickRecorder, list_segments, read_segment
+)
+from algoproject.data.streaming.stream_manager import StreamManager
+from algoproject.data.streaming.tick_ingest import Tick
+
+T0 = 1700000000000
+
+
+def tick(i, symbol='BTCUSDT'):
+    return Tick(symbol, T0 + i, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, float(i), 'binance')
+
+
+class TempDirTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class TestTickRecorder(TempDirTestCase):
+    """Ticks land in fixed-size records across rotated segments"""
+
+    def test_segments_rotate_and_round_trip(self):
+        recorder = TickRecorder(self.directory, segment_records=3)
+        for i in range(6):
+            recorder.record(tick(i, 'ETHUSDT' if i % 2 else 'BTCUSDT'))
+        recorder.record(MarketData('SOLUSDT', datetime.fromtimestamp((T0 + 6) / 1000), 1.0, 2.0, 0.5, 1.5, 9.0, 'bybit'))
+        recorder.close()
+
+        segments = list_segments(self.directory)
+        self.assertEqual([path.name for path in segments], ['ticks-000000.bin', 'ticks-000001.bin', 'ticks-000002.bin'])
+        # Closed segments are trimmed to their records
+        self.assertEqual(segments[2].stat().st_size, HEADER_DTYPE.itemsize + RECORD_DTYPE.itemsize)
+
+        records = [read_segment(path) for path in segments]
+        self.assertEqual([len(r) for r in records], [3, 3, 1])
+        first = records[0][1]
+        self.assertEqual((first['symbol'], int(first['ts']), float(first['close']), float(first['volume'])),
+                         (b'ETHUSDT', T0 + 1, 101.5, 1.0))
+        last = records[2][0]
+        self.assertEqual((last['symbol'], last['exchange'], int(last['ts'])), (b'SOLUSDT', b'bybit', T0 + 6))
+        self.assertEqual(recorder.get_stats()['records'], 7)
+
+    def test_unclosed_segment_is_readable(self):
+        recorder = TickRecorder(self.directory, segment_records=100)
+        for i in range(4):
+            recorder.record(tick(i))
+        # Not closed, as after a crash: the header count bounds the records
+        self.assertEqual(read_segment(recorder.segments[0])['ts'].tolist(), [T0, T0 + 1, T0 + 2, T0 + 3])
+        recorder.close()
+
+    def test_gap_in_segments_does_not_overwrite(self):
+        recorder = TickRecorder(self.directory, segment_records=1)
+        for i in range(3):
+            recorder.record(tick(i))
+        recorder.close()
+        (self.directory / 'ticks-000001.bin').unlink()
+        kept = (self.directory / 'ticks-000002.bin').read_bytes()
+
+        recorder = TickRecorder(self.directory, segment_records=1)
+        recorder.record(tick(3))
+        recorder.close()
+        self.assertEqual(recorder.segments[0].name, 'ticks-000003.bin')
+        self.assertEqual((self.directory / 'ticks-000002.bin').read_bytes(), kept)
+
+    def test_long_multibyte_names_replay(self):
+        symbol = 'X' + 'ÄÖÜ' * 5  # 31 bytes; a byte cut at 24 would split a character
+        recorder = TickRecorder(self.directory)
+        recorder.record(tick(0, symbol))
+        recorder.close()
+
+        ticks = [t for _, t in ReplayStream(self.directory).iter_ticks()]
+        self.assertEqual(ticks[0].symbol, 'X' + ('ÄÖÜ' * 4)[:11])
+        self.assertEqual(recorder.get_stats()['truncated_names'], 1)
+
+    def test_rejects_other_files(self):
+        path = self.directory / 'ticks-000000.bin'
+        path.write_bytes(b'not a segment' * 10)
+        with self.assertRaises(ValueError):
+            read_segment(path)
+
+
+class TestReplayStream(TempDirTestCase):
+    """A recording replays through StreamManager like a live stream"""
+
+    def record(self, count, pause=0.0):
+        recorder = TickRecorder(self.directory, segment_records=4)
+        for i in range(count):
+            recorder.record(tick(i, 'ETHUSDT' if i % 3 == 0 else 'BTCUSDT'))
+            if pause:
+                time.sleep(pause)
+        recorder.close()
+
+    def test_drop_in_stream_as_fast_as_possible(self):
+        self.record(10)
+
+        async def run():
+            manager = StreamManager(Mock(spec=ConfigManager))
+            received, inline = [], []
+
+            async def on_data(data):
+                received.append((data.symbol, data.ts))
+
+            manager.add_subscriber("data", on_data)
+            manager.add_subscriber("data", lambda data: inline.append(data.ts))
+            replay = ReplayStream(self.directory, speed=None)
+            self.assertTrue(await manager.add_stream('replay', replay))
+            await replay.wait_finished()
+            await asyncio.sleep(0.01)
+            await manager.stop()
+            return replay, received, inline, manager
+
+        replay, received, inline, manager = asyncio.run(run())
+        self.assertEqual(inline, [T0 + i for i in range(10)])
+        self.assertEqual(received, [('ETHUSDT' if i % 3 == 0 else 'BTCUSDT', T0 + i) for i in range(10)])
+        self.assertEqual(replay.get_status(), StreamStatus.DISCONNECTED)
+        self.assertEqual(replay.get_stats()['replayed'], 10)
+        self.assertGreater(replay.get_stats()['rate'], 0)
+        self.assertEqual(len(manager.get_latest_data('BTCUSDT', limit=100)), 6)
+
+    def test_paced_replay_and_symbol_filter(self):
+        self.record(3, pause=0.02)
+
+        async def run():
+            replay = ReplayStream(self.directory, speed=1.0, symbols=['BTCUSDT'])
+            seen = []
+            replay.add_subscriber("data", lambda data: seen.append(data.ts))
+            started = time.perf_counter()
+            self.assertTrue(await replay.connect())
+            await replay.wait_finished()
+            return seen, time.perf_counter() - started, replay
+
+        seen, elapsed, replay = asyncio.run(run())
+        self.assertEqual(seen, [T0 + 1, T0 + 2])
+        self.assertEqual(replay.get_stats()['skipped'], 1)
+        # The two BTCUSDT ticks were recorded about 20ms apart
+        self.assertGreaterEqual(elapsed, 0.015)
+
+    def test_connect_fails_without_recording(self):
+        async def run():
+            return await ReplayStream(self.directory / 'missing').connect()
+
+        self.assertFalse(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Backtest Result Cache Tests
+===========================
+
+Content-addressed keys, cached matrix sweeps, eviction and invalidation.
+"""
+
+import pickle
+import unittest
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, '.')
+
+from algoproject.backtesting.matrix_backtest import MatrixBacktestEngine
+from algoproject.backtesting.result_cache import (
+    BacktestResultCache, frame_fingerprint, make_result_key, strategy_id
+)
+from algoproject.data.data_loader import DataLoader
+from algoproject.strategies.base_strategy import BaseStrategy
+
+
+def make_frame(periods, seed):
+    """Create a deterministic random-walk OHLCV frame"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2023-01-01', periods=periods, freq='D')
+    close = 100.0 * np.cumprod(1 + rng.normal(0, 0.02, periods))
+    return pd.DataFrame({'open': close * 0.999, 'high': close * 1.01, 'low': close * 0.99,
+                         'close': close, 'volume': rng.uniform(100, 1000, periods)}, index=dates)
+
+
+FRAMES = {'AAA': make_frame(150, 1), 'BBB': make_frame(150, 2)}
+
+
+class MomentumStrategy(BaseStrategy):
+    """Buys after `lookback` rising closes and sells after a falling close"""
+
+    def _on_initialize(self):
+        self.closes = []
+
+    def next(self, data):
+        self.closes.append(data.close)
+        lookback = self.get_parameter('lookback', 2)
+        if len(self.closes) <= lookback:
+            return []
+        recent = self.closes[-lookback - 1:]
+        if all(b > a for a, b in zip(recent, recent[1:])):
+            return [self.create_signal(data.symbol, 'buy', 3.0)]
+        if recent[-1] < recent[-2] and self.context.get_position(data.symbol) > 0:
+            return [self.create_signal(data.symbol, 'sell', 3.0)]
+        return []
+
+
+def make_engine(cache, frames=FRAMES, lookbacks=(1, 2, 3)):
+    data_loader = Mock(spec=DataLoader)
+    data_loader.get_historical_data.side_effect = lambda symbol, **kwargs: frames[symbol]
+    engine = MatrixBacktestEngine(data_loader, max_workers=2, result_cache=cache)
+    engine.add_parameter_sweep(MomentumStrategy, {'lookback': list(lookbacks)}, ['AAA', 'BBB'],
+                               datetime(2023, 1, 1), datetime(2023, 6, 1))
+    return engine
+
+
+def make_key(params, fingerprint='abc'):
+    return make_result_key(MomentumStrategy, params, ['AAA'], datetime(2023, 1, 1),
+                           datetime(2023, 6, 1), '1d', 100000.0, 0.001, 0.001,
+                           {'AAA': fingerprint})
+
+
+class TestBacktestResultCache(unittest.TestCase):
+    """Test the backtest result cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = BacktestResultCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_keys_cover_definition_and_data(self):
+        key = make_key({'lookback': 2})
+        self.assertTrue(key.startswith(strategy_id(MomentumStrategy)))
+        self.assertEqual(key, make_key({'lookback': 2}))
+        self.assertNotEqual(key, make_key({'lookback': 3}))
+        self.assertNotEqual(key, make_key({'lookback': 2}, fingerprint='abd'))
+
+        changed = FRAMES['AAA'].copy()
+        changed.iloc[-1, changed.columns.get_loc('close')] += 0.01
+        self.assertEqual(frame_fingerprint(FRAMES['AAA']), frame_fingerprint(FRAMES['AAA'].copy()))
+        self.assertNotEqual(frame_fingerprint(FRAMES['AAA']), frame_fingerprint(changed))
+
+    def test_engine_changes_miss_the_cache(self):
+        key = make_key({'lookback': 2})
+        with patch('algoproject.backtesting.result_cache.engine_fingerprint', return_value='edited'):
+            self.assertNotEqual(make_key({'lookback': 2}), key)
+
+        make_engine(self.cache).run_matrix_backtest()
+        with patch('algoproject.backtesting.result_cache.RESULT_CACHE_VERSION', 2):
+            self.assertNotEqual(make_key({'lookback': 2}), key)
+            results = make_engine(self.cache).run_matrix_backtest()
+        self.assertFalse(any(r.cached for r in results))
+        self.assertEqual(self.cache.get_stats()['stores'], 12)
+
+    def test_repeated_sweep_is_served_from_cache(self):
+        first = {r.job_id: r for r in make_engine(self.cache).run_matrix_backtest()}
+        self.assertEqual(self.cache.get_stats()['stores'], 6)
+
+        # A larger sweep only runs the new combinations
+        engine = make_engine(self.cache, lookbacks=(1, 2, 3, 4))
+        second = {r.job_id: r for r in engine.run_matrix_backtest()}
+        self.assertEqual(sum(r.cached for r in second.values()), 6)
+        self.assertEqual(engine.get_results_summary()['cached_backtests'], 6)
+        for job_id, result in first.items():
+            self.assertTrue(second[job_id].cached)
+            self.assertEqual(second[job_id].results['trade_log'], result.results['trade_log'])
+            self.assertEqual(second[job_id].results['performance'], result.results['performance'])
+
+        # Different bars for one symbol invalidate only that symbol's results
+        frames = {'AAA': make_frame(150, 99), 'BBB': FRAMES['BBB']}
+        third = make_engine(BacktestResultCache(self.tmp.name), frames=frames).run_matrix_backtest()
+        self.assertEqual(sorted(r.symbols[0] for r in third if r.cached), ['BBB'] * 3)
+
+    def test_eviction_and_strategy_invalidation(self):
+        payload = {'trade_log': [{'price': float(i)} for i in range(200)]}
+        size = len(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        cache = BacktestResultCache(self.tmp.name + '/lru', max_bytes=int(size * 2.5))
+
+        keys = [make_key({'lookback': i}) for i in range(3)]
+        cache.put(keys[0], payload)
+        cache.put(keys[1], payload)
+        self.assertIsNotNone(cache.get(keys[0]))
+        cache.put(keys[2], payload)
+        # keys[1] was the least recently used
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+        other = 'tests.OtherStrategy/0123'
+        cache.put(other, payload)
+        reopened = BacktestResultCache(self.tmp.name + '/lru', max_bytes=int(size * 2.5))
+        self.assertEqual(reopened.get_stats()['entries'], 2)
+        self.assertEqual(reopened.invalidate_strategy(MomentumStrategy), 1)
+        self.assertIsNone(reopened.get(keys[2]))
+        self.assertEqual(reopened.get(other), payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
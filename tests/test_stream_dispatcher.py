@@ -0,0 +1,156 @@
+"""
+Stream Dispatcher Tests
+=======================
+
+Bounded subscriber queues, overflow policies and StreamManager delivery.
+"""
+
+import asyncio
+import unittest
+import sys
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.core.config_manager import ConfigManager
+from algoproject.core.interfaces import MarketData
+from algoproject.data.streaming.dispatcher import OverflowPolicy, StreamDispatcher, SubscriberQueue
+from algoproject.data.streaming.stream_manager import StreamManager
+
+
+def tick(symbol, price):
+    return MarketData(symbol, datetime(2024, 1, 1), price, price, price, price, 1.0, 'test')
+
+
+class GatedSubscriber:
+    """Records events and holds each delivery until the gate is opened"""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.seen = []
+
+    async def receive(self, data):
+        await self.gate.wait()
+        self.seen.append((data.symbol, data.close))
+
+
+async def settle():
+    await asyncio.sleep(0.01)
+
+
+class TestOverflowPolicies(unittest.TestCase):
+    """A full queue blocks, drops its oldest event or conflates by symbol"""
+
+    def run_policy(self, policy, events, maxsize=3):
+        async def run():
+            subscriber = GatedSubscriber()
+            dispatcher = StreamDispatcher(maxsize=maxsize, policy=policy)
+            queue = dispatcher.add(subscriber.receive)
+            for symbol, price in events:
+                await dispatcher.publish(tick(symbol, price))
+                await asyncio.sleep(0)  # Let the worker take the first event
+            subscriber.gate.set()
+            await settle()
+            await dispatcher.stop()
+            return subscriber.seen, queue.get_stats()
+
+        return asyncio.run(run())
+
+    def test_drop_oldest(self):
+        seen, stats = self.run_policy(OverflowPolicy.DROP_OLDEST, [('AAA', float(i)) for i in range(10)])
+        # The first event is in flight; of the rest only the newest three stay queued
+        self.assertEqual(seen, [('AAA', 0.0), ('AAA', 7.0), ('AAA', 8.0), ('AAA', 9.0)])
+        self.assertEqual((stats['dropped'], stats['delivered'], stats['max_depth']), (6, 4, 3))
+
+    def test_conflate_keeps_latest_per_symbol_in_place(self):
+        events = [('XXX', 0.0), ('AAA', 1.0), ('BBB', 1.0), ('AAA', 2.0), ('AAA', 3.0), ('BBB', 2.0)]
+        seen, stats = self.run_policy(OverflowPolicy.CONFLATE, events)
+        self.assertEqual(seen, [('XXX', 0.0), ('AAA', 3.0), ('BBB', 2.0)])
+        self.assertEqual((stats['conflated'], stats['dropped'], stats['delivered']), (3, 0, 3))
+
+    def test_block_waits_for_room_and_loses_nothing(self):
+        async def run():
+            subscriber = GatedSubscriber()
+            dispatcher = StreamDispatcher(maxsize=2, policy=OverflowPolicy.BLOCK)
+            queue = dispatcher.add(subscriber.receive)
+
+            async def produce():
+                for i in range(6):
+                    await dispatcher.publish(tick('AAA', float(i)))
+
+            producer = asyncio.create_task(produce())
+            await settle()
+            # One event in flight, two queued, the producer is parked
+            self.assertFalse(producer.done())
+            self.assertEqual(queue.depth(), 2)
+
+            subscriber.gate.set()
+            await asyncio.wait_for(producer, 1)
+            await settle()
+            await dispatcher.stop()
+            return subscriber.seen, queue.get_stats()
+
+        seen, stats = asyncio.run(run())
+        self.assertEqual([price for _, price in seen], [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual((stats['dropped'], stats['max_depth']), (0, 2))
+        self.assertGreater(stats['lag_max_ms'], 0)
+        self.assertLessEqual(stats['lag_avg_ms'], stats['lag_max_ms'])
+
+    def test_offer_refuses_when_blocked_queue_is_full(self):
+        queue = SubscriberQueue(GatedSubscriber().receive, maxsize=1, policy=OverflowPolicy.BLOCK)
+        self.assertTrue(queue.offer(tick('AAA', 1.0)))
+        self.assertFalse(queue.offer(tick('AAA', 2.0)))
+        self.assertEqual(queue.get_stats()['published'], 1)
+        with self.assertRaises(ValueError):
+            SubscriberQueue(GatedSubscriber().receive, maxsize=0)
+
+
+class TestStreamManagerDispatch(unittest.TestCase):
+    """StreamManager queues async subscribers and calls sync ones inline"""
+
+    def test_delivery_is_ordered_and_isolated(self):
+        async def run():
+            manager = StreamManager(Mock(spec=ConfigManager), queue_size=8,
+                                    overflow_policy=OverflowPolicy.DROP_OLDEST)
+            fast_seen, inline_seen = [], []
+            slow = GatedSubscriber()
+
+            async def fast(data):
+                await asyncio.sleep(0)
+                fast_seen.append((data.symbol, data.close))
+
+            manager.add_subscriber("data", fast)
+            manager.add_subscriber("data", slow.receive, queue_size=2)
+            manager.add_subscriber("data", lambda data: inline_seen.append(data.close))
+
+            events = [('AAA', 1.0), ('BBB', 1.0), ('AAA', 2.0), ('BBB', 2.0), ('AAA', 3.0)]
+            for symbol, price in events:
+                await manager._handle_stream_data(tick(symbol, price))
+                await asyncio.sleep(0)
+            await settle()
+
+            # A stalled subscriber does not hold back the others
+            self.assertEqual(fast_seen, events)
+            self.assertEqual(inline_seen, [1.0, 1.0, 2.0, 2.0, 3.0])
+
+            stats = manager.get_dispatch_stats()
+            slow_stats = next(s for name, s in stats.items() if 'GatedSubscriber' in name)
+            self.assertEqual((slow_stats['depth'], slow_stats['dropped']), (2, 2))
+
+            manager.remove_subscriber("data", fast)
+            await manager._handle_stream_data(tick('AAA', 4.0))
+            await settle()
+            self.assertEqual(len(fast_seen), 5)
+
+            slow.gate.set()
+            await settle()
+            await manager.stop()
+            return slow.seen
+
+        slow_seen = asyncio.run(run())
+        self.assertEqual(slow_seen, [('AAA', 1.0), ('AAA', 3.0), ('AAA', 4.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tick Ingestion Tests
+====================
+
+Exchange parsers, per-symbol ring buffers and the StreamManager tick buffer.
+"""
+
+import asyncio
+import json
+import unittest
+import sys
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.core.config_manager import ConfigManager
+from algoproject.core.interfaces import MarketData
+from algoproject.data.streaming.stream_manager import StreamManager
+from algoproject.data.streaming.tick_ingest import Tick, TickIngestor, TickRingBuffer
+
+
+BINANCE_TICKER = {"e": "24hrTicker", "E": 1700000000000, "s": "BTCUSDT", "o": "35000.0",
+                  "h": "36000.5", "l": "34800.0", "c": "35500.25", "v": "1234.5"}
+BINANCE_TRADE = {"e": "trade", "E": 1700000000100, "s": "ETHUSDT", "t": 1, "p": "2000.5",
+                 "q": "0.25", "T": 1700000000099}
+BYBIT_TICKER = {"topic": "tickers.BTCUSDT", "ts": 1700000000200, "type": "snapshot",
+                "data": {"symbol": "BTCUSDT", "lastPrice": "35510", "highPrice24h": "36000",
+                         "lowPrice24h": "34900", "prevPrice24h": "35100", "volume24h": "999.5"}}
+BYBIT_TRADES = {"topic": "publicTrade.ETHUSDT", "ts": 1700000000300, "type": "snapshot",
+                "data": [{"T": 1700000000298, "s": "ETHUSDT", "S": "Buy", "v": "1.5", "p": "2001"},
+                         {"T": 1700000000299, "s": "ETHUSDT", "S": "Sell", "v": "0.5", "p": "2002"}]}
+
+
+def frame(message):
+    return json.dumps(message).encode()
+
+
+class TestTickIngestor(unittest.TestCase):
+    """Parsers registered at subscribe time turn frames into ticks"""
+
+    def test_binance_raw_and_combined_messages(self):
+        ticks = []
+        ingestor = TickIngestor('binance', on_tick=ticks.append)
+        ingestor.enable('ticker')
+        ingestor.enable('trades')
+
+        self.assertTrue(ingestor.ingest(frame(BINANCE_TICKER)))
+        self.assertTrue(ingestor.ingest(frame({"stream": "ethusdt@trade", "data": BINANCE_TRADE})))
+
+        btc, eth = ticks
+        self.assertEqual((btc.symbol, btc.ts, btc.open, btc.high, btc.low, btc.close, btc.volume),
+                         ('BTCUSDT', 1700000000000, 35000.0, 36000.5, 34800.0, 35500.25, 1234.5))
+        self.assertEqual((eth.symbol, eth.ts, eth.close, eth.volume), ('ETHUSDT', 1700000000099, 2000.5, 0.25))
+        self.assertEqual(btc.exchange, 'binance')
+        self.assertEqual(ingestor.latest('BTCUSDT')['close'].tolist(), [35500.25])
+
+    def test_bybit_ticker_and_trade_batches(self):
+        ingestor = TickIngestor('bybit', source='bybit-spot')
+        ingestor.enable('ticker')
+        ingestor.enable('trades')
+
+        ingestor.ingest(frame(BYBIT_TICKER))
+        ingestor.ingest(frame(BYBIT_TRADES))
+
+        btc = ingestor.latest('BTCUSDT')
+        self.assertEqual((int(btc['ts'][0]), float(btc['open'][0]), float(btc['close'][0])),
+                         (1700000000200, 35100.0, 35510.0))
+        eth = ingestor.latest('ETHUSDT')
+        self.assertEqual(eth['close'].tolist(), [2001.0, 2002.0])
+        self.assertEqual(eth['volume'].tolist(), [1.5, 0.5])
+        self.assertEqual(ingestor.get_stats()['ticks'], 3)
+
+    def test_unsubscribed_and_control_messages_fall_through(self):
+        ingestor = TickIngestor('binance')
+        ingestor.enable('ticker')
+
+        self.assertFalse(ingestor.ingest(frame(BINANCE_TRADE)))
+        self.assertFalse(ingestor.ingest(frame({"result": None, "id": 1})))
+        self.assertFalse(ingestor.enable('orderbook'))
+
+        # A malformed tick is consumed and counted, not raised
+        self.assertTrue(ingestor.ingest(frame({**BINANCE_TICKER, "c": "not-a-number"})))
+        stats = ingestor.get_stats()
+        self.assertEqual((stats['messages'], stats['unrouted'], stats['errors'], stats['ticks']), (3, 2, 1, 0))
+
+    def test_unknown_exchange_format(self):
+        with self.assertRaises(ValueError):
+            TickIngestor('kraken')
+
+
+class TestTickRingBuffer(unittest.TestCase):
+    """The ring keeps the newest ticks in arrival order"""
+
+    def test_wraps_around(self):
+        ring = TickRingBuffer(capacity=4)
+        for i in range(6):
+            ring.append(i, 1.0, 1.0, 1.0, float(i), 1.0)
+
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(ring.latest()['ts'].tolist(), [2, 3, 4, 5])
+        self.assertEqual(ring.latest(3)['close'].tolist(), [3.0, 4.0, 5.0])
+        self.assertEqual(ring.latest(1)['ts'].tolist(), [5])
+        self.assertEqual(len(TickRingBuffer(4).latest(2)), 0)
+
+    def test_tick_matches_market_data(self):
+        tick = Tick('BTCUSDT', 1700000000000, 1.0, 2.0, 0.5, 1.5, 10.0, 'binance')
+        self.assertEqual(tick.to_market_data(),
+                         MarketData('BTCUSDT', datetime.fromtimestamp(1700000000), 1.0, 2.0, 0.5, 1.5, 10.0, 'binance'))
+        with self.assertRaises(AttributeError):
+            tick.extra = 1
+
+
+class TestStreamManagerBuffer(unittest.TestCase):
+    """StreamManager keeps a bounded buffer per symbol"""
+
+    def test_buffer_is_bounded(self):
+        async def run():
+            manager = StreamManager(Mock(spec=ConfigManager))
+            manager.buffer_size = 3
+            for i in range(5):
+                await manager._handle_stream_data(Tick('AAA', i, 1.0, 1.0, 1.0, float(i), 1.0, 'test'))
+            return manager
+
+        manager = asyncio.run(run())
+        self.assertEqual([t.ts for t in manager.get_latest_data('AAA', limit=10)], [2, 3, 4])
+        self.assertEqual([t.ts for t in manager.get_latest_data('AAA', limit=2)], [3, 4])
+        self.assertEqual(manager.get_latest_data('AAA')[0].close, 4.0)
+        self.assertEqual(manager.get_latest_data('BBB'), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Vectorized Backtest Engine Tests
+================================
+
+Bar-for-bar parity between the event loop and the aligned-timeline loop.
+"""
+
+import unittest
+import sys
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.insert(0, '.')
+
+from algoproject.backtesting.backtest_engine import BacktestEngine, EngineMode
+from algoproject.backtesting.aligned_timeline import AlignedTimeline
+from algoproject.data.data_loader import DataLoader
+from algoproject.strategies.base_strategy import BaseStrategy
+
+
+def make_frame(dates, seed):
+    """Create a deterministic random-walk OHLCV frame"""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1 + rng.normal(0, 0.02, len(dates)))
+    return pd.DataFrame({
+        'open': close * 0.999,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.uniform(100, 1000, len(dates))
+    }, index=dates)
+
+
+class RecordingStrategy(BaseStrategy):
+    """Buys on up-closes, sells on down-closes and records every input"""
+
+    def _on_initialize(self):
+        self.seen = []
+        self.last_close = {}
+
+    def next(self, data):
+        self.seen.append((data.symbol, data.timestamp, data.open, data.high,
+                          data.low, data.close, data.volume, data.exchange))
+        signals = []
+        previous = self.last_close.get(data.symbol)
+        if previous is not None:
+            if data.close > previous:
+                signals.append(self.create_signal(data.symbol, 'buy', 5.0))
+            elif data.close < previous and self.context.get_position(data.symbol) > 0:
+                signals.append(self.create_signal(data.symbol, 'sell', 2.0))
+        self.last_close[data.symbol] = data.close
+        return signals
+
+
+class TestAlignedTimeline(unittest.TestCase):
+    """Test timeline alignment"""
+
+    def test_alignment_and_mask(self):
+        """Frames are aligned onto the union index with a presence mask"""
+        a = make_frame(pd.date_range('2023-01-01', periods=5, freq='D'), 1)
+        b = make_frame(pd.date_range('2023-01-03', periods=5, freq='D'), 2)
+
+        timeline = AlignedTimeline.from_frames({'A': a, 'B': b})
+
+        self.assertEqual(len(timeline), 7)
+        self.assertEqual(timeline.ohlcv.shape, (2, 5, 7))
+        self.assertTrue(timeline.ohlcv.flags['C_CONTIGUOUS'])
+        self.assertEqual(timeline.mask[0].tolist(), [True] * 5 + [False] * 2)
+        self.assertEqual(timeline.mask[1].tolist(), [False] * 2 + [True] * 5)
+        np.testing.assert_array_equal(timeline.field('close', 'B')[2:], b['close'].to_numpy())
+        self.assertTrue(np.isnan(timeline.field('close', 'B')[0]))
+
+
+class TestVectorizedParity(unittest.TestCase):
+    """Event loop and vectorized loop must produce identical backtests"""
+
+    def setUp(self):
+        frames = {
+            'AAA': make_frame(pd.date_range('2023-01-01', periods=120, freq='D'), 7),
+            # Misaligned, sparser series exercises the presence mask
+            'BBB': make_frame(pd.date_range('2023-01-10', periods=60, freq='2D'), 11),
+        }
+        self.data_loader = Mock(spec=DataLoader)
+        self.data_loader.get_historical_data.side_effect = lambda symbol, **kwargs: frames[symbol]
+
+    def _run(self, mode):
+        engine = BacktestEngine(self.data_loader, initial_capital=100000.0,
+                                commission=0.001, slippage=0.0005, mode=mode)
+        strategy = RecordingStrategy("Recorder", {})
+        results = engine.run_backtest(strategy, ['AAA', 'BBB'],
+                                      datetime(2023, 1, 1), datetime(2023, 6, 1))
+        return strategy, engine, results
+
+    def test_bar_for_bar_parity(self):
+        """Strategy inputs, trades and equity curve match exactly"""
+        event_strategy, event_engine, event_results = self._run(EngineMode.EVENT)
+        fast_strategy, fast_engine, fast_results = self._run('vectorized')
+
+        self.assertGreater(len(event_strategy.seen), 0)
+        self.assertEqual(event_strategy.seen, fast_strategy.seen)
+
+        event_history = {s: [vars(d) for d in bars] for s, bars in event_engine.context.historical_data.items()}
+        fast_history = {s: [vars(d) for d in bars] for s, bars in fast_engine.context.historical_data.items()}
+        self.assertEqual(event_history, fast_history)
+
+        self.assertGreater(len(event_results['trade_log']), 0)
+        self.assertEqual(event_results['trade_log'], fast_results['trade_log'])
+        self.assertEqual(event_results['equity_curve'], fast_results['equity_curve'])
+        self.assertEqual(event_results['performance'], fast_results['performance'])
+        self.assertEqual(event_results['final_portfolio'], fast_results['final_portfolio'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+WebSocket Broadcaster Tests
+===========================
+
+Topic routing, per-client queues, price conflation and slow clients.
+"""
+
+import asyncio
+import json
+import unittest
+import sys
+
+sys.path.insert(0, '.')
+
+from api.ws_broadcaster import WebSocketBroadcaster, price_topic
+
+
+class FakeWebSocket:
+    """Records sent text; a stalled socket blocks until released"""
+
+    def __init__(self, stalled=False):
+        self.sent = []
+        self.release = asyncio.Event()
+        if not stalled:
+            self.release.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.release.wait()
+        self.sent.append(text)
+
+    def messages(self):
+        return [json.loads(text) for text in self.sent]
+
+
+async def settle():
+    await asyncio.sleep(0.01)
+
+
+class TestWebSocketBroadcaster(unittest.TestCase):
+    """Test the broadcaster"""
+
+    def test_topics_route_to_subscribers(self):
+        async def run():
+            broadcaster = WebSocketBroadcaster()
+            everything, prices, btc = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+            for ws in (everything, prices, btc):
+                await broadcaster.connect(ws)
+            broadcaster.subscribe(prices, ['price:*'])
+            self.assertEqual(broadcaster.subscribe(btc, [price_topic('BTC/USDT'), 'backtest']),
+                             ['backtest', 'price:BTC/USDT'])
+
+            broadcaster.publish('portfolio', {'type': 'portfolio_update'})
+            broadcaster.publish(price_topic('ETH/USDT'), {'type': 'price_update', 'data': {'ETH/USDT': 1}})
+            broadcaster.publish(price_topic('BTC/USDT'), {'type': 'price_update', 'data': {'BTC/USDT': 2}})
+            broadcaster.publish('backtest', {'type': 'backtest_complete'})
+            await settle()
+            return everything, prices, btc
+
+        everything, prices, btc = asyncio.run(run())
+        self.assertEqual(len(everything.sent), 4)
+        self.assertEqual([m['data'] for m in prices.messages()], [{'ETH/USDT': 1}, {'BTC/USDT': 2}])
+        self.assertEqual([m['type'] for m in btc.messages()], ['price_update', 'backtest_complete'])
+        # The same serialized string goes to every recipient
+        self.assertIs(everything.sent[1], prices.sent[0])
+
+    def test_slow_client_does_not_stall_others(self):
+        async def run():
+            broadcaster = WebSocketBroadcaster(max_queue=5)
+            fast, slow = FakeWebSocket(), FakeWebSocket(stalled=True)
+            await broadcaster.connect(fast)
+            await broadcaster.connect(slow)
+
+            for i in range(100):
+                broadcaster.publish(price_topic('BTC/USDT'), {'type': 'price_update', 'data': {'BTC/USDT': i}})
+                broadcaster.publish(price_topic('ETH/USDT'), {'type': 'price_update', 'data': {'ETH/USDT': i}})
+                await asyncio.sleep(0)
+            for i in range(10):
+                broadcaster.publish('backtest', {'type': 'backtest_progress', 'data': i})
+                await asyncio.sleep(0)
+            await settle()
+
+            fast_messages = fast.messages()
+            stats = broadcaster.get_stats()
+            slow.release.set()
+            await settle()
+            return fast_messages, slow, stats
+
+        fast_messages, slow, stats = asyncio.run(run())
+        # The fast client kept up while the slow one was stuck
+        self.assertGreater(len(fast_messages), 150)
+        self.assertEqual([m['data'] for m in fast_messages[-10:]], list(range(10)))
+        self.assertLessEqual(stats['max_queue_depth'], 5)
+        self.assertGreater(stats['conflated'], 150)
+
+        # The stalled client gets the latest prices and the newest events
+        messages = slow.messages()
+        self.assertLessEqual(len(messages), 7)
+        self.assertEqual([m['data'] for m in messages[-5:]], [5, 6, 7, 8, 9])
+
+    def test_failed_client_is_disconnected(self):
+        class BrokenWebSocket(FakeWebSocket):
+            async def send_text(self, text):
+                raise ConnectionError("gone")
+
+        async def run():
+            broadcaster = WebSocketBroadcaster()
+            ok, broken = FakeWebSocket(), BrokenWebSocket()
+            await broadcaster.connect(ok)
+            await broadcaster.connect(broken)
+            broadcaster.publish('portfolio', {'type': 'portfolio_update'})
+            await settle()
+            self.assertEqual(broadcaster.publish('portfolio', {'type': 'portfolio_update'}), 1)
+            await settle()
+            return broadcaster, ok
+
+        broadcaster, ok = asyncio.run(run())
+        self.assertEqual(len(ok.sent), 2)
+        self.assertEqual(broadcaster.get_stats()['clients'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
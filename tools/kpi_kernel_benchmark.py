@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+KPI Kernel Benchmark
+====================
+
+Times scoring many equity curves with one compute_kpis call against
+scoring them one by one with the per-curve pandas calculation it replaced.
+
+    python tools/kpi_kernel_benchmark.py --curves 2000 --bars 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from algoproject.core.kpi_kernel import TradeTable, compute_kpis
+
+
+def make_runs(curves: int, bars: int, trades_per_run: int, seed: int):
+    """Random-walk equity curves and a trade table covering every run"""
+    rng = np.random.default_rng(seed)
+    equity = 100000.0 * np.cumprod(1 + rng.normal(0.0004, 0.01, (curves, bars)), axis=1)
+    timestamps = pd.date_range('2020-01-01', periods=bars, freq='D').to_numpy()
+
+    count = curves * trades_per_run
+    entry = timestamps[rng.integers(0, bars - 10, count)]
+    pnl_pct = rng.normal(0.2, 2.0, count)
+    trades = TradeTable(
+        run=np.repeat(np.arange(curves), trades_per_run),
+        pnl=pnl_pct * 10,
+        pnl_pct=pnl_pct,
+        entry_time=entry,
+        exit_time=entry + rng.integers(1, 10, count) * np.timedelta64(1, 'D')
+    )
+    return equity, timestamps, trades
+
+
+def score_one(values: np.ndarray, risk_free_rate: float = 0.02) -> dict:
+    """The previous per-curve approach: a pandas pass and Python loop per curve"""
+    equity = pd.Series(values)
+    returns = equity.pct_change().dropna()
+    volatility = returns.std() * np.sqrt(252)
+    excess = returns.mean() * 252 - risk_free_rate
+    downside = returns[returns < 0].std() * np.sqrt(252)
+    peak = equity.expanding().max()
+    drawdown = (equity - peak) / peak
+
+    periods, current = [], 0
+    for underwater in drawdown < 0:
+        if underwater:
+            current += 1
+        elif current:
+            periods.append(current)
+            current = 0
+    if current:
+        periods.append(current)
+
+    return {
+        'sharpe_ratio': excess / volatility if volatility > 0 else 0,
+        'sortino_ratio': excess / downside if downside > 0 else 0,
+        'max_drawdown_pct': -drawdown.min() * 100,
+        'max_drawdown_duration': max(periods) if periods else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[4])
+    parser.add_argument('--curves', type=int, default=2000)
+    parser.add_argument('--bars', type=int, default=1000)
+    parser.add_argument('--trades', type=int, default=50, help='Closed trades per curve')
+    parser.add_argument('--loop-curves', type=int, default=200,
+                        help='Curves timed for the per-curve loop, which is much slower')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    equity, timestamps, trades = make_runs(args.curves, args.bars, args.trades, args.seed)
+
+    start = time.perf_counter()
+    kpis = compute_kpis(equity, timestamps, trades)
+    kernel_seconds = time.perf_counter() - start
+    kernel_per_curve = kernel_seconds / args.curves
+
+    sample = equity[:args.loop_curves]
+    start = time.perf_counter()
+    for values in sample:
+        score_one(values)
+    loop_per_curve = (time.perf_counter() - start) / max(1, len(sample))
+
+    print(f"Curves scored:           {args.curves:,} x {args.bars:,} bars, "
+          f"{len(trades):,} trades in {kernel_seconds:.2f}s ({len(kpis)} KPIs)")
+    print(f"Kernel per curve:        {kernel_per_curve * 1e6:,.1f} us (all KPIs)")
+    print(f"Per-curve loop:          {loop_per_curve * 1e6:,.1f} us (4 KPIs)")
+    print(f"Speedup:                 {loop_per_curve / kernel_per_curve:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
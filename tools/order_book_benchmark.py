@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Order Book Benchmark
+====================
+
+Times TradeExecutor.process_market_data against the previous full scan of
+pending orders, with a large book of resting limit and stop orders spread
+over many symbols.
+
+    python tools/order_book_benchmark.py --orders 100000 --symbols 1000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from algoproject.backtesting.backtest_context import BacktestContext
+from algoproject.backtesting.trade_executor import ExecutionMode, TradeExecutor
+from algoproject.core.interfaces import MarketData
+
+
+def build_executor(orders: int, symbols: int, seed: int) -> TradeExecutor:
+    """Create an executor holding `orders` resting orders around a price of 100"""
+    rng = np.random.default_rng(seed)
+    context = BacktestContext(initial_capital=1e12, commission=0.0)
+    executor = TradeExecutor(context, slippage=0.0)
+
+    names = [f"SYM{i:05d}" for i in range(symbols)]
+    # Hold every symbol so sell orders can fill
+    for symbol in names:
+        context.portfolio.buy(symbol, 1e6, 100.0)
+
+    offsets = rng.uniform(0.5, 20.0, orders)
+    for i in range(orders):
+        symbol = names[i % symbols]
+        kind = i % 4
+        if kind == 0:
+            executor.place_order(symbol, 'buy', 1.0, ExecutionMode.LIMIT, price=100.0 - offsets[i])
+        elif kind == 1:
+            executor.place_order(symbol, 'sell', 1.0, ExecutionMode.LIMIT, price=100.0 + offsets[i])
+        elif kind == 2:
+            executor.place_order(symbol, 'buy', 1.0, ExecutionMode.STOP, stop_price=100.0 + offsets[i])
+        else:
+            executor.place_order(symbol, 'sell', 1.0, ExecutionMode.STOP, stop_price=100.0 - offsets[i])
+    return executor
+
+
+def make_bars(symbols: int, timestamps: int, seed: int):
+    """Random-walk bars for every symbol at every timestamp"""
+    rng = np.random.default_rng(seed)
+    names = [f"SYM{i:05d}" for i in range(symbols)]
+    close = np.full(symbols, 100.0)
+    start = datetime(2024, 1, 1)
+    for t in range(timestamps):
+        step = rng.normal(0, 0.3, symbols)
+        open_ = close
+        close = close + step
+        high = np.maximum(open_, close) + 0.1
+        low = np.minimum(open_, close) - 0.1
+        ts = start + timedelta(minutes=t)
+        yield [MarketData(names[s], ts, open_[s], high[s], low[s], close[s], 1.0, 'bench')
+               for s in range(symbols)]
+
+
+def scan_pending(executor: TradeExecutor, data: MarketData):
+    """The previous implementation: check every pending order for every bar"""
+    triggered = []
+    for order_id, order in executor.pending_orders.items():
+        if order.symbol == data.symbol and executor._should_execute_order(order, data):
+            triggered.append(order_id)
+    return triggered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[4])
+    parser.add_argument('--orders', type=int, default=100000)
+    parser.add_argument('--symbols', type=int, default=1000)
+    parser.add_argument('--timestamps', type=int, default=50)
+    parser.add_argument('--scan-bars', type=int, default=200,
+                        help='Bars timed for the full scan, which is much slower')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    start = time.perf_counter()
+    executor = build_executor(args.orders, args.symbols, args.seed)
+    place_seconds = time.perf_counter() - start
+
+    # Time the full scan first: it only reads the pending orders
+    scan_bars = [bar for bars in make_bars(args.symbols, 1, args.seed) for bar in bars][:args.scan_bars]
+    start = time.perf_counter()
+    for data in scan_bars:
+        scan_pending(executor, data)
+    scan_per_bar = (time.perf_counter() - start) / max(1, len(scan_bars))
+
+    bars_processed = 0
+    start = time.perf_counter()
+    for bars in make_bars(args.symbols, args.timestamps, args.seed):
+        for data in bars:
+            executor.context.update_market_data(data)
+            executor.process_market_data(data)
+        bars_processed += len(bars)
+    book_seconds = time.perf_counter() - start
+    book_per_bar = book_seconds / max(1, bars_processed)
+
+    stats = executor.order_book.get_stats()
+    print(f"Resting orders placed:   {args.orders:,} over {args.symbols:,} symbols "
+          f"in {place_seconds:.2f}s")
+    print(f"Bars processed:          {bars_processed:,} in {book_seconds:.2f}s "
+          f"({len(executor.filled_orders):,} fills, {stats['resting']:,} still resting)")
+    print(f"Order book per bar:      {book_per_bar * 1e6:,.1f} us (includes fills)")
+    print(f"Full scan per bar:       {scan_per_bar * 1e6:,.1f} us")
+    print(f"Speedup:                 {scan_per_bar / book_per_bar:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
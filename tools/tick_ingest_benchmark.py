@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tick Ingestion Benchmark
+========================
+
+Replays recorded-style WebSocket frames through the TickIngestor path and
+through the json.loads / MarketData / list-buffer path it replaced.
+
+    python tools/tick_ingest_benchmark.py --messages 200000 --symbols 50
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from algoproject.core.interfaces import MarketData
+from algoproject.data.streaming.tick_ingest import TickIngestor, orjson
+
+
+def make_frames(messages: int, symbols: int, seed: int):
+    """Binance combined-stream ticker frames cycling over the symbols"""
+    rng = np.random.default_rng(seed)
+    names = [f"SYM{i}USDT" for i in range(symbols)]
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.001, messages))
+    frames = []
+    for i in range(messages):
+        symbol = names[i % symbols]
+        price = prices[i]
+        frames.append(json.dumps({
+            "stream": f"{symbol.lower()}@ticker",
+            "data": {"e": "24hrTicker", "E": 1700000000000 + i, "s": symbol,
+                     "o": f"{price * 0.99:.4f}", "h": f"{price * 1.01:.4f}",
+                     "l": f"{price * 0.98:.4f}", "c": f"{price:.4f}", "v": f"{rng.random() * 100:.3f}"}
+        }).encode())
+    return frames
+
+
+def legacy_replay(frames, buffer_size: int):
+    """The previous path: json.loads, fallback parsing and list re-slicing"""
+    buffer = {}
+    for raw in frames:
+        message = json.loads(raw)
+        if 'error' in message or ('result' in message and message.get('id')):
+            continue
+        if 'stream' in message and 'data' in message:
+            stream_name, data = message['stream'], message['data']
+            symbol = stream_name.split('@')[0].upper()
+            if '@ticker' in stream_name or 'c' in data:
+                tick = MarketData(
+                    symbol=symbol,
+                    timestamp=datetime.fromtimestamp(data.get('E', data.get('timestamp', 0)) / 1000),
+                    open=float(data.get('o', data.get('open', 0))),
+                    high=float(data.get('h', data.get('high', 0))),
+                    low=float(data.get('l', data.get('low', 0))),
+                    close=float(data.get('c', data.get('close', data.get('price', 0)))),
+                    volume=float(data.get('v', data.get('volume', 0))),
+                    exchange='binance'
+                )
+                ticks = buffer.setdefault(symbol, [])
+                ticks.append(tick)
+                if len(ticks) > buffer_size:
+                    buffer[symbol] = ticks[-buffer_size:]
+    return buffer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[4])
+    parser.add_argument('--messages', type=int, default=200000)
+    parser.add_argument('--symbols', type=int, default=50)
+    parser.add_argument('--buffer', type=int, default=1000, help='Ticks kept per symbol')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    frames = make_frames(args.messages, args.symbols, args.seed)
+
+    start = time.perf_counter()
+    legacy_replay(frames, args.buffer)
+    legacy_rate = args.messages / (time.perf_counter() - start)
+
+    ingestor = TickIngestor('binance', capacity=args.buffer)
+    ingestor.enable('ticker')
+    start = time.perf_counter()
+    for raw in frames:
+        ingestor.ingest(raw)
+    ingest_rate = args.messages / (time.perf_counter() - start)
+
+    delivered = 0
+
+    def count(tick):
+        nonlocal delivered
+        delivered += 1
+
+    subscribed = TickIngestor('binance', capacity=args.buffer, on_tick=count)
+    subscribed.enable('ticker')
+    start = time.perf_counter()
+    for raw in frames:
+        subscribed.ingest(raw)
+    subscribed_rate = args.messages / (time.perf_counter() - start)
+
+    print(f"Frames replayed:         {args.messages:,} over {args.symbols} symbols "
+          f"(decoder: {'orjson' if orjson is not None else 'json'})")
+    print(f"Previous path:           {legacy_rate:,.0f} msg/s")
+    print(f"Ingestor (buffer only):  {ingest_rate:,.0f} msg/s")
+    print(f"Ingestor + subscriber:   {subscribed_rate:,.0f} msg/s ({delivered:,} ticks)")
+    print(f"Speedup:                 {ingest_rate / legacy_rate:,.1f}x / {subscribed_rate / legacy_rate:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()